@@ -0,0 +1,162 @@
+"""
+Stream Load Chunk Serialization Benchmark
+
+Compares the native Polars serializer used by insert_records (CsvFormat:
+SOH-separated CSV with \\N for NULL, written slice by slice into the Stream
+Load body) against the previous pandas path (chunk.to_pandas(), column
+reorder, DataFrame.to_csv to a temp file that was then streamed from disk),
+on a synthetic fact-invoice-like chunk. Both outputs are parsed back and
+checked against the source chunk.
+
+Usage:
+    python benchmark_chunk_serialization.py                  # 100,000-row chunk, 5 runs
+    python benchmark_chunk_serialization.py --rows 500000 --runs 3
+    python benchmark_chunk_serialization.py --skip-pandas    # native timing only
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.loaders.stream_load_body import iter_file_body  # noqa: E402
+from core.loaders.stream_load_formats import CsvFormat  # noqa: E402
+
+GREEN = "\033[32m"
+RED = "\033[31m"
+CYAN = "\033[36m"
+RESET = "\033[0m"
+
+SEPARATOR = "\x01"
+NULL_MARKER = "\\N"
+
+
+def build_chunk(rows: int, seed: int = 42) -> pl.DataFrame:
+    """
+    Synthetic fact chunk: YYYYMMDD dates, small-int codes, decimals, free text
+    (with commas and quotes) and ~5% NULLs in every nullable column.
+    """
+    idx = pl.int_range(0, rows, dtype=pl.Int64)
+
+    def rand(salt: int) -> pl.Expr:
+        # Deterministic pseudo-random integer in [0, 1000)
+        return (idx + salt).hash(seed) % 1000
+
+    def nullable(expr: pl.Expr, salt: int) -> pl.Expr:
+        return pl.when(rand(salt) < 50).then(None).otherwise(expr)
+
+    return pl.select(
+        (20250101 + rand(1) % 28).cast(pl.Int32).alias("invoice_date"),
+        pl.format("C{}", (rand(2) * 97).cast(pl.Utf8).str.zfill(8)).alias("customer_code"),
+        nullable(pl.format("INV/{}/{}", rand(3), idx), 4).alias("invoice_no"),
+        (100 + rand(5) % 60).cast(pl.Int16).alias("sales_group_code"),
+        nullable((rand(6) * 13.37).round(2), 7).alias("value"),
+        nullable((rand(8) / 7).round(3), 9).alias("volume"),
+        nullable(rand(10).cast(pl.Int64), 11).alias("quantity"),
+        nullable(pl.format('Item {}, "grade" {}', rand(12), rand(13)), 14).alias("item_name"),
+        pl.lit("SECONDARY").alias("record_type"),
+    )
+
+
+def serialize_native(chunk: pl.DataFrame, ordered_columns: list, fmt: CsvFormat) -> bytes:
+    """insert_records path: Polars CSV slices straight into the request body."""
+    return b"".join(fmt.iter_body(chunk.select(ordered_columns)))
+
+
+def serialize_pandas(chunk: pl.DataFrame, ordered_columns: list) -> bytes:
+    """Previous insert_records path: pandas copy + to_csv temp file, then read from disk."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as tmp_file:
+        csv_path = tmp_file.name
+    try:
+        chunk_pd = chunk.to_pandas()
+        chunk_pd = chunk_pd[ordered_columns]
+        chunk_pd.to_csv(csv_path, sep=SEPARATOR, header=False, index=False, na_rep=NULL_MARKER)
+        return b"".join(iter_file_body(csv_path))
+    finally:
+        os.unlink(csv_path)
+
+
+def parse_back(body: bytes, chunk: pl.DataFrame) -> pl.DataFrame:
+    """Parse a body the way Stream Load does (SOH, \\N = NULL, no quotes) into the chunk schema."""
+    return pl.read_csv(
+        io.BytesIO(body),
+        separator=SEPARATOR,
+        has_header=False,
+        quote_char=None,
+        new_columns=chunk.columns,
+        null_values=NULL_MARKER,
+        schema_overrides=chunk.schema,
+    )
+
+
+def time_runs(func, runs: int) -> float:
+    """Best wall time of several runs (seconds)."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Stream Load chunk serialization")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per chunk")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per serializer")
+    parser.add_argument("--skip-pandas", action="store_true", help="Only time the native path")
+    args = parser.parse_args()
+
+    print(f"{CYAN}Building synthetic fact chunk: {args.rows:,} rows...{RESET}")
+    chunk = build_chunk(args.rows)
+    # Load in a different order than the file, as insert_records does for DB order
+    ordered_columns = list(reversed(chunk.columns))
+    expected = chunk.select(ordered_columns)
+    fmt = CsvFormat(separator=SEPARATOR, null_marker=NULL_MARKER)
+
+    native_body = serialize_native(chunk, ordered_columns, fmt)
+    native = time_runs(lambda: serialize_native(chunk, ordered_columns, fmt), args.runs)
+    print(
+        f"{GREEN}Native (Polars): {native:.3f}s "
+        f"({len(native_body) / 1024 / 1024:.1f} MB body){RESET}"
+    )
+
+    failed = False
+    if parse_back(native_body, expected).equals(expected):
+        print(f"{GREEN}✓ Native body round-trips to the source chunk{RESET}")
+    else:
+        print(f"{RED}✗ Native body does not round-trip{RESET}")
+        failed = True
+
+    if not args.skip_pandas:
+        pandas_body = serialize_pandas(chunk, ordered_columns)
+        legacy = time_runs(lambda: serialize_pandas(chunk, ordered_columns), args.runs)
+        print(
+            f"{GREEN}pandas (legacy): {legacy:.3f}s "
+            f"({len(pandas_body) / 1024 / 1024:.1f} MB body){RESET}"
+        )
+        print(f"{CYAN}Speedup: {legacy / native:.1f}x{RESET}")
+
+        # pandas turns nullable integer columns into float64 ("42.0"), which
+        # StarRocks INT columns may reject, and quotes text containing '"',
+        # which Stream Load keeps as data; the native body does neither
+        try:
+            pandas_ok = parse_back(pandas_body, expected).equals(expected)
+        except Exception:
+            pandas_ok = False
+        status = "round-trips" if pandas_ok else "does not round-trip (floats for ints, quoted text)"
+        print(f"{CYAN}pandas body {status}{RESET}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+DimDealerMaster ETL Benchmark
+
+Compares the vectorized apply_dim_dealer_etl (native Polars lookup) against the
+previous row-wise implementation (to_dicts() mapping + map_elements) on a
+synthetic dealer master, and checks that both produce identical output.
+
+Usage:
+    python benchmark_dim_dealer_etl.py                 # 2,000,000 rows
+    python benchmark_dim_dealer_etl.py --rows 5000000
+    python benchmark_dim_dealer_etl.py --skip-legacy   # vectorized timing only
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import polars as pl
+
+PROJECT_ROOT = Path(__file__).parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.dim_transform_utils import apply_dim_dealer_etl  # noqa: E402
+
+GREEN = "\033[32m"
+RED = "\033[31m"
+CYAN = "\033[36m"
+RESET = "\033[0m"
+
+
+def legacy_apply_dim_dealer_etl(df: pl.DataFrame) -> pl.DataFrame:
+    """Previous row-wise implementation, kept here as the reference output."""
+    df = df.with_columns(
+        [pl.coalesce([pl.col("DealerGroupCode"), pl.col("DealerCode")]).alias("DealerGroupCode")]
+    )
+
+    dealer_mapping = {}
+    for i in range(0, df.height, 50000):
+        for row in df.slice(i, 50000).to_dicts():
+            if row.get("ActiveFlag") == "True" and row.get("DealerCode"):
+                dealer_mapping[row["DealerCode"]] = row.get("DealerName")
+
+    def get_dealer_group_name(dealer_group_code, dealer_code, dealer_name):
+        if dealer_group_code != dealer_code:
+            return dealer_mapping.get(dealer_group_code, dealer_name)
+        return dealer_name
+
+    return df.with_columns(
+        [
+            pl.struct(["DealerGroupCode", "DealerCode", "DealerName"])
+            .map_elements(
+                lambda x: get_dealer_group_name(
+                    x["DealerGroupCode"], x["DealerCode"], x["DealerName"]
+                ),
+                return_dtype=pl.Utf8,
+            )
+            .alias("DealerGroupName")
+        ]
+    )
+
+
+def build_dealer_master(rows: int, seed: int = 42) -> pl.DataFrame:
+    """
+    Synthetic DimDealerMaster with the edge cases the CASE logic depends on:
+    NULL group codes, self-referencing groups, inactive dealers, NULL and
+    empty dealer names/codes and duplicate dealer codes (last row wins).
+    """
+    idx = pl.int_range(0, rows, dtype=pl.Int64)
+
+    def rand(salt: int) -> pl.Expr:
+        # Deterministic pseudo-random integer in [0, 1000)
+        return (idx + salt).hash(seed) % 1000
+
+    def code(expr: pl.Expr) -> pl.Expr:
+        return pl.format("D{}", expr.cast(pl.Utf8).str.zfill(8))
+
+    # ~1% of rows reuse an earlier dealer code
+    dealer_index = pl.when(rand(1) < 10).then(idx // 2).otherwise(idx)
+
+    return pl.select(
+        pl.when(rand(2) < 2).then(pl.lit("")).otherwise(code(dealer_index)).alias("DealerCode"),
+        pl.when(rand(3) < 10)
+        .then(pl.lit(None, dtype=pl.Utf8))
+        .otherwise(pl.format("Dealer {}", idx))
+        .alias("DealerName"),
+        # ~30% NULL (falls back to DealerCode), the rest point at a random dealer
+        pl.when(rand(4) < 300)
+        .then(pl.lit(None, dtype=pl.Utf8))
+        .otherwise(code(rand(5) * rows // 1000))
+        .alias("DealerGroupCode"),
+        pl.when(rand(6) < 800).then(pl.lit("True")).otherwise(pl.lit("False")).alias("ActiveFlag"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark apply_dim_dealer_etl")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Synthetic dealer rows")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the new version")
+    args = parser.parse_args()
+
+    print(f"{CYAN}Building synthetic dealer master: {args.rows:,} rows...{RESET}")
+    df = build_dealer_master(args.rows)
+
+    start = time.perf_counter()
+    result = apply_dim_dealer_etl(df)
+    vectorized = time.perf_counter() - start
+    print(f"{GREEN}Vectorized: {vectorized:.2f}s{RESET}")
+
+    if args.skip_legacy:
+        return
+
+    start = time.perf_counter()
+    expected = legacy_apply_dim_dealer_etl(df)
+    legacy = time.perf_counter() - start
+    print(f"{GREEN}Row-wise (legacy): {legacy:.2f}s{RESET}")
+    print(f"{CYAN}Speedup: {legacy / vectorized:.1f}x{RESET}")
+
+    if result.equals(expected):
+        print(f"{GREEN}✓ Outputs are identical{RESET}")
+    else:
+        diff = result.with_row_index().join(
+            expected.with_row_index(), on="index", suffix="_legacy"
+        ).filter(pl.col("DealerGroupName").ne_missing(pl.col("DealerGroupName_legacy")))
+        print(f"{RED}✗ Outputs differ in {diff.height:,} rows{RESET}")
+        print(diff.head(10))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
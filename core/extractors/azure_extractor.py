@@ -1,7 +1,7 @@
 from azure.storage.blob.aio import BlobServiceClient
 import asyncio
 import os
-import aiofiles
+import sys
 import time
 from colorama import init, Fore
 from pathlib import Path
@@ -10,6 +10,9 @@ init(autoreset=True)
 
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT.parent))
+
+from utils.blob_processor_utils import gunzip_file, stream_blob_to_file  # noqa: E402
 
 
 async def decompress_file(local_path: str, output_path: str, max_retries: int = 3) -> bool:
@@ -19,20 +22,7 @@ async def decompress_file(local_path: str, output_path: str, max_retries: int =
     while retries <= max_retries:
         try:
             compressed_size = os.path.getsize(local_path)
-            escaped_local_path = local_path.replace(" ", "\\ ")
-            escaped_output_path = output_path.replace(" ", "\\ ")
-
-            cmd = f"gzip -d -c {escaped_local_path} > {escaped_output_path}"
-            process = await asyncio.create_subprocess_shell(
-                cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                shell=True,
-            )
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise Exception(f"gzip failed: {stderr.decode()}")
+            await asyncio.to_thread(gunzip_file, local_path, output_path)
 
             uncompressed_size = os.path.getsize(output_path)
             elapsed = time.perf_counter() - start
@@ -56,17 +46,25 @@ async def decompress_file(local_path: str, output_path: str, max_retries: int =
                 return False
 
 
-async def download_blob(blob_client, blob_path: str) -> bytes:
+async def download_blob(
+    blob_client, blob_path: str, output_path: str, decompress: bool = False
+) -> bool:
     try:
         print(f"{Fore.YELLOW}⬇️  Downloading: {Fore.CYAN}{blob_path}")
-        blob_data = await blob_client.download_blob()
-        size = blob_data.size
-        content = await blob_data.readall()
-        print(f"{Fore.CYAN}Downloaded: {size / 1024 / 1024:.1f}MB")
-        return content
+        # Stream chunks straight to disk (gunzipping on the fly for .gz blobs)
+        received, written = await stream_blob_to_file(
+            blob_client, Path(output_path), decompress=decompress
+        )
+        if decompress:
+            print(
+                f"{Fore.CYAN}Downloaded: {received / 1024 / 1024:.1f}MB → {written / 1024 / 1024:.1f}MB decompressed"
+            )
+        else:
+            print(f"{Fore.CYAN}Downloaded: {received / 1024 / 1024:.1f}MB")
+        return True
     except Exception as e:
         print(f"{Fore.RED}Download error for {blob_path}: {str(e)}")
-        return None
+        return False
 
 
 async def process_blob(
@@ -74,7 +72,6 @@ async def process_blob(
     client: BlobServiceClient,
     container_name: str,
     download_semaphore: asyncio.Semaphore,
-    decompress_semaphore: asyncio.Semaphore,
     base_path: str,
 ) -> bool:
     start = time.perf_counter()
@@ -95,20 +92,12 @@ async def process_blob(
         if os.path.exists(output_path):
             os.remove(output_path)
 
+        print(f"{Fore.YELLOW}Saving to: {Fore.CYAN}{output_path}")
         async with download_semaphore:
-            content = await download_blob(blob, blob_path)
-            if not content:
+            is_gzip = local_path.lower().endswith(".gz")
+            if not await download_blob(blob, blob_path, output_path, decompress=is_gzip):
                 return False
 
-        print(f"{Fore.YELLOW}Saving to: {Fore.CYAN}{local_path}")
-        async with aiofiles.open(local_path, "wb") as f:
-            await f.write(content)
-
-        if local_path.lower().endswith(".gz"):
-            async with decompress_semaphore:
-                if not await decompress_file(local_path, output_path):
-                    return False
-
         elapsed = time.perf_counter() - start
         size = os.path.getsize(output_path)
         print(
@@ -263,11 +252,16 @@ async def main():
             print(f"{Fore.CYAN}Found {len(unextracted_files)} unextracted .gz files")
 
             decompress_semaphore = asyncio.Semaphore(max_concurrent_decompressions)
+
+            async def bounded_decompress(gz_path: str, csv_path: str) -> bool:
+                async with decompress_semaphore:
+                    return await decompress_file(gz_path, csv_path)
+
             tasks = []
 
             for gz_path in unextracted_files:
                 csv_path = gz_path.rsplit(".", 2)[0] + ".csv"
-                tasks.append(decompress_file(gz_path, csv_path))
+                tasks.append(bounded_decompress(gz_path, csv_path))
 
             results = await asyncio.gather(*tasks)
             success_count = sum(1 for r in results if r)
@@ -307,7 +301,6 @@ async def main():
                 f"{Fore.GREEN}Downloading {len(blob_names_to_download)} files with {max_concurrent_downloads} parallel connections..."
             )
             download_semaphore = asyncio.Semaphore(max_concurrent_downloads)
-            decompress_semaphore = asyncio.Semaphore(max_concurrent_decompressions)
 
             tasks = [
                 process_blob(
@@ -315,7 +308,6 @@ async def main():
                     client,
                     container_name,
                     download_semaphore,
-                    decompress_semaphore,
                     base_path,
                 )
                 for blob in blob_names_to_download
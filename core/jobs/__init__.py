@@ -3,6 +3,12 @@ ETL Jobs - Job orchestration and scheduling
 
 This module contains job definitions for ETL pipeline orchestration and scheduling.
 
+Modules:
+    job_graph - Dependency graph of a session's job scripts (declared in the
+                session's jobs.yaml): independent jobs run concurrently, each in
+                its own process, with per-job timing, critical path and
+                re-runs of only the jobs that failed
+
 Modules (PLANNED):
     daily_sync_job - Daily full and incremental data sync from Azure to StarRocks
                      Orchestrates extraction, transformation, and loading
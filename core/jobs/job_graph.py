@@ -0,0 +1,428 @@
+"""
+Job Graph Scheduler
+
+Runs a session's job scripts as a dependency graph instead of one after the
+other. Dependencies are declared next to the scripts in jobs.yaml:
+
+    # scheduler/tenants/pidilite/daily/morning/jobs.yaml
+    jobs:
+      02_fact_invoice_secondary: {}
+      03_fact_invoice_details: {}
+      04_dd_logic:
+        depends_on: [03_fact_invoice_details]
+
+A job starts as soon as all of its dependencies have succeeded, so 02 runs
+alongside 03 → 04 and the session takes as long as its critical path. A
+script not listed in jobs.yaml (or every script, without one) depends on all
+scripts before it in file order - the old serial convention.
+
+- Each job runs in its own process (and process group, so a kill also stops
+  the pools it spawned); output goes to one log file per job
+- Per-node timing (start, end, elapsed) and the critical path are recorded
+- A failed job marks its dependents upstream_failed; independent branches
+  keep running
+- The node states are saved to a JSON state file stamped with the run date;
+  a re-run with rerun_failed=True on the same date reuses the jobs that
+  succeeded and runs only the rest (state of another day is ignored)
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Dependency declarations, next to the job scripts
+GRAPH_FILE = "jobs.yaml"
+
+# Job scripts: NN_name.py
+JOB_SCRIPT_PATTERN = "[0-9][0-9]_*.py"
+
+# Seconds between checks of a running job (deadline / stop)
+POLL_INTERVAL = 1.0
+
+# Seconds a job gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE = 15.0
+
+# Node states
+PENDING = "pending"
+SUCCESS = "success"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+UPSTREAM_FAILED = "upstream_failed"
+REUSED = "reused"  # Succeeded in the previous run, not re-run
+
+DONE_STATES = (SUCCESS, REUSED)
+
+
+@dataclass(frozen=True)
+class JobNode:
+    """A job script and the jobs it waits for."""
+
+    name: str
+    script: Path
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class JobResult:
+    """Outcome and timing of one node."""
+
+    job: str
+    status: str = PENDING
+    returncode: Optional[int] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    elapsed: float = 0.0
+    log_file: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.status in DONE_STATES
+
+    @property
+    def timed_out(self) -> bool:
+        return self.status == TIMED_OUT
+
+    @property
+    def cancelled(self) -> bool:
+        return self.status == CANCELLED
+
+
+def _stop_process(process: subprocess.Popen):
+    """SIGTERM the job's process group, then SIGKILL it after TERMINATE_GRACE."""
+    for sig, grace in ((signal.SIGTERM, TERMINATE_GRACE), (signal.SIGKILL, None)):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        try:
+            process.wait(timeout=grace)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+
+def run_job_process(
+    script: Path,
+    log_file: Path,
+    deadline: Optional[float] = None,
+    stop_event: Optional[threading.Event] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Tuple[str, Optional[int]]:
+    """
+    Run a job script in its own process group until it exits, the deadline
+    passes or stop_event is set.
+
+    Args:
+        script: Job script (run with this interpreter, cwd = project root)
+        log_file: File receiving stdout and stderr
+        deadline: Optional time.time() after which the job is killed
+        stop_event: Optional event that stops the job when set
+        env: Optional environment for the job
+
+    Returns:
+        Tuple of (status, returncode) with status success, failed, timed_out
+        or cancelled
+    """
+    with open(log_file, "w") as log:
+        process = subprocess.Popen(
+            [sys.executable, str(script)],
+            cwd=PROJECT_ROOT,  # Jobs resolve configs/ relative to the project root
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            start_new_session=True,
+            env=env,
+        )
+        while True:
+            try:
+                process.wait(timeout=POLL_INTERVAL)
+                break
+            except subprocess.TimeoutExpired:
+                pass
+            if deadline is not None and time.time() >= deadline:
+                status = TIMED_OUT
+            elif stop_event is not None and stop_event.is_set():
+                status = CANCELLED
+            else:
+                continue
+            _stop_process(process)
+            return status, process.returncode
+
+    return (SUCCESS if process.returncode == 0 else FAILED), process.returncode
+
+
+class JobGraph:
+    """Dependency graph of a session's job scripts."""
+
+    def __init__(self, nodes: Sequence[JobNode]):
+        """
+        Args:
+            nodes: Job nodes, in file order
+
+        Raises:
+            ValueError: On duplicate names, unknown dependencies or cycles
+        """
+        self.nodes: Dict[str, JobNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate job '{node.name}'")
+            self.nodes[node.name] = node
+
+        for node in self.nodes.values():
+            unknown = [dep for dep in node.depends_on if dep not in self.nodes]
+            if unknown:
+                raise ValueError(f"Job '{node.name}' depends on unknown job(s): {unknown}")
+
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_session_dir(cls, session_dir: Path) -> "JobGraph":
+        """
+        Graph of the NN_*.py scripts in a session directory, with the
+        dependencies of its jobs.yaml.
+
+        Scripts not declared in jobs.yaml depend on every script before them.
+        """
+        session_dir = Path(session_dir)
+        scripts = sorted(session_dir.glob(JOB_SCRIPT_PATTERN))
+
+        declared: Dict[str, Dict] = {}
+        graph_file = session_dir / GRAPH_FILE
+        if graph_file.exists():
+            with open(graph_file) as f:
+                declared = (yaml.safe_load(f) or {}).get("jobs", {}) or {}
+
+        names = [script.stem for script in scripts]
+        missing = set(declared) - set(names)
+        if missing:
+            raise ValueError(
+                f"{graph_file} declares job(s) without a script: {', '.join(sorted(missing))}"
+            )
+
+        nodes = []
+        for index, script in enumerate(scripts):
+            if script.stem in declared:
+                depends_on = tuple((declared[script.stem] or {}).get("depends_on", []))
+            else:
+                depends_on = tuple(names[:index])
+            nodes.append(JobNode(name=script.stem, script=script, depends_on=depends_on))
+        return cls(nodes)
+
+    def _topological_order(self) -> List[str]:
+        """Node names with every node after its dependencies (file order among peers)."""
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        order: List[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between jobs: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def dependents(self, name: str) -> Set[str]:
+        """All jobs that (transitively) depend on a job."""
+        found: Set[str] = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for node in self.nodes.values():
+                if current in node.depends_on and node.name not in found:
+                    found.add(node.name)
+                    frontier.append(node.name)
+        return found
+
+    def max_width(self) -> int:
+        """Most jobs at the same dependency depth (jobs that can run at once)."""
+        depth: Dict[str, int] = {}
+        for name in self.order:
+            depth[name] = 1 + max((depth[dep] for dep in self.nodes[name].depends_on), default=-1)
+        counts: Dict[int, int] = {}
+        for level in depth.values():
+            counts[level] = counts.get(level, 0) + 1
+        return max(counts.values(), default=0)
+
+    def critical_path(self, results: Dict[str, JobResult]) -> Tuple[List[str], float]:
+        """
+        Longest chain of dependent jobs by elapsed time.
+
+        Returns:
+            Tuple of (job names along the path, total seconds)
+        """
+        best: Dict[str, Tuple[float, List[str]]] = {}
+        for name in self.order:
+            elapsed = results[name].elapsed if name in results else 0.0
+            upstream = max(
+                (best[dep] for dep in self.nodes[name].depends_on),
+                key=lambda item: item[0],
+                default=(0.0, []),
+            )
+            best[name] = (upstream[0] + elapsed, upstream[1] + [name])
+        if not best:
+            return [], 0.0
+        total, path = max(best.values(), key=lambda item: item[0])
+        return path, total
+
+    def run(
+        self,
+        log_dir: Path,
+        log_prefix: str = "",
+        max_parallel: Optional[int] = None,
+        deadline: Optional[float] = None,
+        stop_event: Optional[threading.Event] = None,
+        state_file: Optional[Path] = None,
+        rerun_failed: bool = False,
+        env: Optional[Dict[str, str]] = None,
+        on_job_done: Optional[Callable[[JobResult], None]] = None,
+        run_date: Optional[str] = None,
+    ) -> Dict[str, JobResult]:
+        """
+        Run the graph: each job starts once all of its dependencies succeeded.
+
+        Args:
+            log_dir: Directory for the per-job log files
+            log_prefix: Prefix of the log file names
+            max_parallel: Jobs running at once (None = no limit)
+            deadline: Optional time.time() after which running jobs are killed
+                      and pending ones are not started
+            stop_event: Optional event that stops the run when set
+            state_file: Optional JSON file the node states are saved to
+            rerun_failed: Reuse the jobs that succeeded in state_file's run,
+                          if that run had the same run_date
+            env: Optional environment for the jobs
+            on_job_done: Optional callback per finished job
+            run_date: Date the run processes, stored in state_file
+                      (YYYY-MM-DD, default: today)
+
+        Returns:
+            {job: JobResult}, in topological order
+        """
+        run_date = run_date or date.today().isoformat()
+        results = {name: JobResult(job=name) for name in self.order}
+        if rerun_failed and state_file is not None:
+            for name, previous in load_graph_state(state_file, run_date).items():
+                if name in results and previous.success:
+                    results[name] = JobResult(
+                        job=name,
+                        status=REUSED,
+                        elapsed=previous.elapsed,
+                        log_file=previous.log_file,
+                    )
+
+        log_dir = Path(log_dir)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        running: Dict[Future, str] = {}
+
+        def _run_node(name: str) -> JobResult:
+            # Runs on a pool thread: builds a new result and leaves results to
+            # the main thread, which saves the state while other jobs run
+            log_file = log_dir / f"{log_prefix}{name}.log"
+            start = time.time()
+            started_at = datetime.now().isoformat(timespec="seconds")
+            status, returncode = run_job_process(
+                self.nodes[name].script, log_file, deadline, stop_event, env
+            )
+            return JobResult(
+                job=name,
+                status=status,
+                returncode=returncode,
+                started_at=started_at,
+                finished_at=datetime.now().isoformat(timespec="seconds"),
+                elapsed=time.time() - start,
+                log_file=str(log_file),
+            )
+
+        def _ready() -> List[str]:
+            return [
+                name
+                for name in self.order
+                if results[name].status == PENDING
+                and name not in running.values()
+                and all(results[dep].success for dep in self.nodes[name].depends_on)
+            ]
+
+        with ThreadPoolExecutor(
+            max_workers=max_parallel or max(len(self.nodes), 1), thread_name_prefix="job"
+        ) as pool:
+            while True:
+                stopped = (stop_event is not None and stop_event.is_set()) or (
+                    deadline is not None and time.time() >= deadline
+                )
+                if not stopped:
+                    for name in _ready():
+                        if max_parallel and len(running) >= max_parallel:
+                            break
+                        running[pool.submit(_run_node, name)] = name
+                if not running:
+                    break
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = results[name] = future.result()
+                    if not result.success:
+                        for dependent in self.dependents(name):
+                            if results[dependent].status == PENDING:
+                                results[dependent].status = UPSTREAM_FAILED
+                    if state_file is not None:
+                        save_graph_state(state_file, results, run_date)
+                    if on_job_done is not None:
+                        on_job_done(result)
+
+        # Never started: the run was stopped or hit the deadline
+        for result in results.values():
+            if result.status == PENDING:
+                result.status = CANCELLED
+        if state_file is not None:
+            save_graph_state(state_file, results, run_date)
+        return results
+
+
+def save_graph_state(state_file: Path, results: Dict[str, JobResult], run_date: str):
+    """Write the node states of a run and its run date (atomic replace)."""
+    state_file = Path(state_file)
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_file.with_name(state_file.name + ".tmp")
+    state = {
+        "run_date": run_date,
+        "jobs": {name: asdict(result) for name, result in results.items()},
+    }
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_file)
+
+
+def load_graph_state(state_file: Path, run_date: Optional[str] = None) -> Dict[str, JobResult]:
+    """
+    Node states of the previous run ({} if there is none).
+
+    Args:
+        state_file: State file written by save_graph_state
+        run_date: Only return the states of a run with this run date
+                  (None = any run date)
+    """
+    try:
+        with open(state_file) as f:
+            state = json.load(f)
+        if run_date is not None and state.get("run_date") != run_date:
+            return {}
+        return {name: JobResult(**job) for name, job in state.get("jobs", {}).items()}
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
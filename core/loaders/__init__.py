@@ -3,6 +3,30 @@ Data Loaders - Data loading into target systems
 
 This module contains loaders for inserting validated data into target databases.
 
+Modules:
+    starrocks_stream_loader - Centralized Stream Load handler (CSV files and
+                              in-memory Polars DataFrames)
+
+    stream_load_body - Streamed (chunked) HTTP body builders for Stream Load
+
+    stream_load_formats - Pluggable body formats (CSV default; Parquet, Arrow IPC opt-in)
+                          driven by configs/starrocks/stream_load_defaults.yaml
+
+    stream_load_transport - Shared keep-alive HTTP session with connect retries and
+                            optional round-robin direct-to-BE routing
+
+    parallel_stream_load - Multi-chunk Stream Load with bounded in-flight requests,
+                           ordered labels and per-chunk retry
+
+    connection_pool - Process-wide, lazily-populated MySQL connection pool per
+                      StarRocks endpoint with idle-time health checks
+
+    table_swap - Shadow-table full reloads (CREATE TABLE ... LIKE, verify row
+                 count, ALTER TABLE ... SWAP WITH) without an empty-table window
+
+    date_range_delete - Fact deletes scoped to the incoming file's date range and
+                        the partitions covering it
+
 Modules (PLANNED):
     starrocks_loader - Loads cleaned and validated Parquet data into StarRocks
                        Handles batch inserts, schema creation, and data validation
@@ -0,0 +1,285 @@
+"""
+Shared StarRocks MySQL Connection Pool
+
+One lazily-populated pool per StarRocks endpoint (host, port, user, database),
+shared by every StarRocksStreamLoader, ETLOrchestrator and utils/starrocks_utils
+call in the process. Connections are opened on first use and reused across
+loaders and chunks, so short metadata queries (DESC, TRUNCATE, COUNT) no longer
+pay a TCP + auth handshake each.
+
+Health checks are idle-time based: a connection is pinged only if it has sat
+in the pool for longer than health_check_after seconds; hot connections are
+handed out without a round-trip.
+
+Checked-out connections are PooledConnection proxies. They behave like a
+pymysql connection, and close() returns them to the pool, so existing
+``conn = get_connection(); ...; conn.close()`` code pools transparently.
+
+Usage:
+    pool = get_connection_pool(config)          # or tenant_config=...
+    with pool.acquire() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("DESC dim_material")
+"""
+
+import atexit
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple, TYPE_CHECKING
+
+import pymysql
+
+if TYPE_CHECKING:
+    from orchestration.tenant_manager import TenantConfig
+
+# Idle connections kept per pool (checked-out connections are not capped)
+POOL_MAX_IDLE = 8
+
+# Ping a pooled connection before reuse if it has been idle this long (seconds)
+HEALTH_CHECK_AFTER = 30.0
+
+# Errors after which a connection is not put back in the pool
+_BROKEN_CONNECTION_ERRORS = (pymysql.err.OperationalError, pymysql.err.InterfaceError)
+
+
+class PooledConnection:
+    """
+    A pymysql connection checked out of a StarRocksConnectionPool.
+
+    Attribute access is delegated to the underlying connection. close()
+    (or leaving a ``with`` block) returns it to the pool instead of closing it;
+    after a connection-level error it is discarded instead.
+    """
+
+    def __init__(self, pool: "StarRocksConnectionPool", conn: pymysql.Connection):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, name: str) -> Any:
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise pymysql.err.InterfaceError("Connection already returned to the pool")
+        return getattr(conn, name)
+
+    @property
+    def raw(self) -> pymysql.Connection:
+        """The underlying pymysql connection."""
+        return self._conn
+
+    def close(self):
+        """Return the connection to the pool."""
+        if self._conn is not None:
+            self._pool.release(self._conn)
+            self._conn = None
+
+    def discard(self):
+        """Close the connection for good (e.g. after a protocol error)."""
+        if self._conn is not None:
+            self._pool.discard(self._conn)
+            self._conn = None
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None and issubclass(exc_type, _BROKEN_CONNECTION_ERRORS):
+            self.discard()
+        else:
+            self.close()
+        return False
+
+
+class StarRocksConnectionPool:
+    """Thread-safe, lazily-populated pool of pymysql connections to one StarRocks endpoint."""
+
+    def __init__(
+        self,
+        config: Dict,
+        max_idle: int = POOL_MAX_IDLE,
+        health_check_after: float = HEALTH_CHECK_AFTER,
+    ):
+        """
+        Args:
+            config: Connection dict with host, port, user, password, database
+                    (optional charset, autocommit)
+            max_idle: Idle connections kept for reuse
+            health_check_after: Idle seconds after which a connection is pinged before reuse
+        """
+        self.config = config
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self._idle: Deque[Tuple[pymysql.Connection, float]] = deque()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._server_version: Optional[str] = None
+        self._version_checked = False
+        self.stats = {"created": 0, "reused": 0, "health_checks": 0, "discarded": 0}
+
+    def _connect(self) -> pymysql.Connection:
+        conn = pymysql.connect(
+            host=self.config["host"],
+            port=self.config.get("port", 9030),
+            user=self.config["user"],
+            password=self.config["password"],
+            database=self.config["database"],
+            charset=self.config.get("charset", "utf8mb4"),
+            autocommit=self.config.get("autocommit", True),
+        )
+        with self._lock:
+            self.stats["created"] += 1
+        return conn
+
+    def _check_fork(self):
+        """Forget (without closing) connections inherited from a parent process."""
+        if self._pid != os.getpid():
+            self._idle.clear()
+            self._pid = os.getpid()
+
+    def acquire(self) -> PooledConnection:
+        """
+        Check out a connection, reusing an idle one when possible.
+
+        Returns:
+            PooledConnection (close() returns it to the pool)
+
+        Raises:
+            pymysql.Error: If a new connection cannot be opened
+        """
+        while True:
+            with self._lock:
+                self._check_fork()
+                item = self._idle.pop() if self._idle else None
+
+            if item is None:
+                return PooledConnection(self, self._connect())
+
+            conn, released_at = item
+            if time.monotonic() - released_at > self.health_check_after:
+                with self._lock:
+                    self.stats["health_checks"] += 1
+                try:
+                    conn.ping(reconnect=False)
+                except Exception:
+                    self.discard(conn)
+                    continue
+
+            with self._lock:
+                self.stats["reused"] += 1
+            return PooledConnection(self, conn)
+
+    def release(self, conn: pymysql.Connection):
+        """Put a connection back for reuse (closed if the pool is full)."""
+        with self._lock:
+            self._check_fork()
+            if conn.open and len(self._idle) < self.max_idle:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self.discard(conn)
+
+    def discard(self, conn: pymysql.Connection):
+        """Close a connection without returning it to the pool."""
+        with self._lock:
+            self.stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle = [conn for conn, _ in self._idle] if self._pid == os.getpid() else []
+            self._idle.clear()
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def server_version(self) -> Optional[str]:
+        """
+        StarRocks version of the endpoint (SELECT current_version()), read once.
+
+        Returns:
+            Version string, or None if it could not be read
+        """
+        if not self._version_checked:
+            try:
+                with self.acquire() as conn, conn.cursor() as cursor:
+                    cursor.execute("SELECT current_version()")
+                    row = cursor.fetchone()
+                self._server_version = str(row[0]) if row else None
+            except Exception:
+                self._server_version = None
+            self._version_checked = True
+        return self._server_version
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+
+_POOLS: Dict[Tuple, StarRocksConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool_key(config: Dict) -> Tuple:
+    """Endpoint key; the password only as a digest (a rotated password gets a new pool)."""
+    password = str(config.get("password") or "").encode("utf-8")
+    return (
+        config["host"],
+        int(config.get("port", 9030)),
+        config["user"],
+        config["database"],
+        hashlib.sha256(password).hexdigest(),
+    )
+
+
+def get_connection_pool(
+    config: Optional[Dict] = None,
+    tenant_config: Optional["TenantConfig"] = None,
+) -> StarRocksConnectionPool:
+    """
+    Get the process-wide pool for a StarRocks endpoint, creating it on first use.
+
+    Creating a pool does not open any connection.
+
+    Args:
+        config: Connection dict (host, port, user, password, database)
+        tenant_config: TenantConfig (multi-tenant mode); takes precedence over config
+
+    Returns:
+        Shared StarRocksConnectionPool
+    """
+    if tenant_config is not None:
+        config = {
+            "host": tenant_config.database_host,
+            "port": tenant_config.database_port,
+            "user": tenant_config.database_user,
+            "password": tenant_config.database_password,
+            "database": tenant_config.database_name,
+        }
+    elif config is None:
+        raise ValueError("Either config or tenant_config must be provided")
+
+    key = _pool_key(config)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = StarRocksConnectionPool(config)
+            _POOLS[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close idle connections of every pool (registered with atexit)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
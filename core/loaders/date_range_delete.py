@@ -0,0 +1,160 @@
+"""
+Date-Range Scoped Fact Deletes
+
+Before a fact file is re-loaded, the rows it replaces have to go. Deleting by
+sales group alone (``DELETE ... WHERE sales_group_code IN (...)``) touches the
+group's whole history, so its cost grows with the table, not with the file.
+
+This module scopes the delete to the dates actually present in the incoming
+parquet (min/max of invoice_date / posting_date, taken from the row-group
+statistics index of utils/parquet_index, or a lazy scan) and, when the table is range-partitioned on a date
+column, to the partitions overlapping that range:
+
+    DELETE FROM fact_invoice_details PARTITION (p202501, p202502)
+    WHERE posting_date BETWEEN 20250114 AND 20250203
+      AND sales_group_code IN ('107', '112')
+
+Unpartitioned tables get the same statement without the PARTITION clause.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from utils.parquet_index import column_range, load_parquet_index
+
+# Fact tables and their YYYYMMDD date column
+FACT_DATE_COLUMNS = {
+    "fact_invoice_secondary": "invoice_date",
+    "fact_invoice_details": "posting_date",
+}
+
+# "keys: [20250101]" in the Range column of SHOW PARTITIONS
+_RANGE_KEY_PATTERN = re.compile(r"keys: \[([^\]]*)\]")
+
+
+def parquet_date_range(file: Path, date_column: str) -> Optional[Tuple[int, int]]:
+    """
+    Min/max of a YYYYMMDD date column in a parquet file.
+
+    Read from the row-group statistics index when available (no data pages
+    touched); otherwise computed by a lazy scan. The column is matched
+    case-insensitively (cleaned parquets may keep source casing).
+
+    Returns:
+        (min_date, max_date), or None if the column is missing or all-null
+    """
+    index = load_parquet_index(file)
+    if index is not None:
+        try:
+            date_range = column_range(index, date_column)
+            if date_range is not None:
+                return int(date_range[0]), int(date_range[1])
+        except (TypeError, ValueError):
+            pass  # Non-numeric statistics: scan instead
+
+    lf = pl.scan_parquet(file)
+    names = {name.lower(): name for name in lf.collect_schema().names()}
+    column = names.get(date_column.lower())
+    if column is None:
+        return None
+
+    date = pl.col(column).cast(pl.Int64, strict=False)
+    lo, hi = lf.select(date.min().alias("lo"), date.max().alias("hi")).collect().row(0)
+    if lo is None or hi is None:
+        return None
+    return int(lo), int(hi)
+
+
+def _range_key(key: str) -> Optional[int]:
+    """Partition bound as YYYYMMDD (INT keys as-is, DATE keys with dashes removed)."""
+    try:
+        return int(key.strip().replace("-", "")[:8])
+    except ValueError:
+        return None
+
+
+def get_range_partitions(conn, table_name: str) -> Optional[List[Tuple[str, int, int]]]:
+    """
+    Range partitions of a table from SHOW PARTITIONS.
+
+    Args:
+        conn: StarRocks MySQL connection
+        table_name: Table to inspect
+
+    Returns:
+        List of (partition_name, lower_bound, upper_bound_exclusive), or None if
+        the table is not range-partitioned (or a bound cannot be parsed)
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(f"SHOW PARTITIONS FROM {table_name}")
+        names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+
+    if "Range" not in names:
+        return None
+    name_col = names.index("PartitionName")
+    range_col = names.index("Range")
+
+    partitions = []
+    for row in rows:
+        keys = _RANGE_KEY_PATTERN.findall(str(row[range_col] or ""))
+        if len(keys) != 2:
+            return None
+        lower, upper = _range_key(keys[0]), _range_key(keys[1])
+        if lower is None or upper is None:
+            return None
+        partitions.append((row[name_col], lower, upper))
+    return partitions or None
+
+
+def overlapping_partitions(
+    partitions: List[Tuple[str, int, int]], lo: int, hi: int
+) -> List[str]:
+    """Names of the partitions whose [lower, upper) range intersects [lo, hi]."""
+    return [name for name, lower, upper in partitions if lower <= hi and upper > lo]
+
+
+def delete_date_range(
+    conn,
+    table_name: str,
+    date_column: str,
+    lo: int,
+    hi: int,
+    predicate: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    DELETE the rows of a date range, pruned to the partitions covering it.
+
+    Args:
+        conn: StarRocks MySQL connection
+        table_name: Fact table
+        date_column: YYYYMMDD date column
+        lo: First date of the range (inclusive)
+        hi: Last date of the range (inclusive)
+        predicate: Optional extra WHERE condition (e.g. sales group filter)
+
+    Returns:
+        Dict with the date range, the partitions touched (None = unpartitioned)
+        and the executed statement
+    """
+    where = f"{date_column} BETWEEN {lo} AND {hi}"
+    if predicate:
+        where = f"{where} AND {predicate}"
+
+    partitions = get_range_partitions(conn, table_name)
+    touched = None
+    partition_clause = ""
+    if partitions is not None:
+        touched = overlapping_partitions(partitions, lo, hi)
+        if not touched:
+            # Nothing stored in this range yet
+            return {"date_range": (lo, hi), "partitions": [], "statement": None}
+        partition_clause = f" PARTITION ({', '.join(touched)})"
+
+    statement = f"DELETE FROM {table_name}{partition_clause} WHERE {where}"
+    with conn.cursor() as cursor:
+        cursor.execute(statement)
+    return {"date_range": (lo, hi), "partitions": touched, "statement": statement}
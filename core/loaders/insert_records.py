@@ -1,12 +1,10 @@
 import time
+import uuid
 from pathlib import Path
 import polars as pl
-import pandas as pd
-import tempfile
 import os
 from tqdm import tqdm
 import sys
-import pymysql
 from colorama import init
 
 # Add project root to Python path
@@ -14,7 +12,26 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.append(str(PROJECT_ROOT))
 
 from utils.DB_CONFIG import DB_CONFIG  # noqa: E402
+from utils.pipeline_config import Config  # noqa: E402
+from core.loaders.connection_pool import get_connection_pool  # noqa: E402
 from core.loaders.starrocks_stream_loader import StarRocksStreamLoader  # noqa: E402
+from core.loaders.stream_load_formats import CsvFormat  # noqa: E402
+from core.loaders.date_range_delete import (  # noqa: E402
+    FACT_DATE_COLUMNS,
+    delete_date_range,
+    parquet_date_range,
+)
+from core.loaders.parallel_stream_load import (  # noqa: E402
+    iter_frame_chunks,
+    load_chunks_concurrently,
+)
+from core.loaders.table_swap import (  # noqa: E402
+    create_shadow_table,
+    drop_table,
+    swap_shadow_table,
+)
+from utils.chunk_planner import plan_load_chunks  # noqa: E402
+from utils.load_tracking import TRACKED_DATE_COLUMNS, record_loaded_dates  # noqa: E402
 
 init(autoreset=True)
 
@@ -36,20 +53,13 @@ STARROCKS_CONFIG = {
 # Stream Load settings
 STREAM_LOAD_TIMEOUT = 1800  # 30 minutes
 MAX_ERROR_RATIO = 0.1  # 10% error tolerance
-CHUNK_SIZE = 100000  # Records per chunk
+CHUNK_SIZE = Config.CHUNK_SIZE or None  # Fixed records per chunk (None = adaptive)
+MAX_CONCURRENT_INSERTS = Config.MAX_CONCURRENT_INSERTS  # In-flight Stream Load requests
 
 
 def get_starrocks_connection():
-    """Create StarRocks MySQL connection for metadata operations"""
-    return pymysql.connect(
-        host=STARROCKS_CONFIG["host"],
-        port=STARROCKS_CONFIG["port"],
-        user=STARROCKS_CONFIG["user"],
-        password=STARROCKS_CONFIG["password"],
-        database=STARROCKS_CONFIG["database"],
-        charset="utf8mb4",
-        autocommit=True,
-    )
+    """Check out a pooled StarRocks MySQL connection for metadata operations (close() returns it)"""
+    return get_connection_pool(STARROCKS_CONFIG).acquire()
 
 
 # Stream Load is now handled by StarRocksStreamLoader from core.loaders
@@ -67,8 +77,86 @@ def get_table_columns(conn, table_name):
         return []
 
 
-def delete_existing_records(table_name, stem):
-    """Delete existing records based on table type"""
+def track_dates(table_name, dates, action):
+    """
+    Record dates of a tracked table as pending for incremental DD logic.
+
+    Both the dates a load deletes and the dates it inserts go into
+    Config.DATA_STATE_DIR (see utils/load_tracking.py), so a DD run with
+    dd_logic.incremental recomputes every date this loader changed. The DD
+    jobs read the tenant's data/<tenant>/state directory, so nothing is
+    recorded unless DATA_STATE_DIR points there.
+    """
+    if Config.DATA_STATE_DIR is None:
+        print(
+            f"{YELLOW}⚠️  DATA_STATE_DIR not set - {action} dates for {table_name} not tracked; "
+            f"incremental DD logic will not see them (set it to data/<tenant>/state){RESET}"
+        )
+        return
+    try:
+        dates = [int(d) for d in dates if d is not None]
+        pending = record_loaded_dates(Config.DATA_STATE_DIR, table_name, dates)
+        print(
+            f"{CYAN}Tracked {len(dates)} {action} {TRACKED_DATE_COLUMNS[table_name]} value(s) "
+            f"for {table_name} ({pending} pending for downstream jobs){RESET}"
+        )
+    except Exception as e:
+        print(f"{YELLOW}⚠️  Could not record {action} dates for {table_name}: {e}{RESET}")
+
+
+def track_deleted_dates(conn, table_name, where):
+    """Record the distinct tracked dates of the rows a DELETE ... WHERE where will remove."""
+    date_column = TRACKED_DATE_COLUMNS.get(table_name)
+    if date_column is None:
+        return
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT {date_column} FROM {table_name} WHERE {where}")
+            dates = [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"{YELLOW}⚠️  Could not read deleted dates for {table_name}: {e}{RESET}")
+        return
+    track_dates(table_name, dates, "deleted")
+
+
+def delete_fact_records(conn, table_name, predicate, file=None):
+    """
+    DELETE the fact rows an incoming file replaces.
+
+    With FACT_DELETE_STRATEGY=date_range the delete is limited to the file's
+    date range (and the partitions covering it); otherwise, or if the file has
+    no usable date column, it deletes every row matching predicate.
+
+    Returns:
+        True if the delete was date-range scoped
+    """
+    date_range = None
+    if Config.FACT_DELETE_STRATEGY == "date_range" and file is not None:
+        date_range = parquet_date_range(file, FACT_DATE_COLUMNS[table_name])
+        if date_range is None:
+            print(
+                f"{YELLOW}No {FACT_DATE_COLUMNS[table_name]} values in {file.name}, "
+                f"falling back to a full sales-group delete{RESET}"
+            )
+
+    if date_range is None:
+        track_deleted_dates(conn, table_name, predicate)
+        with conn.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table_name} WHERE {predicate}")
+        return False
+
+    lo, hi = date_range
+    date_column = FACT_DATE_COLUMNS[table_name]
+    track_deleted_dates(conn, table_name, f"{date_column} BETWEEN {lo} AND {hi} AND {predicate}")
+    summary = delete_date_range(conn, table_name, date_column, lo, hi, predicate)
+    partitions = summary["partitions"]
+    scope = "unpartitioned" if partitions is None else f"{len(partitions)} partition(s)"
+    print(f"{CYAN}Deleted {table_name} rows for {lo}..{hi} ({scope}){RESET}")
+    return True
+
+
+def delete_existing_records(table_name, stem, file=None):
+    """Delete existing records based on table type (fact deletes use the file's dates if enabled)"""
     conn = None
     try:
         conn = get_starrocks_connection()
@@ -86,10 +174,12 @@ def delete_existing_records(table_name, stem):
                 print(
                     f"{YELLOW}Deleting fact_invoice_secondary records for SalesGroupCodes: {groups_str}{RESET}"
                 )
-                with conn.cursor() as cursor:
-                    cursor.execute(
-                        f"DELETE FROM fact_invoice_secondary WHERE sales_group_code IN ({groups_str}) AND record_type != 'DD'"
-                    )
+                delete_fact_records(
+                    conn,
+                    "fact_invoice_secondary",
+                    f"sales_group_code IN ({groups_str}) AND record_type != 'DD'",
+                    file,
+                )
             print(f"{GREEN}Deleted records{RESET}")
 
         elif "FactInvoiceDetails" in stem:
@@ -142,10 +232,9 @@ def delete_existing_records(table_name, stem):
             print(
                 f"{YELLOW}Deleting fact_invoice_details records for SalesGroupCodes: {groups_str}{RESET}"
             )
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    f"DELETE FROM fact_invoice_details WHERE sales_group_code IN ({groups_str})"
-                )
+            delete_fact_records(
+                conn, "fact_invoice_details", f"sales_group_code IN ({groups_str})", file
+            )
             print(f"{GREEN}Deleted records{RESET}")
         else:
             print(f"{YELLOW}Truncating {table_name}...{RESET}")
@@ -162,6 +251,7 @@ def delete_existing_records(table_name, stem):
 def process_records(file, delete_existing=True):
     """Process parquet file and load to StarRocks using Stream Load API"""
     start = time.time()
+    live_table = None  # Set when loading into a shadow table (LOAD_STRATEGY=swap)
     try:
         print(f"{GREEN}Processing: {file.name}{RESET}")
         stem = file.stem
@@ -189,9 +279,17 @@ def process_records(file, delete_existing=True):
             table_name = stem
         print(f"{YELLOW}Table: {table_name}{RESET}")
 
-        # Delete existing records if requested
+        # Delete existing records if requested. Full reloads (non-fact tables) with
+        # LOAD_STRATEGY=swap load a shadow table instead and swap it in at the end,
+        # so the live table never sits empty during the load.
         if delete_existing:
-            delete_existing_records(table_name, stem)
+            is_fact = "FactInvoiceSecondary" in stem or "FactInvoiceDetails" in stem
+            if Config.LOAD_STRATEGY == "swap" and not is_fact:
+                live_table = table_name
+                table_name = create_shadow_table(get_connection_pool(STARROCKS_CONFIG), live_table)
+                print(f"{YELLOW}Loading {live_table} via shadow table {table_name}{RESET}")
+            else:
+                delete_existing_records(table_name, stem, file)
 
         # Get row count using lazy load (without loading all data)
         lf = pl.scan_parquet(file)
@@ -202,6 +300,9 @@ def process_records(file, delete_existing=True):
 
         if total == 0:
             print(f"{YELLOW}No records to process{RESET}")
+            if live_table:
+                # Same outcome as TRUNCATE: the (empty) shadow replaces the table
+                swap_shadow_table(get_connection_pool(STARROCKS_CONFIG), live_table, table_name, 0)
             return
 
         # CRITICAL: Validate that parquet types match database schema
@@ -308,9 +409,6 @@ def process_records(file, delete_existing=True):
         except Exception as e:
             print(f"{YELLOW}⚠️  Could not verify schema: {e}{RESET}")
 
-        total_chunks = (total + CHUNK_SIZE - 1) // CHUNK_SIZE
-        print(f"{GREEN}Processing {total:,} records in {total_chunks} chunks{RESET}")
-
         # CRITICAL: Get database columns in correct order for Stream Load mapping
         try:
             conn = get_starrocks_connection()
@@ -357,110 +455,104 @@ def process_records(file, delete_existing=True):
             # Fallback: use columns as-is
             ordered_db_columns = list(df.columns)
 
-        successful_chunks = 0
-        failed_chunks = 0
-        total_rows_loaded = 0
+        # Dates this load inserts are pending for incremental DD logic (recorded
+        # before loading, so a load that fails part way still gets recomputed)
+        date_column = TRACKED_DATE_COLUMNS.get(table_name)
+        source_column = next((c for c in df.columns if c.lower() == date_column), None)
+        if source_column is not None:
+            track_dates(
+                table_name,
+                df.get_column(source_column).cast(pl.Int64, strict=False).drop_nulls().unique(),
+                "loaded",
+            )
+
+        # Rows per chunk from the memory budget and target body size (utils/chunk_planner)
+        plan = plan_load_chunks(
+            df,
+            table_name,
+            max_in_flight=MAX_CONCURRENT_INSERTS,
+            target_body_mb=Config.STREAM_LOAD_TARGET_BODY_MB,
+            memory_budget_mb=Config.MEMORY_BUDGET_MB,
+            fixed_rows=CHUNK_SIZE,
+        )
+        total_chunks = plan.num_chunks
+        print(f"{CYAN}{plan.describe()}{RESET}")
+        print(f"{GREEN}Processing {total:,} records in {total_chunks} chunks{RESET}")
+
+        # SOH-delimited CSV with \N for NULL, serialized natively by Polars one row
+        # slice at a time straight into the Stream Load body (no pandas copy, no
+        # temp file). df is already in DB column order (ordered_columns).
+        csv_format = CsvFormat(separator="\x01", null_marker="\\N")
+
+        def load_chunk(chunk_index, chunk, label):
+            """Stream Load one chunk, serialized directly into the request body (worker thread)."""
+            return loader.stream_load_dataframe(
+                chunk,
+                table_name=table_name,
+                chunk_id=chunk_index + 1,
+                columns=ordered_db_columns,
+                body_format=csv_format,
+                label=label,
+            )
+
         failed_chunk_details = []
 
         with tqdm(total=total_chunks, desc="Loading chunks", ncols=100) as pbar:
-            for chunk_num, start_row in enumerate(range(0, total, CHUNK_SIZE), 1):
-                try:
-                    chunk = df.slice(start_row, CHUNK_SIZE)
-
-                    if chunk.is_empty():
-                        pbar.update(1)
-                        continue
-
-                    # Create temporary CSV file
-                    with tempfile.NamedTemporaryFile(
-                        mode="w", suffix=".csv", delete=False
-                    ) as tmp_file:
-                        # Export to CSV with SOH (\x01) delimiter
-                        # SOH (Start of Heading) is rarely found in data and avoids issues with commas in fields
-                        chunk_pd = chunk.to_pandas()
-                        
-                        # CRITICAL: Write columns in the exact order specified in ordered_columns
-                        # This matches the order sent to StarRocks in the "columns" header
-                        if ordered_columns:
-                            chunk_pd = chunk_pd[ordered_columns]
-                        
-                        # Write CSV without converting NaN to empty strings
-                        # We'll use the na_rep parameter and null_marker in Stream Load
-                        chunk_pd.to_csv(tmp_file.name, sep="\x01", header=False, index=False, na_rep='\\N')
-
-                        # Debug: Show what columns are being sent vs expected
-                        # print(f"{CYAN}📤 Sending Stream Load request:{RESET}")  # Commented: verbose
-                        # print(f"  CSV columns (order written): {list(chunk_pd.columns)}")  # Commented: verbose
-                        # print(f"  DB columns (expected order): {ordered_db_columns}")  # Commented: verbose
-                        # print(f"  Total columns: {len(ordered_db_columns)}")  # Commented: verbose
-                        # print(f"  Total rows in chunk: {len(chunk_pd)}")  # Commented: verbose
-                        # print(f"  CSV file size: {os.path.getsize(tmp_file.name)} bytes")  # Commented: verbose
-                        
-                        # Sample first few rows to debug data issues
-                        # if chunk_num == 1:  # Only show for first chunk to avoid spam  # Commented: debug output
-                        #     print(f"\n{CYAN}📊 Sample data (first 3 rows of first 10 columns):{RESET}")
-                        #     sample_cols = ordered_db_columns[:10]
-                        #     for idx, row_idx in enumerate(range(min(3, len(chunk_pd)))):
-                        #         row_data = []
-                        #         for col in sample_cols:
-                        #             val = chunk_pd.iloc[row_idx][col]
-                        #             # Show value, type, and if it's null
-                        #             is_null = pd.isna(val)
-                        #             row_data.append(f"{col}={repr(val)[:30]}{'(NULL)' if is_null else ''}")
-                        #         print(f"  Row {row_idx+1}: {' | '.join(row_data)}")
-
-
-                        # Load using centralized Stream Loader with explicit column mapping
-                        # STRICT: 0% error tolerance - all rows must be valid
-                        with StarRocksStreamLoader(STARROCKS_CONFIG, logger=None) as loader:
-                            success, result = loader.stream_load_csv(
-                                table_name=table_name,
-                                csv_file_path=tmp_file.name,
-                                chunk_id=chunk_num,
-                                columns=ordered_db_columns,
-                                null_marker='\\N',  # Use \N for NULL values (MySQL standard)
-                            )
-
-                        if success:
-                            successful_chunks += 1
-                            rows_loaded = result.get("NumberLoadedRows", len(chunk))
-                            total_rows_loaded += rows_loaded
-                        else:
-                            failed_chunks += 1
-                            # Extract detailed error info
-                            filtered = result.get("NumberFilteredRows", 0)
-                            total = result.get("NumberTotalRows", 0)
-                            error_msg = result.get("Message", "Unknown error")
-                            error_url = result.get("ErrorURL", "No error URL")
-                            
-                            # Print detailed failure info for debugging
-                            print(f"\n{RED}❌ Stream Load FAILED (Chunk {chunk_num}/3){RESET}")
-                            print(f"  Status: {result.get('Status', 'Unknown')}")
-                            print(f"  Message: {error_msg}")
-                            print(f"  Loaded rows: {result.get('NumberLoadedRows', 0)}/{total}")
-                            print(f"  Filtered rows: {filtered}/{total} ({100*filtered/total if total > 0 else 0:.1f}%)")
-                            print(f"  Error log: {error_url}")
-                            
-                            failed_chunk_details.append(
-                                {
-                                    "chunk": chunk_num,
-                                    "filtered": filtered,
-                                    "total": total,
-                                    "message": error_msg,
-                                    "error_url": error_url,
-                                }
-                            )
 
-                        # Clean up temp file
-                        os.unlink(tmp_file.name)
+            def on_chunk_done(chunk_result):
+                if not chunk_result.success:
+                    # Extract detailed error info
+                    result = chunk_result.result
+                    filtered = result.get("NumberFilteredRows", 0)
+                    chunk_total = result.get("NumberTotalRows", 0)
+                    error_msg = result.get("Message", "Unknown error")
+                    error_url = result.get("ErrorURL", "No error URL")
 
-                except Exception as e:
-                    print(f"{RED}Chunk {chunk_num} error: {e}{RESET}")
-                    failed_chunks += 1
-                    failed_chunk_details.append({"chunk": chunk_num, "error": str(e)})
+                    # Print detailed failure info for debugging
+                    print(
+                        f"\n{RED}❌ Stream Load FAILED (Chunk {chunk_result.index + 1}/{total_chunks}){RESET}"
+                    )
+                    print(f"  Status: {result.get('Status', 'Unknown')}")
+                    print(f"  Message: {error_msg}")
+                    print(f"  Loaded rows: {result.get('NumberLoadedRows', 0)}/{chunk_total}")
+                    print(
+                        f"  Filtered rows: {filtered}/{chunk_total} "
+                        f"({100*filtered/chunk_total if chunk_total > 0 else 0:.1f}%)"
+                    )
+                    print(f"  Error log: {error_url}")
 
+                    failed_chunk_details.append(
+                        {
+                            "chunk": chunk_result.index + 1,
+                            "filtered": filtered,
+                            "total": chunk_total,
+                            "message": error_msg,
+                            "error_url": error_url,
+                        }
+                    )
                 pbar.update(1)
 
+            # Concurrent Stream Load: up to MAX_CONCURRENT_INSERTS chunks in flight,
+            # ordered labels, per-chunk retry (the loader retries internally, so
+            # no second retry layer here); stop sending after a failed chunk
+            # STRICT: 0% error tolerance - all rows must be valid
+            with StarRocksStreamLoader(STARROCKS_CONFIG, logger=None) as loader:
+                summary = load_chunks_concurrently(
+                    iter_frame_chunks(df, plan.rows),
+                    load_chunk,
+                    label_prefix=f"{table_name}_{int(time.time())}_{uuid.uuid4().hex[:8]}",
+                    max_in_flight=MAX_CONCURRENT_INSERTS,
+                    max_retries=1,
+                    on_chunk_done=on_chunk_done,
+                    fail_fast=True,
+                )
+            if summary["stopped_early"]:
+                print(f"{RED}❌ Stopped after a failed chunk - remaining chunks not sent{RESET}")
+
+        successful_chunks = summary["successful_chunks"]
+        failed_chunks = summary["failed_chunks"]
+        total_rows_loaded = summary["total_loaded"]
+
         total_time = time.time() - start
         print(f"\n{GREEN}Loaded {total_rows_loaded:,}/{total:,} rows in {total_time:.2f}s{RESET}")
         
@@ -487,6 +579,24 @@ def process_records(file, delete_existing=True):
             except Exception as e:
                 print(f"{YELLOW}⚠️  Could not verify row count: {e}{RESET}")
 
+        if live_table:
+            pool = get_connection_pool(STARROCKS_CONFIG)
+            if failed_chunks == 0:
+                swapped, swap_result = swap_shadow_table(pool, live_table, table_name, total)
+                if swapped:
+                    print(
+                        f"{GREEN}✓ Swapped {table_name} into {live_table} "
+                        f"({swap_result['swap_seconds']:.2f}s){RESET}"
+                    )
+                else:
+                    print(
+                        f"{RED}❌ Swap aborted, {live_table} left unchanged: "
+                        f"{swap_result.get('error')}{RESET}"
+                    )
+            else:
+                drop_table(pool, table_name)
+                print(f"{RED}❌ Shadow load failed, {live_table} left unchanged{RESET}")
+
         if failed_chunks > 0:
             print(
                 f"{RED}❌ Successful chunks: {successful_chunks}, Failed chunks: {failed_chunks}{RESET}"
@@ -515,6 +625,11 @@ def process_records(file, delete_existing=True):
 
     except Exception as e:
         print(f"{RED}Processing error: {str(e)}{RESET}")
+        if live_table and table_name != live_table:
+            try:
+                drop_table(get_connection_pool(STARROCKS_CONFIG), table_name)
+            except Exception:
+                pass
         raise
 
 
@@ -0,0 +1,224 @@
+"""
+Parallel Multi-Chunk Stream Load
+
+Runs Stream Load requests for many chunks of one table with a bounded number
+in flight. While chunk N is uploading, chunk N+1 is already being serialized
+on another worker thread (Polars writers and socket I/O release the GIL), so
+FE/BE are not left idle between chunks.
+
+Features:
+- Bounded in-flight requests (default: Config.MAX_CONCURRENT_INSERTS)
+- Ordered, deterministic labels: {label_prefix}_{chunk_index:05d}
+- Per-chunk retry reusing the same label, so a retry after a lost response
+  cannot load a chunk twice ("Label Already Exists" + FINISHED = success)
+- Optional fail-fast: no new chunk is sent once one has failed for good
+- Aggregated NumberLoadedRows / NumberFilteredRows accounting
+
+This is the only retry layer for a chunk. A load_chunk that already retries
+internally (StarRocksStreamLoader.stream_load_dataframe) must be run with
+max_retries=1, or every attempt multiplies its retries and backoff.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import polars as pl
+
+from utils.pipeline_config import Config
+
+# Failure messages worth retrying (server-side or transport hiccups)
+RETRIABLE_MARKERS = (
+    "internal error",
+    "service unavailable",
+    "timeout",
+    "timed out",
+    "connection",
+    "too many",
+)
+
+ChunkLoadFn = Callable[[int, pl.DataFrame, str], Tuple[bool, Dict[str, Any]]]
+
+
+@dataclass
+class ChunkLoadResult:
+    """Outcome of one chunk's Stream Load."""
+
+    index: int
+    label: str
+    rows: int
+    success: bool
+    result: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def loaded_rows(self) -> int:
+        return int(self.result.get("NumberLoadedRows", 0) or 0)
+
+    @property
+    def filtered_rows(self) -> int:
+        return int(self.result.get("NumberFilteredRows", 0) or 0)
+
+
+def iter_frame_chunks(df: pl.DataFrame, chunk_size: int) -> Iterator[Tuple[int, pl.DataFrame]]:
+    """
+    Yield (chunk_index, chunk) zero-copy slices of a DataFrame.
+
+    Args:
+        df: DataFrame to split
+        chunk_size: Rows per chunk
+
+    Yields:
+        Tuple of (0-based chunk index, DataFrame slice)
+    """
+    for index, offset in enumerate(range(0, df.height, chunk_size)):
+        yield index, df.slice(offset, chunk_size)
+
+
+def _is_already_committed(result: Dict[str, Any]) -> bool:
+    """True if the label was already committed by an earlier attempt."""
+    return (
+        result.get("Status") == "Label Already Exists"
+        and result.get("ExistingJobStatus") == "FINISHED"
+    )
+
+
+def _is_retriable(result: Dict[str, Any]) -> bool:
+    """True if a failed chunk is worth re-sending."""
+    message = str(result.get("Message") or result.get("error") or "").lower()
+    return any(marker in message for marker in RETRIABLE_MARKERS)
+
+
+def _load_one_chunk(
+    load_chunk: ChunkLoadFn,
+    index: int,
+    chunk_df: pl.DataFrame,
+    label: str,
+    max_retries: int,
+    retry_delay: float,
+) -> ChunkLoadResult:
+    """Load one chunk with retry (runs on a worker thread)."""
+    start = time.time()
+    result: Dict[str, Any] = {}
+    success = False
+    attempt = 0
+
+    while attempt < max_retries:
+        attempt += 1
+        try:
+            success, result = load_chunk(index, chunk_df, label)
+        except Exception as e:
+            success, result = False, {"Status": "Fail", "Message": str(e)}
+
+        if success:
+            break
+        if _is_already_committed(result):
+            # An earlier attempt succeeded but its response was lost
+            success = True
+            result = {**result, "NumberLoadedRows": chunk_df.height}
+            break
+        if not _is_retriable(result) or attempt >= max_retries:
+            break
+
+        time.sleep(retry_delay * (2 ** (attempt - 1)))
+
+    return ChunkLoadResult(
+        index=index,
+        label=label,
+        rows=chunk_df.height,
+        success=success,
+        result=result,
+        attempts=attempt,
+        elapsed=time.time() - start,
+    )
+
+
+def load_chunks_concurrently(
+    chunks: Iterable[Tuple[int, pl.DataFrame]],
+    load_chunk: ChunkLoadFn,
+    label_prefix: str,
+    max_in_flight: Optional[int] = None,
+    max_retries: int = Config.MAX_RETRIES,
+    retry_delay: float = Config.RETRY_DELAY,
+    on_chunk_done: Optional[Callable[[ChunkLoadResult], None]] = None,
+    fail_fast: bool = False,
+) -> Dict[str, Any]:
+    """
+    Stream Load chunks with at most max_in_flight requests at a time.
+
+    Chunks are pulled from the iterable lazily, so at most max_in_flight chunks
+    are materialized/serialized at once.
+
+    With fail_fast, the first chunk that fails for good stops the load: chunks
+    already in flight finish, the rest are never sent (a non-transactional load
+    is then left with as little partial data as possible).
+
+    Args:
+        chunks: Iterable of (chunk_index, DataFrame) pairs
+        load_chunk: Callable(chunk_index, chunk_df, label) -> (success, result_dict)
+        label_prefix: Label prefix; each chunk gets {label_prefix}_{index:05d}
+        max_in_flight: Concurrent Stream Load requests (default: Config.MAX_CONCURRENT_INSERTS,
+                       1 = sequential)
+        max_retries: Attempts per chunk (1 when load_chunk retries by itself)
+        retry_delay: Base delay in seconds (exponential backoff)
+        on_chunk_done: Optional callback, called on the calling thread as chunks finish
+        fail_fast: Stop sending chunks after the first chunk failure
+
+    Returns:
+        Dict with:
+            - total_loaded: Sum of NumberLoadedRows
+            - total_filtered: Sum of NumberFilteredRows
+            - successful_chunks / failed_chunks: Chunk counts
+            - stopped_early: True if fail_fast left chunks unsent
+            - results: List[ChunkLoadResult] in chunk order
+    """
+    max_in_flight = max(1, max_in_flight or Config.MAX_CONCURRENT_INSERTS)
+    results: List[ChunkLoadResult] = []
+    failed = False
+    stopped_early = False
+
+    def _collect(done: Iterable[Future]):
+        nonlocal failed
+        for future in done:
+            chunk_result = future.result()
+            results.append(chunk_result)
+            failed = failed or not chunk_result.success
+            if on_chunk_done:
+                on_chunk_done(chunk_result)
+
+    with ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="stream_load") as pool:
+        in_flight = set()
+        for index, chunk_df in chunks:
+            if chunk_df.is_empty():
+                continue
+
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                _collect(done)
+
+            if fail_fast and failed:
+                stopped_early = True
+                break
+
+            label = f"{label_prefix}_{index:05d}"
+            in_flight.add(
+                pool.submit(
+                    _load_one_chunk, load_chunk, index, chunk_df, label, max_retries, retry_delay
+                )
+            )
+
+        if in_flight:
+            done, _ = wait(in_flight)
+            _collect(done)
+
+    results.sort(key=lambda r: r.index)
+    return {
+        "total_loaded": sum(r.loaded_rows for r in results),
+        "total_filtered": sum(r.filtered_rows for r in results),
+        "successful_chunks": sum(1 for r in results if r.success),
+        "failed_chunks": sum(1 for r in results if not r.success),
+        "stopped_early": stopped_early,
+        "results": results,
+    }
@@ -12,20 +12,63 @@ Features:
 - Batch labeling to prevent duplicate loads
 - Strict error handling (0% error tolerance - no errors tolerated)
 - Comprehensive logging with optional debug mode
-- Connection pooling for better performance
+- Stream Load transactions (begin/load/prepare/commit/rollback) for atomic
+  multi-chunk loads
+- Process-wide shared connection pool (see connection_pool.py)
 """
 
+import queue
+import threading
 import time
 import uuid
 import requests
-import pymysql
+import polars as pl
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
+from typing import Callable, Dict, Iterable, List, Tuple, Optional, Union, TYPE_CHECKING
 from tqdm import tqdm
+from urllib3.exceptions import NewConnectionError
+
+from core.loaders.connection_pool import get_connection_pool
+from core.loaders.parallel_stream_load import iter_frame_chunks, load_chunks_concurrently
+from core.loaders.stream_load_body import iter_file_body, put_stream_body
+from core.loaders.stream_load_formats import (
+    StreamLoadFormat,
+    get_stream_load_format,
+    resolve_stream_load_format,
+)
+from core.loaders.stream_load_transport import (
+    discover_backends,
+    get_stream_load_transport,
+)
 
 if TYPE_CHECKING:
     from orchestration.tenant_manager import TenantConfig
 
+# Status values of successful transaction API calls
+TRANSACTION_OK_STATUSES = ("OK", "Success")
+
+# Transaction failures worth retrying
+TRANSACTION_RETRIABLE_ERRORS = ("internal error", "service unavailable", "timeout", "timed out")
+
+
+def _is_connect_error(exc: Exception) -> bool:
+    """
+    True if a request failed before any body byte reached the server.
+
+    Only these failures are safe to re-send inside a transaction: a timeout or
+    reset mid-upload may already have written the chunk under the open label.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", exc.args[0]), NewConnectionError)
+    return False
+
+
+def _channel_headers(channel_num: int) -> Dict[str, str]:
+    """channel_num header of a transaction loaded over parallel channels (none for one)."""
+    return {"channel_num": str(channel_num)} if channel_num > 1 else {}
+
 
 class StarRocksStreamLoader:
     """
@@ -36,7 +79,7 @@ class StarRocksStreamLoader:
     - Parquet files to StarRocks tables
     - Column mapping and transformation
     - Error handling with exponential backoff retries
-    - Connection pooling for performance
+    - Shared connection pooling for metadata queries
     """
 
     def __init__(
@@ -45,7 +88,8 @@ class StarRocksStreamLoader:
         tenant_config: Optional['TenantConfig'] = None,
         logger=None,
         debug: bool = False,
-        max_error_ratio: float = 0.0
+        max_error_ratio: float = 0.0,
+        body_format: Optional[str] = None,
     ):
         """
         Initialize Stream Loader with StarRocks configuration.
@@ -60,11 +104,14 @@ class StarRocksStreamLoader:
                 - user: Username
                 - password: Password
                 - database: Database name
+                - direct_to_be / backends: Optional direct-to-BE Stream Load routing
             tenant_config: Optional TenantConfig for multi-tenant mode
             logger: Optional logger instance for logging output
             debug: Enable debug logging (default: False)
             max_error_ratio: Maximum error ratio (0.0 = strict/no errors, 1.0 = 100% tolerance)
                            (default: 0.0 for production safety)
+            body_format: Body format for stream_load_dataframe (csv, parquet, arrow).
+                         Default: tenant stream_load.format, then stream_load_defaults.yaml
 
         Note: Either config or tenant_config must be provided.
         """
@@ -79,9 +126,15 @@ class StarRocksStreamLoader:
                 'database': tenant_config.database_name,
             }
             self.tenant_slug = tenant_config.tenant_slug
+            if body_format is None:
+                body_format = tenant_config.stream_load_format
+            direct_to_be = tenant_config.stream_load_direct_to_be
+            backends = tenant_config.stream_load_backends
         elif config is not None:
             self.config = config
             self.tenant_slug = None  # Legacy mode
+            direct_to_be = config.get('direct_to_be', False)
+            backends = config.get('backends')
         else:
             raise ValueError("Either config or tenant_config must be provided")
         # self.config is now set above based on tenant_config or config parameter
@@ -94,67 +147,32 @@ class StarRocksStreamLoader:
         self.base_retry_delay = 2  # seconds, exponential backoff
         self.max_error_ratio = max_error_ratio  # Configurable error tolerance
 
-        # Connection pool
-        self.conn_pool = []
-        self.pool_size = 5
-        self._initialize_connection_pool()
+        # Body format for DataFrame loads (CSV unless a typed format is configured)
+        self.body_format = get_stream_load_format(body_format)
+        self.bytes_sent_by_format: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()  # Loads may run on worker threads
 
-    def _initialize_connection_pool(self):
-        """Initialize connection pool for DB operations."""
-        try:
-            for _ in range(self.pool_size):
-                conn = pymysql.connect(
-                    host=self.config["host"],
-                    port=self.config["port"],
-                    user=self.config["user"],
-                    password=self.config["password"],
-                    database=self.config["database"],
-                    charset="utf8mb4",
-                    autocommit=True,
-                )
-                self.conn_pool.append(conn)
-            self._log(f"✅ Connection pool initialized with {self.pool_size} connections", "info")
-        except Exception as e:
-            self._log(f"❌ Error initializing connection pool: {e}", "error")
-            raise
+        # Shared, lazily-populated connection pool (no connection is opened here;
+        # Stream Load itself goes over HTTP and never needs one)
+        self.connection_pool = get_connection_pool(self.config)
 
-    def _get_connection(self):
-        """Get a connection from the pool."""
-        if not self.conn_pool:
-            raise RuntimeError("❌ Connection pool exhausted")
-        conn = self.conn_pool.pop()
+        # Shared keep-alive HTTP transport (optionally round-robins BEs)
+        self.transport = get_stream_load_transport(
+            self.config['host'], self.config['http_port'], direct_to_be, backends
+        )
+        if direct_to_be and not backends:
+            self.transport.set_backend_discovery(
+                lambda: discover_backends(self.connection_pool)
+            )
 
-        # Health check: try a simple query
-        try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1")
-            return conn
-        except:
-            # Connection is dead, create a new one
-            try:
-                conn = pymysql.connect(
-                    host=self.config["host"],
-                    port=self.config["port"],
-                    user=self.config["user"],
-                    password=self.config["password"],
-                    database=self.config["database"],
-                    charset="utf8mb4",
-                    autocommit=True,
-                )
-                return conn
-            except Exception as e:
-                self._log(f"❌ Error creating new connection: {e}", "error")
-                raise
+    def _get_connection(self):
+        """Check out a connection from the shared pool (close() returns it)."""
+        return self.connection_pool.acquire()
 
     def _return_connection(self, conn):
-        """Return a connection to the pool."""
-        if conn and len(self.conn_pool) < self.pool_size:
-            self.conn_pool.append(conn)
-        elif conn:
-            try:
-                conn.close()
-            except:
-                pass
+        """Return a connection to the shared pool."""
+        if conn:
+            conn.close()
 
     def _log(self, message: str, level: str = "info"):
         """
@@ -217,6 +235,7 @@ class StarRocksStreamLoader:
         columns: List[str] = None,
         max_error_ratio: float = None,
         null_marker: str = None,
+        label: str = None,
     ) -> Tuple[bool, Dict]:
         """
         Load CSV data into StarRocks table via Stream Load API.
@@ -228,6 +247,8 @@ class StarRocksStreamLoader:
         - Comprehensive error logging
         - Returns full result details for monitoring
 
+        The file is streamed from disk in blocks rather than read into memory.
+
         Args:
             table_name: Target table name in StarRocks
             csv_file_path: Path to CSV file
@@ -238,6 +259,7 @@ class StarRocksStreamLoader:
                            If None, uses instance default (set in __init__)
             null_marker: String representation of NULL values in CSV (e.g., '\\N' for MySQL NULL)
                         Default: '' (empty string)
+            label: Optional explicit Stream Load label. Default: generated from table/chunk_id
 
         Returns:
             Tuple of (success: bool, result_dict: Dict)
@@ -252,26 +274,129 @@ class StarRocksStreamLoader:
                 - LoadTimeMs: Time to load in milliseconds
                 - ErrorURL: URL to error log (if failed)
         """
+        format_headers = {"format": "CSV", "column_separator": "\x01"}
+        # Add NULL marker if provided (for handling NULL values in CSV)
+        if null_marker:
+            format_headers["null_marker"] = null_marker
+
+        return self._execute_stream_load(
+            table_name,
+            body_factory=lambda: iter_file_body(csv_file_path),
+            format_headers=format_headers,
+            format_name="csv",
+            chunk_id=chunk_id,
+            columns=columns,
+            max_error_ratio=max_error_ratio,
+            label=label,
+        )
+
+    def stream_load_dataframe(
+        self,
+        df: pl.DataFrame,
+        table_name: str,
+        chunk_id: str = None,
+        columns: List[str] = None,
+        max_error_ratio: float = None,
+        body_format: Optional[Union[str, StreamLoadFormat]] = None,
+        label: str = None,
+    ) -> Tuple[bool, Dict]:
+        """
+        Load a Polars DataFrame into StarRocks without a temp file.
+
+        The DataFrame is serialized straight into the HTTP body, so no file on
+        disk is created. CSV bodies are streamed slice by slice; Parquet and
+        Arrow bodies (opt-in) are typed and compressed, which cuts bytes on the
+        wire and lets StarRocks skip CSV parsing. A typed format the cluster's
+        version does not support is replaced by CSV before anything is sent.
+
+        Retry, labeling and error handling match stream_load_csv.
+
+        Args:
+            df: DataFrame to load
+            table_name: Target table name in StarRocks
+            chunk_id: Optional chunk identifier for logging/labeling
+            columns: Optional column mapping (defaults to df.columns, so the
+                     DataFrame does not need to be in DB column order)
+            max_error_ratio: Override default error ratio for this operation
+            body_format: Optional format name or instance overriding the
+                         loader default (csv, parquet, arrow)
+            label: Optional explicit Stream Load label (e.g. ordered labels from
+                   parallel_stream_load). Default: generated from table/chunk_id
+
+        Returns:
+            Tuple of (success: bool, result_dict: Dict) - same as stream_load_csv,
+            plus BodyFormat and BytesSent
+        """
+        if df.height == 0:
+            self._log(f"⚠️ Empty DataFrame - nothing to load into {table_name}", "warning")
+            return True, {"Status": "Success", "NumberLoadedRows": 0, "NumberTotalRows": 0}
+
+        if body_format is None:
+            fmt = self.body_format
+        elif isinstance(body_format, StreamLoadFormat):
+            fmt = body_format
+        else:
+            fmt = get_stream_load_format(body_format)
+
+        fmt = resolve_stream_load_format(fmt, self.connection_pool)
+
+        return self._execute_stream_load(
+            table_name,
+            body_factory=lambda: fmt.iter_body(df),
+            format_headers=fmt.headers(),
+            format_name=fmt.name,
+            chunk_id=chunk_id,
+            columns=columns or df.columns,
+            max_error_ratio=max_error_ratio,
+            label=label,
+        )
+
+    def _execute_stream_load(
+        self,
+        table_name: str,
+        body_factory: Callable[[], Iterable[bytes]],
+        format_headers: Dict[str, str],
+        format_name: str,
+        chunk_id: str = None,
+        columns: List[str] = None,
+        max_error_ratio: float = None,
+        label: str = None,
+    ) -> Tuple[bool, Dict]:
+        """
+        Send a Stream Load request with retry and exponential backoff.
+
+        The same label is reused across retries, so a retry after a lost
+        response cannot load the data twice.
+
+        Args:
+            table_name: Target table name in StarRocks
+            body_factory: Callable returning a fresh body iterable for each attempt
+                          (generators are single-use, so retries rebuild the body)
+            format_headers: Body format headers (format, separator, null marker)
+            format_name: Body format name, used for bytes-sent reporting
+            chunk_id: Optional chunk identifier for logging/labeling
+            columns: Optional list of column names for mapping
+            max_error_ratio: Override default error ratio for this operation
+            label: Optional explicit label (default: generated)
+
+        Returns:
+            Tuple of (success: bool, result_dict: Dict)
+        """
         # Use provided max_error_ratio or fall back to instance default
         error_ratio = max_error_ratio if max_error_ratio is not None else self.max_error_ratio
         url = f"http://{self.config['host']}:{self.config['http_port']}/api/{self.config['database']}/{table_name}/_stream_load"
 
         # Prepare headers for Stream Load
-        label = self._get_stream_load_label(table_name, chunk_id)
+        label = label or self._get_stream_load_label(table_name, chunk_id)
         headers = {
             "label": label,
-            "column_separator": "\x01",
-            "format": "CSV",
+            **format_headers,
             "max_filter_ratio": str(error_ratio),
             "strict_mode": "true" if error_ratio == 0.0 else "false",
             "timezone": "Asia/Shanghai",
             "Expect": "100-continue",
         }
 
-        # Add NULL marker if provided (for handling NULL values in CSV)
-        if null_marker:
-            headers["null_marker"] = null_marker
-
         # Add column mapping if provided
         if columns:
             headers["columns"] = ",".join(columns)
@@ -288,23 +413,22 @@ class StarRocksStreamLoader:
                     "debug",
                 )
 
-                # Read CSV file
-                with open(csv_file_path, "rb") as f:
-                    file_data = f.read()
-
-                file_size_mb = len(file_data) / 1024 / 1024
-                self._log(f"📤 Uploading {file_size_mb:.2f}MB to {table_name}", "debug")
-
-                # Execute Stream Load
-                response = requests.put(
-                    url,
-                    headers=headers,
-                    data=file_data,
-                    auth=auth,
-                    timeout=self.stream_load_timeout,
+                # Execute Stream Load with a fresh streamed body
+                response, bytes_sent = self.transport.put(
+                    url, headers, body_factory, auth, self.stream_load_timeout
+                )
+                with self._stats_lock:
+                    self.bytes_sent_by_format[format_name] = (
+                        self.bytes_sent_by_format.get(format_name, 0) + bytes_sent
+                    )
+                self._log(
+                    f"📤 Uploaded {bytes_sent / 1024 / 1024:.2f}MB ({format_name}) to {table_name}",
+                    "debug",
                 )
 
                 result = response.json()
+                result["BodyFormat"] = format_name
+                result["BytesSent"] = bytes_sent
                 status = result.get("Status", "Unknown")
 
                 # Check result
@@ -314,10 +438,20 @@ class StarRocksStreamLoader:
                     elapsed_ms = result.get("LoadTimeMs", 0)
 
                     self._log(
-                        f"✅ Stream Load SUCCESS: {loaded}/{total} rows in {elapsed_ms}ms", "info"
+                        f"✅ Stream Load SUCCESS: {loaded}/{total} rows in {elapsed_ms}ms "
+                        f"({format_name}, {bytes_sent / 1024 / 1024:.2f}MB)",
+                        "info",
                     )
                     return True, result
 
+                elif (
+                    status == "Label Already Exists"
+                    and result.get("ExistingJobStatus") == "FINISHED"
+                ):
+                    # An earlier attempt committed but its response was lost
+                    self._log(f"✅ Stream Load already committed under label {label}", "info")
+                    return True, result
+
                 else:
                     # Load failed
                     message = result.get("Message", "Unknown error")
@@ -382,6 +516,311 @@ class StarRocksStreamLoader:
         # Should not reach here
         return False, {"Status": "Fail", "Message": "Unknown error - max retries exceeded"}
 
+    # Stream Load transaction API (begin → load × N → prepare → commit)
+
+    def _transaction_request(
+        self, action: str, table_name: str, label: str, extra_headers: Optional[Dict] = None
+    ) -> Tuple[bool, Dict]:
+        """
+        Call a body-less transaction endpoint (begin, prepare, commit, rollback).
+
+        The FE may redirect to the transaction's coordinator BE; the redirect
+        is followed here so basic auth is kept.
+
+        Returns:
+            Tuple of (ok, response_dict)
+        """
+        url = f"http://{self.config['host']}:{self.config['http_port']}/api/transaction/{action}"
+        headers = {
+            "label": label,
+            "db": self.config["database"],
+            "table": table_name,
+            **(extra_headers or {}),
+        }
+        auth = (self.config["user"], self.config["password"])
+        session = self.transport.session
+        try:
+            response = session.post(
+                url,
+                headers=headers,
+                auth=auth,
+                timeout=self.stream_load_timeout,
+                allow_redirects=False,
+            )
+            if response.is_redirect:
+                response = session.post(
+                    response.headers["Location"],
+                    headers=headers,
+                    auth=auth,
+                    timeout=self.stream_load_timeout,
+                    allow_redirects=False,
+                )
+            result = response.json()
+        except Exception as e:
+            return False, {"Status": "Fail", "Message": str(e)}
+
+        status = result.get("Status", "Unknown")
+        ok = status in TRANSACTION_OK_STATUSES or (
+            action == "commit" and "already committed" in str(result.get("Message", "")).lower()
+        )
+        return ok, result
+
+    def begin_transaction(
+        self, table_name: str, label: str, channel_num: int = 1
+    ) -> Tuple[bool, Dict]:
+        """Begin a Stream Load transaction under label (returns TxnId).
+
+        channel_num > 1 opens that many load channels, so the same number of
+        load requests (one per channel_id) may run at once.
+        """
+        return self._transaction_request(
+            "begin",
+            table_name,
+            label,
+            {"timeout": str(self.stream_load_timeout), **_channel_headers(channel_num)},
+        )
+
+    def prepare_transaction(
+        self, table_name: str, label: str, channel_num: int = 1
+    ) -> Tuple[bool, Dict]:
+        """Pre-commit a transaction (data is persisted but not yet visible)."""
+        return self._transaction_request(
+            "prepare", table_name, label, _channel_headers(channel_num)
+        )
+
+    def commit_transaction(
+        self, table_name: str, label: str, channel_num: int = 1
+    ) -> Tuple[bool, Dict]:
+        """Commit a prepared transaction, retrying transient failures."""
+        for attempt in range(1, self.max_retries + 1):
+            ok, result = self._transaction_request(
+                "commit", table_name, label, _channel_headers(channel_num)
+            )
+            message = str(result.get("Message", "")).lower()
+            if ok or not any(err in message for err in TRANSACTION_RETRIABLE_ERRORS):
+                return ok, result
+            if attempt < self.max_retries:
+                time.sleep(self.base_retry_delay * (2 ** (attempt - 1)))
+        return ok, result
+
+    def rollback_transaction(
+        self, table_name: str, label: str, channel_num: int = 1
+    ) -> Tuple[bool, Dict]:
+        """Abort a transaction; nothing loaded under it becomes visible."""
+        ok, result = self._transaction_request(
+            "rollback", table_name, label, _channel_headers(channel_num)
+        )
+        if ok:
+            self._log(f"↩️  Rolled back transaction {label}", "warning")
+        else:
+            self._log(
+                f"⚠️ Rollback of {label} failed: {result.get('Message', 'Unknown error')}",
+                "warning",
+            )
+        return ok, result
+
+    def _transaction_load_chunk(
+        self,
+        table_name: str,
+        label: str,
+        df: pl.DataFrame,
+        fmt: StreamLoadFormat,
+        columns: List[str],
+        channel_id: Optional[int] = None,
+    ) -> Tuple[bool, Dict]:
+        """
+        Send one chunk into an open transaction (always via the FE, never BE-routed).
+
+        Only connect errors are retried: the request never reached the server,
+        so nothing was written. Any other failure (a timeout or reset mid-upload,
+        an error response) may have left data under the label and is returned
+        as is, for the caller to roll the transaction back.
+
+        Args:
+            table_name: Target table name in StarRocks
+            label: Open transaction label
+            df: Chunk to load
+            fmt: Resolved body format
+            columns: Column mapping
+            channel_id: Load channel of this request (None for a single channel)
+
+        Returns:
+            Tuple of (success, response_dict) with BytesSent and Attempts
+        """
+        url = f"http://{self.config['host']}:{self.config['http_port']}/api/transaction/load"
+        headers = {
+            "label": label,
+            "db": self.config["database"],
+            "table": table_name,
+            **fmt.headers(),
+            "max_filter_ratio": str(self.max_error_ratio),
+            "strict_mode": "true" if self.max_error_ratio == 0.0 else "false",
+            "timezone": "Asia/Shanghai",
+            "columns": ",".join(columns),
+            "Expect": "100-continue",
+        }
+        if channel_id is not None:
+            headers["channel_id"] = str(channel_id)
+        auth = (self.config["user"], self.config["password"])
+
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                # The probe keeps the label (and channel): the FE routes
+                # transaction loads to the transaction's coordinator BE
+                response, bytes_sent = put_stream_body(
+                    url,
+                    headers,
+                    lambda: fmt.iter_body(df),
+                    auth,
+                    self.stream_load_timeout,
+                    session=self.transport.session,
+                    probe_headers=headers,
+                )
+                break
+            except Exception as e:
+                if not _is_connect_error(e) or attempt >= self.max_retries:
+                    return False, {"Status": "Fail", "Message": str(e), "Attempts": attempt}
+                wait_time = self.base_retry_delay * (2 ** (attempt - 1))
+                self._log(
+                    f"⏳ Could not connect for {label} (attempt {attempt}/{self.max_retries}), "
+                    f"retrying in {wait_time}s: {e}",
+                    "warning",
+                )
+                time.sleep(wait_time)
+
+        with self._stats_lock:
+            self.bytes_sent_by_format[fmt.name] = (
+                self.bytes_sent_by_format.get(fmt.name, 0) + bytes_sent
+            )
+
+        result = response.json()
+        result["BytesSent"] = bytes_sent
+        result["Attempts"] = attempt
+        return result.get("Status") in TRANSACTION_OK_STATUSES, result
+
+    def load_dataframe_transactional(
+        self,
+        df: pl.DataFrame,
+        table_name: str,
+        chunk_size: int,
+        columns: List[str] = None,
+        max_in_flight: int = 1,
+        label: str = None,
+    ) -> Tuple[bool, Dict]:
+        """
+        Load a DataFrame in chunks inside one Stream Load transaction.
+
+        All chunks become visible together at commit, or not at all. A chunk is
+        re-sent only if its request could not connect (nothing was written);
+        any other chunk failure stops the load and rolls the transaction back,
+        since re-sending a chunk that may already be written would load it twice.
+
+        With max_in_flight > 1 the transaction is opened with that many load
+        channels and every concurrent request uses its own channel_id.
+
+        Args:
+            df: DataFrame to load (columns in DB order)
+            table_name: Target table name in StarRocks
+            chunk_size: Rows per load request
+            columns: Optional column mapping (defaults to df.columns)
+            max_in_flight: Concurrent load requests (= load channels) within the transaction
+            label: Optional transaction label (default: generated)
+
+        Returns:
+            Tuple of (success, result_dict) with Label, TxnId, NumberLoadedRows,
+            NumberFilteredRows, FailedChunks and RetriedChunks
+        """
+        label = label or self._get_stream_load_label(table_name, "txn")
+        fmt = resolve_stream_load_format(self.body_format, self.connection_pool)
+        columns = columns or df.columns
+        channel_num = max(1, max_in_flight)
+
+        ok, begin = self.begin_transaction(table_name, label, channel_num)
+        if not ok:
+            self._log(f"❌ Could not begin transaction {label}: {begin.get('Message')}", "error")
+            return False, begin
+        self._log(
+            f"🔒 Began transaction {label} (TxnId {begin.get('TxnId')}, "
+            f"{channel_num} channel(s))",
+            "info",
+        )
+
+        # A channel serves one request at a time: each chunk borrows a free one
+        free_channels: "queue.Queue[int]" = queue.Queue()
+        for channel_id in range(channel_num):
+            free_channels.put(channel_id)
+
+        def load_chunk(index, chunk_df, _chunk_label):
+            channel_id = free_channels.get()
+            try:
+                return self._transaction_load_chunk(
+                    table_name,
+                    label,
+                    chunk_df,
+                    fmt,
+                    columns,
+                    channel_id if channel_num > 1 else None,
+                )
+            finally:
+                free_channels.put(channel_id)
+
+        summary = load_chunks_concurrently(
+            iter_frame_chunks(df, chunk_size),
+            load_chunk,
+            label_prefix=label,
+            max_in_flight=channel_num,
+            max_retries=1,
+            fail_fast=True,
+        )
+
+        result = {
+            "Label": label,
+            "TxnId": begin.get("TxnId"),
+            "BodyFormat": fmt.name,
+            "NumberTotalRows": df.height,
+            "NumberLoadedRows": summary["total_loaded"],
+            "NumberFilteredRows": summary["total_filtered"],
+            "FailedChunks": summary["failed_chunks"],
+            "RetriedChunks": sum(
+                1 for r in summary["results"] if r.result.get("Attempts", 1) > 1
+            ),
+        }
+
+        if summary["failed_chunks"] or (self.max_error_ratio == 0.0 and summary["total_filtered"]):
+            failed = next((r for r in summary["results"] if not r.success), None)
+            result["Status"] = "Fail"
+            result["Message"] = (
+                failed.result.get("Message", "Unknown error")
+                if failed
+                else f"{summary['total_filtered']} rows filtered"
+            )
+            self.rollback_transaction(table_name, label, channel_num)
+            return False, result
+
+        for step in (self.prepare_transaction, self.commit_transaction):
+            ok, step_result = step(table_name, label, channel_num)
+            if not ok:
+                result["Status"] = "Fail"
+                result["Message"] = step_result.get("Message", "Unknown error")
+                self.rollback_transaction(table_name, label, channel_num)
+                return False, result
+
+        # Per-request responses may omit row counts; the commit response has
+        # the transaction's totals
+        for key in ("NumberTotalRows", "NumberLoadedRows", "NumberFilteredRows"):
+            if key in step_result:
+                result[key] = step_result[key]
+
+        result["Status"] = "Success"
+        self._log(
+            f"✅ Committed transaction {label}: {result['NumberLoadedRows']:,} rows "
+            f"({result['RetriedChunks']} chunk(s) retried)",
+            "info",
+        )
+        return True, result
+
     def get_table_row_count(self, table_name: str) -> Optional[int]:
         """
         Get current row count for a table.
@@ -434,17 +873,18 @@ class StarRocksStreamLoader:
             f"   Filtered: {filtered_rows:,} rows ({filter_pct:.1f}%)\n"
             f"   Time: {elapsed_ms}ms"
         )
+        for format_name, sent in self.bytes_sent_by_format.items():
+            summary += f"\n   Sent ({format_name}): {sent / 1024 / 1024:.2f}MB"
         self._log(summary, "info")
 
     def close(self):
-        """Close all connections in the pool."""
-        try:
-            for conn in self.conn_pool:
-                conn.close()
-            self.conn_pool.clear()
-            self._log("✅ All connections closed", "debug")
-        except Exception as e:
-            self._log(f"⚠️ Error closing connections: {e}", "warning")
+        """
+        Release loader resources.
+
+        Pooled connections are shared with other loaders in the process and
+        stay open for reuse; they are closed at interpreter exit.
+        """
+        self._log("✅ Stream loader closed", "debug")
 
     def __enter__(self):
         """Context manager entry."""
@@ -0,0 +1,215 @@
+"""
+Stream Load Request Bodies
+
+Builders for the HTTP body sent to StarRocks Stream Load.
+
+Every builder returns a generator of ``bytes`` so that ``requests`` sends the
+payload with chunked transfer encoding: a DataFrame is serialized one row slice
+at a time straight into the socket instead of being written to a temp file and
+read back into memory in full.
+
+Generators are single-use. Callers that retry must call the builder again to
+get a fresh body for every attempt.
+"""
+
+import io
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import polars as pl
+import requests
+
+# Rows serialized per body slice. Small enough to keep the in-flight buffer at a
+# few MB for wide fact tables, large enough to amortize the per-call overhead.
+DEFAULT_BODY_BATCH_ROWS = 50_000
+
+# DATETIME text in CSV bodies ("2025-01-14 09:30:00", fraction only when non-zero),
+# the same text pandas' to_csv produced for the temp-file loads
+CSV_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S%.f"
+
+# Read size when streaming an existing file from disk
+DEFAULT_FILE_BLOCK_SIZE = 1024 * 1024  # 1MB
+
+
+def iter_csv_body(
+    df: pl.DataFrame,
+    separator: str = "\x01",
+    null_value: str = "",
+    batch_rows: int = DEFAULT_BODY_BATCH_ROWS,
+    datetime_format: str = CSV_DATETIME_FORMAT,
+) -> Iterator[bytes]:
+    """
+    Serialize a DataFrame to headerless CSV, one row slice at a time.
+
+    Fields are never quoted: Stream Load is not sent an enclose header, so it
+    would load any quote characters into the table as data.
+
+    Args:
+        df: DataFrame to serialize (column order is preserved)
+        separator: Column separator (default: SOH, matches Stream Load headers)
+        null_value: Text written for NULL values (use '\\N' with a null_marker header)
+        batch_rows: Rows serialized per yielded block
+        datetime_format: strftime format for Datetime columns
+
+    Yields:
+        CSV-encoded bytes for each row slice
+    """
+    for offset in range(0, df.height, batch_rows):
+        buffer = io.BytesIO()
+        df.slice(offset, batch_rows).write_csv(
+            buffer,
+            separator=separator,
+            include_header=False,
+            null_value=null_value,
+            datetime_format=datetime_format,
+            quote_style="never",
+        )
+        yield buffer.getvalue()
+
+
+def iter_file_body(
+    file_path: Union[str, Path], block_size: int = DEFAULT_FILE_BLOCK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream an existing file from disk in fixed-size blocks.
+
+    Args:
+        file_path: Path to the file to send
+        block_size: Bytes read per yielded block
+
+    Yields:
+        Raw file bytes
+    """
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            yield block
+
+
+class CountingBody:
+    """
+    Iterable wrapper that counts bytes as ``requests`` pulls them.
+
+    Has no ``__len__`` on purpose, so ``requests`` keeps using chunked transfer
+    encoding instead of trying to buffer the body to compute Content-Length.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = chunks
+        self.bytes_sent = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+def probe_redirect(
+    url: str,
+    headers: Dict[str, str],
+    auth: Tuple[str, str],
+    timeout: int,
+    session: Optional[requests.Session] = None,
+) -> Optional[str]:
+    """
+    Ask a Stream Load endpoint where the body should go, without sending it.
+
+    The FE answers Stream Load requests with a 307 to a BE before reading the
+    body, so a zero-length PUT with the same headers is enough to learn the BE.
+
+    Args:
+        url: Stream Load URL
+        headers: Headers sent on the probe (the caller strips the label when an
+                 endpoint that does not redirect would otherwise consume it)
+        auth: (user, password) tuple for basic auth
+        timeout: Request timeout in seconds
+        session: Optional keep-alive session
+
+    Returns:
+        Redirect Location, or None when the endpoint serves the request itself
+    """
+    http = session or requests
+    response = http.put(
+        url,
+        headers={**headers, "Expect": "100-continue"},
+        data=b"",
+        auth=auth,
+        timeout=timeout,
+        allow_redirects=False,
+    )
+    if response.is_redirect:
+        return response.headers["Location"]
+    return None
+
+
+def put_stream_body(
+    url: str,
+    headers: Dict[str, str],
+    body_factory: Callable[[], Iterable[bytes]],
+    auth: Tuple[str, str],
+    timeout: int,
+    session: Optional[requests.Session] = None,
+    on_redirect: Optional[Callable[[str], None]] = None,
+    probe: bool = True,
+    probe_headers: Optional[Dict[str, str]] = None,
+) -> Tuple[requests.Response, int]:
+    """
+    PUT a streamed body to a Stream Load endpoint, serializing it once.
+
+    ``requests`` cannot replay a generator body when following a redirect (it
+    silently sends an empty body instead), and uploading the body to the FE
+    only to be redirected would serialize and send every chunk twice. The BE
+    is therefore resolved first with a body-less probe (probe_redirect), and
+    the body is streamed once, straight to it.
+
+    Args:
+        url: Stream Load URL
+        headers: Stream Load headers
+        body_factory: Callable returning a fresh body iterable
+        auth: (user, password) tuple for basic auth
+        timeout: Request timeout in seconds
+        session: Optional keep-alive session (see stream_load_transport);
+                 default: a new connection per request
+        on_redirect: Optional callback receiving the FE redirect Location
+        probe: Resolve the redirect before sending (False when url is a BE)
+        probe_headers: Headers of the probe (default: headers without the
+                       label, so a probe the endpoint serves itself is an empty
+                       load under a throwaway label and the real label stays free)
+
+    Returns:
+        Tuple of (response, bytes_sent)
+    """
+    http = session or requests
+    if probe:
+        if probe_headers is None:
+            probe_headers = {k: v for k, v in headers.items() if k.lower() != "label"}
+        location = probe_redirect(url, probe_headers, auth, timeout, session=session)
+        if location:
+            if on_redirect:
+                on_redirect(location)
+            url = location
+
+    body = CountingBody(body_factory())
+    response = http.put(
+        url, headers=headers, data=body, auth=auth, timeout=timeout, allow_redirects=False
+    )
+
+    if response.is_redirect:
+        # Redirected although the probe was not (or probing is off): follow it
+        # with a freshly built body
+        location = response.headers["Location"]
+        if on_redirect:
+            on_redirect(location)
+        body = CountingBody(body_factory())
+        response = http.put(
+            location,
+            headers=headers,
+            data=body,
+            auth=auth,
+            timeout=timeout,
+            allow_redirects=False,
+        )
+
+    return response, body.bytes_sent
@@ -0,0 +1,253 @@
+"""
+Stream Load Body Formats
+
+Pluggable serializers for the Stream Load request body.
+
+Formats:
+    csv     - SOH-delimited text with '\\N' NULL markers (default)
+    parquet - Typed, compressed columnar body; StarRocks skips CSV parsing
+    arrow   - Arrow IPC stream; typed and cheap to produce from Polars
+
+CSV is the default. Parquet and Arrow are opt-in, per tenant with
+``stream_load.format`` or via common_parameters.format in
+configs/starrocks/stream_load_defaults.yaml, and are only used when the
+cluster's version supports them (resolve_stream_load_format, decided once per
+cluster before any body is sent). Unknown names fall back to CSV.
+"""
+
+from abc import ABC, abstractmethod
+import io
+import logging
+from functools import lru_cache
+from pathlib import Path
+import re
+import threading
+from typing import Dict, Iterator, Optional, Tuple, TYPE_CHECKING
+
+import polars as pl
+import yaml
+
+from core.loaders.stream_load_body import DEFAULT_BODY_BATCH_ROWS, iter_csv_body
+
+if TYPE_CHECKING:
+    from core.loaders.connection_pool import StarRocksConnectionPool
+
+logger = logging.getLogger(__name__)
+
+STREAM_LOAD_DEFAULTS_FILE = (
+    Path(__file__).parent.parent.parent / "configs" / "starrocks" / "stream_load_defaults.yaml"
+)
+
+DEFAULT_FORMAT = "csv"
+
+# First StarRocks release whose Stream Load accepts the body format
+# (overridable with <format>.min_starrocks_version in stream_load_defaults.yaml)
+FORMAT_MIN_VERSIONS = {
+    "parquet": "4.0",
+    "arrow": "4.0",
+}
+
+# (pool, format name) -> supported, decided once per cluster and process
+_SUPPORT_CACHE: Dict[Tuple[int, str], bool] = {}
+_SUPPORT_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def load_stream_load_defaults() -> Dict:
+    """
+    Load configs/starrocks/stream_load_defaults.yaml (cached per process).
+
+    Returns:
+        Parsed YAML dict, or an empty dict if the file is missing or invalid
+    """
+    if not STREAM_LOAD_DEFAULTS_FILE.exists():
+        return {}
+    try:
+        with open(STREAM_LOAD_DEFAULTS_FILE) as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.warning(f"Could not read {STREAM_LOAD_DEFAULTS_FILE.name}: {e}")
+        return {}
+
+
+class StreamLoadFormat(ABC):
+    """Base class for Stream Load body formats."""
+
+    name = "base"
+
+    @abstractmethod
+    def headers(self) -> Dict[str, str]:
+        """Format-specific Stream Load headers."""
+
+    @abstractmethod
+    def iter_body(self, df: pl.DataFrame) -> Iterator[bytes]:
+        """Serialize a DataFrame into body blocks."""
+
+
+class CsvFormat(StreamLoadFormat):
+    """SOH-delimited CSV. Streams row slices, so it never holds the whole body."""
+
+    name = "csv"
+
+    def __init__(
+        self,
+        separator: str = "\x01",
+        null_marker: str = "\\N",
+        batch_rows: int = DEFAULT_BODY_BATCH_ROWS,
+    ):
+        self.separator = separator
+        self.null_marker = null_marker
+        self.batch_rows = batch_rows
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"format": "CSV", "column_separator": self.separator}
+        if self.null_marker:
+            headers["null_marker"] = self.null_marker
+        return headers
+
+    def iter_body(self, df: pl.DataFrame) -> Iterator[bytes]:
+        return iter_csv_body(
+            df,
+            separator=self.separator,
+            null_value=self.null_marker or "",
+            batch_rows=self.batch_rows,
+        )
+
+
+class ParquetFormat(StreamLoadFormat):
+    """
+    Parquet body. A Parquet file needs its footer, so each chunk is written as
+    one compressed file in memory (bounded by the chunk size, not the table).
+    """
+
+    name = "parquet"
+
+    def __init__(self, compression: str = "zstd"):
+        self.compression = compression
+
+    def headers(self) -> Dict[str, str]:
+        return {"format": "parquet"}
+
+    def iter_body(self, df: pl.DataFrame) -> Iterator[bytes]:
+        buffer = io.BytesIO()
+        df.write_parquet(buffer, compression=self.compression)
+        yield buffer.getvalue()
+
+
+class ArrowFormat(StreamLoadFormat):
+    """Arrow IPC stream body, written in one piece per chunk."""
+
+    name = "arrow"
+
+    def __init__(self, compression: str = "lz4"):
+        self.compression = compression
+
+    def headers(self) -> Dict[str, str]:
+        return {"format": "arrow"}
+
+    def iter_body(self, df: pl.DataFrame) -> Iterator[bytes]:
+        buffer = io.BytesIO()
+        df.write_ipc_stream(buffer, compression=self.compression)
+        yield buffer.getvalue()
+
+
+STREAM_LOAD_FORMATS = {
+    "csv": CsvFormat,
+    "parquet": ParquetFormat,
+    "arrow": ArrowFormat,
+}
+
+
+def get_stream_load_format(name: Optional[str] = None) -> StreamLoadFormat:
+    """
+    Build a body format from its name and stream_load_defaults.yaml.
+
+    Args:
+        name: Format name (csv, parquet, arrow). None uses
+              common_parameters.format from the YAML defaults (csv when unset).
+
+    Returns:
+        StreamLoadFormat instance (CsvFormat for unknown names)
+    """
+    defaults = load_stream_load_defaults()
+    if name is None:
+        name = defaults.get("common_parameters", {}).get("format", DEFAULT_FORMAT)
+    name = str(name).lower()
+
+    if name == "parquet":
+        writer = defaults.get("parquet", {}).get("writer", {})
+        return ParquetFormat(compression=writer.get("compression", "zstd"))
+    if name == "arrow":
+        writer = defaults.get("arrow", {}).get("writer", {})
+        return ArrowFormat(compression=writer.get("compression", "lz4"))
+    if name != "csv":
+        logger.warning(f"Stream Load format '{name}' is not supported here, falling back to CSV")
+
+    null_string = defaults.get("csv", {}).get("type_conversion", {}).get("null_string", "\\N")
+    return CsvFormat(null_marker=null_string)
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    """Numeric part of a version string ("3.3.5-abc1234" -> (3, 3, 5))."""
+    match = re.match(r"\s*v?(\d+(?:\.\d+)*)", version or "")
+    if not match:
+        return ()
+    return tuple(int(part) for part in match.group(1).split("."))
+
+
+def format_supported(name: str, server_version: Optional[str]) -> bool:
+    """
+    True if a StarRocks release accepts Stream Load bodies in a format.
+
+    Args:
+        name: Format name
+        server_version: Cluster version (None = unknown, only CSV is assumed)
+    """
+    if name == "csv":
+        return True
+    required = load_stream_load_defaults().get(name, {}).get(
+        "min_starrocks_version", FORMAT_MIN_VERSIONS.get(name)
+    )
+    if not required or not server_version:
+        return False
+    actual = parse_version(server_version)
+    return bool(actual) and actual >= parse_version(str(required))
+
+
+def resolve_stream_load_format(
+    fmt: StreamLoadFormat, connection_pool: "StarRocksConnectionPool"
+) -> StreamLoadFormat:
+    """
+    The format to actually send to a cluster: fmt if the cluster's version
+    supports it, CSV otherwise.
+
+    The version is read once per pool (SELECT current_version()) and the
+    decision is cached, so call this before fanning chunks out to workers
+    instead of reacting to per-chunk errors.
+
+    Args:
+        fmt: Configured body format
+        connection_pool: Pool of the target cluster
+
+    Returns:
+        fmt, or a CsvFormat when the cluster cannot take it
+    """
+    if fmt.name == "csv":
+        return fmt
+
+    key = (id(connection_pool), fmt.name)
+    with _SUPPORT_LOCK:
+        supported = _SUPPORT_CACHE.get(key)
+    if supported is None:
+        server_version = connection_pool.server_version()
+        supported = format_supported(fmt.name, server_version)
+        with _SUPPORT_LOCK:
+            first = key not in _SUPPORT_CACHE
+            _SUPPORT_CACHE[key] = supported
+        if first and not supported:
+            logger.warning(
+                f"StarRocks {server_version or '(unknown version)'} does not support "
+                f"{fmt.name} Stream Load bodies - using CSV"
+            )
+
+    return fmt if supported else get_stream_load_format("csv")
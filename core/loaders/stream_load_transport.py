@@ -0,0 +1,264 @@
+"""
+Stream Load HTTP Transport
+
+Keep-alive HTTP transport for Stream Load, shared by every loader in the
+process:
+
+- One pooled ``requests.Session`` per StarRocks FE, so chunks reuse TCP
+  connections instead of opening one (plus a redirect hop) per request
+- Transport-level retries for connection failures only; a body that has
+  started streaming is never replayed here (the caller retries with the
+  same label, which StarRocks de-duplicates)
+- Optional direct-to-BE routing (stream_load.direct_to_be): the alive BEs
+  are read from SHOW BACKENDS (refreshed every BACKEND_REFRESH_SECONDS),
+  configured via stream_load.backends, or learned from FE redirects, and
+  chunks are round-robined across them, skipping the FE hop and spreading
+  ingest load. A BE that refuses connections is skipped for a cooldown and
+  the request goes through the FE instead.
+
+Direct-to-BE routing is off by default: BE addresses advertised by the FE are
+not always reachable from the client (NAT, containers).
+"""
+
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from urllib.parse import urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.loaders.stream_load_body import put_stream_body
+
+if TYPE_CHECKING:
+    from core.loaders.connection_pool import StarRocksConnectionPool
+
+# Keep-alive connections per host (>= concurrent in-flight Stream Loads)
+DEFAULT_POOL_MAXSIZE = 16
+
+# Transport-level retries for connection errors (before any body is sent)
+DEFAULT_CONNECT_RETRIES = 3
+
+# Seconds a BE is skipped after a connection failure
+UNHEALTHY_COOLDOWN = 60.0
+
+# Seconds between SHOW BACKENDS refreshes in direct-to-BE mode
+BACKEND_REFRESH_SECONDS = 300.0
+
+
+def _netloc(url: str) -> str:
+    """host:port of a URL (credentials stripped)."""
+    parsed = urlparse(url)
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else str(parsed.hostname)
+
+
+def discover_backends(connection_pool: "StarRocksConnectionPool") -> List[str]:
+    """
+    Alive BE HTTP endpoints from SHOW BACKENDS.
+
+    Args:
+        connection_pool: Pool for the cluster's FE
+
+    Returns:
+        List of "host:http_port" for every alive BE
+    """
+    with connection_pool.acquire() as conn, conn.cursor() as cursor:
+        cursor.execute("SHOW BACKENDS")
+        names = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+
+    host_col = names.index("IP") if "IP" in names else names.index("Host")
+    port_col = names.index("HttpPort")
+    alive_col = names.index("Alive")
+    return [
+        f"{row[host_col]}:{row[port_col]}"
+        for row in rows
+        if str(row[alive_col]).lower() == "true"
+    ]
+
+
+class StreamLoadTransport:
+    """Keep-alive Stream Load transport with optional round-robin direct-to-BE routing."""
+
+    def __init__(
+        self,
+        direct_to_be: bool = False,
+        backends: Optional[List[str]] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        connect_retries: int = DEFAULT_CONNECT_RETRIES,
+        unhealthy_cooldown: float = UNHEALTHY_COOLDOWN,
+    ):
+        """
+        Args:
+            direct_to_be: Send chunks straight to known BEs (round-robin)
+            backends: Optional initial BE HTTP endpoints ("host:port")
+            pool_maxsize: Keep-alive connections kept per host
+            connect_retries: Retries for connection errors at the transport layer
+            unhealthy_cooldown: Seconds a failing BE is skipped
+        """
+        self.direct_to_be = direct_to_be
+        self.unhealthy_cooldown = unhealthy_cooldown
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_maxsize,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=connect_retries,
+                connect=connect_retries,
+                read=0,
+                status=0,
+                redirect=0,
+                backoff_factor=0.5,
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._backends: List[str] = list(dict.fromkeys(backends or []))
+        self._unhealthy: Dict[str, float] = {}
+        self._round_robin = itertools.count()
+        self._lock = threading.Lock()
+
+        self._discovery: Optional[Callable[[], List[str]]] = None
+        self._discovered_at = 0.0
+
+    @property
+    def backends(self) -> List[str]:
+        """Known BE endpoints ("host:port")."""
+        with self._lock:
+            return list(self._backends)
+
+    def set_backend_discovery(self, discovery: Callable[[], List[str]]):
+        """
+        Register a callable returning the cluster's BE endpoints (e.g. discover_backends).
+
+        Used only in direct-to-BE mode; the first registration wins. Not
+        needed when stream_load.backends lists the endpoints explicitly.
+        """
+        with self._lock:
+            if self._discovery is None:
+                self._discovery = discovery
+
+    def _refresh_backends(self):
+        """Re-read the BE list if it is older than BACKEND_REFRESH_SECONDS."""
+        with self._lock:
+            discovery = self._discovery
+            now = time.monotonic()
+            if discovery is None or now - self._discovered_at < BACKEND_REFRESH_SECONDS:
+                return
+            self._discovered_at = time.monotonic()
+
+        try:
+            discovered = discovery()
+        except Exception:
+            # No privilege for SHOW BACKENDS etc.: keep learning from redirects
+            return
+        if discovered:
+            with self._lock:
+                self._backends = list(dict.fromkeys(discovered))
+
+    def remember_backend(self, location: str):
+        """Record the BE an FE redirected to."""
+        backend = _netloc(location)
+        with self._lock:
+            if backend not in self._backends:
+                self._backends.append(backend)
+
+    def mark_unhealthy(self, backend: str):
+        """Skip a BE for unhealthy_cooldown seconds."""
+        with self._lock:
+            self._unhealthy[backend] = time.monotonic() + self.unhealthy_cooldown
+
+    def _next_backend(self) -> Optional[str]:
+        """Next healthy BE in round-robin order (None = go through the FE)."""
+        with self._lock:
+            now = time.monotonic()
+            healthy = [b for b in self._backends if self._unhealthy.get(b, 0.0) <= now]
+            if not healthy:
+                return None
+            return healthy[next(self._round_robin) % len(healthy)]
+
+    def put(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        body_factory: Callable[[], Iterable[bytes]],
+        auth: Tuple[str, str],
+        timeout: int,
+    ) -> Tuple[requests.Response, int]:
+        """
+        PUT a streamed Stream Load body over the keep-alive session.
+
+        Same contract as stream_load_body.put_stream_body; url is the FE
+        Stream Load URL and is rewritten to a BE when direct routing is on.
+
+        Returns:
+            Tuple of (response, bytes_sent)
+        """
+        backend = None
+        if self.direct_to_be:
+            self._refresh_backends()
+            backend = self._next_backend()
+        if backend is not None:
+            be_url = urlunparse(urlparse(url)._replace(netloc=backend))
+            try:
+                return put_stream_body(
+                    be_url,
+                    headers,
+                    body_factory,
+                    auth,
+                    timeout,
+                    session=self.session,
+                    probe=False,
+                )
+            except requests.exceptions.ConnectionError:
+                # BE unreachable: skip it for a while and go through the FE
+                self.mark_unhealthy(backend)
+
+        return put_stream_body(
+            url,
+            headers,
+            body_factory,
+            auth,
+            timeout,
+            session=self.session,
+            on_redirect=self.remember_backend if self.direct_to_be else None,
+        )
+
+    def close(self):
+        self.session.close()
+
+
+_TRANSPORTS: Dict[Tuple, StreamLoadTransport] = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def get_stream_load_transport(
+    host: str,
+    http_port: int,
+    direct_to_be: bool = False,
+    backends: Optional[List[str]] = None,
+) -> StreamLoadTransport:
+    """
+    Get the process-wide Stream Load transport for a StarRocks FE.
+
+    Args:
+        host: FE host
+        http_port: FE HTTP port
+        direct_to_be: Round-robin chunks directly across BEs
+        backends: Optional configured BE endpoints ("host:port")
+
+    Returns:
+        Shared StreamLoadTransport
+    """
+    key = (host, int(http_port), bool(direct_to_be), tuple(backends or ()))
+    with _TRANSPORTS_LOCK:
+        transport = _TRANSPORTS.get(key)
+        if transport is None:
+            transport = StreamLoadTransport(direct_to_be=direct_to_be, backends=backends)
+            _TRANSPORTS[key] = transport
+        return transport
@@ -0,0 +1,179 @@
+"""
+Shadow Table Swap Loading
+
+Full reloads without a read-availability gap. Instead of TRUNCATE → load
+(dashboards see an empty or half-loaded table for the whole load window), the
+data is Stream Loaded into a shadow copy of the table, its row count is
+verified, and the shadow is swapped in atomically:
+
+    CREATE TABLE dim_material__shadow_1760600000_a1b2c3 LIKE dim_material
+    -- Stream Load into the shadow at full parallelism --
+    SELECT COUNT(*) FROM dim_material__shadow_1760600000_a1b2c3     -- verify
+    ALTER TABLE dim_material SWAP WITH dim_material__shadow_1760600000_a1b2c3
+    DROP TABLE dim_material__shadow_1760600000_a1b2c3 FORCE         -- old data
+
+If the load or the verification fails, the shadow is dropped and the live
+table is left untouched.
+
+Every reload gets its own shadow ({table}__shadow_{epoch}_{random}), so two
+reloads of one table never load into or drop each other's shadow. Shadows a
+crashed run left behind are swept once they are older than
+SHADOW_MAX_AGE_SECONDS (sweep_stale_shadow_tables, called by
+create_shadow_table).
+"""
+
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.loaders.connection_pool import StarRocksConnectionPool
+
+# Suffix of shadow tables (kept short: StarRocks table names are limited to 64 chars)
+SHADOW_SUFFIX = "__shadow"
+
+# Shadows older than this are leftovers of a crashed run (a load times out
+# after 30 minutes, so a live reload never gets near it)
+SHADOW_MAX_AGE_SECONDS = 6 * 3600
+
+
+def shadow_table_name(table_name: str, created_at: Optional[float] = None) -> str:
+    """
+    Unique name of a shadow table used to reload table_name.
+
+    Args:
+        table_name: Live table
+        created_at: Creation time (epoch seconds, default now); encoded in the
+                    name so stale shadows can be swept
+
+    Returns:
+        {table_name}__shadow_{epoch}_{6 hex chars}
+    """
+    created_at = int(time.time() if created_at is None else created_at)
+    return f"{table_name}{SHADOW_SUFFIX}_{created_at}_{uuid.uuid4().hex[:6]}"
+
+
+def _shadow_pattern(table_name: str) -> "re.Pattern":
+    return re.compile(rf"^{re.escape(table_name + SHADOW_SUFFIX)}_(\d+)_[0-9a-f]+$", re.IGNORECASE)
+
+
+def sweep_stale_shadow_tables(
+    pool: StarRocksConnectionPool,
+    table_name: str,
+    max_age_seconds: int = SHADOW_MAX_AGE_SECONDS,
+) -> List[str]:
+    """
+    Drop shadows of table_name left behind by runs that died before cleaning up.
+
+    Shadows younger than max_age_seconds may belong to a reload still in
+    progress and are kept.
+
+    Args:
+        pool: Connection pool for the table's database
+        table_name: Live table
+        max_age_seconds: Minimum age of a shadow to drop
+
+    Returns:
+        Names of the dropped shadow tables
+    """
+    pattern = _shadow_pattern(table_name)
+    with pool.acquire() as conn, conn.cursor() as cursor:
+        cursor.execute(f"SHOW TABLES LIKE '{table_name}{SHADOW_SUFFIX}%'")
+        names = [row[0] for row in cursor.fetchall()]
+
+    cutoff = time.time() - max_age_seconds
+    dropped = []
+    for name in names:
+        match = pattern.match(name)
+        if match is None:
+            continue
+        if int(match.group(1)) > cutoff:
+            continue
+        drop_table(pool, name)
+        dropped.append(name)
+    return dropped
+
+
+def drop_table(pool: StarRocksConnectionPool, table_name: str):
+    """DROP TABLE IF EXISTS ... FORCE (no recycle bin)."""
+    with pool.acquire() as conn, conn.cursor() as cursor:
+        cursor.execute(f"DROP TABLE IF EXISTS {table_name} FORCE")
+
+
+def create_shadow_table(pool: StarRocksConnectionPool, table_name: str) -> str:
+    """
+    Create an empty shadow copy of a table (same schema, keys, partitions, buckets).
+
+    Stale shadows of earlier failed runs are swept first
+    (sweep_stale_shadow_tables); shadows of reloads still running are kept.
+
+    Args:
+        pool: Connection pool for the table's database
+        table_name: Live table
+
+    Returns:
+        Shadow table name (unique to this reload)
+    """
+    sweep_stale_shadow_tables(pool, table_name)
+    shadow = shadow_table_name(table_name)
+    with pool.acquire() as conn, conn.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {shadow} LIKE {table_name}")
+    return shadow
+
+
+def count_rows(pool: StarRocksConnectionPool, table_name: str) -> int:
+    """SELECT COUNT(*) of a table."""
+    with pool.acquire() as conn, conn.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        return int(cursor.fetchone()[0])
+
+
+def swap_shadow_table(
+    pool: StarRocksConnectionPool,
+    table_name: str,
+    shadow: str,
+    expected_rows: Optional[int] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Verify a loaded shadow table and swap it in place of the live table.
+
+    Args:
+        pool: Connection pool for the table's database
+        table_name: Live table
+        shadow: Loaded shadow table
+        expected_rows: Row count the shadow must have (None = skip the check)
+
+    Returns:
+        Tuple of (success, result_dict) with shadow_rows, previous_rows and
+        swap_seconds. On failure the shadow is dropped and the live table is
+        unchanged.
+    """
+    result: Dict[str, Any] = {"table": table_name, "shadow": shadow}
+    try:
+        result["shadow_rows"] = count_rows(pool, shadow)
+        if expected_rows is not None and result["shadow_rows"] != expected_rows:
+            result["error"] = (
+                f"Row count mismatch: {shadow} has {result['shadow_rows']:,} rows, "
+                f"expected {expected_rows:,}"
+            )
+            drop_table(pool, shadow)
+            return False, result
+
+        result["previous_rows"] = count_rows(pool, table_name)
+
+        start = time.time()
+        with pool.acquire() as conn, conn.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {table_name} SWAP WITH {shadow}")
+        result["swap_seconds"] = time.time() - start
+
+        # After the swap the shadow name holds the previous data
+        drop_table(pool, shadow)
+        return True, result
+
+    except Exception as e:
+        result["error"] = str(e)
+        try:
+            drop_table(pool, shadow)
+        except Exception:
+            pass
+        return False, result
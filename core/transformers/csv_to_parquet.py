@@ -1,6 +1,7 @@
 from pathlib import Path
 import re
 import shutil
+import sys
 import polars as pl
 import asyncio
 import time
@@ -10,6 +11,22 @@ init(autoreset=True)
 
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.blob_processor_utils import gzip_csv_to_parquet  # noqa: E402
+from utils.parquet_index import write_parquet_index  # noqa: E402
+
+RAW_FILE_PATTERNS = ("**/*.csv", "**/*.csv.gz")
+
+
+def list_raw_files(raw_dir):
+    """CSV files to convert, plain or gzip-compressed"""
+    return sorted(f for pattern in RAW_FILE_PATTERNS for f in raw_dir.glob(pattern))
+
+
+def csv_file_stem(path):
+    """File name without .csv / .csv.gz"""
+    return Path(path.stem).stem if path.suffix.lower() == ".gz" else path.stem
 
 
 def get_size_format(bytes):
@@ -26,7 +43,7 @@ async def process_single_file(path):
         output_dir = PROJECT_ROOT / "data" / "data_historical" / "raw_parquets"
         output_dir.mkdir(exist_ok=True, parents=True)
 
-        file_name = path.stem
+        file_name = csv_file_stem(path)
         if "FactInvoiceDetails" in file_name:
             match = re.match(r"(FactInvoiceDetails(?:_\d+){1,2})_", file_name)
             cleaned_file_name = match.group(1) if match else file_name.split("_")[0]
@@ -53,25 +70,44 @@ async def process_single_file(path):
         for attempt in range(3):
             try:
                 print(f"{Fore.CYAN}Processing {path.name} - Attempt {attempt + 1}{Style.RESET_ALL}")
-                df_stream = pl.scan_csv(
-                    path,
-                    schema_overrides={"": pl.Utf8},
-                    infer_schema_length=0,
-                    rechunk=True,
-                    low_memory=False,
-                )
-
-                if "FactInvoiceSecondary" in cleaned_file_name:
-                    df_stream = df_stream.with_columns(pl.col("invoicedate").cast(pl.Int32)).filter(
-                        pl.col("invoicedate") > 20230331
+                if path.suffix.lower() == ".gz":
+                    # Decompress and convert in one streaming pass, no plain CSV on disk
+                    filter_column = None
+                    if "FactInvoiceSecondary" in cleaned_file_name:
+                        filter_column = "invoicedate"
+                    elif "FactInvoiceDetails" in cleaned_file_name:
+                        filter_column = "postingdate"
+                    await asyncio.to_thread(
+                        gzip_csv_to_parquet,
+                        path,
+                        parquet_file,
+                        filter_column,
+                        null_values=(),
+                        row_group_size=100000,
                     )
-
-                elif "FactInvoiceDetails" in cleaned_file_name:
-                    df_stream = df_stream.with_columns(pl.col("postingdate").cast(pl.Int32)).filter(
-                        pl.col("postingdate") > 20230331
+                else:
+                    df_stream = pl.scan_csv(
+                        path,
+                        schema_overrides={"": pl.Utf8},
+                        infer_schema_length=0,
+                        rechunk=True,
+                        low_memory=False,
                     )
 
-                await asyncio.to_thread(df_stream.sink_parquet, parquet_file, row_group_size=100000)
+                    if "FactInvoiceSecondary" in cleaned_file_name:
+                        df_stream = df_stream.with_columns(
+                            pl.col("invoicedate").cast(pl.Int32)
+                        ).filter(pl.col("invoicedate") > 20230331)
+
+                    elif "FactInvoiceDetails" in cleaned_file_name:
+                        df_stream = df_stream.with_columns(
+                            pl.col("postingdate").cast(pl.Int32)
+                        ).filter(pl.col("postingdate") > 20230331)
+
+                    await asyncio.to_thread(
+                        df_stream.sink_parquet, parquet_file, row_group_size=100000
+                    )
+                    await asyncio.to_thread(write_parquet_index, parquet_file)
 
                 new_size = parquet_file.stat().st_size
                 compression_ratio = (1 - new_size / raw_size) * 100
@@ -108,9 +144,7 @@ def display_menu():
 
 async def select_files_to_convert():
     try:
-        csv_files = list(
-            (PROJECT_ROOT / "data" / "data_historical" / "raw").glob("**/*.csv")
-        )
+        csv_files = list_raw_files(PROJECT_ROOT / "data" / "data_historical" / "raw")
         if not csv_files:
             print(
                 f"{Fore.RED}No CSV files found in data/data_historical/raw{Style.RESET_ALL}"
@@ -140,15 +174,13 @@ async def select_files_to_convert():
 
 async def find_missing_files():
     try:
-        csv_files = list(
-            (PROJECT_ROOT / "data" / "data_historical" / "raw").glob("**/*.csv")
-        )
+        csv_files = list_raw_files(PROJECT_ROOT / "data" / "data_historical" / "raw")
         output_dir = PROJECT_ROOT / "data" / "data_historical" / "raw_parquets"
         output_dir.mkdir(exist_ok=True, parents=True)
 
         missing_files = []
         for path in csv_files:
-            file_name = path.stem
+            file_name = csv_file_stem(path)
             if "FactInvoiceDetails" in file_name:
                 match = re.match(r"(FactInvoiceDetails(?:_\d+){1,2})_", file_name)
                 cleaned_file_name = match.group(1) if match else file_name.split("_")[0]
@@ -197,9 +229,7 @@ async def main():
                 if raw_parquets_dir.exists():
                     await asyncio.to_thread(shutil.rmtree, raw_parquets_dir)
 
-                csv_files = list(
-                    (PROJECT_ROOT / "data" / "data_historical" / "raw").glob("**/*.csv")
-                )
+                csv_files = list_raw_files(PROJECT_ROOT / "data" / "data_historical" / "raw")
                 print(f"{Fore.CYAN}Found {len(csv_files)} CSV files to process{Style.RESET_ALL}")
                 await process_files(csv_files)
             except Exception as e:
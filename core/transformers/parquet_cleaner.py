@@ -4,7 +4,7 @@ import asyncio
 from pathlib import Path
 import polars as pl
 import time
-from typing import List
+from typing import Dict, List, Union
 import sys
 from datetime import datetime
 
@@ -17,20 +17,32 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from utils.schema_validator import SchemaValidator  # noqa: E402
+from utils.pipeline_config import Config  # noqa: E402
 
 # Import centralized transformation engine
 from core.transformers.transformation_engine import (  # noqa: E402
     validate_and_transform_dataframe as centralized_validate_and_transform,
+    get_legacy_validator,
     get_table_name_from_file,
 )
+from utils.parquet_index import footer_column_stats, write_parquet_index  # noqa: E402
+from utils.chunk_planner import memory_budget, plan_cleaning  # noqa: E402
 
+# Rows per row group in cleaned parquet files
+ROW_GROUP_SIZE = 100000
 
-def validate_parquet_schema(df: pl.DataFrame, table_name: str) -> bool:
+
+def validate_parquet_schema(
+    df: Union[pl.DataFrame, Dict[str, pl.DataType]], table_name: str
+) -> bool:
     """
     Validate that cleaned parquet column types match database schema.
 
+    Only column types are compared, so a schema read from the parquet footer
+    (pl.read_parquet_schema) is enough - the data is never read back.
+
     Args:
-        df: Cleaned parquet dataframe
+        df: Cleaned parquet dataframe, or its schema ({column: dtype})
         table_name: Database table name
 
     Returns:
@@ -66,9 +78,10 @@ def validate_parquet_schema(df: pl.DataFrame, table_name: str) -> bool:
     }
 
     # Check each column
+    schema = df.schema if isinstance(df, pl.DataFrame) else df
     mismatches = []
-    for col_name in df.columns:
-        parquet_type = str(df[col_name].dtype)
+    for col_name, dtype in schema.items():
+        parquet_type = str(dtype)
         expected_sql_type = db_schema.get(col_name, "UNKNOWN")
 
         # Extract base type from Polars
@@ -116,233 +129,152 @@ def validate_parquet_schema(df: pl.DataFrame, table_name: str) -> bool:
         return True
 
 
-def determine_chunk_size(file_size_mb):
+def validate_streamed_output(
+    source_file: Path, output_file: Path, table_name: str, metadata: Dict
+) -> None:
     """
-    Determine chunk size based on file size - optimized for 64GB RAM system.
+    Data checks for a streamed (never collected) cleaned file.
+
+    - Conversion failures: NULLs added by cleaning string columns to numbers or
+      dates (output null_count - input null_count, from the parquet footers)
+      must stay within 10% of rows
+    - Type mismatches and numeric overflows: detect_data_overflows on a profile
+      of the output (VARCHAR byte lengths, integer min/max) computed by one
+      streaming aggregate
+    - Schema changes (VARCHAR expansions, type upgrades) are logged from the
+      same profile, as the in-memory transform does; they are added to
+      metadata["schema_changes"]
 
-    Strategy:
-    - Large files (>5GB): Use smaller chunks to avoid memory spike
-    - Medium files (1-5GB): Larger chunks for better throughput
-    - Small files (<1GB): Process in single pass for speed
+    Raises:
+        ValueError: If a check fails (same rules as the in-memory transform)
     """
-    if file_size_mb > 5000:  # > 5GB - be conservative
-        return 500000  # 500K records per chunk
-    elif file_size_mb > 2000:  # 2-5GB
-        return 1000000  # 1M records per chunk
-    elif file_size_mb > 1000:  # 1-2GB
-        return 5000000  # 2M records per chunk
-    elif file_size_mb > 500:  # 500MB-1GB
-        return 3000000  # 3M records per chunk
-    elif file_size_mb > 100:  # 100MB-500MB
-        return 5000000  # 5M records per chunk
-    else:
-        return None  # Process entire file at once (< 100MB)
-
-
-async def process_large_file_chunked(parquet_file, output_dir, chunk_size):
-    """Process large files in chunks with optimized memory usage - streaming approach"""
-    try:
-        start_time = time.time()
-        print(f"\n{Fore.CYAN}Processing large file in chunks: {parquet_file}{Style.RESET_ALL}")
-
-        # Get table name from file
-        table_name = get_table_name_from_file(parquet_file.stem)
-
-        # Read file lazily
-        lf = pl.scan_parquet(parquet_file)
-        total_rows = lf.select(pl.len()).collect().item()
-
-        print(f"{Fore.CYAN}Total rows: {total_rows}, Chunk size: {chunk_size}{Style.RESET_ALL}")
-
-        # Prepare output path
-        output_path = output_dir / parquet_file.name
-        if output_path.exists():
-            output_path.unlink()
-
-        # Create temporary directory for chunks
-        temp_dir = output_dir / f"temp_{parquet_file.stem}_{int(time.time())}"
-        temp_dir.mkdir(exist_ok=True)
-
-        try:
-            chunk_files = []
-
-            # Process all chunks first
-            for i in range(0, total_rows, chunk_size):
-                chunk_num = i // chunk_size + 1
-                print(
-                    f"{Fore.CYAN}Processing chunk {chunk_num}/{(total_rows + chunk_size - 1) // chunk_size}{Style.RESET_ALL}"
-                )
-
-                # Process chunk
-                df_chunk = lf.slice(i, chunk_size).collect()
-
-                # Apply validation
-                df_chunk = await validate_and_transform_dataframe(df_chunk, table_name)
-
-                # Save chunk to temp directory
-                chunk_file = temp_dir / f"chunk_{chunk_num:06d}.parquet"
-                df_chunk.write_parquet(chunk_file)
-                chunk_files.append(chunk_file)
-
-                # Clear chunk from memory immediately
-                del df_chunk
-
-            # Now combine all chunks using lazy evaluation
-            print(
-                f"{Fore.CYAN}Combining {len(chunk_files)} chunks using streaming{Style.RESET_ALL}"
-            )
-
-            if chunk_files:
-                # Use lazy scanning for memory efficiency
-                lazy_frames = [pl.scan_parquet(chunk_file) for chunk_file in chunk_files]
-                combined_lf = pl.concat(lazy_frames)
-
-                # Stream write the final result
-                combined_lf.sink_parquet(output_path)
-
-            elapsed_time = time.time() - start_time
-            print(
-                f"{Fore.GREEN}Written chunked parquet to {output_path} in {elapsed_time:.2f} seconds{Style.RESET_ALL}"
+    _, source_stats = footer_column_stats(source_file)
+    num_rows, output_stats = footer_column_stats(output_file)
+
+    source_names = {db: parquet for parquet, db in metadata.get("column_renames", {}).items()}
+    for output_col, plan_col in metadata.get("cleaned_columns", {}).items():
+        source_col = source_names.get(plan_col, plan_col)
+        before = source_stats.get(source_col, {}).get("null_count")
+        after = output_stats.get(output_col, {}).get("null_count")
+        if before is None or after is None or after <= before:
+            continue
+        failed = after - before
+        if failed > num_rows * 0.1:
+            raise ValueError(
+                f"Too many conversion failures for {output_col}: {failed} out of {num_rows} rows "
+                f"({failed / num_rows:.1%})"
             )
-
-        finally:
-            # Clean up temporary directory
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
-
-    except Exception as e:
-        print(f"{Fore.RED}Error processing chunked file {parquet_file}: {e}{Style.RESET_ALL}")
-        raise
-
-
-async def process_large_file_chunked_optimized(parquet_file, output_dir, chunk_size):
-    """Most memory-efficient approach with progressive combining"""
-    try:
-        start_time = time.time()
         print(
-            f"\n{Fore.CYAN}Processing large file in chunks (optimized): {parquet_file}{Style.RESET_ALL}"
+            f"{Fore.YELLOW}Warning: {failed} values in {output_col} could not be converted "
+            f"(set to null){Style.RESET_ALL}"
         )
 
-        # Get table name from file
-        table_name = get_table_name_from_file(parquet_file.stem)
-
-        # Read file lazily
-        lf = pl.scan_parquet(parquet_file)
-        total_rows = lf.select(pl.len()).collect().item()
-
-        print(f"{Fore.CYAN}Total rows: {total_rows}, Chunk size: {chunk_size}{Style.RESET_ALL}")
-
-        # Prepare output path
-        output_path = output_dir / parquet_file.name
-        if output_path.exists():
-            output_path.unlink()
-
-        # Create temporary directory for chunks
-        temp_dir = output_dir / f"temp_{parquet_file.stem}_{int(time.time())}"
-        temp_dir.mkdir(exist_ok=True)
-
-        try:
-            chunk_files = []
-            merge_threshold = 5  # Merge every 5 chunks to keep memory low
-
-            # Process chunks with progressive merging
-            for i in range(0, total_rows, chunk_size):
-                chunk_num = i // chunk_size + 1
-                print(
-                    f"{Fore.CYAN}Processing chunk {chunk_num}/{(total_rows + chunk_size - 1) // chunk_size}{Style.RESET_ALL}"
-                )
-
-                # Process chunk
-                df_chunk = lf.slice(i, chunk_size).collect()
-
-                # Apply validation
-                df_chunk = await validate_and_transform_dataframe(df_chunk, table_name)
-
-                # Save chunk to temp directory
-                chunk_file = temp_dir / f"chunk_{chunk_num:06d}.parquet"
-                df_chunk.write_parquet(chunk_file)
-                chunk_files.append(chunk_file)
-
-                # Clear chunk from memory immediately
-                del df_chunk
-
-                # Progressive merging to keep chunk count manageable
-                if len(chunk_files) >= merge_threshold:
-                    print(
-                        f"{Fore.CYAN}Merging {len(chunk_files)} intermediate chunks{Style.RESET_ALL}"
-                    )
-                    merged_file = await _merge_chunks_efficiently(chunk_files, temp_dir)
-                    chunk_files = [merged_file]
-
-            # Final combination
-            print(f"{Fore.CYAN}Final combination of {len(chunk_files)} chunks{Style.RESET_ALL}")
+    validator = get_legacy_validator()
+    output_schema = pl.read_parquet_schema(output_file)
+    profile = validator.profile_lazyframe(pl.scan_parquet(output_file), table_name)
+    overflows = validator.detect_data_overflows(
+        pl.DataFrame(schema=output_schema), table_name, profile=profile
+    )
+    errors = [
+        f"Column '{m['column']}': Expected {m['schema_type']}, got {m['data_type']}"
+        for m in overflows.get("type_mismatches", [])
+    ] + [
+        f"Column '{o['column']}' ({o['schema_type']}): Data range [{o['min']}, {o['max']}] "
+        f"exceeds type range {o['range']}"
+        for o in overflows.get("numeric_overflows", [])
+    ]
+    if errors:
+        raise ValueError(f"Data validation failed for {table_name}:\n" + "\n".join(errors))
+
+    changes = validator.log_profile_schema_changes(output_schema, table_name, profile)
+    metadata.setdefault("schema_changes", []).extend(changes)
+
+
+async def process_large_file_streaming(parquet_file, output_dir):
+    """
+    Clean a large file as one streaming plan: scan_parquet → lazy transform → sink_parquet.
 
-            if len(chunk_files) == 1:
-                # Just move the single file
-                shutil.move(str(chunk_files[0]), str(output_path))
-            else:
-                # Combine remaining chunks
-                lazy_frames = [pl.scan_parquet(chunk_file) for chunk_file in chunk_files]
-                combined_lf = pl.concat(lazy_frames)
-                combined_lf.sink_parquet(output_path)
+    The file is never fully in memory and no temp chunk files are written;
+    the plan is sunk to a hidden file next to the output, checked from its
+    footer and one streaming aggregate, then renamed into place. If the plan
+    cannot run in streaming mode (e.g. a strict cast fails), the file is
+    cleaned in memory instead.
 
-            elapsed_time = time.time() - start_time
-            print(
-                f"{Fore.GREEN}Written optimized chunked parquet to {output_path} in {elapsed_time:.2f} seconds{Style.RESET_ALL}"
-            )
+    The Polars morsel size is process-global and set by process_batch for
+    all files cleaned at the same time.
+    """
+    start_time = time.time()
+    print(f"\n{Fore.CYAN}Processing large file (streaming): {parquet_file}{Style.RESET_ALL}")
 
-        finally:
-            # Clean up temporary directory
-            if temp_dir.exists():
-                shutil.rmtree(temp_dir)
+    table_name = get_table_name_from_file(parquet_file.stem)
+    output_path = output_dir / parquet_file.name
+    tmp_path = output_dir / f".{parquet_file.name}.streaming"
 
+    try:
+        plan, metadata = centralized_validate_and_transform(
+            pl.scan_parquet(parquet_file), table_name, None, collect=False
+        )
+        await asyncio.to_thread(plan.sink_parquet, tmp_path, row_group_size=ROW_GROUP_SIZE)
     except Exception as e:
+        if tmp_path.exists():
+            tmp_path.unlink()
         print(
-            f"{Fore.RED}Error processing optimized chunked file {parquet_file}: {e}{Style.RESET_ALL}"
+            f"{Fore.YELLOW}⚠️  Streaming plan failed ({e}), cleaning in memory instead"
+            f"{Style.RESET_ALL}"
         )
-        raise
+        await process_file_in_memory(parquet_file, output_path, table_name)
+        return
 
+    try:
+        validate_streamed_output(parquet_file, tmp_path, table_name, metadata)
+        os.replace(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
 
-async def _merge_chunks_efficiently(chunk_files, temp_dir):
-    """Efficiently merge chunks using lazy evaluation"""
-    if len(chunk_files) <= 1:
-        return chunk_files[0] if chunk_files else None
+    elapsed_time = time.time() - start_time
+    print(
+        f"{Fore.GREEN}Written streamed parquet to {output_path} in {elapsed_time:.2f} seconds{Style.RESET_ALL}"
+    )
 
-    # Use lazy frames for memory efficiency
-    lazy_frames = [pl.scan_parquet(chunk_file) for chunk_file in chunk_files]
-    combined_lf = pl.concat(lazy_frames)
 
-    # Create merged file
-    merged_file = temp_dir / f"merged_{int(time.time() * 1000000)}.parquet"
-    combined_lf.sink_parquet(merged_file)
+async def process_file_in_memory(parquet_file, output_path, table_name):
+    """Read, transform and write a file in one DataFrame (small files)"""
+    start_time = time.time()
+    df = pl.read_parquet(parquet_file)
+    print(f"{Fore.GREEN}Read {parquet_file} successfully{Style.RESET_ALL}")
 
-    # Clean up individual chunks
-    for chunk_file in chunk_files:
-        try:
-            chunk_file.unlink()
-        except Exception:
-            pass  # Ignore cleanup errors
+    # Apply validation
+    df = await validate_and_transform_dataframe(df, table_name)
 
-    return merged_file
+    if output_path.exists():
+        output_path.unlink()
+    df.write_parquet(output_path, row_group_size=ROW_GROUP_SIZE)
+
+    elapsed_time = time.time() - start_time
+    print(
+        f"{Fore.GREEN}Written cleaned parquet to {output_path} in {elapsed_time:.2f} seconds{Style.RESET_ALL}"
+    )
 
 
 def configure_polars_for_low_memory():
     """
-    Configure Polars for memory-efficient operations on 64GB RAM system.
+    Configure Polars for memory-efficient operations.
 
     Optimizations:
     - Use all available CPU cores (parallelism)
-    - Larger streaming chunks for better throughput
-    - Increased memory budget for better performance
+    - Streaming engine for large files (morsel size is set per file by the
+      cleaning plan, from the memory budget)
     """
-    # Set larger streaming chunk size for better performance with 64GB RAM
-    pl.Config.set_streaming_chunk_size(100000)  # 100K rows per chunk (up from 25K)
-
     # Use all CPU cores for maximum parallelism
     cpu_count = os.cpu_count()
     os.environ["POLARS_MAX_THREADS"] = str(cpu_count)
 
-    print(f"{Fore.CYAN}Polars configured for {cpu_count} CPU cores with 64GB RAM{Style.RESET_ALL}")
+    budget, source = memory_budget(Config.MEMORY_BUDGET_MB)
+    print(
+        f"{Fore.CYAN}Polars configured for {cpu_count} CPU cores, "
+        f"memory budget {budget / 1024 / 1024 / 1024:.1f}GB ({source}){Style.RESET_ALL}"
+    )
 
     # Enable streaming engine for memory efficiency
     try:
@@ -374,67 +306,65 @@ async def validate_and_transform_dataframe(df: pl.DataFrame, table_name: str) ->
     return transformed_df
 
 
-async def process_parquet_file(parquet_file, output_dir):
+async def process_parquet_file(parquet_file, output_dir, plan=None):
+    """Clean one raw parquet file (plan: its CleaningPlan, computed if not given)"""
     try:
-        start_time = time.time()
         print(parquet_file)
         print(f"\n{Fore.CYAN}Processing file: {parquet_file}{Style.RESET_ALL}")
 
         # Get table name from file
         table_name = get_table_name_from_file(parquet_file.stem)
-
-        # Check file size for chunking decision
-        file_size_mb = parquet_file.stat().st_size / (1024 * 1024)
-        chunk_size = determine_chunk_size(file_size_mb)
-
-        if chunk_size:
-            print(
-                f"{Fore.CYAN}File size: {file_size_mb:.2f}MB - Using optimized chunked processing{Style.RESET_ALL}"
-            )
-            # Use the optimized version instead
-            await process_large_file_chunked_optimized(parquet_file, output_dir, chunk_size)
-            return
-
-        # Regular processing for smaller files
-        print(
-            f"{Fore.CYAN}File size: {file_size_mb:.2f}MB - Using regular processing{Style.RESET_ALL}"
-        )
-
-        df = pl.read_parquet(parquet_file)
-        print(f"{Fore.GREEN}Read {parquet_file} successfully{Style.RESET_ALL}")
-
-        # Apply validation
-        df = await validate_and_transform_dataframe(df, table_name)
-
         output_path = output_dir / parquet_file.name
-        if output_path.exists():
-            output_path.unlink()
-        df.write_parquet(output_path)
-
-        elapsed_time = time.time() - start_time
-        print(
-            f"{Fore.GREEN}Written cleaned parquet to {output_path} in {elapsed_time:.2f} seconds{Style.RESET_ALL}"
-        )
 
-        # Validate schema of cleaned parquet
-        df_written = pl.read_parquet(output_path)
-        if not validate_parquet_schema(df_written, table_name):
+        # Files whose in-memory cleaning would not fit the memory budget are streamed
+        if plan is None:
+            plan = plan_cleaning(parquet_file, memory_budget_mb=Config.MEMORY_BUDGET_MB)
+        print(f"{Fore.CYAN}{plan.describe()}{Style.RESET_ALL}")
+        if plan.in_memory:
+            await process_file_in_memory(parquet_file, output_path, table_name)
+        else:
+            await process_large_file_streaming(parquet_file, output_dir)
+
+        # Validate schema of cleaned parquet (footer only, the data is not read back)
+        if not validate_parquet_schema(pl.read_parquet_schema(output_path), table_name):
             raise ValueError(
                 f"Schema validation failed for {table_name}: Parquet types don't match database schema"
             )
 
+        # Row-group statistics sidecar for the loaders (date ranges, skip-scans)
+        write_parquet_index(output_path)
+
     except Exception as e:
         print(f"{Fore.RED}Error processing {parquet_file}: {e}{Style.RESET_ALL}")
         raise
 
 
 async def process_batch(files, output_dir, semaphore):
+    """
+    Clean a batch of files concurrently.
+
+    Polars' streaming chunk size is process-global, so it is set once for the
+    whole batch (not per file, where concurrent files would overwrite each
+    other's): the smallest morsel any streamed file's plan asks for, which
+    keeps every streamed file within its memory estimate.
+    """
     async with semaphore:
-        tasks = []
+        plans = []
         for file in files:
-            task = asyncio.create_task(process_parquet_file(file, output_dir))
-            tasks.append(task)
-        return await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                plans.append(plan_cleaning(file, memory_budget_mb=Config.MEMORY_BUDGET_MB))
+            except Exception:
+                plans.append(None)  # process_parquet_file re-plans and reports the error
+
+        streamed = [plan.streaming_chunk_rows for plan in plans if plan and not plan.in_memory]
+        config = {"streaming_chunk_size": min(streamed)} if streamed else {}
+
+        with pl.Config(**config):
+            tasks = []
+            for file, plan in zip(files, plans):
+                task = asyncio.create_task(process_parquet_file(file, output_dir, plan))
+                tasks.append(task)
+            return await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def display_file_menu(files: List[Path]) -> List[int]:
@@ -551,11 +481,10 @@ async def main():
                         print(
                             f"{Fore.CYAN}Processing file {idx} of {len(selected_indices)}: {selected_file.name}{Style.RESET_ALL}"
                         )
-                        try:
-                            await process_parquet_file(selected_file, clean_dir)
-                        except Exception as e:
+                        (result,) = await process_batch([selected_file], clean_dir, semaphore)
+                        if isinstance(result, Exception):
                             print(
-                                f"{Fore.RED}Error processing {selected_file.name}: {e}{Style.RESET_ALL}"
+                                f"{Fore.RED}Error processing {selected_file.name}: {result}{Style.RESET_ALL}"
                             )
 
                 elif choice == 3:
@@ -10,14 +10,16 @@ Supports both legacy (single-tenant) and multi-tenant modes:
 
 Core Functions:
 - validate_and_transform_dataframe: Complete transformation with validation
+  (eager DataFrame, or LazyFrame: one plan collected once with predicate pushdown)
 - detect_data_overflows: Check for type mismatches and overflows
 - apply_column_mappings: Map parquet columns to database columns
 """
 
 import sys
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple, Optional, TYPE_CHECKING
+from typing import Dict, List, Tuple, Optional, Union, TYPE_CHECKING
 from datetime import datetime
 
 import polars as pl
@@ -30,14 +32,33 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from utils.schema_validator import SchemaValidator  # noqa: E402
+from utils.dim_transform_utils import apply_type_conversions  # noqa: E402
 
 # Legacy paths (backward compatibility)
 SCHEMAS_DIR = Path(__file__).parent.parent.parent / "db" / "schemas"
 COLUMN_MAPPINGS_DIR = Path(__file__).parent.parent.parent / "db" / "column_mappings"
 COMPUTED_COLUMNS_FILE = Path(__file__).parent.parent.parent / "db" / "computed_columns.json"
 
-# Initialize legacy validator (backward compatibility)
-validator = SchemaValidator.from_schema_files(SCHEMAS_DIR, COLUMN_MAPPINGS_DIR)
+
+def get_legacy_validator() -> SchemaValidator:
+    """Validator for db/schemas (compiled once per process, fresh schema changes per call)"""
+    return SchemaValidator.cached(SCHEMAS_DIR, COLUMN_MAPPINGS_DIR, cache_key="legacy")
+
+
+@lru_cache(maxsize=None)
+def _has_schema_files(schemas_dir: Path) -> bool:
+    """True if a tenant schema directory holds schema files (checked once per process)"""
+    if not schemas_dir.exists():
+        return False
+    return any(f.name != "__init__.py" for f in schemas_dir.rglob("*.py"))
+
+
+def __getattr__(name: str):
+    # Legacy module-level `validator` (backward compatibility), now built lazily
+    if name == "validator":
+        return get_legacy_validator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Legacy computed columns config (backward compatibility)
 def load_computed_columns_config(computed_columns_file: Path = None) -> Dict:
@@ -61,6 +82,13 @@ def load_computed_columns_config(computed_columns_file: Path = None) -> Dict:
 COMPUTED_COLUMNS_CONFIG = load_computed_columns_config()
 
 
+def _frame_columns(df: Union[pl.DataFrame, pl.LazyFrame]) -> List[str]:
+    """Column names of a DataFrame or LazyFrame (schema only, nothing is computed)"""
+    if isinstance(df, pl.LazyFrame):
+        return df.collect_schema().names()
+    return df.columns
+
+
 def get_table_name_from_file(file_stem: str) -> str:
     """Map parquet filename to database table name."""
     # Comprehensive mapping for all PascalCase filenames to snake_case table names
@@ -94,11 +122,11 @@ def get_table_name_from_file(file_stem: str) -> str:
 
 
 def generate_computed_columns(
-    df: pl.DataFrame,
+    df: Union[pl.DataFrame, pl.LazyFrame],
     table_name: str,
     tenant_config: Optional['TenantConfig'] = None,
     logger=None
-) -> pl.DataFrame:
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """
     Generate computed columns for a dataframe before validation.
 
@@ -106,7 +134,7 @@ def generate_computed_columns(
     Supports both legacy and multi-tenant modes.
 
     Args:
-        df: Input Polars DataFrame
+        df: Input Polars DataFrame (or LazyFrame: columns are added to the plan)
         table_name: Database table name (e.g., 'fact_invoice_secondary')
         tenant_config: Optional TenantConfig for multi-tenant mode
         logger: Optional logger instance
@@ -152,6 +180,7 @@ def generate_computed_columns(
     computed_cols = computed_cols_config[table_name]
     generated_cols = []
     failed_cols = []
+    available_columns = set(_frame_columns(df))
 
     for col_name, col_config in computed_cols.items():
         col_type = col_config.get("type")
@@ -164,7 +193,7 @@ def generate_computed_columns(
             separator = col_config.get("separator", "")
 
             # Check if all required columns exist
-            missing_cols = [c for c in cols_to_concat if c not in df.columns]
+            missing_cols = [c for c in cols_to_concat if c not in available_columns]
             if missing_cols:
                 failed_cols.append(f"{col_name} (missing: {', '.join(missing_cols)})")
                 continue
@@ -177,6 +206,7 @@ def generate_computed_columns(
                     separator=separator,
                 ).cast(target_dtype)
                 df = df.with_columns(concat_expr.alias(col_name))
+                available_columns.add(col_name)
                 generated_cols.append(col_name)
             except Exception as e:
                 failed_cols.append(f"{col_name} ({str(e)})")
@@ -193,11 +223,13 @@ def generate_computed_columns(
 
 
 def validate_and_transform_dataframe(
-    df: pl.DataFrame,
+    df: Union[pl.DataFrame, pl.LazyFrame],
     table_name: str,
     tenant_config: Optional['TenantConfig'] = None,
-    logger=None
-) -> Tuple[pl.DataFrame, Dict]:
+    logger=None,
+    collect: bool = True,
+    db_columns: Optional[Dict[str, str]] = None,
+) -> Tuple[Union[pl.DataFrame, pl.LazyFrame], Dict]:
     """
     Transform and validate dataframe using column mappings.
 
@@ -208,10 +240,28 @@ def validate_and_transform_dataframe(
     4. Detect and handle data overflows
     5. Validate against database schema
 
+    Lazy mode: pass a LazyFrame (e.g. pl.scan_parquet(path)) and the rename,
+    date filter, type casts and computed columns are built as one plan and
+    collected once with the streaming engine. When db_columns is given,
+    apply_type_conversions is the last step of that plan. The date filter is placed
+    before the casts so Polars can push it down into the parquet scan.
+    If the plan fails to collect, the frame is collected as-is and the
+    eager steps run instead. Overflow detection and schema validation
+    always run on the collected DataFrame.
+
+    Streaming mode (LazyFrame with collect=False): nothing is collected. The
+    schema step is added to the plan as well (SchemaValidator.conform_lazyframe)
+    and the plan is returned, e.g. for sink_parquet. Checks that need the data
+    (overflows, conversion failures) are then up to the caller; metadata has
+    "column_renames" and "cleaned_columns" to map output columns back to the input.
+
     Args:
-        df: Polars DataFrame from parquet file (with parquet column names)
+        df: Polars DataFrame or LazyFrame from parquet file (with parquet column names)
         table_name: Database table name for schema lookup (e.g., 'dim_customer_master')
         logger: Optional logger instance for output
+        collect: Lazy mode only - False returns the uncollected plan (streaming mode)
+        db_columns: Optional {column: type} of the target table; when given,
+                    apply_type_conversions runs after the computed columns
 
     Returns:
         Tuple of (transformed_dataframe, metadata_dict)
@@ -234,13 +284,18 @@ def validate_and_transform_dataframe(
         else:
             print(msg)
 
+    lazy = isinstance(df, pl.LazyFrame)
+    source_df = df
+
     metadata = {
         "table_name": table_name,
-        "rows_before": len(df),
-        "columns_before": len(df.columns),
+        # Lazy: a row count over scan_parquet is answered from the parquet footer
+        "rows_before": df.select(pl.len()).collect().item() if lazy else len(df),
+        "columns_before": len(_frame_columns(df)),
         "invalid_mappings": [],
         "overflow_warnings": [],
         "transformation_errors": [],
+        "column_renames": {},
     }
 
     # Determine paths and validator based on mode (tenant-aware or legacy)
@@ -250,27 +305,26 @@ def validate_and_transform_dataframe(
         tenant_mappings_dir = tenant_config.column_mappings_path
 
         # Check if tenant-specific schemas exist (exclude __init__.py files)
-        has_schema_files = False
-        if tenant_schemas_dir.exists():
-            schema_files = [f for f in tenant_schemas_dir.rglob("*.py") if f.name != "__init__.py"]
-            has_schema_files = len(schema_files) > 0
-
-        if has_schema_files:
-            # Use tenant-specific schemas
+        if _has_schema_files(tenant_schemas_dir):
+            # Use tenant-specific schemas (compiled once per tenant)
             column_mappings_dir = tenant_mappings_dir
             schemas_dir = tenant_schemas_dir
-            tenant_validator = SchemaValidator.from_schema_files(schemas_dir, column_mappings_dir)
+            tenant_validator = SchemaValidator.cached(
+                schemas_dir, column_mappings_dir, cache_key=tenant_config.tenant_id
+            )
             log(f"Using tenant-specific schemas from {schemas_dir}")
         else:
             # Fallback to shared schemas
             column_mappings_dir = COLUMN_MAPPINGS_DIR
-            tenant_validator = validator  # Use global validator
+            tenant_validator = get_legacy_validator()
             log(f"Tenant-specific schemas not found, using shared schemas from {SCHEMAS_DIR}")
     else:
         # Legacy mode: use global paths and validator
         column_mappings_dir = COLUMN_MAPPINGS_DIR
-        tenant_validator = validator  # Use global validator
+        tenant_validator = get_legacy_validator()
 
+    # Schema changes (VARCHAR expansions, type upgrades) found in this call only
+    metadata["schema_changes"] = tenant_validator.schema_changes
 
     log(f"🔄 Transforming data for table: {table_name}")
 
@@ -359,8 +413,9 @@ def validate_and_transform_dataframe(
             # Step 4: Apply column renaming
             if rename_dict:
                 # Filter rename_dict to only include columns that exist in the dataframe
-                existing_renames = {k: v for k, v in rename_dict.items() if k in df.columns}
-                missing_columns = {k: v for k, v in rename_dict.items() if k not in df.columns}
+                frame_columns = set(_frame_columns(df))
+                existing_renames = {k: v for k, v in rename_dict.items() if k in frame_columns}
+                missing_columns = {k: v for k, v in rename_dict.items() if k not in frame_columns}
 
                 if missing_columns:
                     log(
@@ -374,6 +429,7 @@ def validate_and_transform_dataframe(
                     with tqdm(total=len(existing_renames), desc="Column renaming", unit="cols", leave=False, disable=logger is None) as pbar:
                         df = df.rename(existing_renames)
                         pbar.update(len(existing_renames))
+                    metadata["column_renames"] = existing_renames
                     log(f"✓ Column transformation complete ({len(existing_renames)} columns renamed)")
                 else:
                     log(f"⚠️  No columns found to rename", "warning")
@@ -385,6 +441,14 @@ def validate_and_transform_dataframe(
     else:
         log(f"⚠️  No mapping file configured for {table_name}", "warning")
 
+    # Step 4.2 (lazy mode): DATE FILTER BEFORE THE CASTS
+    # With the cast inside the predicate, nothing computed sits between the
+    # filter and the scan, so Polars pushes it down into scan_parquet.
+    date_filter = table_name == "fact_invoice_secondary" and "invoice_date" in _frame_columns(df)
+    if lazy and date_filter:
+        df = df.filter(pl.col("invoice_date").cast(pl.Int32) >= 20230401)
+        log("🔍 Added FactInvoiceSecondary date filter (>= 2023-04-01) to the lazy plan")
+
     # Step 4.3: APPLY TYPE CONVERSIONS FOR NUMERIC/INTEGER COLUMNS
     # Convert columns to proper data types based on mapping (handles string -> int conversion)
     if json_filename and mapping_file.exists():
@@ -392,6 +456,8 @@ def validate_and_transform_dataframe(
             type_conversions = []
             conversion_errors = []
             columns_to_convert = mapping_data.get("columns", {})
+            frame_schema = df.collect_schema() if lazy else df.schema
+            cast_exprs = []
 
             # Use tqdm for progress
             with tqdm(total=len(columns_to_convert), desc="Type conversions", unit="cols", leave=False, disable=logger is None) as pbar:
@@ -400,30 +466,36 @@ def validate_and_transform_dataframe(
                     data_type = col_info.get("data_type", "").upper()
 
                     # Only convert columns that exist in the dataframe
-                    if db_col in df.columns:
+                    if db_col in frame_schema:
                         # Check if conversion is needed
-                        current_type = str(df[db_col].dtype)
+                        current_type = str(frame_schema[db_col])
+                        is_string = "String" in current_type or "Utf8" in current_type
 
                         # Handle INTEGER/SMALLINT columns that are strings
-                        if "INTEGER" in data_type or "SMALLINT" in data_type:
-                            if "String" in current_type or "Utf8" in current_type:
-                                try:
-                                    df = df.with_columns(pl.col(db_col).cast(pl.Int32))
-                                    type_conversions.append(f"{db_col} (String→Int32)")
-                                except Exception as e:
-                                    conversion_errors.append(f"{db_col}: {e}")
+                        if ("INTEGER" in data_type or "SMALLINT" in data_type) and is_string:
+                            cast_exprs.append((db_col, pl.Int32, f"{db_col} (String→Int32)"))
 
                         # Handle DOUBLE/FLOAT columns that are strings
-                        elif "DOUBLE" in data_type or "FLOAT" in data_type:
-                            if "String" in current_type or "Utf8" in current_type:
-                                try:
-                                    df = df.with_columns(pl.col(db_col).cast(pl.Float64))
-                                    type_conversions.append(f"{db_col} (String→Float64)")
-                                except Exception as e:
-                                    conversion_errors.append(f"{db_col}: {e}")
+                        elif ("DOUBLE" in data_type or "FLOAT" in data_type) and is_string:
+                            cast_exprs.append((db_col, pl.Float64, f"{db_col} (String→Float64)"))
 
                     pbar.update(1)
 
+            if lazy:
+                # One projection in the plan; failures surface when the plan is collected
+                if cast_exprs:
+                    df = df.with_columns(
+                        [pl.col(db_col).cast(dtype) for db_col, dtype, _ in cast_exprs]
+                    )
+                    type_conversions.extend(label for _, _, label in cast_exprs)
+            else:
+                for db_col, dtype, label in cast_exprs:
+                    try:
+                        df = df.with_columns(pl.col(db_col).cast(dtype))
+                        type_conversions.append(label)
+                    except Exception as e:
+                        conversion_errors.append(f"{db_col}: {e}")
+
             if type_conversions:
                 log(f"✓ Applied type conversions for {len(type_conversions)} columns")
 
@@ -439,7 +511,10 @@ def validate_and_transform_dataframe(
 
     # Step 4.4: APPLY TABLE-SPECIFIC FILTERS AFTER RENAME
     # FactInvoiceSecondary: Filter to recent invoices only (after 2023-03-31)
-    if table_name == "fact_invoice_secondary" and "invoice_date" in df.columns:
+    # (lazy mode added this filter to the plan in Step 4.2; only the cast is left)
+    if lazy and date_filter:
+        df = df.with_columns(pl.col("invoice_date").cast(pl.Int32))
+    elif date_filter:
         rows_before = len(df)
         try:
             # Cast to Int32 first (handle both string and numeric types)
@@ -461,8 +536,37 @@ def validate_and_transform_dataframe(
     log(f"🔧 Generating computed columns for {table_name}...")
     df = generate_computed_columns(df, table_name, tenant_config, logger)
 
+    # Step 4.5.1: DB TYPE CONVERSIONS (caller-supplied table columns)
+    # In lazy mode this is part of the plan, so everything is collected once below
+    if db_columns:
+        df = apply_type_conversions(df, db_columns, table_name, logger)
+
+    # Step 4.6 (streaming mode): RETURN THE PLAN WITHOUT COLLECTING
+    if lazy and not collect:
+        df, cleaned_columns = tenant_validator.conform_lazyframe(df, table_name)
+        metadata["cleaned_columns"] = cleaned_columns
+        metadata["columns_after"] = len(_frame_columns(df))
+        log(f"✓ Built streaming transform plan ({metadata['columns_after']} columns)")
+        return df, metadata
+
+    # Step 4.6 (lazy mode): COLLECT THE PLAN ONCE
+    if lazy:
+        try:
+            df = df.collect(engine="streaming")
+        except Exception as e:
+            log(f"⚠️  Lazy transform plan failed ({e}), falling back to eager transform", "warning")
+            return validate_and_transform_dataframe(
+                source_df.collect(), table_name, tenant_config, logger, db_columns=db_columns
+            )
+        log(f"✓ Collected lazy transform plan: {len(df):,} rows × {len(df.columns)} columns")
+        if date_filter and metadata["rows_before"] > len(df):
+            log(
+                f"🔍 Filtered {metadata['rows_before'] - len(df):,} old FactInvoiceSecondary records (before 2023-04-01)"
+            )
+
     # Step 5: DETECT OVERFLOWS AND TYPE MISMATCHES
     overflows = tenant_validator.detect_data_overflows(df, table_name)
+    metadata["column_profile"] = overflows.get("profile")  # one-pass column stats
 
     has_errors = False
     error_details = []
@@ -529,7 +633,7 @@ def validate_and_transform_dataframe(
 
     # Step 6: Validate against schema
     is_valid, error_msg, transformed_df = tenant_validator.validate_dataframe_against_schema(
-        df, table_name
+        df, table_name, profile=metadata["column_profile"]
     )
 
     if not is_valid:
@@ -6,5 +6,6 @@ for running ETL pipelines across multiple tenants.
 """
 
 from .tenant_manager import TenantConfig, TenantManager
+from .tenant_job_runner import TenantJobRunner
 
-__all__ = ['TenantConfig', 'TenantManager']
+__all__ = ['TenantConfig', 'TenantManager', 'TenantJobRunner']
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Multi-Tenant Job Runner
+
+Runs a daily session (morning or evening) for every enabled tenant, with
+tenants processed in parallel, using the global_config of
+configs/tenant_registry.yaml:
+
+- max_concurrent_tenants: tenants running at the same time
+- tenant_timeout: seconds a tenant's whole session may take; the running job
+  is killed and the tenant's remaining jobs are skipped when it expires
+- fail_fast: on the first failed tenant, stop the running tenants and skip
+  the ones not started yet
+
+Each job script (scheduler/tenants/<slug>/daily/<session>/NN_*.py) runs in
+its own worker process, in its own process group so that a timeout also
+kills the pools it spawned. A tenant's jobs run as the dependency graph of
+the session's jobs.yaml (core/jobs/job_graph.py): independent jobs run side
+by side, up to scheduler.execution.max_concurrent_jobs. Output goes to
+<logs>/<slug>/scheduler/<session>_<timestamp>_<job>.log, so the interleaved
+output of parallel jobs stays readable.
+
+Concurrent jobs split the memory budget: each gets JOB_MEMORY_SHARE_MB (the
+container budget divided by the jobs that can run at once), which the chunk
+planner honours.
+
+Wall clock for N tenants approaches the slowest tenant instead of the sum,
+and a tenant's wall clock approaches its critical path.
+
+Usage:
+    python orchestration/tenant_job_runner.py morning
+    python orchestration/tenant_job_runner.py evening --tenant pidilite --tenant uthra-global
+    python orchestration/tenant_job_runner.py morning --max-concurrent 2 --timeout 3600 --fail-fast
+    python orchestration/tenant_job_runner.py morning --tenant pidilite --rerun-failed
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from orchestration.tenant_manager import TenantConfig, TenantManager  # noqa: E402
+from core.jobs.job_graph import JobGraph, JobResult  # noqa: E402
+from utils.chunk_planner import JOB_MEMORY_SHARE_ENV, memory_budget  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Color codes
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+CYAN = "\033[36m"
+RESET = "\033[0m"
+
+SESSIONS = ("morning", "evening")
+
+# Tenant job scripts: scheduler/tenants/<slug>/daily/<session>/NN_*.py
+SCHEDULER_TENANTS_ROOT = PROJECT_ROOT / "scheduler" / "tenants"
+
+
+@dataclass
+class TenantRunResult:
+    """Outcome of a tenant's session."""
+
+    tenant_slug: str
+    session: str
+    jobs: List[JobResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    skipped: bool = False  # Session disabled or no job scripts
+    timed_out: bool = False
+    cancelled: bool = False  # Stopped or never started because of fail_fast
+    error: Optional[str] = None
+    critical_path: Tuple[List[str], float] = ([], 0.0)
+
+    @property
+    def success(self) -> bool:
+        return (
+            self.error is None
+            and not self.timed_out
+            and not self.cancelled
+            and all(job.success for job in self.jobs)
+        )
+
+
+class TenantJobRunner:
+    """Runs a daily session for many tenants concurrently, as worker processes."""
+
+    def __init__(
+        self,
+        tenant_manager: TenantManager,
+        session: str,
+        max_concurrent_tenants: Optional[int] = None,
+        tenant_timeout: Optional[int] = None,
+        fail_fast: Optional[bool] = None,
+        rerun_failed: bool = False,
+        scheduler_root: Path = SCHEDULER_TENANTS_ROOT,
+    ):
+        """
+        Args:
+            tenant_manager: Loaded tenant manager
+            session: morning or evening
+            max_concurrent_tenants: Tenants run in parallel
+                                    (default: global_config.max_concurrent_tenants)
+            tenant_timeout: Seconds per tenant session (default: global_config.tenant_timeout)
+            fail_fast: Stop everything on the first failed tenant
+                       (default: global_config.fail_fast)
+            rerun_failed: Re-run only the jobs that did not succeed in each
+                          tenant's previous run of the session today
+            scheduler_root: scheduler/tenants directory
+        """
+        if session not in SESSIONS:
+            raise ValueError(f"Unknown session '{session}' (expected one of {SESSIONS})")
+
+        self.tenant_manager = tenant_manager
+        self.session = session
+        self.max_concurrent_tenants = max(
+            max_concurrent_tenants or tenant_manager.max_concurrent_tenants, 1
+        )
+        self.tenant_timeout = tenant_timeout or tenant_manager.tenant_timeout
+        self.fail_fast = tenant_manager.fail_fast if fail_fast is None else fail_fast
+        self.rerun_failed = rerun_failed
+        self.scheduler_root = Path(scheduler_root)
+
+        # Stamped into each tenant's state file: --rerun-failed only reuses
+        # jobs that succeeded on the same day
+        self.run_date = datetime.now().strftime("%Y-%m-%d")
+
+        # Set on the first failure when fail_fast is on
+        self._stop = threading.Event()
+
+    def _session_enabled(self, tenant_config: TenantConfig) -> bool:
+        if self.session == "morning":
+            return tenant_config.enable_morning_jobs
+        return tenant_config.enable_evening_jobs
+
+    def _log_dir(self, tenant_config: TenantConfig) -> Path:
+        log_dir = tenant_config.logs_base_path / "scheduler"
+        if not log_dir.is_absolute():
+            log_dir = PROJECT_ROOT / log_dir
+        log_dir.mkdir(parents=True, exist_ok=True)
+        return log_dir
+
+    def _job_env(self, graph: JobGraph, tenant_config: TenantConfig) -> Dict[str, str]:
+        """Environment of a tenant's jobs, with their share of the memory budget."""
+        parallel = graph.max_width()
+        if tenant_config.max_concurrent_jobs:
+            parallel = min(parallel, tenant_config.max_concurrent_jobs)
+        budget, _ = memory_budget(tenant_config.max_memory_mb)
+        share_mb = budget // (1024 * 1024) // max(parallel * self.max_concurrent_tenants, 1)
+        return {**os.environ, JOB_MEMORY_SHARE_ENV: str(share_mb)}
+
+    def _log_job_done(self, slug: str, job: JobResult):
+        if job.success:
+            logger.info(f"{GREEN}✓ {slug}/{job.job} ({job.elapsed:.1f}s){RESET}")
+        elif job.timed_out:
+            logger.error(
+                f"{RED}⏱  {slug}/{job.job} killed: tenant timeout of "
+                f"{self.tenant_timeout}s reached (log: {job.log_file}){RESET}"
+            )
+        elif job.cancelled:
+            logger.warning(f"{YELLOW}⏹  {slug}/{job.job} stopped (fail-fast){RESET}")
+        else:
+            logger.error(
+                f"{RED}✗ {slug}/{job.job} exited with {job.returncode} "
+                f"(log: {job.log_file}){RESET}"
+            )
+
+    def run_tenant(self, tenant_config: TenantConfig) -> TenantRunResult:
+        """Run the session's job graph of one tenant within tenant_timeout."""
+        slug = tenant_config.tenant_slug
+        result = TenantRunResult(tenant_slug=slug, session=self.session)
+        if self._stop.is_set():
+            result.cancelled = True
+            return result
+
+        start = time.time()
+        deadline = start + self.tenant_timeout
+        run_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            graph = JobGraph.from_session_dir(self.scheduler_root / slug / "daily" / self.session)
+            if not self._session_enabled(tenant_config) or not graph.nodes:
+                result.skipped = True
+                logger.info(f"{YELLOW}⏭  {slug}: no {self.session} jobs to run{RESET}")
+                return result
+
+            log_dir = self._log_dir(tenant_config)
+            logger.info(f"{CYAN}▶ {slug}: {len(graph.nodes)} {self.session} job(s){RESET}")
+
+            jobs = graph.run(
+                log_dir,
+                log_prefix=f"{self.session}_{run_stamp}_",
+                max_parallel=tenant_config.max_concurrent_jobs or None,
+                deadline=deadline,
+                stop_event=self._stop,
+                state_file=log_dir / f"{self.session}_state.json",
+                rerun_failed=self.rerun_failed,
+                env=self._job_env(graph, tenant_config),
+                on_job_done=lambda job: self._log_job_done(slug, job),
+                run_date=self.run_date,
+            )
+            result.jobs = list(jobs.values())
+            result.critical_path = graph.critical_path(jobs)
+            result.timed_out = any(job.timed_out for job in result.jobs) or (
+                time.time() >= deadline and not all(job.success for job in result.jobs)
+            )
+            result.cancelled = not result.timed_out and any(job.cancelled for job in result.jobs)
+
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"{RED}✗ {slug}: {e}{RESET}")
+
+        result.elapsed = time.time() - start
+        if not result.success and not result.cancelled and self.fail_fast:
+            self._stop.set()
+        return result
+
+    def run(self, tenant_slugs: Optional[Sequence[str]] = None) -> Dict[str, TenantRunResult]:
+        """
+        Run the session for all enabled tenants (or the given ones), in priority order.
+
+        Args:
+            tenant_slugs: Optional subset of tenant slugs
+
+        Returns:
+            {tenant_slug: TenantRunResult}, in priority order
+        """
+        tenants = self.tenant_manager.get_all_enabled_tenants()
+        if tenant_slugs:
+            unknown = set(tenant_slugs) - {t.tenant_slug for t in tenants}
+            if unknown:
+                raise ValueError(f"Unknown or disabled tenant(s): {', '.join(sorted(unknown))}")
+            tenants = [t for t in tenants if t.tenant_slug in tenant_slugs]
+
+        logger.info(
+            f"{CYAN}Running {self.session} session for {len(tenants)} tenant(s): "
+            f"{self.max_concurrent_tenants} concurrent, timeout {self.tenant_timeout}s, "
+            f"fail_fast={self.fail_fast}{RESET}"
+        )
+
+        # Threads only supervise; every job runs in its own worker process.
+        # Tenants are submitted in priority order, so higher priority starts first.
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_tenants, thread_name_prefix="tenant"
+        ) as pool:
+            futures = [(t.tenant_slug, pool.submit(self.run_tenant, t)) for t in tenants]
+            return {slug: future.result() for slug, future in futures}
+
+
+def print_summary(results: Dict[str, TenantRunResult], wall_clock: float):
+    """Print a per-tenant summary of a run."""
+    print(f"\n{CYAN}{'=' * 70}{RESET}")
+    print(f"{CYAN}TENANT RUN SUMMARY ({wall_clock:.1f}s wall clock){RESET}")
+    print(f"{CYAN}{'=' * 70}{RESET}")
+    for slug, result in results.items():
+        if result.skipped:
+            status = f"{YELLOW}SKIPPED{RESET}"
+        elif result.cancelled:
+            status = f"{YELLOW}CANCELLED{RESET}"
+        elif result.timed_out:
+            status = f"{RED}TIMED OUT{RESET}"
+        elif result.success:
+            status = f"{GREEN}OK{RESET}"
+        else:
+            status = f"{RED}FAILED{RESET}"
+        print(f"  {slug:<25} {status:<20} {result.elapsed:>8.1f}s")
+        for job in result.jobs:
+            mark = f"{GREEN}✓{RESET}" if job.success else f"{RED}✗{RESET}"
+            print(f"      {mark} {job.job:<35} {job.elapsed:>8.1f}s  {job.status}")
+        path, path_seconds = result.critical_path
+        if path:
+            busy = sum(job.elapsed for job in result.jobs)
+            print(
+                f"      {CYAN}critical path {' → '.join(path)}: {path_seconds:.1f}s "
+                f"(jobs total {busy:.1f}s){RESET}"
+            )
+        if result.error:
+            print(f"      {RED}{result.error}{RESET}")
+    print(f"{CYAN}{'=' * 70}{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a daily session for all enabled tenants")
+    parser.add_argument("session", choices=SESSIONS, help="Daily session to run")
+    parser.add_argument(
+        "--tenant",
+        action="append",
+        dest="tenants",
+        help="Tenant slug to run (repeatable; default: all enabled tenants)",
+    )
+    parser.add_argument(
+        "--max-concurrent", type=int, help="Override global_config.max_concurrent_tenants"
+    )
+    parser.add_argument("--timeout", type=int, help="Override global_config.tenant_timeout")
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        default=None,
+        help="Stop all tenants on the first failure (default: global_config.fail_fast)",
+    )
+    parser.add_argument(
+        "--rerun-failed",
+        action="store_true",
+        help="Only re-run the jobs that did not succeed in today's previous run of the session",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    tenant_manager = TenantManager(PROJECT_ROOT / "configs")
+    runner = TenantJobRunner(
+        tenant_manager,
+        args.session,
+        max_concurrent_tenants=args.max_concurrent,
+        tenant_timeout=args.timeout,
+        fail_fast=args.fail_fast,
+        rerun_failed=args.rerun_failed,
+    )
+
+    start = time.time()
+    try:
+        results = runner.run(args.tenants)
+    except ValueError as e:
+        print(f"{RED}❌ {e}{RESET}")
+        sys.exit(1)
+    print_summary(results, time.time() - start)
+
+    sys.exit(0 if all(r.success or r.skipped for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
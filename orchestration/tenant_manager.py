@@ -194,17 +194,88 @@ class TenantConfig:
     @property
     def stream_load_timeout(self) -> int:
         """Stream Load timeout in seconds."""
-        return self.merged_config.get('stream_load', {}).get('timeout', 900)
+        return (self.merged_config.get('stream_load') or {}).get('timeout', 900)
 
     @property
     def max_error_ratio(self) -> float:
         """Maximum error ratio for Stream Load."""
-        return self.merged_config.get('stream_load', {}).get('max_error_ratio', 0.0)
+        return (self.merged_config.get('stream_load') or {}).get('max_error_ratio', 0.0)
 
     @property
-    def chunk_size(self) -> int:
-        """Chunk size for Stream Load."""
-        return self.merged_config.get('stream_load', {}).get('chunk_size', 8192)
+    def chunk_size(self) -> Optional[int]:
+        """Fixed rows per Stream Load chunk. None = adaptive (sized by utils/chunk_planner)."""
+        return (self.merged_config.get('stream_load') or {}).get('chunk_size')
+
+    @property
+    def stream_load_target_body_mb(self) -> int:
+        """Stream Load body size (MB) the adaptive chunk planner aims for."""
+        return (self.merged_config.get('stream_load') or {}).get('target_body_mb', 64)
+
+    @property
+    def max_memory_mb(self) -> Optional[int]:
+        """Memory budget per ETL job in MB. None/0 = the container (cgroup) limit."""
+        return (self.merged_config.get('performance') or {}).get('max_memory_mb')
+
+    @property
+    def max_concurrent_loads(self) -> int:
+        """Concurrent in-flight Stream Load requests per table load."""
+        return (self.merged_config.get('stream_load') or {}).get('max_concurrent_loads', 3)
+
+    @property
+    def stream_load_format(self) -> Optional[str]:
+        """Stream Load body format (csv, parquet, arrow). None = stream_load_defaults.yaml."""
+        return (self.merged_config.get('stream_load') or {}).get('format')
+
+    @property
+    def stream_load_transactional(self) -> bool:
+        """Load all chunks of a table in one Stream Load transaction (atomic commit)."""
+        return (self.merged_config.get('stream_load') or {}).get('transactional', False)
+
+    @property
+    def stream_load_load_strategy(self) -> str:
+        """Full-reload strategy: truncate (TRUNCATE, then load) or swap (shadow table + SWAP)."""
+        return (self.merged_config.get('stream_load') or {}).get('load_strategy', 'truncate')
+
+    @property
+    def stream_load_direct_to_be(self) -> bool:
+        """Round-robin Stream Load chunks directly across BEs (skips the FE redirect)."""
+        return (self.merged_config.get('stream_load') or {}).get('direct_to_be', False)
+
+    @property
+    def stream_load_backends(self) -> List[str]:
+        """Optional BE HTTP endpoints ("host:port") for direct-to-BE Stream Load."""
+        return (self.merged_config.get('stream_load') or {}).get('backends', [])
+
+    # DD logic configuration
+    @property
+    def dd_logic_mode(self) -> str:
+        """How DD rows are generated: insert_select (inside StarRocks) or stream_load (via Python)."""
+        return self.merged_config.get('dd_logic', {}).get('mode', 'stream_load')
+
+    @property
+    def dd_partition_months(self) -> int:
+        """Months of posting dates per INSERT ... SELECT statement (0 = one statement)."""
+        return self.merged_config.get('dd_logic', {}).get('partition_months', 0)
+
+    @property
+    def dd_max_parallel_partitions(self) -> int:
+        """Concurrent INSERT ... SELECT statements when DD logic is partitioned."""
+        return self.merged_config.get('dd_logic', {}).get('max_parallel_partitions', 2)
+
+    @property
+    def dd_fetch_batch_size(self) -> int:
+        """Rows per fetch batch / Stream Load request when DD logic runs in stream_load mode."""
+        return self.merged_config.get('dd_logic', {}).get('fetch_batch_size', 100000)
+
+    @property
+    def dd_incremental(self) -> bool:
+        """Recompute DD rows only for posting dates touched by fact_invoice_details loads."""
+        return self.merged_config.get('dd_logic', {}).get('incremental', False)
+
+    @property
+    def dd_query_timeout(self) -> int:
+        """Session query_timeout in seconds for each DD INSERT ... SELECT."""
+        return self.merged_config.get('dd_logic', {}).get('query_timeout', 3600)
 
     # Path configurations
     @property
@@ -269,6 +340,11 @@ class TenantConfig:
         """Temporary data directory."""
         return self.data_base_path / "temp"
 
+    @property
+    def data_state_path(self) -> Path:
+        """Pipeline state directory (e.g. dates touched by incremental loads)."""
+        return self.data_base_path / "state"
+
     # Incremental data subdirectories
     @property
     def data_incremental_source_path(self) -> Path:
@@ -361,6 +437,15 @@ class TenantConfig:
         """Whether to enable evening jobs (dimension sync)."""
         return self.merged_config.get('scheduler', {}).get('enable_evening_jobs', True)
 
+    @property
+    def max_concurrent_jobs(self) -> int:
+        """Jobs of a session run at once when their dependencies allow (0 = no limit)."""
+        return (
+            self.merged_config.get('scheduler', {})
+            .get('execution', {})
+            .get('max_concurrent_jobs', 0)
+        )
+
     @property
     def enable_morning_jobs(self) -> bool:
         """Whether to enable morning jobs (fact loads)."""
@@ -396,6 +481,11 @@ class TenantConfig:
         """Whether distributor dashboard logic is enabled."""
         return self.features.get('enable_dd_logic', False)
 
+    @property
+    def enable_lazy_transform(self) -> bool:
+        """Whether the ETL orchestrator scans parquet lazily and collects the transform plan once."""
+        return self.features.get('enable_lazy_transform', False)
+
     def __repr__(self) -> str:
         """String representation."""
         return (
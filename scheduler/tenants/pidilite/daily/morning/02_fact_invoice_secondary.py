@@ -18,7 +18,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from azure.storage.blob.aio import BlobServiceClient
 from orchestration.tenant_manager import TenantManager
 from utils.logging_utils import get_pipeline_logger, log_summary
-from utils.blob_processor_utils import process_blobs_sequentially
+from utils.blob_processor_utils import process_blobs_pipelined
 from utils.etl_orchestrator import ETLOrchestrator
 
 tracemalloc.start()
@@ -93,7 +93,9 @@ async def main():
                 logger=logger
             )
 
-            # Process each fact folder
+            # List blobs across all fact folders first, so every file goes
+            # through one pipeline instead of one folder after another
+            blob_paths = []
             for azure_folder in FACT_FOLDERS:
                 logger.info(f"\n{CYAN}{'=' * 80}{RESET}")
                 logger.info(f"{CYAN}Processing: fact_invoice_secondary from {azure_folder}{RESET}")
@@ -104,23 +106,27 @@ async def main():
                 logger.info(f"Azure folder: {folder_path}")
 
                 # List blobs in this folder
-                blob_paths = []
+                folder_blobs = []
                 async for blob in container_client.list_blobs(name_starts_with=folder_path):
                     if blob.name.endswith(('.csv', '.gz', '.zip', '.parquet')):
-                        blob_paths.append(blob.name)
+                        folder_blobs.append(blob.name)
 
-                if not blob_paths:
+                if not folder_blobs:
                     logger.warning(f"{YELLOW}No blobs found in {folder_path}{RESET}")
                     continue
 
-                logger.info(f"Found {len(blob_paths)} blob(s) to process")
+                logger.info(f"Found {len(folder_blobs)} blob(s) to process")
+                blob_paths.extend(folder_blobs)
 
+            if blob_paths:
                 # Create output directory for raw parquet (Bronze layer)
                 output_dir = tenant_config.data_incremental_raw_path
                 output_dir.mkdir(parents=True, exist_ok=True)
 
-                # Download and convert blobs to parquet
-                blob_result = await process_blobs_sequentially(
+                # Download → decompress → convert as a staged pipeline. Outputs keep
+                # the blob's folders (blob_parquet_path), so same-named files of the
+                # two fact folders never overwrite each other
+                blob_result = await process_blobs_pipelined(
                     blob_paths,
                     container_client,
                     output_dir,
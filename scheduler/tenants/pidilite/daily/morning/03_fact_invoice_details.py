@@ -18,7 +18,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from azure.storage.blob.aio import BlobServiceClient
 from orchestration.tenant_manager import TenantManager
 from utils.logging_utils import get_pipeline_logger, log_summary
-from utils.blob_processor_utils import process_blobs_sequentially
+from utils.blob_processor_utils import process_blobs_pipelined
 from utils.etl_orchestrator import ETLOrchestrator
 
 tracemalloc.start()
@@ -119,8 +119,8 @@ async def main():
                 output_dir = tenant_config.data_incremental_raw_path
                 output_dir.mkdir(parents=True, exist_ok=True)
 
-                # Download and convert blobs to parquet
-                blob_result = await process_blobs_sequentially(
+                # Download → decompress → convert as a staged pipeline
+                blob_result = await process_blobs_pipelined(
                     blob_paths,
                     container_client,
                     output_dir,
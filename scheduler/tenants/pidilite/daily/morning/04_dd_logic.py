@@ -4,13 +4,18 @@ Pidilite - Daily DD Logic
 
 Generates DD (Dealer Direct) records from fact_invoice_details.
 Deletes existing DD records from fact_invoice_secondary and inserts
-transformed records based on business rules.
+transformed records based on business rules. With dd_logic.incremental only
+the posting dates loaded by 03_fact_invoice_details since the last run are
+deleted and regenerated.
+
+By default (dd_logic.mode: stream_load) the records are streamed out in
+batches and Stream Loaded back; this tenant sets dd_logic.mode to
+insert_select to generate them inside StarRocks with INSERT INTO ... SELECT.
 """
 
 import sys
 import time
 import pymysql
-import csv
 from pathlib import Path
 from datetime import datetime
 import tracemalloc
@@ -22,6 +27,13 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from orchestration.tenant_manager import TenantManager
 from utils.logging_utils import get_pipeline_logger
 from core.loaders.starrocks_stream_loader import StarRocksStreamLoader
+from utils.dd_logic_utils import (
+    delete_dd_records,
+    restrict_to_dates,
+    run_insert_select,
+    stream_select_to_stream_load,
+)
+from utils.load_tracking import clear_pending_dates, read_pending_dates
 
 tracemalloc.start()
 
@@ -134,13 +146,29 @@ def run_dd_logic(tenant_config, main_logger=None):
         conn = get_starrocks_connection(tenant_config)
         task_logger.info(f"{GREEN}✅ Connected to StarRocks{RESET}")
 
+        # Scope: every DD record, or (incremental) only the posting dates that
+        # fact_invoice_details loads have touched since the last run
+        pending_dates = read_pending_dates(tenant_config.data_state_path, "fact_invoice_details")
+        dd_dates = pending_dates if tenant_config.dd_incremental else None
+        if dd_dates is not None:
+            if not dd_dates:
+                task_logger.info(f"{GREEN}✅ No new posting dates loaded - DD records are up to date{RESET}")
+                if main_logger:
+                    main_logger.info(f"{GREEN}✅ DD logic: no new posting dates to process{RESET}")
+                return
+            task_logger.info(
+                f"{CYAN}🔁 Incremental DD logic for {len(dd_dates)} posting date(s): "
+                f"{dd_dates[0]} .. {dd_dates[-1]}{RESET}"
+            )
+            dd_query = restrict_to_dates(QUERY, dd_dates)
+        else:
+            dd_query = QUERY
+
         # 2. Delete existing DD records
         delete_start = time.time()
         try:
-            with conn.cursor() as cursor:
-                task_logger.info(f"{YELLOW}🗑️  Deleting existing DD records...{RESET}")
-                cursor.execute("DELETE FROM fact_invoice_secondary WHERE record_type = 'DD'")
-                deleted_count = cursor.rowcount
+            task_logger.info(f"{YELLOW}🗑️  Deleting existing DD records...{RESET}")
+            deleted_count = delete_dd_records(conn, dd_dates)
             delete_duration = time.time() - delete_start
             task_logger.info(
                 f"{GREEN}🗑️  Deleted {deleted_count} existing DD records in {delete_duration:.2f} seconds{RESET}"
@@ -149,131 +177,71 @@ def run_dd_logic(tenant_config, main_logger=None):
             task_logger.error(f"{RED}❌ Error deleting DD records: {e}{RESET}")
             raise
 
-        # 3. Fetch records from FactInvoiceDetails
-        fetch_start = time.time()
-        try:
-            task_logger.info(f"{CYAN}📥 Fetching DD records from FactInvoiceDetails...{RESET}")
-            with conn.cursor() as cursor:
-                task_logger.info(f"Executing DD logic query...")
-                cursor.execute(QUERY)
-                # Fetch all records as list of dicts
-                columns = [desc[0] for desc in cursor.description]
-                records = []
-                for row in cursor.fetchall():
-                    records.append(dict(zip(columns, row)))
-
-            expected_insert_count = len(records)
-            fetch_duration = time.time() - fetch_start
-            task_logger.info(
-                f"{GREEN}📥 Fetched {expected_insert_count} DD records in {fetch_duration:.2f} seconds{RESET}"
+        # 3-4. Generate DD records inside StarRocks (no round-trip through Python)
+        if tenant_config.dd_logic_mode == "insert_select":
+            fetch_duration = 0.0
+            insert_start = time.time()
+            task_logger.info(f"{CYAN}⚙️  Generating DD records with INSERT INTO ... SELECT...{RESET}")
+            success, result = run_insert_select(
+                connection_factory=lambda: get_starrocks_connection(tenant_config),
+                select_query=dd_query,
+                target_table="fact_invoice_secondary",
+                partition_column="invoice_date",
+                partition_months=tenant_config.dd_partition_months,
+                max_parallel=tenant_config.dd_max_parallel_partitions,
+                query_timeout=tenant_config.dd_query_timeout,
+                label_prefix=f"{TENANT_SLUG}_dd_logic_{int(time.time())}",
+                log=task_logger,
             )
+            if not success:
+                raise Exception(f"INSERT ... SELECT Error: {result.get('error', 'unknown error')}")
 
-            if not records:
-                task_logger.warning(f"{YELLOW}⚠️  No DD records found to process{RESET}")
-                if main_logger:
-                    main_logger.warning(f"{YELLOW}⚠️  No DD records found to process{RESET}")
-                return
-        except Exception as e:
-            task_logger.error(f"{RED}❌ Error fetching DD records: {e}{RESET}")
-            raise
-
-        # 4. Convert to CSV and use Stream Load for fast bulk insert
-        insert_start = time.time()
-        try:
-            task_logger.info(f"{CYAN}⬆️  Preparing bulk insert via Stream Load API...{RESET}")
-
-            # Get correct column order from database
-            with conn.cursor() as cursor:
-                cursor.execute("SHOW COLUMNS FROM fact_invoice_secondary")
-                db_columns = [row[0] for row in cursor.fetchall()]
-
-            task_logger.info(f"📋 Database has {len(db_columns)} columns")
-
-            # Write records directly to CSV with \x01 separator
-            csv_path = Path(f"/tmp/dd_logic_{int(time.time())}.csv")
-
-            if records:
-                # Get query columns (order from query result)
-                query_columns = list(records[0].keys())
-
-                # Use ALL database columns (not just those in query) to match table structure
-                # This ensures all 68 columns are in CSV, with NULL for missing ones
-                fieldnames = db_columns
-
-                task_logger.info(f"📋 Query returned {len(query_columns)} columns")
-                task_logger.info(f"📋 Writing ALL {len(fieldnames)} database columns to CSV (missing = NULL)")
-
-                # Check for missing columns (in query but not in DB)
-                missing_in_db = set(query_columns) - set(db_columns)
-                if missing_in_db:
-                    task_logger.warning(f"{YELLOW}⚠️  Columns in query but not in database: {missing_in_db}{RESET}")
-
-                # Check for columns in DB but not in query (will be NULL)
-                missing_in_query = set(db_columns) - set(query_columns)
-                if missing_in_query:
-                    task_logger.info(f"ℹ️  Setting {len(missing_in_query)} columns to NULL (not in query)")
-
-                with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
-                    writer = csv.DictWriter(
-                        csvfile, fieldnames=fieldnames, delimiter="\x01", lineterminator="\n"
-                    )
-                    # Don't write header
-                    for record in records:
-                        # Write ALL columns in database order
-                        # Use query values if available, otherwise \N (MySQL NULL marker)
-                        clean_record = {
-                            k: "\\N" if record.get(k) is None else str(record.get(k, "\\N"))
-                            for k in fieldnames
-                        }
-                        writer.writerow(clean_record)
-
-            task_logger.info(f"📝 Created CSV: {csv_path} ({len(records)} records)")
+            expected_insert_count = result["inserted_rows"]
+            insert_duration = time.time() - insert_start
             task_logger.info(
-                f"📋 Column order: {', '.join(fieldnames[:5])}... ({len(fieldnames)} total)"
+                f"{GREEN}⬆️  Inserted {expected_insert_count} records via INSERT ... SELECT "
+                f"({len(result['partitions'])} statement(s)) in {insert_duration:.2f} seconds{RESET}"
             )
-
-            # Use centralized Stream Load API with tenant config
-            db_config = {
-                "host": tenant_config.database_host,
-                "port": tenant_config.database_port,
-                "http_port": tenant_config.database_http_port,
-                "user": tenant_config.database_user,
-                "password": tenant_config.database_password,
-                "database": tenant_config.database_name,
-            }
-
-            with StarRocksStreamLoader(db_config, logger=task_logger) as loader:
-                success, result = loader.stream_load_csv(
-                    table_name="fact_invoice_secondary",
-                    csv_file_path=str(csv_path),
-                    chunk_id="dd_logic",
-                    columns=fieldnames,
-                    null_marker="\\N",  # Use MySQL/StarRocks standard NULL marker
-                )
-
-                if not success:
-                    error_msg = (
-                        result.get("Message", "Unknown error")
-                        if isinstance(result, dict)
-                        else str(result)
+        else:
+            # 3-4. Stream batches out of FactInvoiceDetails into concurrent Stream Loads.
+            # Fetch and load overlap, so there is no separate fetch phase to time.
+            fetch_duration = 0.0
+            insert_start = time.time()
+            task_logger.info(
+                f"{CYAN}📥 Streaming DD records in batches of {tenant_config.dd_fetch_batch_size:,} "
+                f"via Stream Load API...{RESET}"
+            )
+            try:
+                with StarRocksStreamLoader(tenant_config=tenant_config, logger=task_logger) as loader:
+                    success, result = stream_select_to_stream_load(
+                        conn,
+                        loader,
+                        select_query=dd_query,
+                        target_table="fact_invoice_secondary",
+                        batch_size=tenant_config.dd_fetch_batch_size,
+                        max_in_flight=tenant_config.max_concurrent_loads,
+                        label_prefix=f"{TENANT_SLUG}_dd_logic_{int(time.time())}",
+                        log=task_logger,
                     )
-                    task_logger.error(f"{RED}Stream Load failed: {error_msg}{RESET}")
-                    raise Exception(f"Stream Load Error: {error_msg}")
+                if not success:
+                    raise Exception(f"Stream Load Error: {result.get('error', 'Unknown error')}")
 
-            if success:
-                insert_count = len(records)
+                expected_insert_count = result["total_loaded"]
                 insert_duration = time.time() - insert_start
+                if not expected_insert_count:
+                    task_logger.warning(f"{YELLOW}⚠️  No DD records found to process{RESET}")
+                    if main_logger:
+                        main_logger.warning(f"{YELLOW}⚠️  No DD records found to process{RESET}")
                 task_logger.info(
-                    f"{GREEN}⬆️  Inserted {insert_count} records via Stream Load in {insert_duration:.2f} seconds{RESET}"
+                    f"{GREEN}⬆️  Inserted {expected_insert_count} records via Stream Load "
+                    f"({result['batches']} batches) in {insert_duration:.2f} seconds{RESET}"
                 )
-            else:
-                raise Exception("Stream Load failed")
+            except Exception as e:
+                task_logger.error(f"{RED}❌ Error inserting DD records: {e}{RESET}")
+                raise
 
-            # Clean up temp file
-            csv_path.unlink()
-        except Exception as e:
-            task_logger.error(f"{RED}❌ Error inserting DD records: {e}{RESET}")
-            raise
+        # Every date read above is now covered (a full run covers them all)
+        clear_pending_dates(tenant_config.data_state_path, "fact_invoice_details", pending_dates)
 
         # Calculate total processing time
         total_duration = time.time() - start_time
@@ -4,16 +4,20 @@ Uthra Global - Daily DD Business Logic Processing
 
 Processes dealer-distributor business logic for Uthra Global tenant.
 Transforms fact_invoice_details into fact_invoice_secondary format.
+With dd_logic.incremental only the posting dates loaded by
+03_fact_invoice_details since the last run are deleted and regenerated.
+
+By default (dd_logic.mode: stream_load) the rows are streamed out in batches
+and Stream Loaded back; a tenant can set dd_logic.mode to insert_select to
+generate them inside StarRocks with INSERT INTO ... SELECT.
 """
 
 import sys
 import time
 import pymysql
-import csv
 import tracemalloc
 from pathlib import Path
 from datetime import datetime
-from tqdm import tqdm
 
 tracemalloc.start()
 
@@ -24,6 +28,13 @@ sys.path.insert(0, str(PROJECT_ROOT))
 from orchestration.tenant_manager import TenantManager
 from utils.logging_utils import get_pipeline_logger
 from core.loaders.starrocks_stream_loader import StarRocksStreamLoader
+from utils.dd_logic_utils import (
+    delete_dd_records,
+    restrict_to_dates,
+    run_insert_select,
+    stream_select_to_stream_load,
+)
+from utils.load_tracking import clear_pending_dates, read_pending_dates
 
 # Tenant configuration
 TENANT_SLUG = "uthra-global"
@@ -124,48 +135,68 @@ def main():
     overall_start = time.time()
 
     try:
+        # Scope: the full query, or (incremental) only the posting dates that
+        # fact_invoice_details loads have touched since the last run
+        pending_dates = read_pending_dates(tenant_config.data_state_path, "fact_invoice_details")
+        dd_query = QUERY
+        if tenant_config.dd_incremental:
+            if not pending_dates:
+                logger.info(f"{GREEN}✅ No new posting dates loaded - DD rows are up to date{RESET}")
+                sys.exit(0)
+
+            logger.info(
+                f"{CYAN}[Step 0] Incremental DD logic for {len(pending_dates)} posting date(s): "
+                f"{pending_dates[0]} .. {pending_dates[-1]}{RESET}"
+            )
+            dd_query = restrict_to_dates(QUERY, pending_dates)
+            conn = get_starrocks_connection(tenant_config)
+            try:
+                deleted = delete_dd_records(conn, pending_dates)
+            finally:
+                conn.close()
+            logger.info(f"{GREEN}✓ Deleted {deleted} DD rows on those dates{RESET}")
+
+        if tenant_config.dd_logic_mode == "insert_select":
+            # Generate DD rows inside StarRocks (no round-trip through Python)
+            logger.info(f"\n{CYAN}[Step 1] Running DD logic as INSERT INTO ... SELECT...{RESET}")
+            success, result = run_insert_select(
+                connection_factory=lambda: get_starrocks_connection(tenant_config),
+                select_query=dd_query,
+                target_table="fact_invoice_secondary",
+                partition_column="invoice_date",
+                partition_months=tenant_config.dd_partition_months,
+                max_parallel=tenant_config.dd_max_parallel_partitions,
+                query_timeout=tenant_config.dd_query_timeout,
+                label_prefix=f"uthra_global_dd_logic_{int(time.time())}",
+                log=logger,
+            )
+            if not success:
+                logger.error(f"{RED}❌ Load failed: {result.get('error', 'Unknown error')}{RESET}")
+                sys.exit(1)
+
+            overall_time = time.time() - overall_start
+            logger.info(f"\n{CYAN}{'=' * 80}{RESET}")
+            logger.info(f"{CYAN}DD LOGIC SUMMARY{RESET}")
+            logger.info(f"{CYAN}{'=' * 80}{RESET}")
+            logger.info(f"Rows selected: {result['expected_rows']}")
+            logger.info(f"Rows loaded: {result['inserted_rows']}")
+            logger.info(f"Statements: {len(result['partitions'])}")
+            logger.info(f"Total time: {overall_time:.2f}s")
+            logger.info(f"{CYAN}{'=' * 80}{RESET}")
+            logger.info(f"{GREEN}✅ Job completed successfully{RESET}")
+            clear_pending_dates(tenant_config.data_state_path, "fact_invoice_details", pending_dates)
+            sys.exit(0)
+
         # Connect to StarRocks
         logger.info(f"\n{CYAN}[Step 1] Connecting to StarRocks...{RESET}")
         conn = get_starrocks_connection(tenant_config)
-        cursor = conn.cursor(pymysql.cursors.DictCursor)
-
-        # Execute query
-        logger.info(f"\n{CYAN}[Step 2] Executing DD logic query...{RESET}")
-        cursor.execute(QUERY)
-
-        # Fetch results
-        logger.info(f"{CYAN}[Step 3] Fetching results...{RESET}")
-        rows = cursor.fetchall()
-        total_rows = len(rows)
-        logger.info(f"{GREEN}✓ Fetched {total_rows} rows{RESET}")
-
-        if total_rows == 0:
-            logger.warning(f"{YELLOW}No rows to process, exiting{RESET}")
-            cursor.close()
-            conn.close()
-            sys.exit(0)
-
-        # Get column names from first row
-        column_names = list(rows[0].keys())
-        logger.info(f"Columns: {len(column_names)}")
-
-        # Write to CSV
-        import tempfile
-        import os
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, newline='') as tmp_file:
-            csv_path = tmp_file.name
-            writer = csv.DictWriter(tmp_file, fieldnames=column_names, delimiter='\x01')
-
-            logger.info(f"\n{CYAN}[Step 4] Writing to CSV...{RESET}")
-            for row in tqdm(rows, desc="Writing rows", unit="rows"):
-                writer.writerow(row)
-
-        logger.info(f"{GREEN}✓ Wrote {total_rows} rows to CSV{RESET}")
-
-        # Load to StarRocks
-        logger.info(f"\n{CYAN}[Step 5] Loading to fact_invoice_secondary...{RESET}")
 
+        # Stream the query result in batches; each batch is Stream Loaded while
+        # the next one is fetched (the full result set is never held in memory)
+        logger.info(
+            f"\n{CYAN}[Step 2] Streaming DD logic query into fact_invoice_secondary "
+            f"(batches of {tenant_config.dd_fetch_batch_size:,})...{RESET}"
+        )
         loader = StarRocksStreamLoader(
             tenant_config=tenant_config,
             logger=logger,
@@ -174,40 +205,46 @@ def main():
         )
 
         try:
-            success, result = loader.stream_load_csv(
-                table_name="fact_invoice_secondary",
-                csv_file_path=csv_path,
-                columns=column_names
+            success, result = stream_select_to_stream_load(
+                conn,
+                loader,
+                select_query=dd_query,
+                target_table="fact_invoice_secondary",
+                batch_size=tenant_config.dd_fetch_batch_size,
+                max_in_flight=tenant_config.max_concurrent_loads,
+                label_prefix=f"uthra_global_dd_logic_{int(time.time())}",
+                log=logger,
             )
         finally:
-            if os.path.exists(csv_path):
-                os.unlink(csv_path)
+            loader.close()
+            conn.close()
 
         # Check result
-        if success and result.get('Status') == 'Success':
-            rows_loaded = result.get('NumberLoadedRows', 0)
-            logger.info(f"{GREEN}✅ Loaded {rows_loaded} rows successfully{RESET}")
-        else:
-            logger.error(f"{RED}❌ Load failed: {result.get('Message', 'Unknown error')}{RESET}")
-            cursor.close()
-            conn.close()
+        if not success:
+            logger.error(f"{RED}❌ Load failed: {result.get('error', 'Unknown error')}{RESET}")
             sys.exit(1)
 
+        if result["fetched_rows"] == 0:
+            logger.warning(f"{YELLOW}No rows to process, exiting{RESET}")
+            clear_pending_dates(tenant_config.data_state_path, "fact_invoice_details", pending_dates)
+            sys.exit(0)
+
+        logger.info(f"{GREEN}✅ Loaded {result['total_loaded']} rows successfully{RESET}")
+
         # Summary
         overall_time = time.time() - overall_start
 
         logger.info(f"\n{CYAN}{'=' * 80}{RESET}")
-        logger.info(f"{CYAN}PIDILITE DD LOGIC SUMMARY{RESET}")
+        logger.info(f"{CYAN}DD LOGIC SUMMARY{RESET}")
         logger.info(f"{CYAN}{'=' * 80}{RESET}")
-        logger.info(f"Rows processed: {total_rows}")
-        logger.info(f"Rows loaded: {rows_loaded}")
+        logger.info(f"Rows processed: {result['fetched_rows']}")
+        logger.info(f"Rows loaded: {result['total_loaded']}")
+        logger.info(f"Batches: {result['batches']}")
         logger.info(f"Total time: {overall_time:.2f}s")
         logger.info(f"{CYAN}{'=' * 80}{RESET}")
 
-        cursor.close()
-        conn.close()
-
         logger.info(f"{GREEN}✅ Job completed successfully{RESET}")
+        clear_pending_dates(tenant_config.data_state_path, "fact_invoice_details", pending_dates)
         sys.exit(0)
 
     except Exception as e:
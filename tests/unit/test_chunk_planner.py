@@ -0,0 +1,54 @@
+"""Unit tests for utils.chunk_planner.plan_load_chunks."""
+
+import polars as pl
+import pytest
+
+from utils import chunk_planner
+from utils.chunk_planner import MAX_CHUNK_ROWS, MIN_CHUNK_ROWS, plan_load_chunks
+
+
+@pytest.fixture(autouse=True)
+def _no_host_limits(monkeypatch):
+    # Only the configured budget counts, whatever machine runs the tests
+    monkeypatch.setattr(chunk_planner, "detect_memory_limits", lambda: {})
+    monkeypatch.delenv(chunk_planner.JOB_MEMORY_SHARE_ENV, raising=False)
+
+
+def test_small_budget_is_raised_to_min_rows():
+    df = pl.DataFrame({"id": range(20_000), "name": ["x" * 200] * 20_000})
+
+    plan = plan_load_chunks(df, "t", max_in_flight=3, memory_budget_mb=1)
+
+    assert plan.rows == MIN_CHUNK_ROWS
+    assert plan.limited_by == "min_rows"
+    assert plan.num_chunks == 20
+
+
+def test_large_body_target_is_capped_at_max_rows():
+    df = pl.DataFrame({"id": pl.int_range(0, MAX_CHUNK_ROWS + 500_000, eager=True)})
+
+    plan = plan_load_chunks(df, "t", target_body_mb=100_000, memory_budget_mb=1_000_000)
+
+    assert plan.rows == MAX_CHUNK_ROWS
+    assert plan.limited_by == "max_rows"
+    assert plan.num_chunks == 2
+
+
+def test_frame_smaller_than_a_chunk_is_a_single_chunk():
+    df = pl.DataFrame({"id": range(10)})
+
+    plan = plan_load_chunks(df, "t", memory_budget_mb=1024)
+
+    assert plan.rows == 10
+    assert plan.limited_by == "single_chunk"
+    assert plan.num_chunks == 1
+
+
+def test_fixed_rows_bypass_sizing():
+    df = pl.DataFrame({"id": range(2_500)})
+
+    plan = plan_load_chunks(df, "t", memory_budget_mb=1, fixed_rows=1_000)
+
+    assert plan.rows == 1_000
+    assert plan.limited_by == "fixed"
+    assert plan.num_chunks == 3
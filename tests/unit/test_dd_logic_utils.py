@@ -0,0 +1,47 @@
+"""Unit tests for the date helpers of utils.dd_logic_utils."""
+
+from utils.dd_logic_utils import month_ranges, restrict_to_dates
+
+
+def test_month_ranges_single_month():
+    assert month_ranges(20250105, 20250120) == [(20250105, 20250201)]
+
+
+def test_month_ranges_cover_span_end_exclusive():
+    assert month_ranges(20250115, 20250410) == [
+        (20250115, 20250201),
+        (20250201, 20250301),
+        (20250301, 20250401),
+        (20250401, 20250501),
+    ]
+
+
+def test_month_ranges_cross_year_boundary():
+    assert month_ranges(20241110, 20250215, months=2) == [
+        (20241110, 20250101),
+        (20250101, 20250301),
+    ]
+
+
+def test_month_ranges_last_date_on_range_start():
+    # max_date is inclusive, so a span ending on the 1st still gets that month
+    assert month_ranges(20250101, 20250201) == [(20250101, 20250201), (20250201, 20250301)]
+
+
+def test_month_ranges_non_positive_months_means_one():
+    assert month_ranges(20250101, 20250131, months=0) == [(20250101, 20250201)]
+
+
+def test_restrict_to_dates_wraps_select():
+    query = restrict_to_dates("SELECT invoice_date, qty FROM t", [20250102, "20250101"])
+
+    assert query == (
+        "SELECT * FROM (SELECT invoice_date, qty FROM t) dd_src "
+        "WHERE invoice_date IN (20250102, 20250101)"
+    )
+
+
+def test_restrict_to_dates_custom_column():
+    query = restrict_to_dates("SELECT posting_date FROM t", [20250101], date_column="posting_date")
+
+    assert query.endswith("WHERE posting_date IN (20250101)")
@@ -0,0 +1,49 @@
+"""Unit tests for utils.blob_processor_utils.gzip_csv_to_parquet."""
+
+import gzip
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.blob_processor_utils import gzip_csv_to_parquet
+
+
+def _convert(tmp_path, text: str, **kwargs) -> pa.Table:
+    gz_path = tmp_path / "input.csv.gz"
+    parquet_path = tmp_path / "output.parquet"
+    with gzip.open(gz_path, "wb") as f:
+        f.write(text.encode("utf-8"))
+    gzip_csv_to_parquet(gz_path, parquet_path, **kwargs)
+    return pq.read_table(parquet_path)
+
+
+def test_all_columns_read_as_strings(tmp_path):
+    table = _convert(tmp_path, "code,amount\n007,12\n010,3\n")
+
+    assert table.schema.types == [pa.string(), pa.string()]
+    assert table.column("code").to_pylist() == ["007", "010"]
+
+
+def test_bom_prefixed_header_keeps_first_column_a_string(tmp_path):
+    table = _convert(tmp_path, "\ufeffcode,amount\n007,12\n010,3\n")
+
+    assert table.column_names == ["code", "amount"]
+    assert table.schema.field("code").type == pa.string()
+    assert table.column("code").to_pylist() == ["007", "010"]
+
+
+def test_empty_fields_are_null_and_quoted_empty_is_not(tmp_path):
+    table = _convert(tmp_path, 'code,name\n1,\n2,""\n')
+
+    assert table.column("name").to_pylist() == [None, ""]
+
+
+def test_filter_column_is_cast_and_filtered(tmp_path):
+    table = _convert(
+        tmp_path,
+        "postingdate,code\n20230331,a\n20230401,b\n",
+        filter_column="postingdate",
+    )
+
+    assert table.schema.field("postingdate").type == pa.int32()
+    assert table.column("code").to_pylist() == ["b"]
@@ -0,0 +1,90 @@
+"""Unit tests for core.jobs.job_graph."""
+
+from pathlib import Path
+
+import pytest
+
+from core.jobs.job_graph import (
+    FAILED,
+    REUSED,
+    SUCCESS,
+    UPSTREAM_FAILED,
+    JobGraph,
+    JobNode,
+    load_graph_state,
+)
+
+
+def _script(directory: Path, name: str, exit_code: int = 0) -> Path:
+    script = directory / f"{name}.py"
+    script.write_text(f"import sys\nsys.exit({exit_code})\n")
+    return script
+
+
+def test_topological_order_puts_dependencies_first():
+    graph = JobGraph(
+        [
+            JobNode("04_dd_logic", Path("04.py"), ("03_fact_invoice_details",)),
+            JobNode("02_fact_invoice_secondary", Path("02.py")),
+            JobNode("03_fact_invoice_details", Path("03.py")),
+        ]
+    )
+
+    assert graph.order == [
+        "02_fact_invoice_secondary",
+        "03_fact_invoice_details",
+        "04_dd_logic",
+    ]
+    assert graph.max_width() == 2
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        JobGraph([JobNode("a", Path("a.py"), ("b",)), JobNode("b", Path("b.py"), ("a",))])
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        JobGraph([JobNode("a", Path("a.py"), ("missing",))])
+
+
+def test_failed_job_marks_dependents_upstream_failed(tmp_path):
+    graph = JobGraph(
+        [
+            JobNode("01_a", _script(tmp_path, "01_a", exit_code=1)),
+            JobNode("02_b", _script(tmp_path, "02_b"), ("01_a",)),
+            JobNode("03_c", _script(tmp_path, "03_c"), ("02_b",)),
+            JobNode("04_d", _script(tmp_path, "04_d")),
+        ]
+    )
+
+    results = graph.run(tmp_path / "logs")
+
+    assert results["01_a"].status == FAILED
+    assert results["02_b"].status == UPSTREAM_FAILED
+    assert results["03_c"].status == UPSTREAM_FAILED
+    assert results["04_d"].status == SUCCESS  # Independent branch keeps running
+
+
+def test_rerun_failed_reuses_only_the_same_run_date(tmp_path):
+    state_file = tmp_path / "state.json"
+    nodes = [
+        JobNode("01_a", _script(tmp_path, "01_a")),
+        JobNode("02_b", _script(tmp_path, "02_b", exit_code=1), ("01_a",)),
+    ]
+    JobGraph(nodes).run(tmp_path / "logs", state_file=state_file, run_date="2026-10-15")
+
+    _script(tmp_path, "02_b")  # Fixed before the re-run
+    same_day = JobGraph(nodes).run(
+        tmp_path / "logs", state_file=state_file, rerun_failed=True, run_date="2026-10-15"
+    )
+    assert same_day["01_a"].status == REUSED
+    assert same_day["02_b"].status == SUCCESS
+
+    next_day = JobGraph(nodes).run(
+        tmp_path / "logs", state_file=state_file, rerun_failed=True, run_date="2026-10-16"
+    )
+    assert next_day["01_a"].status == SUCCESS  # Another day's state is ignored
+    assert next_day["02_b"].status == SUCCESS
+    assert load_graph_state(state_file, "2026-10-15") == {}
+    assert set(load_graph_state(state_file, "2026-10-16")) == {"01_a", "02_b"}
@@ -0,0 +1,25 @@
+"""Unit tests for utils.load_tracking."""
+
+from utils.load_tracking import (
+    clear_pending_dates,
+    dates_in_range,
+    read_pending_dates,
+    record_loaded_dates,
+)
+
+
+def test_dates_in_range_spans_month_and_year_ends():
+    assert dates_in_range(20241230, 20250102) == [20241230, 20241231, 20250101, 20250102]
+    assert dates_in_range(20240228, 20240301) == [20240228, 20240229, 20240301]
+    assert dates_in_range(20250105, 20250105) == [20250105]
+
+
+def test_record_and_clear_pending_dates(tmp_path):
+    table = "fact_invoice_details"
+
+    assert record_loaded_dates(tmp_path, table, [20250102, 20250101, None]) == 2
+    assert record_loaded_dates(tmp_path, table, dates_in_range(20250102, 20250103)) == 3
+    assert read_pending_dates(tmp_path, table) == [20250101, 20250102, 20250103]
+
+    assert clear_pending_dates(tmp_path, table, [20250101, 20250102]) == 1
+    assert read_pending_dates(tmp_path, table) == [20250103]
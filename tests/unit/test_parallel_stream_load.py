@@ -0,0 +1,129 @@
+"""Unit tests for core.loaders.parallel_stream_load."""
+
+import threading
+
+import polars as pl
+
+from core.loaders.parallel_stream_load import iter_frame_chunks, load_chunks_concurrently
+
+
+def _frame(rows: int) -> pl.DataFrame:
+    return pl.DataFrame({"id": list(range(rows))})
+
+
+def _success(chunk_df: pl.DataFrame) -> dict:
+    return {"Status": "Success", "NumberLoadedRows": chunk_df.height, "NumberFilteredRows": 0}
+
+
+def test_labels_follow_chunk_order():
+    labels = {}
+    lock = threading.Lock()
+
+    def load_chunk(index, chunk_df, label):
+        with lock:
+            labels[index] = label
+        return True, _success(chunk_df)
+
+    summary = load_chunks_concurrently(
+        iter_frame_chunks(_frame(25), 10), load_chunk, label_prefix="t_1", max_in_flight=3
+    )
+
+    assert labels == {0: "t_1_00000", 1: "t_1_00001", 2: "t_1_00002"}
+    assert [r.index for r in summary["results"]] == [0, 1, 2]
+    assert [r.label for r in summary["results"]] == ["t_1_00000", "t_1_00001", "t_1_00002"]
+    assert summary["total_loaded"] == 25
+    assert summary["successful_chunks"] == 3
+    assert summary["failed_chunks"] == 0
+
+
+def test_label_already_exists_finished_counts_as_loaded():
+    calls = []
+
+    def load_chunk(index, chunk_df, label):
+        calls.append(label)
+        if len(calls) == 1:
+            return False, {"Status": "Fail", "Message": "connection reset by peer"}
+        # The first attempt was committed but its response was lost
+        return False, {"Status": "Label Already Exists", "ExistingJobStatus": "FINISHED"}
+
+    summary = load_chunks_concurrently(
+        iter_frame_chunks(_frame(5), 10),
+        load_chunk,
+        label_prefix="t_2",
+        max_in_flight=1,
+        max_retries=3,
+        retry_delay=0,
+    )
+
+    assert calls == ["t_2_00000", "t_2_00000"]  # Retry reuses the label
+    (result,) = summary["results"]
+    assert result.success
+    assert result.attempts == 2
+    assert summary["total_loaded"] == 5
+    assert summary["failed_chunks"] == 0
+
+
+def test_fail_fast_stops_sending_chunks():
+    sent = []
+
+    def load_chunk(index, chunk_df, label):
+        sent.append(index)
+        if index == 0:
+            return False, {"Status": "Fail", "Message": "quality error", "NumberFilteredRows": 1}
+        return True, _success(chunk_df)
+
+    summary = load_chunks_concurrently(
+        iter_frame_chunks(_frame(50), 10),
+        load_chunk,
+        label_prefix="t_3",
+        max_in_flight=1,
+        max_retries=1,
+        fail_fast=True,
+    )
+
+    assert sent == [0]
+    assert summary["stopped_early"]
+    assert summary["failed_chunks"] == 1
+    assert summary["total_filtered"] == 1
+
+
+def test_max_retries_one_makes_a_single_attempt():
+    attempts = []
+
+    def load_chunk(index, chunk_df, label):
+        attempts.append(label)
+        return False, {"Status": "Fail", "Message": "Service Unavailable"}
+
+    summary = load_chunks_concurrently(
+        iter_frame_chunks(_frame(5), 10),
+        load_chunk,
+        label_prefix="t_4",
+        max_in_flight=1,
+        max_retries=1,
+        retry_delay=0,
+    )
+
+    assert attempts == ["t_4_00000"]
+    assert summary["results"][0].attempts == 1
+    assert not summary["stopped_early"]
+    assert summary["failed_chunks"] == 1
+
+
+def test_retriable_failures_are_retried_up_to_max_retries():
+    attempts = []
+
+    def load_chunk(index, chunk_df, label):
+        attempts.append(label)
+        return False, {"Status": "Fail", "Message": "Service Unavailable"}
+
+    summary = load_chunks_concurrently(
+        iter_frame_chunks(_frame(5), 10),
+        load_chunk,
+        label_prefix="t_5",
+        max_in_flight=1,
+        max_retries=3,
+        retry_delay=0,
+    )
+
+    assert len(attempts) == 3
+    assert summary["results"][0].attempts == 3
@@ -0,0 +1,69 @@
+"""Unit tests for utils.parquet_index row-group selection."""
+
+import polars as pl
+
+from utils.parquet_index import (
+    load_parquet_index,
+    read_parquet_filtered,
+    select_row_groups,
+)
+
+
+def _index(stats):
+    """Index with one row group per (min, max) pair of posting_date (None = no stats)."""
+    return {
+        "columns": {"posting_date": "postingdate"},
+        "row_groups": [
+            {
+                "num_rows": 100,
+                "stats": {
+                    "posting_date": None
+                    if bounds is None
+                    else {"min": bounds[0], "max": bounds[1], "null_count": 0}
+                },
+            }
+            for bounds in stats
+        ],
+    }
+
+
+def test_numeric_statistics():
+    index = _index([(20250101, 20250110), (20250111, 20250120), (20250121, 20250131)])
+
+    assert select_row_groups(index, "posting_date", lo=20250112, hi=20250115) == [1]
+    assert select_row_groups(index, "posting_date", lo=20250110, hi=20250121) == [0, 1, 2]
+    assert select_row_groups(index, "posting_date", lo=20250125) == [2]
+    assert select_row_groups(index, "posting_date", hi=20250101) == [0]
+    # String bounds are coerced to the numeric statistics
+    assert select_row_groups(index, "posting_date", lo="20250111", hi="20250111") == [1]
+
+
+def test_string_statistics():
+    index = _index([("20250101", "20250110"), ("20250111", "20250120")])
+
+    # Integer bounds compare as fixed-width YYYYMMDD strings
+    assert select_row_groups(index, "posting_date", lo=20250115) == [1]
+    assert select_row_groups(index, "posting_date", hi=20250105) == [0]
+    assert select_row_groups(index, "posting_date", values=[20250120]) == [1]
+    assert select_row_groups(index, "posting_date", values=["20250131"]) == []
+
+
+def test_row_groups_without_statistics_are_always_selected():
+    index = _index([(20250101, 20250110), None])
+
+    assert select_row_groups(index, "posting_date", lo=20250201) == [1]
+
+
+def test_read_parquet_filtered_skips_row_groups(tmp_path):
+    path = tmp_path / "FactInvoiceDetails_1.parquet"
+    dates = [str(20250101 + i // 100) for i in range(1_000)]  # 10 dates, one per row group
+    pl.DataFrame({"PostingDate": dates, "qty": range(1_000)}).write_parquet(
+        path, row_group_size=100
+    )
+
+    index = load_parquet_index(path)
+    assert select_row_groups(index, "posting_date", lo=20250103, hi=20250104) == [2, 3]
+
+    df = read_parquet_filtered(path, "posting_date", lo=20250103, hi=20250104)
+    assert df.height == 200
+    assert sorted(df["PostingDate"].unique()) == ["20250103", "20250104"]
@@ -0,0 +1,44 @@
+"""Unit tests for utils.blob_processor_utils.StreamingGunzip."""
+
+import gzip
+import zlib
+
+import pytest
+
+from utils.blob_processor_utils import StreamingGunzip
+
+
+def _gunzip_in_chunks(data: bytes, chunk_size: int) -> bytes:
+    gunzip = StreamingGunzip()
+    output = [gunzip.feed(data[i : i + chunk_size]) for i in range(0, len(data), chunk_size)]
+    output.append(gunzip.finish())
+    return b"".join(output)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_single_member(chunk_size):
+    payload = b"a,b,c\n" + b"1,2,3\n" * 5_000
+
+    assert _gunzip_in_chunks(gzip.compress(payload), chunk_size) == payload
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, 64 * 1024])
+def test_multi_member(chunk_size):
+    members = [b"header\n", b"row 1\n" * 1_000, b"", b"row 2\n" * 10]
+    data = b"".join(gzip.compress(member) for member in members)
+
+    assert _gunzip_in_chunks(data, chunk_size) == b"".join(members)
+
+
+def test_truncated_stream_raises():
+    data = gzip.compress(b"row\n" * 10_000)
+
+    with pytest.raises(zlib.error, match="Truncated"):
+        _gunzip_in_chunks(data[: len(data) // 2], 1024)
+
+
+def test_truncated_second_member_raises():
+    data = gzip.compress(b"first\n") + gzip.compress(b"second\n" * 1_000)
+
+    with pytest.raises(zlib.error, match="Truncated"):
+        _gunzip_in_chunks(data[:-4], 16)
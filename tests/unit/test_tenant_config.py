@@ -0,0 +1,33 @@
+"""Unit tests for orchestration.tenant_manager.TenantConfig."""
+
+from pathlib import Path
+
+from orchestration.tenant_manager import TenantConfig
+
+
+def _tenant(tmp_path: Path, config_yaml: str) -> TenantConfig:
+    (tmp_path / "config.yaml").write_text(config_yaml)
+    return TenantConfig(
+        tenant_id="tenant1",
+        config_path=tmp_path,
+        registry_entry={"tenant_slug": "tenant1"},
+        shared_defaults={},
+    )
+
+
+def test_empty_stream_load_section_uses_defaults(tmp_path):
+    # An empty "stream_load:" key (all overrides commented out) loads as None
+    tenant = _tenant(tmp_path, "stream_load:\n  # chunk_size: 8192\n")
+
+    assert tenant.merged_config["stream_load"] is None
+    assert tenant.max_concurrent_loads == 3
+    assert tenant.stream_load_format is None
+    assert tenant.chunk_size is None
+    assert tenant.stream_load_load_strategy == "truncate"
+
+
+def test_stream_load_section_overrides_defaults(tmp_path):
+    tenant = _tenant(tmp_path, "stream_load:\n  max_concurrent_loads: 5\n  format: parquet\n")
+
+    assert tenant.max_concurrent_loads == 5
+    assert tenant.stream_load_format == "parquet"
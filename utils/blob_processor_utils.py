@@ -3,17 +3,34 @@ Azure Blob Storage Processing Utilities
 
 Handles downloading, decompressing, and converting files from Azure Blob Storage
 to Parquet format for efficient data processing.
+
+Two drivers are available:
+- process_blobs_sequentially: one blob at a time, every stage in turn
+- process_blobs_pipelined: staged pipeline (download → decompress → convert)
+  with bounded queues between stages and a concurrency limit per stage, so
+  throughput is bound by the slowest stage instead of the sum of all stages
 """
 
 import asyncio
+import csv
 import gzip
 import logging
+import os
+import shutil
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Tuple
 import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import aiofiles
 from azure.storage.blob.aio import ContainerClient
 
+from utils.parquet_index import index_path, write_parquet_index
+
 # Color codes for console output
 RED = "\033[31m"
 GREEN = "\033[32m"
@@ -25,6 +42,23 @@ MAX_RETRIES = 3
 RETRY_DELAY = 2
 PARQUET_ROW_GROUP_SIZE = 100000
 
+# Pipeline stage limits (process_blobs_pipelined)
+DOWNLOAD_CONCURRENCY = 4  # Network-bound: concurrent blob downloads
+DECOMPRESS_WORKERS = min(4, os.cpu_count() or 1)  # CPU-bound: gzip process pool
+CONVERT_CONCURRENCY = 2  # Polars CSV → Parquet (multi-threaded itself)
+PIPELINE_QUEUE_SIZE = 4  # Max files waiting between two stages
+DECOMPRESS_BLOCK_SIZE = 1024 * 1024  # 1MB streaming block
+
+# How .gz blobs are handled by the drivers:
+#   "direct" - keep the .gz on disk and convert it straight to Parquet (no plain CSV)
+#   "stream" - gunzip while downloading, then convert the plain CSV
+#   "pool"   - download the .gz, gunzip in a process pool, then convert
+GZIP_MODE = "direct"
+CSV_READ_BLOCK_SIZE = 64 * 1024 * 1024  # Uncompressed bytes per record batch (direct mode)
+
+# zlib window bits for gzip framing (16 + MAX_WBITS = expect a gzip header)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
 
 def clean_file_name(filename: str) -> str:
     """Clean filename to be safe for filesystem
@@ -42,32 +76,145 @@ def clean_file_name(filename: str) -> str:
     return name
 
 
+def blob_parquet_path(output_dir: Path, blob_path: str) -> Path:
+    """Parquet output path of a blob
+
+    Mirrors the blob's folders under cleaned/, so same-named blobs from
+    different folders (FactInvoiceSecondary and FactInvoiceSecondary_107_112)
+    never share an output file, while the file name stays the blob's stem.
+
+    Args:
+        output_dir: Directory to save processed files
+        blob_path: Path of blob in Azure container
+
+    Returns:
+        cleaned/<blob folders>/<clean blob stem>.parquet under output_dir
+    """
+    return output_dir / "cleaned" / Path(blob_path).parent / f"{clean_file_name(blob_path)}.parquet"
+
+
+def remove_blob_files(output_dir: Path, blob_path: str):
+    """Remove the local files of a blob that failed part-way
+
+    Deletes the downloaded raw file, its decompressed copy and any partial
+    Parquet output (with its index sidecar), so a retry starts from a fresh
+    download and a failed blob leaves nothing behind.
+
+    Args:
+        output_dir: Directory to save processed files
+        blob_path: Path of blob in Azure container
+    """
+    raw_file_path = output_dir / "raw" / blob_path
+    parquet_path = blob_parquet_path(output_dir, blob_path)
+    candidates = [raw_file_path, parquet_path, index_path(parquet_path)]
+    if raw_file_path.suffix.lower() == ".gz":
+        candidates.append(raw_file_path.with_suffix(""))
+    for path in candidates:
+        path.unlink(missing_ok=True)
+
+
+class StreamingGunzip:
+    """Incremental gzip decompressor for data that arrives in chunks
+
+    Wraps zlib.decompressobj so a blob can be decompressed while it downloads,
+    holding only the current chunk in memory. Handles multi-member gzip files
+    (several gzip streams concatenated), which `gzip -d` also accepts.
+    """
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(GZIP_WBITS)
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Decompress the next compressed chunk and return the output bytes"""
+        output = [self._decompressor.decompress(chunk)]
+        # A new gzip member starts right after the previous one ends
+        while self._decompressor.eof and self._decompressor.unused_data:
+            remainder = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(GZIP_WBITS)
+            output.append(self._decompressor.decompress(remainder))
+        return b"".join(output)
+
+    def finish(self) -> bytes:
+        """Flush buffered output; raises if the gzip stream was truncated"""
+        tail = self._decompressor.flush()
+        if not self._decompressor.eof:
+            raise zlib.error("Truncated gzip stream")
+        return tail
+
+
+async def stream_blob_to_file(
+    blob_client,
+    output_path: Path,
+    decompress: bool = False,
+) -> Tuple[int, int]:
+    """Stream a blob to disk chunk by chunk, optionally gunzipping on the fly
+
+    Peak memory is one download chunk regardless of blob size, and
+    decompression overlaps with the download. Data goes to a ".part" file
+    that replaces output_path only once the whole blob has been written, so a
+    failed download never leaves a truncated output_path behind.
+
+    Args:
+        blob_client: Azure BlobClient (aio)
+        output_path: Local path to write (decompressed data if decompress=True)
+        decompress: Pipe chunks through an incremental gzip decompressor
+
+    Returns:
+        Tuple of (bytes downloaded, bytes written)
+    """
+    downloader = await blob_client.download_blob()
+    gunzip = StreamingGunzip() if decompress else None
+    received = 0
+    written = 0
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    part_path = output_path.with_name(output_path.name + ".part")
+    try:
+        async with aiofiles.open(part_path, "wb") as f:
+            async for chunk in downloader.chunks():
+                received += len(chunk)
+                if gunzip is not None:
+                    # zlib releases the GIL, so decompress off the event loop
+                    chunk = await asyncio.to_thread(gunzip.feed, chunk)
+                await f.write(chunk)
+                written += len(chunk)
+
+            if gunzip is not None:
+                tail = gunzip.finish()
+                await f.write(tail)
+                written += len(tail)
+        os.replace(part_path, output_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+
+    return received, written
+
+
 async def download_blob(
     blob_path: str,
     container: ContainerClient,
     output_path: Path,
     logger: Optional[logging.Logger] = None,
+    decompress: bool = False,
 ) -> bool:
     """Download blob from Azure Storage to local file
 
+    The blob is streamed to disk in chunks, never read into memory whole.
+
     Args:
         blob_path: Path of blob in container
         container: Azure BlobContainerClient
         output_path: Local path to save file
         logger: Optional logger instance
+        decompress: Gunzip while downloading (output_path receives plain data)
 
     Returns:
         True if successful, False otherwise
     """
     try:
         blob = container.get_blob_client(blob_path)
-        content = await (await blob.download_blob()).readall()
-
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        async with aiofiles.open(output_path, "wb") as f:
-            await f.write(content)
-
+        await stream_blob_to_file(blob, output_path, decompress=decompress)
         return True
 
     except Exception as e:
@@ -83,6 +230,9 @@ async def decompress_gzip(
 ) -> bool:
     """Decompress gzip file asynchronously
 
+    Streams in fixed-size blocks on a worker thread, so memory stays constant
+    regardless of file size.
+
     Args:
         input_path: Path to gzip file
         output_path: Path to save decompressed file
@@ -92,14 +242,7 @@ async def decompress_gzip(
         True if successful, False otherwise
     """
     try:
-        async with aiofiles.open(input_path, "rb") as f:
-            content = await f.read()
-
-        decompressed = gzip.decompress(content)
-
-        async with aiofiles.open(output_path, "wb") as f:
-            await f.write(decompressed)
-
+        await asyncio.to_thread(gunzip_file, str(input_path), str(output_path))
         return True
 
     except Exception as e:
@@ -108,6 +251,90 @@ async def decompress_gzip(
         return False
 
 
+def gzip_csv_to_parquet(
+    gz_path: Path,
+    parquet_path: Path,
+    filter_column: Optional[str] = None,
+    min_value: int = 20230331,
+    null_values: Tuple[str, ...] = ("\x00",),
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+) -> int:
+    """Convert a gzip CSV straight to Parquet without writing the plain CSV
+
+    The compressed file is decompressed as a stream and parsed in record
+    batches, each appended to the Parquet file as it is read, so memory stays
+    at roughly one batch and the only disk I/O is the .gz read and the
+    Parquet write. Blocking; run it in a thread from async code.
+
+    Args:
+        gz_path: Path to gzip-compressed CSV
+        parquet_path: Path to save Parquet file
+        filter_column: Optional date column to cast to Int32 and filter on
+        min_value: Keep rows where filter_column > min_value
+        null_values: Extra strings read as NULL (empty fields are always NULL)
+        row_group_size: Max rows per Parquet row group
+
+    Returns:
+        Number of rows written
+    """
+    # All columns are read as strings (same as scan_csv(infer_schema_length=0));
+    # utf-8-sig drops a leading BOM from the first name, as pyarrow does
+    with gzip.open(gz_path, "rt", newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f))
+
+    # Match pl.scan_csv: quoted fields may span lines, and a quoted "" is an
+    # empty string rather than NULL
+    parse_options = pacsv.ParseOptions(newlines_in_values=True)
+    convert_options = pacsv.ConvertOptions(
+        column_types={name: pa.string() for name in header},
+        null_values=["", *null_values],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False,
+    )
+    read_options = pacsv.ReadOptions(block_size=CSV_READ_BLOCK_SIZE)
+
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    rows_written = 0
+    try:
+        with pa.input_stream(str(gz_path), compression="gzip") as stream:
+            reader = pacsv.open_csv(
+                stream,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options,
+            )
+            for batch in reader:
+                table = pa.Table.from_batches([batch])
+
+                if filter_column:
+                    index = table.schema.get_field_index(filter_column)
+                    values = pc.cast(table.column(index), pa.int32())
+                    table = table.set_column(index, filter_column, values).filter(
+                        pc.greater(values, min_value)
+                    )
+
+                if writer is None:
+                    writer = pq.ParquetWriter(str(parquet_path), table.schema, compression="zstd")
+                writer.write_table(table, row_group_size=row_group_size)
+                rows_written += table.num_rows
+
+            if writer is None:
+                # Header-only file: still produce a valid (empty) Parquet file
+                schema = reader.schema
+                if filter_column:
+                    index = schema.get_field_index(filter_column)
+                    schema = schema.set(index, pa.field(filter_column, pa.int32()))
+                writer = pq.ParquetWriter(str(parquet_path), schema, compression="zstd")
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Row-group statistics sidecar for skip-scanning readers
+    write_parquet_index(parquet_path)
+    return rows_written
+
+
 async def csv_to_parquet(
     csv_path: Path,
     parquet_path: Path,
@@ -129,8 +356,18 @@ async def csv_to_parquet(
         Special handling for FactInvoiceSecondary:
         - Converts invoicedate to Int32
         - Filters to records after 2023-03-31
+
+        A .gz csv_path is converted directly (gzip_csv_to_parquet), without
+        an intermediate uncompressed CSV on disk.
     """
     try:
+        if csv_path.suffix.lower() == ".gz":
+            filter_column = "invoicedate" if "FactInvoiceSecondary" in table_stem else None
+            await asyncio.to_thread(
+                gzip_csv_to_parquet, csv_path, parquet_path, filter_column
+            )
+            return True
+
         # Scan CSV with lazy loading
         df_stream = pl.scan_csv(
             csv_path,
@@ -146,7 +383,11 @@ async def csv_to_parquet(
             )
 
         parquet_path.parent.mkdir(parents=True, exist_ok=True)
-        df_stream.sink_parquet(parquet_path, row_group_size=PARQUET_ROW_GROUP_SIZE)
+        # Run the (blocking) sink off the event loop so other blobs keep moving
+        await asyncio.to_thread(
+            df_stream.sink_parquet, parquet_path, row_group_size=PARQUET_ROW_GROUP_SIZE
+        )
+        await asyncio.to_thread(write_parquet_index, parquet_path)
 
         return True
 
@@ -185,23 +426,25 @@ async def process_blob_with_retry(
 
         # Prepare paths
         raw_file_path = output_dir / "raw" / blob_path
-        parquet_path = output_dir / "cleaned" / f"{clean_file_name(blob_path)}.parquet"
-
-        # Download blob
-        success = await download_blob(blob_path, container, raw_file_path, logger)
+        parquet_path = blob_parquet_path(output_dir, blob_path)
+
+        # Download blob. In "stream" mode .gz blobs are gunzipped on the fly;
+        # in "direct" mode the .gz is kept and converted straight to Parquet
+        gunzip_now = GZIP_MODE == "stream" and blob_path.lower().endswith(".gz")
+        if gunzip_now:
+            raw_file_path = raw_file_path.with_suffix("")
+        success = await download_blob(
+            blob_path, container, raw_file_path, logger, decompress=gunzip_now
+        )
         if not success:
             raise Exception("Failed to download blob")
 
-        # Handle gzip decompression
-        if blob_path.lower().endswith(".gz"):
+        if GZIP_MODE == "pool" and raw_file_path.suffix.lower() == ".gz":
             decompressed_path = raw_file_path.with_suffix("")
-            success = await decompress_gzip(raw_file_path, decompressed_path, logger)
-            if not success:
+            if not await decompress_gzip(raw_file_path, decompressed_path, logger):
                 raise Exception("Failed to decompress file")
+            raw_file_path.unlink(missing_ok=True)
             raw_file_path = decompressed_path
-            raw_file_path_gz = raw_file_path.parent / f"{raw_file_path.name}.gz"
-            if raw_file_path_gz.exists():
-                raw_file_path_gz.unlink()
 
         # Convert CSV to Parquet
         success = await csv_to_parquet(raw_file_path, parquet_path, table_stem, logger)
@@ -215,6 +458,8 @@ async def process_blob_with_retry(
         return parquet_path
 
     except Exception as e:
+        # Never reuse a partial or corrupt download: the retry starts over
+        remove_blob_files(output_dir, blob_path)
         if attempt < MAX_RETRIES:
             wait = RETRY_DELAY**attempt
             if logger:
@@ -288,3 +533,249 @@ async def process_blobs_sequentially(
         )
 
     return results
+
+
+def gunzip_file(input_path: str, output_path: str) -> str:
+    """Decompress a gzip file to disk in fixed-size blocks
+
+    Runs in a worker process (process_blobs_pipelined), so it takes and
+    returns plain strings and only ever holds one block in memory.
+
+    Args:
+        input_path: Path to gzip file
+        output_path: Path to save decompressed file
+
+    Returns:
+        output_path
+    """
+    with gzip.open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        shutil.copyfileobj(src, dst, DECOMPRESS_BLOCK_SIZE)
+    return output_path
+
+
+# Marks the end of input for one stage worker
+_STAGE_DONE = object()
+
+
+async def _pipeline_stage(
+    stage: str,
+    inbox: asyncio.Queue,
+    outbox: Optional[asyncio.Queue],
+    handler: Callable[[str, Optional[Path]], Awaitable[Path]],
+    concurrency: int,
+    next_concurrency: int,
+    on_error: Callable[[str, str, int, Exception], Awaitable[None]],
+    on_done: Optional[Callable[[str, Path], None]] = None,
+):
+    """Run `concurrency` workers for one stage, then close the next stage
+
+    Each worker takes (blob_path, path, attempt) items from inbox, runs
+    handler and puts (blob_path, new_path, attempt) on outbox; the last stage
+    (outbox None) hands its output to on_done. A failure goes to on_error,
+    which decides whether the whole blob starts over from its download. A
+    full outbox blocks the worker, which is what bounds the work in progress
+    between stages.
+    """
+
+    async def worker():
+        while True:
+            item = await inbox.get()
+            if item is _STAGE_DONE:
+                return
+            blob_path, path, attempt = item
+            try:
+                output = await handler(blob_path, path)
+            except Exception as e:
+                await on_error(stage, blob_path, attempt, e)
+                continue
+            if outbox is not None:
+                await outbox.put((blob_path, output, attempt))
+            elif on_done is not None:
+                on_done(blob_path, output)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    if outbox is not None:
+        for _ in range(next_concurrency):
+            await outbox.put(_STAGE_DONE)
+
+
+async def process_blobs_pipelined(
+    blob_paths: list,
+    container: ContainerClient,
+    output_dir: Path,
+    logger: Optional[logging.Logger] = None,
+    download_concurrency: int = DOWNLOAD_CONCURRENCY,
+    decompress_workers: int = DECOMPRESS_WORKERS,
+    convert_concurrency: int = CONVERT_CONCURRENCY,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+    gzip_mode: str = GZIP_MODE,
+) -> dict:
+    """Process multiple blobs through a staged pipeline
+
+    Stages run concurrently with their own limits and bounded queues between them:
+        download (async network) → decompress (process pool) → convert (Polars, threads)
+
+    Retries are per blob, not per stage: when any stage fails, the blob's local
+    files are removed and it goes back to the download stage (up to
+    MAX_RETRIES attempts), so a corrupt download is fetched again instead of
+    being re-processed. Parquet outputs are written to blob_parquet_path.
+
+    Args:
+        blob_paths: List of blob paths to process
+        container: Azure BlobContainerClient
+        output_dir: Directory to save processed files
+        logger: Optional logger instance
+        download_concurrency: Concurrent downloads
+        decompress_workers: Processes in the gzip decompression pool
+        convert_concurrency: Concurrent CSV → Parquet conversions
+        queue_size: Max files waiting between two stages
+        gzip_mode: How .gz blobs are handled (see GZIP_MODE): "direct" (default,
+                   converted straight to Parquet), "stream" (gunzip while
+                   downloading) or "pool" (gunzip in the process pool stage).
+                   Only "pool" does any work in the decompress stage
+
+    Returns:
+        Same shape as process_blobs_sequentially; 'successful' keeps input order
+    """
+    results = {
+        "successful": [],
+        "failed": [],
+        "results": {},
+    }
+    if not blob_paths:
+        return results
+
+    if logger:
+        logger.info(
+            f"Pipelining {len(blob_paths)} blob(s): {download_concurrency} download, "
+            f"{decompress_workers} decompress, {convert_concurrency} convert"
+        )
+
+    loop = asyncio.get_running_loop()
+    downloads: asyncio.Queue = asyncio.Queue()  # Unbounded: failed blobs re-enter here
+    to_decompress: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    to_convert: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    converted = 0
+    unfinished = len(blob_paths)
+
+    for blob_path in blob_paths:
+        downloads.put_nowait((blob_path, None, 1))
+
+    def finish_blob():
+        # The download stage (and with it every later stage) closes once
+        # every blob has either converted or failed for good
+        nonlocal unfinished
+        unfinished -= 1
+        if unfinished == 0:
+            for _ in range(download_concurrency):
+                downloads.put_nowait(_STAGE_DONE)
+
+    async def on_error(stage: str, blob_path: str, attempt: int, error: Exception):
+        # A failed decompress/convert usually means a truncated or corrupt
+        # download, so the whole blob starts over from a fresh download
+        remove_blob_files(output_dir, blob_path)
+        if attempt < MAX_RETRIES:
+            wait = RETRY_DELAY**attempt
+            if logger:
+                logger.warning(
+                    f"{YELLOW}❌ {stage} failed for {blob_path}: {error}. Re-downloading in "
+                    f"{wait:.1f}s (Attempt {attempt}/{MAX_RETRIES})...{RESET}"
+                )
+            await asyncio.sleep(wait)
+            downloads.put_nowait((blob_path, None, attempt + 1))
+        else:
+            if logger:
+                logger.error(
+                    f"{RED}❌ Maximum retries reached for {blob_path} ({stage}). "
+                    f"Final error: {error}{RESET}"
+                )
+            results["failed"].append(blob_path)
+            results["results"][blob_path] = None
+            finish_blob()
+
+    def on_converted(blob_path: str, parquet_path: Path):
+        results["results"][blob_path] = parquet_path
+        finish_blob()
+
+    async def download(blob_path: str, _: Optional[Path]) -> Path:
+        raw_file_path = output_dir / "raw" / blob_path
+        gunzip_now = gzip_mode == "stream" and blob_path.lower().endswith(".gz")
+        if gunzip_now:
+            raw_file_path = raw_file_path.with_suffix("")
+        if not await download_blob(
+            blob_path, container, raw_file_path, logger, decompress=gunzip_now
+        ):
+            raise Exception("Failed to download blob")
+        return raw_file_path
+
+    async def decompress(blob_path: str, raw_file_path: Path) -> Path:
+        if gzip_mode != "pool" or raw_file_path.suffix.lower() != ".gz":
+            return raw_file_path
+        decompressed_path = raw_file_path.with_suffix("")
+        await loop.run_in_executor(
+            pool, gunzip_file, str(raw_file_path), str(decompressed_path)
+        )
+        raw_file_path.unlink(missing_ok=True)
+        return decompressed_path
+
+    async def convert(blob_path: str, csv_path: Path) -> Path:
+        nonlocal converted
+        # Extract table stem from blob path for special handling
+        table_stem = blob_path.split("/")[1] if "/" in blob_path else ""
+        parquet_path = blob_parquet_path(output_dir, blob_path)
+        if not await csv_to_parquet(csv_path, parquet_path, table_stem, logger):
+            raise Exception("Failed to convert CSV to Parquet")
+        csv_path.unlink(missing_ok=True)
+
+        converted += 1
+        if logger and (converted == 1 or converted % 5 == 0 or converted == len(blob_paths)):
+            logger.info(f"Converted blob {converted}/{len(blob_paths)}: {blob_path.split('/')[-1]}")
+        return parquet_path
+
+    with ProcessPoolExecutor(max_workers=decompress_workers) as pool:
+        await asyncio.gather(
+            _pipeline_stage(
+                "Download",
+                downloads,
+                to_decompress,
+                download,
+                download_concurrency,
+                decompress_workers,
+                on_error,
+            ),
+            _pipeline_stage(
+                "Decompress",
+                to_decompress,
+                to_convert,
+                decompress,
+                decompress_workers,
+                convert_concurrency,
+                on_error,
+            ),
+            _pipeline_stage(
+                "Convert",
+                to_convert,
+                None,
+                convert,
+                convert_concurrency,
+                0,
+                on_error,
+                on_done=on_converted,
+            ),
+        )
+
+    # Keep input order so downstream loads run in a deterministic order
+    results["successful"] = [
+        results["results"][blob_path]
+        for blob_path in blob_paths
+        if results["results"].get(blob_path) is not None
+    ]
+
+    if logger:
+        logger.info(
+            f"{GREEN}✓ Blob processing complete: {len(results['successful'])} successful, "
+            f"{len(results['failed'])} failed{RESET}"
+        )
+
+    return results
@@ -0,0 +1,356 @@
+"""
+Adaptive Chunk Planner
+
+Chunk sizes derived from a memory budget instead of fixed row counts.
+
+The row counts that used to be hardcoded (Config.CHUNK_SIZE, stream_load.chunk_size,
+the "64GB RAM" thresholds of the parquet cleaner) are either too small for
+narrow dimension tables or OOM the 8-16 GB containers on wide fact files. The
+planner instead:
+
+- estimates bytes per row: fixed-width columns from the schema, strings and
+  nested columns measured on a sample of rows (plus the serialized CSV size)
+- takes a memory budget: the tightest of the configured limit
+  (performance.max_memory_mb / MEMORY_BUDGET_MB), the container cgroup limit
+  and physical RAM
+- picks rows per Stream Load chunk so a body is close to the target size
+  (stream_load.target_body_mb) while all in-flight chunks fit the budget
+- decides whether the cleaner transforms a file in memory or streams it
+
+Every decision is logged (and returned, so print-based scripts can echo it).
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Stream Load body size aimed for per chunk
+DEFAULT_TARGET_BODY_MB = 64
+
+# Per-job memory share (MB) set by core/jobs when jobs run concurrently
+JOB_MEMORY_SHARE_ENV = "JOB_MEMORY_SHARE_MB"
+
+# Used when no limit can be detected (matches the smallest containers we run)
+FALLBACK_MEMORY_BUDGET_MB = 8192
+
+# Share of the budget left after the loaded frame that in-flight chunks may use
+CHUNK_MEMORY_FRACTION = 0.5
+
+# Share of the budget an in-memory cleaning pass may use
+CLEAN_MEMORY_FRACTION = 0.5
+
+# Peak in-memory cleaning footprint vs. the frame size (source frame, the
+# transformed copy and per-column temporaries of casts and string cleaning)
+CLEAN_EXPANSION = 3.0
+
+MIN_CHUNK_ROWS = 1000
+MAX_CHUNK_ROWS = 2_000_000
+
+# Polars streaming engine morsel bounds for the cleaner
+MIN_STREAMING_CHUNK_ROWS = 10_000
+MAX_STREAMING_CHUNK_ROWS = 250_000
+
+# Morsels a streaming thread may hold at once (operator and sink buffers)
+MORSELS_PER_THREAD = 4
+
+# Rows sampled to measure variable-width columns and the CSV body size
+SAMPLE_ROWS = 1000
+
+# Bytes per value assumed for a variable-width column when there is no sample
+VARIABLE_WIDTH_GUESS = 32
+
+# cgroup v2, then v1 memory limit files
+_CGROUP_LIMIT_FILES = (
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+)
+
+# cgroup v1 reports "unlimited" as a huge page-aligned number
+_UNLIMITED = 1 << 60
+
+_FIXED_WIDTHS = {
+    pl.Boolean: 1,
+    pl.Int8: 1,
+    pl.UInt8: 1,
+    pl.Int16: 2,
+    pl.UInt16: 2,
+    pl.Int32: 4,
+    pl.UInt32: 4,
+    pl.Float32: 4,
+    pl.Date: 4,
+    pl.Int64: 8,
+    pl.UInt64: 8,
+    pl.Float64: 8,
+    pl.Datetime: 8,
+    pl.Duration: 8,
+    pl.Time: 8,
+    pl.Decimal: 16,
+}
+
+
+def _mb(num_bytes: float) -> str:
+    return f"{num_bytes / 1024 / 1024:,.0f}MB"
+
+
+def detect_memory_limits() -> Dict[str, int]:
+    """
+    Memory limits visible to this process.
+
+    Returns:
+        {"cgroup": bytes, "physical": bytes}, each present only when detected
+    """
+    limits = {}
+    for path in _CGROUP_LIMIT_FILES:
+        try:
+            with open(path, "r") as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < _UNLIMITED:
+            limits["cgroup"] = int(value)
+            break
+
+    try:
+        limits["physical"] = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        pass
+    return limits
+
+
+def memory_budget(configured_mb: Optional[int] = None) -> Tuple[int, str]:
+    """
+    Memory budget for a job: the tightest of the configured limit, the job's
+    share set by the scheduler (JOB_MEMORY_SHARE_MB), the cgroup limit and
+    physical RAM.
+
+    Args:
+        configured_mb: Configured budget in MB (None or 0 = not configured)
+
+    Returns:
+        Tuple of (budget_bytes, source) with source one of config, job_share,
+        cgroup, physical or fallback
+    """
+    candidates = detect_memory_limits()
+    if configured_mb:
+        candidates["config"] = int(configured_mb) * 1024 * 1024
+    # Share of the container set by the job scheduler when jobs run side by side
+    job_share = os.getenv(JOB_MEMORY_SHARE_ENV, "")
+    if job_share.isdigit() and int(job_share) > 0:
+        candidates["job_share"] = int(job_share) * 1024 * 1024
+    if not candidates:
+        return FALLBACK_MEMORY_BUDGET_MB * 1024 * 1024, "fallback"
+    source = min(candidates, key=candidates.get)
+    return candidates[source], source
+
+
+def estimate_row_bytes(
+    schema: Dict[str, pl.DataType], sample: Optional[pl.DataFrame] = None
+) -> float:
+    """
+    In-memory bytes per row: fixed-width columns from the schema, variable-width
+    columns (strings, binary, nested) measured on the sample.
+
+    Args:
+        schema: Column types
+        sample: Optional sample rows with that schema
+
+    Returns:
+        Estimated bytes per row (validity bitmaps included)
+    """
+    fixed = 0.0
+    variable: List[str] = []
+    for name, dtype in schema.items():
+        width = _FIXED_WIDTHS.get(dtype.base_type())
+        if width is None:
+            variable.append(name)
+        else:
+            fixed += width
+
+    validity = len(schema) / 8
+    if not variable:
+        return fixed + validity
+    if sample is not None and sample.height > 0:
+        measured = sample.select(variable).estimated_size() / sample.height
+    else:
+        measured = len(variable) * VARIABLE_WIDTH_GUESS
+    return fixed + measured + validity
+
+
+def estimate_body_row_bytes(sample: pl.DataFrame, fallback: float) -> float:
+    """Serialized CSV bytes per row of a sample (fallback when the sample is empty)."""
+    if sample.height == 0:
+        return fallback
+    body = sample.write_csv(separator="\x01", include_header=False, null_value="\\N")
+    return max(len(body.encode("utf-8")) / sample.height, 1.0)
+
+
+@dataclass
+class ChunkPlan:
+    """Rows per Stream Load chunk and the estimates behind it."""
+
+    table: str
+    rows: int
+    total_rows: int
+    row_bytes: float
+    body_row_bytes: float
+    memory_budget: int
+    budget_source: str
+    limited_by: str  # target_body, memory, min_rows, max_rows, fixed or single_chunk
+
+    @property
+    def num_chunks(self) -> int:
+        return max((self.total_rows + self.rows - 1) // self.rows, 1)
+
+    def describe(self) -> str:
+        return (
+            f"Chunk plan for {self.table}: {self.rows:,} rows/chunk × {self.num_chunks} "
+            f"({self.row_bytes:,.0f} B/row in memory, "
+            f"~{_mb(self.rows * self.body_row_bytes)} body, "
+            f"budget {_mb(self.memory_budget)} from {self.budget_source}, "
+            f"limited by {self.limited_by})"
+        )
+
+
+def plan_load_chunks(
+    df: pl.DataFrame,
+    table_name: str,
+    max_in_flight: int = 1,
+    target_body_mb: Optional[int] = None,
+    memory_budget_mb: Optional[int] = None,
+    fixed_rows: Optional[int] = None,
+    log: Optional[logging.Logger] = None,
+) -> ChunkPlan:
+    """
+    Rows per Stream Load chunk for a loaded DataFrame.
+
+    A chunk is sized so its body is close to target_body_mb, then capped so
+    max_in_flight chunks plus the one being serialized (each: a working copy
+    of its rows and its body) fit in what the budget leaves after the frame.
+
+    Args:
+        df: Frame to load (columns in load order)
+        table_name: Target table (for logging)
+        max_in_flight: Concurrent in-flight Stream Load requests
+        target_body_mb: Stream Load body size aimed for (default DEFAULT_TARGET_BODY_MB)
+        memory_budget_mb: Configured memory budget (None = detect)
+        fixed_rows: Configured rows per chunk; bypasses the sizing when set
+        log: Optional logger
+
+    Returns:
+        ChunkPlan (also logged)
+    """
+    total_rows = df.height
+    budget, source = memory_budget(memory_budget_mb)
+    row_bytes = df.estimated_size() / total_rows if total_rows else estimate_row_bytes(df.schema)
+    body_row_bytes = estimate_body_row_bytes(df.head(SAMPLE_ROWS), row_bytes)
+
+    if fixed_rows:
+        rows, limited_by = int(fixed_rows), "fixed"
+    else:
+        target_body = (target_body_mb or DEFAULT_TARGET_BODY_MB) * 1024 * 1024
+        body_rows = int(target_body / body_row_bytes)
+
+        # The frame itself is already resident; chunks share what is left
+        # (at least a tenth of the budget, so an oversized frame still loads)
+        available = max(budget - df.estimated_size(), budget * 0.1) * CHUNK_MEMORY_FRACTION
+        memory_rows = int(available / ((max_in_flight + 1) * (row_bytes + body_row_bytes)))
+
+        rows, limited_by = min((body_rows, "target_body"), (memory_rows, "memory"))
+        if rows < MIN_CHUNK_ROWS:
+            rows, limited_by = MIN_CHUNK_ROWS, "min_rows"
+        elif rows > MAX_CHUNK_ROWS:
+            rows, limited_by = MAX_CHUNK_ROWS, "max_rows"
+        if total_rows <= rows:
+            rows, limited_by = max(total_rows, 1), "single_chunk"
+
+    plan = ChunkPlan(
+        table=table_name,
+        rows=rows,
+        total_rows=total_rows,
+        row_bytes=row_bytes,
+        body_row_bytes=body_row_bytes,
+        memory_budget=budget,
+        budget_source=source,
+        limited_by=limited_by,
+    )
+    (log or logger).info(plan.describe())
+    return plan
+
+
+@dataclass
+class CleaningPlan:
+    """How the parquet cleaner processes a file."""
+
+    file: str
+    in_memory: bool
+    total_rows: int
+    row_bytes: float
+    estimated_peak: float
+    memory_budget: int
+    budget_source: str
+    streaming_chunk_rows: int
+
+    def describe(self) -> str:
+        mode = (
+            "in memory"
+            if self.in_memory
+            else f"streaming ({self.streaming_chunk_rows:,}-row morsels)"
+        )
+        return (
+            f"Cleaning plan for {self.file}: {mode} - {self.total_rows:,} rows × "
+            f"{self.row_bytes:,.0f} B/row, est. peak {_mb(self.estimated_peak)} vs "
+            f"budget {_mb(self.memory_budget)} from {self.budget_source}"
+        )
+
+
+def plan_cleaning(
+    parquet_path: Union[str, Path],
+    memory_budget_mb: Optional[int] = None,
+    log: Optional[logging.Logger] = None,
+) -> CleaningPlan:
+    """
+    Decide whether a parquet file is cleaned in memory or streamed.
+
+    Only the footer (schema, row count) and the first SAMPLE_ROWS rows are read.
+
+    Args:
+        parquet_path: Raw parquet file
+        memory_budget_mb: Configured memory budget (None = detect)
+        log: Optional logger
+
+    Returns:
+        CleaningPlan (also logged)
+    """
+    budget, source = memory_budget(memory_budget_mb)
+    lf = pl.scan_parquet(parquet_path)
+    schema = dict(lf.collect_schema())
+    total_rows = lf.select(pl.len()).collect().item()
+    row_bytes = estimate_row_bytes(schema, lf.head(SAMPLE_ROWS).collect())
+
+    estimated_peak = total_rows * row_bytes * CLEAN_EXPANSION
+    usable = budget * CLEAN_MEMORY_FRACTION
+
+    # Streaming: every Polars thread holds a few morsels through the same expansion
+    morsel_rows = int(
+        usable / (pl.thread_pool_size() * MORSELS_PER_THREAD * row_bytes * CLEAN_EXPANSION)
+    )
+    streaming_chunk_rows = min(max(morsel_rows, MIN_STREAMING_CHUNK_ROWS), MAX_STREAMING_CHUNK_ROWS)
+
+    plan = CleaningPlan(
+        file=Path(parquet_path).name,
+        in_memory=estimated_peak <= usable,
+        total_rows=total_rows,
+        row_bytes=row_bytes,
+        estimated_peak=estimated_peak,
+        memory_budget=budget,
+        budget_source=source,
+        streaming_chunk_rows=streaming_chunk_rows,
+    )
+    (log or logger).info(plan.describe())
+    return plan
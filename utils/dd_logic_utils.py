@@ -0,0 +1,451 @@
+"""
+DD Logic Utilities
+
+Runs the DD (Dealer Direct) transformation inside StarRocks as
+``INSERT INTO fact_invoice_secondary SELECT ...`` so the generated rows never
+leave the cluster (no fetch into Python, no Stream Load back).
+
+The SELECT can be split into posting-date ranges (on its date output column)
+and the ranges run as concurrent INSERT statements, each on its own
+connection. Every range is verified: the rows inserted must match a
+COUNT(*) of the same SELECT.
+
+In incremental mode (dd_logic.incremental) only the posting dates touched by
+fact_invoice_details loads since the last run (see utils/load_tracking.py)
+are deleted and regenerated: restrict_to_dates() narrows the SELECT and
+delete_dd_records() removes the matching DD rows.
+
+When the rows have to pass through Python (e.g. the source is another
+cluster), stream_select_to_stream_load reads them with a server-side cursor
+in fetchmany batches and Stream Loads each batch concurrently, so memory
+stays flat and fetching overlaps with loading.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import polars as pl
+import pymysql
+
+from core.loaders.parallel_stream_load import ChunkLoadResult, load_chunks_concurrently
+
+logger = logging.getLogger(__name__)
+
+RED = "\033[31m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+CYAN = "\033[36m"
+RESET = "\033[0m"
+
+# Alias of the DD SELECT inside the generated statements
+SOURCE_ALIAS = "dd_src"
+
+# Rows per fetchmany() batch (and per Stream Load request) in streaming mode
+FETCH_BATCH_SIZE = 100000
+
+# Dates per DELETE ... IN (...) statement in incremental mode
+DELETE_DATES_PER_STATEMENT = 500
+
+
+def get_query_columns(cursor, select_query: str) -> List[str]:
+    """
+    Output column names of a SELECT, without fetching any rows.
+
+    Args:
+        cursor: Open pymysql cursor
+        select_query: SELECT statement
+
+    Returns:
+        Column names in query order
+    """
+    cursor.execute(f"SELECT * FROM ({select_query}) {SOURCE_ALIAS} LIMIT 0")
+    return [desc[0] for desc in cursor.description]
+
+
+def get_table_columns(cursor, table_name: str) -> List[str]:
+    """Column names of a table in table order."""
+    cursor.execute(f"SHOW COLUMNS FROM {table_name}")
+    return [row[0] for row in cursor.fetchall()]
+
+
+def restrict_to_dates(
+    select_query: str, dates: List[int], date_column: str = "invoice_date"
+) -> str:
+    """
+    Narrow a DD SELECT to the given dates of one of its output columns.
+
+    StarRocks pushes the predicate down through the derived table, so only
+    the matching source partitions are scanned.
+
+    Args:
+        select_query: DD SELECT statement
+        dates: YYYYMMDD dates to keep
+        date_column: Output column of the SELECT holding the date
+
+    Returns:
+        SELECT statement restricted to the dates
+    """
+    date_list = ", ".join(str(int(d)) for d in dates)
+    return f"SELECT * FROM ({select_query}) {SOURCE_ALIAS} WHERE {date_column} IN ({date_list})"
+
+
+def delete_dd_records(
+    conn,
+    dates: Optional[List[int]] = None,
+    target_table: str = "fact_invoice_secondary",
+    date_column: str = "invoice_date",
+    record_type: str = "DD",
+) -> int:
+    """
+    Delete DD records, either all of them or only those on the given dates.
+
+    Args:
+        conn: Open pymysql connection (autocommit)
+        dates: YYYYMMDD dates to delete (None = every DD record)
+        target_table: Table holding the DD records
+        date_column: Date column of target_table
+        record_type: record_type value of the rows to delete
+
+    Returns:
+        Number of rows deleted (as reported by StarRocks)
+    """
+    deleted = 0
+    with conn.cursor() as cursor:
+        if dates is None:
+            cursor.execute(f"DELETE FROM {target_table} WHERE record_type = '{record_type}'")
+            return cursor.rowcount
+
+        for i in range(0, len(dates), DELETE_DATES_PER_STATEMENT):
+            date_list = ", ".join(str(int(d)) for d in dates[i : i + DELETE_DATES_PER_STATEMENT])
+            cursor.execute(
+                f"DELETE FROM {target_table} "
+                f"WHERE record_type = '{record_type}' AND {date_column} IN ({date_list})"
+            )
+            deleted += max(cursor.rowcount, 0)
+    return deleted
+
+
+def month_ranges(min_date: int, max_date: int, months: int = 1) -> List[Tuple[int, int]]:
+    """
+    Split a YYYYMMDD date span into [start, end) ranges of whole months.
+
+    Args:
+        min_date: First date (YYYYMMDD)
+        max_date: Last date (YYYYMMDD, inclusive)
+        months: Months per range
+
+    Returns:
+        List of (start, end) YYYYMMDD bounds; start is inclusive, end exclusive
+    """
+    months = max(1, months)
+    year, month = divmod(int(min_date) // 100, 100)
+    ranges = []
+    start = int(min_date)
+    while start <= int(max_date):
+        month += months
+        year += (month - 1) // 12
+        month = (month - 1) % 12 + 1
+        end = year * 10000 + month * 100 + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def _run_partition(
+    connection_factory: Callable,
+    count_sql: str,
+    insert_sql: str,
+    label: str,
+    query_timeout: Optional[int],
+) -> Dict[str, Any]:
+    """Count and insert one range on a dedicated connection."""
+    start = time.time()
+    conn = connection_factory()
+    try:
+        with conn.cursor() as cursor:
+            if query_timeout:
+                cursor.execute(f"SET query_timeout = {int(query_timeout)}")
+            cursor.execute(count_sql)
+            expected = int(cursor.fetchone()[0] or 0)
+
+            inserted = 0
+            if expected:
+                cursor.execute(insert_sql)
+                inserted = cursor.rowcount
+    finally:
+        conn.close()
+
+    return {
+        "label": label,
+        "expected_rows": expected,
+        "inserted_rows": inserted,
+        "elapsed": time.time() - start,
+    }
+
+
+def run_insert_select(
+    connection_factory: Callable,
+    select_query: str,
+    target_table: str = "fact_invoice_secondary",
+    partition_column: Optional[str] = None,
+    partition_months: int = 0,
+    max_parallel: int = 1,
+    query_timeout: Optional[int] = None,
+    label_prefix: str = "dd_logic",
+    log: Optional[logging.Logger] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Run ``INSERT INTO target_table SELECT ...`` inside StarRocks with row-count verification.
+
+    Only columns present in both the SELECT and the table are inserted; other
+    table columns get their defaults (NULL), as with the Stream Load path.
+
+    Args:
+        connection_factory: Callable returning a new pymysql connection (autocommit)
+        select_query: DD SELECT statement
+        target_table: Table to insert into
+        partition_column: YYYYMMDD output column of the SELECT to split on
+                          (None = one statement)
+        partition_months: Months per range (0 = one statement)
+        max_parallel: Concurrent INSERT statements when partitioned
+        query_timeout: Optional session query_timeout in seconds per statement
+        label_prefix: Load label prefix; each statement gets {prefix}_{index:03d}
+        log: Optional logger
+
+    Returns:
+        Tuple of (success, result_dict) with expected_rows, inserted_rows,
+        partitions (per-range results) and elapsed seconds. success is False
+        if any range fails or inserts a different number of rows than it selects.
+    """
+    log = log or logger
+    start = time.time()
+    result: Dict[str, Any] = {
+        "expected_rows": 0,
+        "inserted_rows": 0,
+        "partitions": [],
+        "elapsed": 0.0,
+    }
+
+    conn = connection_factory()
+    try:
+        with conn.cursor() as cursor:
+            query_columns = get_query_columns(cursor, select_query)
+            table_columns = set(get_table_columns(cursor, target_table))
+
+            missing_in_db = [c for c in query_columns if c not in table_columns]
+            if missing_in_db:
+                log.warning(
+                    f"{YELLOW}⚠️  Columns in query but not in {target_table} (skipped): {missing_in_db}{RESET}"
+                )
+            columns = [c for c in query_columns if c in table_columns]
+
+            ranges: List[Optional[Tuple[int, int]]] = [None]
+            if partition_column and partition_months > 0:
+                cursor.execute(
+                    f"SELECT MIN({partition_column}), MAX({partition_column}) "
+                    f"FROM ({select_query}) {SOURCE_ALIAS}"
+                )
+                min_date, max_date = cursor.fetchone()
+                if min_date is None:
+                    log.warning(f"{YELLOW}⚠️  DD SELECT returned no rows{RESET}")
+                    result["elapsed"] = time.time() - start
+                    return True, result
+                ranges = month_ranges(min_date, max_date, partition_months)
+    finally:
+        conn.close()
+
+    column_list = ", ".join(f"`{c}`" for c in columns)
+    statements = []
+    for index, bounds in enumerate(ranges):
+        where = ""
+        if bounds is not None:
+            where = (
+                f" WHERE {partition_column} >= {bounds[0]} AND {partition_column} < {bounds[1]}"
+            )
+        source = f"FROM ({select_query}) {SOURCE_ALIAS}{where}"
+        label = f"{label_prefix}_{index:03d}"
+        statements.append(
+            (
+                f"SELECT COUNT(*) {source}",
+                f"INSERT INTO {target_table} WITH LABEL {label} ({column_list}) "
+                f"SELECT {column_list} {source}",
+                label,
+            )
+        )
+
+    workers = max(1, min(max_parallel, len(statements)))
+    log.info(
+        f"{CYAN}⚙️  INSERT ... SELECT into {target_table}: {len(statements)} statement(s), "
+        f"{workers} in parallel{RESET}"
+    )
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="dd_insert") as pool:
+        futures = {
+            pool.submit(
+                _run_partition, connection_factory, count_sql, insert_sql, label, query_timeout
+            ): label
+            for count_sql, insert_sql, label in statements
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                partition = future.result()
+            except Exception as e:
+                errors.append(f"{label}: {e}")
+                log.error(f"{RED}❌ {label} failed: {e}{RESET}")
+                continue
+
+            result["partitions"].append(partition)
+            if partition["inserted_rows"] != partition["expected_rows"]:
+                errors.append(
+                    f"{label}: inserted {partition['inserted_rows']} of "
+                    f"{partition['expected_rows']} rows"
+                )
+                log.error(f"{RED}❌ Row count mismatch in {errors[-1]}{RESET}")
+            else:
+                log.info(
+                    f"{GREEN}✓ {label}: {partition['inserted_rows']:,} rows "
+                    f"in {partition['elapsed']:.2f}s{RESET}"
+                )
+
+    result["partitions"].sort(key=lambda p: p["label"])
+    result["expected_rows"] = sum(p["expected_rows"] for p in result["partitions"])
+    result["inserted_rows"] = sum(p["inserted_rows"] for p in result["partitions"])
+    result["elapsed"] = time.time() - start
+    if errors:
+        result["error"] = "; ".join(errors)
+        return False, result
+    return True, result
+
+
+def iter_query_batches(
+    conn, select_query: str, batch_size: int = FETCH_BATCH_SIZE
+) -> Iterator[Tuple[int, pl.DataFrame]]:
+    """
+    Stream a SELECT as (batch_index, DataFrame) pairs through a server-side cursor.
+
+    Only one batch of raw rows is held at a time; each is turned into a
+    columnar DataFrame in one call. Columns that are entirely NULL within a
+    batch are typed as Utf8 so every body format can serialize them.
+
+    Args:
+        conn: Open pymysql connection (not used for anything else until exhausted)
+        select_query: SELECT statement
+        batch_size: Rows per fetchmany() call
+
+    Yields:
+        Tuple of (0-based batch index, DataFrame)
+    """
+    with conn.cursor(pymysql.cursors.SSCursor) as cursor:
+        cursor.execute(select_query)
+        columns = [desc[0] for desc in cursor.description]
+
+        index = 0
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+
+            batch = pl.DataFrame(rows, schema=columns, orient="row", infer_schema_length=None)
+            null_columns = [name for name, dtype in batch.schema.items() if dtype == pl.Null]
+            if null_columns:
+                batch = batch.with_columns([pl.col(c).cast(pl.Utf8) for c in null_columns])
+
+            yield index, batch
+            index += 1
+
+
+def stream_select_to_stream_load(
+    conn,
+    loader,
+    select_query: str,
+    target_table: str = "fact_invoice_secondary",
+    batch_size: int = FETCH_BATCH_SIZE,
+    max_in_flight: Optional[int] = None,
+    label_prefix: str = "dd_logic",
+    log: Optional[logging.Logger] = None,
+) -> Tuple[bool, Dict[str, Any]]:
+    """
+    Fetch a SELECT in batches and Stream Load each batch while the next is fetched.
+
+    Args:
+        conn: Open pymysql connection used for the SELECT
+        loader: StarRocksStreamLoader for target_table's database
+        select_query: DD SELECT statement
+        target_table: Table to load into
+        batch_size: Rows per fetch batch / Stream Load request
+        max_in_flight: Concurrent Stream Load requests (default: Config.MAX_CONCURRENT_INSERTS)
+        label_prefix: Load label prefix; each batch gets {prefix}_{index:05d}
+        log: Optional logger
+
+    Returns:
+        Tuple of (success, result_dict) with fetched_rows, total_loaded,
+        total_filtered, batches, failed_chunks and elapsed seconds
+    """
+    log = log or logger
+    start = time.time()
+
+    with conn.cursor() as cursor:
+        table_columns = set(get_table_columns(cursor, target_table))
+
+    fetched = {"rows": 0, "batches": 0}
+    skipped: List[str] = []
+
+    def _batches() -> Iterator[Tuple[int, pl.DataFrame]]:
+        for index, batch in iter_query_batches(conn, select_query, batch_size):
+            if index == 0:
+                skipped.extend(c for c in batch.columns if c not in table_columns)
+                if skipped:
+                    log.warning(
+                        f"{YELLOW}⚠️  Columns in query but not in {target_table} (skipped): {skipped}{RESET}"
+                    )
+            fetched["rows"] += batch.height
+            fetched["batches"] += 1
+            yield index, batch.drop(skipped) if skipped else batch
+
+    def _log_batch(chunk: ChunkLoadResult):
+        if chunk.success:
+            log.info(
+                f"{GREEN}✓ Batch {chunk.index + 1}: {chunk.loaded_rows:,} rows "
+                f"in {chunk.elapsed:.2f}s{RESET}"
+            )
+        else:
+            log.error(
+                f"{RED}❌ Batch {chunk.index + 1} failed after {chunk.attempts} attempt(s): "
+                f"{chunk.result.get('Message', 'Unknown error')}{RESET}"
+            )
+
+    summary = load_chunks_concurrently(
+        _batches(),
+        lambda index, chunk_df, label: loader.stream_load_dataframe(
+            chunk_df, table_name=target_table, chunk_id=f"batch_{index}", label=label
+        ),
+        label_prefix=label_prefix,
+        max_in_flight=max_in_flight,
+        max_retries=1,  # stream_load_dataframe retries each batch itself
+        on_chunk_done=_log_batch,
+        fail_fast=True,
+    )
+
+    result = {
+        "fetched_rows": fetched["rows"],
+        "total_loaded": summary["total_loaded"],
+        "total_filtered": summary["total_filtered"],
+        "batches": fetched["batches"],
+        "failed_chunks": summary["failed_chunks"],
+        "elapsed": time.time() - start,
+    }
+    success = (
+        summary["failed_chunks"] == 0
+        and summary["total_filtered"] == 0
+        and summary["total_loaded"] == fetched["rows"]
+    )
+    if not success:
+        result["error"] = (
+            f"loaded {summary['total_loaded']} of {fetched['rows']} rows "
+            f"({summary['failed_chunks']} failed batch(es), {summary['total_filtered']} filtered)"
+        )
+    return success, result
@@ -6,7 +6,7 @@ for dimension tables like DimDealerMaster, DimCustomerMaster, DimHierarchy, etc.
 """
 
 import logging
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Union
 import polars as pl
 
 # Color codes for console output
@@ -97,27 +97,36 @@ def validate_schema_alignment(
 
 
 def apply_type_conversions(
-    df: pl.DataFrame,
+    df: Union[pl.DataFrame, pl.LazyFrame],
     schema_info: Dict[str, Any],
     table_name: str,
     logger: Optional[logging.Logger] = None,
-) -> pl.DataFrame:
+) -> Union[pl.DataFrame, pl.LazyFrame]:
     """Apply data type conversions based on schema definition
 
+    All renames are applied in one rename and all casts in one with_columns,
+    so a DataFrame is copied once and a LazyFrame gets a single projection.
+
     Args:
-        df: Polars DataFrame
+        df: Polars DataFrame or LazyFrame
         schema_info: Schema dictionary from schema file
         table_name: Name of the table
         logger: Optional logger instance
 
     Returns:
-        DataFrame with converted types
+        DataFrame (or LazyFrame) with converted types
     """
     try:
         file_schema = schema_info.get(table_name, {})
+        if isinstance(df, pl.LazyFrame):
+            columns = set(df.collect_schema().names())
+        else:
+            columns = set(df.columns)
 
+        renames = {}
+        casts = []
         for column, info in file_schema.items():
-            if column not in df.columns:
+            if column not in columns:
                 continue
 
             new_name = info.get("name", column)
@@ -125,27 +134,20 @@ def apply_type_conversions(
 
             # Rename column if needed
             if column != new_name:
-                df = df.rename({column: new_name})
+                renames[column] = new_name
 
-            # Apply type conversions
+            # Apply type conversions (non-strict: unparseable values become NULL)
             if data_type in ["int", "integer"]:
-                df = df.with_columns(
-                    pl.when(pl.col(new_name).is_null())
-                    .then(None)
-                    .otherwise(pl.col(new_name))
-                    .cast(pl.Int64, strict=False)
-                    .alias(new_name)
-                )
+                casts.append(pl.col(new_name).cast(pl.Int64, strict=False))
             elif data_type in ["float", "double"]:
-                df = df.with_columns(
-                    pl.when(pl.col(new_name).is_null())
-                    .then(None)
-                    .otherwise(pl.col(new_name))
-                    .cast(pl.Float64, strict=False)
-                    .alias(new_name)
-                )
+                casts.append(pl.col(new_name).cast(pl.Float64, strict=False))
             elif data_type in ["str", "string", "varchar"]:
-                df = df.with_columns(pl.col(new_name).cast(pl.Utf8).alias(new_name))
+                casts.append(pl.col(new_name).cast(pl.Utf8))
+
+        if renames:
+            df = df.rename(renames)
+        if casts:
+            df = df.with_columns(casts)
 
         return df
 
@@ -179,37 +181,54 @@ def apply_dim_dealer_etl(df: pl.DataFrame, logger: Optional[logging.Logger] = No
             ]
         )
 
-        # 2. Build dealer mapping from active dealers
-        dealer_mapping = {}
-        total_rows = df.height
-        chunk_size = 50000
-
-        for i in range(0, total_rows, chunk_size):
-            chunk = df.slice(i, chunk_size)
-            # Process chunk in batches to minimize memory usage
-            for row in chunk.to_dicts():
-                if row.get("ActiveFlag") == "True" and row.get("DealerCode"):
-                    dealer_mapping[row["DealerCode"]] = row.get("DealerName")
+        # 2. Dealer mapping from active dealers: DealerCode → DealerName.
+        #    Only ActiveFlag == "True" (string flag) and non-empty DealerCode; the last row wins.
+        if df.schema.get("ActiveFlag") == pl.Utf8:
+            dealer_mapping = (
+                df.lazy()
+                .filter(
+                    (pl.col("ActiveFlag") == "True")
+                    & pl.col("DealerCode").is_not_null()
+                    & (pl.col("DealerCode").cast(pl.Utf8) != "")
+                )
+                .select(
+                    pl.col("DealerCode").cast(df.schema["DealerGroupCode"]),
+                    pl.col("DealerName").cast(pl.Utf8),
+                )
+                .unique(subset="DealerCode", keep="last", maintain_order=True)
+                .collect()
+            )
+        else:
+            dealer_mapping = pl.DataFrame(
+                schema={"DealerCode": df.schema["DealerGroupCode"], "DealerName": pl.Utf8}
+            )
 
         if logger:
-            logger.info(f"{GREEN}✓ DimDealerMaster ETL: {len(dealer_mapping):,} active dealers mapped{RESET}")
-
-        # 3. Apply the CASE logic for DealerGroupName
-        def get_dealer_group_name(dealer_group_code, dealer_code, dealer_name):
-            if dealer_group_code != dealer_code:
-                return dealer_mapping.get(dealer_group_code, dealer_name)
-            else:
-                return dealer_name
+            logger.info(f"{GREEN}✓ DimDealerMaster ETL: {dealer_mapping.height:,} active dealers mapped{RESET}")
+
+        # 3. CASE logic for DealerGroupName:
+        #    DealerGroupCode != DealerCode (null-aware) → mapped name of the group code,
+        #    DealerName if the group code is not mapped; otherwise DealerName.
+        #    A mapped NULL name stays NULL.
+        dealer_name = pl.col("DealerName").cast(pl.Utf8)
+        if dealer_mapping.is_empty():
+            group_name = dealer_name
+        else:
+            group_name = pl.col("DealerGroupCode").replace_strict(
+                dealer_mapping["DealerCode"],
+                dealer_mapping["DealerName"],
+                default=dealer_name,
+                return_dtype=pl.Utf8,
+            )
 
         df = df.with_columns(
             [
-                pl.struct(["DealerGroupCode", "DealerCode", "DealerName"])
-                .map_elements(
-                    lambda x: get_dealer_group_name(
-                        x["DealerGroupCode"], x["DealerCode"], x["DealerName"]
-                    ),
-                    return_dtype=pl.Utf8,
+                pl.when(
+                    pl.col("DealerGroupCode").is_not_null()
+                    & pl.col("DealerGroupCode").ne_missing(pl.col("DealerCode"))
                 )
+                .then(group_name)
+                .otherwise(dealer_name)
                 .alias("DealerGroupName")
             ]
         )
@@ -9,13 +9,13 @@ Supports both legacy (Config-based) and multi-tenant (tenant_config-based) modes
 """
 
 import sys
+import threading
 import time
+import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, Optional, Tuple, Union, TYPE_CHECKING
 
 import polars as pl
-import pymysql
-import requests
 
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
@@ -30,6 +30,37 @@ from utils.pipeline_config import (  # noqa: E402
     Config,
 )
 from utils.dim_transform_utils import apply_type_conversions  # noqa: E402
+from utils.load_tracking import (  # noqa: E402
+    TRACKED_DATE_COLUMNS,
+    dates_in_range,
+    record_loaded_dates,
+)
+from utils.chunk_planner import plan_load_chunks  # noqa: E402
+from utils.parquet_index import read_parquet_filtered  # noqa: E402
+from core.loaders.date_range_delete import FACT_DATE_COLUMNS, delete_date_range  # noqa: E402
+from core.loaders.connection_pool import (  # noqa: E402
+    StarRocksConnectionPool,
+    get_connection_pool,
+)
+from core.loaders.parallel_stream_load import (  # noqa: E402
+    ChunkLoadResult,
+    iter_frame_chunks,
+    load_chunks_concurrently,
+)
+from core.loaders.starrocks_stream_loader import StarRocksStreamLoader  # noqa: E402
+from core.loaders.stream_load_formats import (  # noqa: E402
+    get_stream_load_format,
+    resolve_stream_load_format,
+)
+from core.loaders.stream_load_transport import (  # noqa: E402
+    discover_backends,
+    get_stream_load_transport,
+)
+from core.loaders.table_swap import (  # noqa: E402
+    create_shadow_table,
+    drop_table,
+    swap_shadow_table,
+)
 from core.transformers.transformation_engine import (  # noqa: E402
     validate_and_transform_dataframe,
 )
@@ -52,7 +83,7 @@ class ETLOrchestrator:
     Orchestrates complete ETL pipeline for dimension tables.
 
     Pipeline flow:
-    1. EXTRACT: Read parquet file
+    1. EXTRACT: Read parquet file (or scan it lazily, see enable_lazy_transform)
     2. TRANSFORM: Apply schema mappings and column renames
     3. CLEAN: Normalize data types and values
     4. VALIDATE: Check schema alignment
@@ -61,13 +92,28 @@ class ETLOrchestrator:
     Supports both legacy and multi-tenant modes.
     """
 
-    def __init__(self, tenant_config: Optional['TenantConfig'] = None, logger=None):
+    def __init__(
+        self,
+        tenant_config: Optional['TenantConfig'] = None,
+        logger=None,
+        lazy_transform: Optional[bool] = None,
+        transactional: Optional[bool] = None,
+        load_strategy: Optional[str] = None,
+    ):
         """
         Initialize ETL orchestrator.
 
         Args:
             tenant_config: Optional TenantConfig for multi-tenant mode
             logger: Optional logger instance
+            lazy_transform: Scan parquet lazily and collect the transform plan once
+                            (default: tenant feature enable_lazy_transform, off in legacy mode)
+            transactional: Load all chunks of a table in one Stream Load transaction
+                           (default: tenant stream_load.transactional, off in legacy mode)
+            load_strategy: How truncate=True reloads run: "truncate" (TRUNCATE, then load)
+                           or "swap" (load a shadow table, verify, ALTER TABLE ... SWAP WITH)
+                           (default: tenant stream_load.load_strategy / Config.LOAD_STRATEGY;
+                           transactional reloads always swap)
 
         If tenant_config is provided, uses tenant-specific configuration.
         Otherwise, falls back to shared Config (legacy mode).
@@ -86,6 +132,15 @@ class ETLOrchestrator:
             self.timeout = tenant_config.stream_load_timeout
             self.max_error_ratio = tenant_config.max_error_ratio
             self.chunk_size = tenant_config.chunk_size
+            self.memory_budget_mb = tenant_config.max_memory_mb
+            self.target_body_mb = tenant_config.stream_load_target_body_mb
+            self.max_concurrent_loads = tenant_config.max_concurrent_loads
+            body_format = tenant_config.stream_load_format
+            lazy_default = tenant_config.enable_lazy_transform
+            transactional_default = tenant_config.stream_load_transactional
+            strategy_default = tenant_config.stream_load_load_strategy
+            direct_to_be = tenant_config.stream_load_direct_to_be
+            backends = tenant_config.stream_load_backends
         else:
             # Legacy mode: use shared Config
             self.host = Config.STARROCKS_HOST
@@ -96,19 +151,53 @@ class ETLOrchestrator:
             self.database = Config.STARROCKS_DATABASE
             self.timeout = Config.STREAM_LOAD_TIMEOUT
             self.max_error_ratio = Config.MAX_ERROR_RATIO
-            self.chunk_size = Config.CHUNK_SIZE
+            self.chunk_size = Config.CHUNK_SIZE or None
+            self.memory_budget_mb = Config.MEMORY_BUDGET_MB
+            self.target_body_mb = Config.STREAM_LOAD_TARGET_BODY_MB
+            self.max_concurrent_loads = Config.MAX_CONCURRENT_INSERTS
+            body_format = None
+            lazy_default = False
+            transactional_default = False
+            strategy_default = Config.LOAD_STRATEGY
+            direct_to_be = False
+            backends = None
+
+        self.lazy_transform = lazy_default if lazy_transform is None else lazy_transform
+        self.transactional = (
+            transactional_default if transactional is None else transactional
+        )
+        self.load_strategy = strategy_default if load_strategy is None else load_strategy
 
-    def get_starrocks_connection(self):
-        """Create MySQL connection to StarRocks for metadata operations."""
-        return pymysql.connect(
-            host=self.host,
-            port=self.port,
-            user=self.user,
-            password=self.password,
-            database=self.database,
-            charset="utf8mb4",
-            autocommit=True,
+        # Stream Load body format (CSV unless a typed format is configured)
+        self.body_format = get_stream_load_format(body_format)
+        self.bytes_sent_by_format: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()  # Chunks load on worker threads
+
+        # Shared keep-alive HTTP transport (optionally round-robins BEs)
+        self.transport = get_stream_load_transport(
+            self.host, self.http_port, direct_to_be, backends
         )
+        if direct_to_be and not backends:
+            self.transport.set_backend_discovery(
+                lambda: discover_backends(self.connection_pool)
+            )
+
+    @property
+    def connection_pool(self) -> StarRocksConnectionPool:
+        """Process-wide connection pool for this orchestrator's database."""
+        return get_connection_pool(
+            {
+                "host": self.host,
+                "port": self.port,
+                "user": self.user,
+                "password": self.password,
+                "database": self.database,
+            }
+        )
+
+    def get_starrocks_connection(self):
+        """Check out a pooled MySQL connection for metadata operations (close() returns it)."""
+        return self.connection_pool.acquire()
 
     def get_table_columns(self, table_name: str) -> Dict[str, str]:
         """
@@ -121,13 +210,11 @@ class ETLOrchestrator:
             Dict of {column_name: column_type}
         """
         try:
-            conn = self.get_starrocks_connection()
-            with conn.cursor() as cursor:
+            with self.get_starrocks_connection() as conn, conn.cursor() as cursor:
                 cursor.execute(f"DESC {table_name}")
                 rows = cursor.fetchall()
                 # DESC returns (column_name, type, ...)
                 columns = {row[0]: row[1] for row in rows}
-            conn.close()
             logger.info(f"{GREEN}✓ Fetched {len(columns)} columns from {table_name}{RESET}")
             return columns
         except Exception as e:
@@ -145,38 +232,176 @@ class ETLOrchestrator:
             True if successful, False otherwise
         """
         try:
-            conn = self.get_starrocks_connection()
-            with conn.cursor() as cursor:
+            with self.get_starrocks_connection() as conn, conn.cursor() as cursor:
                 logger.info(f"{YELLOW}Truncating {table_name}...{RESET}")
                 cursor.execute(f"TRUNCATE TABLE {table_name}")
-            conn.close()
             logger.info(f"{GREEN}✓ Truncated {table_name}{RESET}")
             return True
         except Exception as e:
             logger.error(f"{RED}Error truncating table: {e}{RESET}")
             return False
 
-    def extract(self, parquet_path: Path) -> Optional[pl.DataFrame]:
+    def delete_dates(self, table_name: str, date_range: Tuple[int, int]) -> bool:
+        """
+        Delete a fact table's rows in a date range to prepare for reloading it.
+
+        Args:
+            table_name: Fact table (see FACT_DATE_COLUMNS)
+            date_range: (first, last) YYYYMMDD dates, inclusive
+
+        Returns:
+            True if successful, False otherwise
+        """
+        lo, hi = date_range
+        try:
+            with self.get_starrocks_connection() as conn:
+                logger.info(f"{YELLOW}Deleting {table_name} rows for {lo}..{hi}...{RESET}")
+                summary = delete_date_range(
+                    conn, table_name, FACT_DATE_COLUMNS[table_name], lo, hi
+                )
+            partitions = summary["partitions"]
+            scope = "unpartitioned" if partitions is None else f"{len(partitions)} partition(s)"
+            logger.info(f"{GREEN}✓ Deleted {table_name} rows for {lo}..{hi} ({scope}){RESET}")
+            return True
+        except Exception as e:
+            logger.error(f"{RED}Error deleting date range: {e}{RESET}")
+            return False
+
+    def load_via_shadow_table(
+        self, df: pl.DataFrame, table_name: str
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Full reload without an empty-table window: load a shadow table, then swap it in.
+
+        The shadow (CREATE TABLE ... LIKE) is Stream Loaded, its row count is
+        checked against the rows StarRocks reported as loaded, and
+        ALTER TABLE ... SWAP WITH replaces the live table atomically. On any
+        failure the shadow is dropped and the live table keeps serving the
+        previous data.
+
+        Args:
+            df: DataFrame to load
+            table_name: Live database table name
+
+        Returns:
+            Tuple of (success_bool, result_dict) - load() result plus "swap"
+        """
+        pool = self.connection_pool
+        try:
+            shadow = create_shadow_table(pool, table_name)
+        except Exception as e:
+            logger.error(f"{RED}[LOAD] Could not create shadow table for {table_name}: {e}{RESET}")
+            return False, {"error": f"Could not create shadow table: {e}"}
+        logger.info(f"{CYAN}Loading {table_name} via shadow table {shadow}...{RESET}")
+
+        load_success, load_result = self.load(df, shadow)
+        if not load_success:
+            try:
+                drop_table(pool, shadow)
+            except Exception as e:
+                logger.warning(f"{YELLOW}Could not drop shadow table {shadow}: {e}{RESET}")
+            logger.error(
+                f"{RED}[LOAD] Shadow load failed; {table_name} left unchanged{RESET}"
+            )
+            return False, load_result
+
+        swap_success, swap_result = swap_shadow_table(
+            pool, table_name, shadow, expected_rows=load_result.get("total_loaded")
+        )
+        load_result["swap"] = swap_result
+        if not swap_success:
+            logger.error(
+                f"{RED}[LOAD] Swap aborted, {table_name} left unchanged: "
+                f"{swap_result.get('error')}{RESET}"
+            )
+            return False, load_result
+
+        logger.info(
+            f"{GREEN}✓ Swapped {shadow} into {table_name} "
+            f"({swap_result['previous_rows']:,} → {swap_result['shadow_rows']:,} rows, "
+            f"{swap_result['swap_seconds']:.2f}s){RESET}"
+        )
+        return True, load_result
+
+    def extract(
+        self,
+        parquet_path: Path,
+        date_range: Optional[Tuple[int, int]] = None,
+        date_column: Optional[str] = None,
+    ) -> Optional[pl.DataFrame]:
         """
         EXTRACT: Read parquet file into DataFrame.
 
+        With a date range, only the row groups whose statistics overlap it are
+        read (utils.parquet_index), then filtered to the range.
+
         Args:
             parquet_path: Path to parquet file
+            date_range: Optional (first, last) YYYYMMDD dates to keep, inclusive
+            date_column: Indexed date column of the range (e.g. "posting_date")
 
         Returns:
             Polars DataFrame or None if error
         """
         try:
             logger.info(f"{CYAN}[EXTRACT] Reading {parquet_path.name}...{RESET}")
-            df = pl.read_parquet(parquet_path)
+            if date_range is not None:
+                lo, hi = date_range
+                df = read_parquet_filtered(parquet_path, date_column, lo, hi)
+                logger.info(f"{CYAN}  Kept {date_column} {lo}..{hi}{RESET}")
+            else:
+                df = pl.read_parquet(parquet_path)
             logger.info(f"{GREEN}✓ Extracted {len(df):,} rows × {len(df.columns)} columns{RESET}")
             return df
         except Exception as e:
             logger.error(f"{RED}[EXTRACT] Error reading parquet: {e}{RESET}")
             return None
 
+    def extract_lazy(
+        self,
+        parquet_path: Path,
+        date_range: Optional[Tuple[int, int]] = None,
+        date_column: Optional[str] = None,
+    ) -> Optional[pl.LazyFrame]:
+        """
+        EXTRACT (lazy): Scan parquet file without reading it.
+
+        Transform builds its whole plan on top of the scan, so projections and
+        the date filter are pushed down into the parquet reader (which skips
+        row groups by their statistics, as extract() does via the index).
+
+        Args:
+            parquet_path: Path to parquet file
+            date_range: Optional (first, last) YYYYMMDD dates to keep, inclusive
+            date_column: Date column of the range (matched case-insensitively)
+
+        Returns:
+            Polars LazyFrame or None if error
+        """
+        try:
+            logger.info(f"{CYAN}[EXTRACT] Scanning {parquet_path.name} (lazy)...{RESET}")
+            lf = pl.scan_parquet(parquet_path)
+            if date_range is not None:
+                lo, hi = date_range
+                names = {name.lower(): name for name in lf.collect_schema().names()}
+                column = names.get(date_column.lower()) or names.get(date_column.replace("_", ""))
+                if column is None:
+                    raise ValueError(f"{date_column} not in {parquet_path.name}")
+                # Raw parquets keep dates as strings; compare YYYYMMDD numerically
+                lf = lf.filter(pl.col(column).cast(pl.Int64, strict=False).is_between(lo, hi))
+                logger.info(f"{CYAN}  Kept {date_column} {lo}..{hi}{RESET}")
+            logger.info(f"{GREEN}✓ Planned scan of {len(lf.collect_schema())} columns{RESET}")
+            return lf
+        except Exception as e:
+            logger.error(f"{RED}[EXTRACT] Error scanning parquet: {e}{RESET}")
+            return None
+
     def transform(
-        self, df: pl.DataFrame, table_name: str, schema: Dict
+        self,
+        df: Union[pl.DataFrame, pl.LazyFrame],
+        table_name: str,
+        schema: Dict,
+        db_columns: Optional[Dict[str, str]] = None,
     ) -> Tuple[Optional[pl.DataFrame], Dict[str, str]]:
         """
         TRANSFORM: Apply schema mappings and column renames using centralized engine.
@@ -189,9 +414,11 @@ class ETLOrchestrator:
         - VARCHAR overflow auto-fix
 
         Args:
-            df: Input DataFrame
+            df: Input DataFrame, or LazyFrame (collected once inside the engine)
             table_name: Database table name
             schema: Schema dictionary (not used, kept for compatibility)
+            db_columns: Optional DB column types; the type conversions of clean()
+                        then run inside the transform (one plan for a LazyFrame)
 
         Returns:
             Tuple of (transformed_df, column_mapping_dict) or (None, {}) if error
@@ -201,7 +428,7 @@ class ETLOrchestrator:
 
             # Use centralized transformation engine
             transformed_df, metadata = validate_and_transform_dataframe(
-                df, table_name, self.tenant_config, logger
+                df, table_name, self.tenant_config, logger, db_columns=db_columns
             )
 
             # Extract column mapping from metadata for compatibility
@@ -301,7 +528,12 @@ class ETLOrchestrator:
         """
         LOAD: Stream Load into StarRocks using HTTP API.
 
-        For large datasets, chunks data into CHUNK_SIZE rows per batch.
+        For large datasets, chunks data into rows sized by the adaptive chunk
+        planner (memory budget, target body size; or a fixed chunk_size) and keeps
+        up to max_concurrent_loads Stream Load requests in flight, so the next
+        chunk is serialized while the previous one uploads. Chunks get ordered
+        labels and are retried individually; once a chunk fails for good, no
+        further chunks are sent.
 
         Args:
             df: DataFrame to load
@@ -338,73 +570,182 @@ class ETLOrchestrator:
             df = df.select(valid_columns)
 
             total_rows = len(df)
-            num_chunks = (total_rows + self.chunk_size - 1) // self.chunk_size
+            plan = plan_load_chunks(
+                df,
+                table_name,
+                max_in_flight=self.max_concurrent_loads,
+                target_body_mb=self.target_body_mb,
+                memory_budget_mb=self.memory_budget_mb,
+                fixed_rows=self.chunk_size,
+                log=logger,
+            )
+            chunk_size = plan.rows
+            num_chunks = plan.num_chunks
+
+            # Settle the body format once, before chunks go out to worker threads
+            self.body_format = resolve_stream_load_format(self.body_format, self.connection_pool)
+
+            if self.transactional:
+                return self._load_transactional(df, table_name, chunk_size, num_chunks)
 
             if num_chunks > 1:
                 logger.info(
-                    f"{CYAN}Loading {total_rows:,} rows in {num_chunks} chunks...{RESET}"
+                    f"{CYAN}Loading {total_rows:,} rows in {num_chunks} chunks "
+                    f"({self.max_concurrent_loads} in flight)...{RESET}"
                 )
 
-            total_loaded = 0
-            total_failed = 0
-
-            for i in range(num_chunks):
-                start_idx = i * self.chunk_size
-                end_idx = min((i + 1) * self.chunk_size, total_rows)
-
-                chunk_df = df[start_idx:end_idx]
-                chunk_label = f"{table_name}_{int(time.time())}_{i}"
-
-                # Save chunk to CSV with SOH delimiter (columns now in DB order)
-                import tempfile  # noqa: F401, E402
-
-                with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
-                    csv_path = Path(f.name)
-                    chunk_df.write_csv(csv_path, separator="\x01", include_header=False)
-
-                # Stream Load this chunk
-                success, result = self._stream_load_chunk(table_name, csv_path, chunk_label)
-
-                # Clean up temp file
-                csv_path.unlink()
-
-                if success:
-                    loaded = result.get("NumberLoadedRows", 0)
-                    total_loaded += loaded
-                else:
-                    filtered = result.get("NumberFilteredRows", 0)
-                    total_failed += filtered
+            completed = 0
 
+            def _log_chunk(chunk: ChunkLoadResult):
+                nonlocal completed
+                completed += 1
                 # Only log failures or every 10th chunk for large jobs
-                if not success:
-                    logger.warning(f"{YELLOW}⚠ Chunk {i+1}/{num_chunks} filtered {total_failed:,} rows{RESET}")
-                elif num_chunks > 10 and (i + 1) % 10 == 0:
-                    logger.info(f"{GREEN}✓ Progress: {i+1}/{num_chunks} chunks loaded{RESET}")
+                if not chunk.success:
+                    logger.warning(
+                        f"{YELLOW}⚠ Chunk {chunk.index + 1}/{num_chunks} failed after "
+                        f"{chunk.attempts} attempt(s), filtered {chunk.filtered_rows:,} rows{RESET}"
+                    )
+                elif num_chunks > 10 and completed % 10 == 0:
+                    logger.info(f"{GREEN}✓ Progress: {completed}/{num_chunks} chunks loaded{RESET}")
                 elif num_chunks <= 3:
                     # For small jobs (≤3 chunks), show each chunk
-                    logger.info(f"{GREEN}✓ Chunk {i+1}/{num_chunks} loaded {end_idx - start_idx:,} rows{RESET}")
+                    logger.info(
+                        f"{GREEN}✓ Chunk {chunk.index + 1}/{num_chunks} loaded {chunk.rows:,} rows{RESET}"
+                    )
+
+            # Ordered labels: {table}_{ts}_{uuid8}[_{chunk_id}]_{index}
+            # (uuid keeps two loads started in the same second apart)
+            label_prefix = f"{table_name}_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+            if chunk_id is not None:
+                label_prefix = f"{label_prefix}_{chunk_id}"
+
+            summary = load_chunks_concurrently(
+                iter_frame_chunks(df, chunk_size),
+                lambda index, chunk_df, label: self._stream_load_chunk(
+                    table_name, chunk_df, label
+                ),
+                label_prefix=label_prefix,
+                max_in_flight=self.max_concurrent_loads,
+                on_chunk_done=_log_chunk,
+                fail_fast=True,
+            )
+            if summary["stopped_early"]:
+                logger.error(
+                    f"{RED}[LOAD] Stopped after a failed chunk - "
+                    f"remaining chunks of {table_name} not sent{RESET}"
+                )
+            total_loaded = summary["total_loaded"]
+            total_failed = summary["total_filtered"]
+            failed_chunks = summary["failed_chunks"]
 
             # Summary
             logger.info(
                 f"{GREEN}✓ Stream Load complete: {total_loaded:,} loaded, "
                 f"{total_failed:,} filtered{RESET}"
             )
+            for format_name, sent in self.bytes_sent_by_format.items():
+                logger.info(f"{CYAN}  Sent ({format_name}): {sent / 1024 / 1024:.2f}MB{RESET}")
 
-            return (total_failed == 0), {"total_loaded": total_loaded, "total_failed": total_failed}
+            return (total_failed == 0 and failed_chunks == 0), {
+                "total_loaded": total_loaded,
+                "total_failed": total_failed,
+                "failed_chunks": failed_chunks,
+            }
 
         except Exception as e:
             logger.error(f"{RED}[LOAD] Stream Load error: {e}{RESET}")
             return False, {"error": str(e)}
 
+    def _load_transactional(
+        self, df: pl.DataFrame, table_name: str, chunk_size: int, num_chunks: int
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Load all chunks inside one Stream Load transaction (all-or-nothing).
+
+        Only chunks that could not reach a backend (connection errors) are
+        re-sent while the transaction is open. A chunk the server rejects, or
+        one that still cannot connect, rolls back the whole transaction, and the
+        table is left exactly as it was before the load. orchestrate() runs
+        truncate=True reloads in transactional mode through the shadow-table
+        swap, so a rollback never leaves a truncated table behind.
+
+        Args:
+            df: DataFrame to load (columns in DB order)
+            table_name: Database table name
+            chunk_size: Rows per chunk
+            num_chunks: Number of chunks (for logging)
+
+        Returns:
+            Tuple of (success_bool, result_dict)
+        """
+        loader_kwargs = {
+            "logger": self.logger,
+            "max_error_ratio": self.max_error_ratio,
+            "body_format": self.body_format.name,
+        }
+        if self.tenant_config is not None:
+            loader = StarRocksStreamLoader(tenant_config=self.tenant_config, **loader_kwargs)
+        else:
+            loader = StarRocksStreamLoader(
+                config={
+                    "host": self.host,
+                    "port": self.port,
+                    "http_port": self.http_port,
+                    "user": self.user,
+                    "password": self.password,
+                    "database": self.database,
+                },
+                **loader_kwargs,
+            )
+        loader.stream_load_timeout = self.timeout
+
+        logger.info(
+            f"{CYAN}Loading {len(df):,} rows in {num_chunks} chunk(s) as one transaction "
+            f"({self.max_concurrent_loads} in flight)...{RESET}"
+        )
+        success, result = loader.load_dataframe_transactional(
+            df,
+            table_name,
+            chunk_size=chunk_size,
+            max_in_flight=self.max_concurrent_loads,
+        )
+        for format_name, sent in loader.bytes_sent_by_format.items():
+            with self._stats_lock:
+                self.bytes_sent_by_format[format_name] = (
+                    self.bytes_sent_by_format.get(format_name, 0) + sent
+                )
+
+        if success:
+            logger.info(
+                f"{GREEN}✓ Transaction {result['Label']} committed: "
+                f"{result['NumberLoadedRows']:,} loaded, "
+                f"{result['RetriedChunks']} chunk(s) retried{RESET}"
+            )
+        else:
+            logger.error(
+                f"{RED}[LOAD] Transaction {result.get('Label', '')} rolled back: "
+                f"{result.get('Message', 'Unknown error')}{RESET}"
+            )
+
+        return success, {
+            "total_loaded": result.get("NumberLoadedRows", 0) if success else 0,
+            "total_failed": result.get("NumberFilteredRows", 0),
+            "failed_chunks": result.get("FailedChunks", 0),
+            "transaction": result.get("Label"),
+        }
+
     def _stream_load_chunk(
-        self, table_name: str, csv_path: Path, label: str
+        self, table_name: str, chunk_df: pl.DataFrame, label: str
     ) -> Tuple[bool, Dict[str, Any]]:
         """
         Execute Stream Load for a single chunk.
 
+        The chunk is serialized into the HTTP body in the body format settled
+        by load() (self.body_format), so no temp file is written.
+
         Args:
             table_name: Database table name
-            csv_path: Path to CSV file to load
+            chunk_df: DataFrame chunk to load (columns in DB order)
             label: Unique label for this load
 
         Returns:
@@ -414,11 +755,13 @@ class ETLOrchestrator:
             f"http://{self.host}:{self.http_port}/api/" f"{self.database}/{table_name}/_stream_load"
         )
 
+        fmt = self.body_format
         headers = {
             "label": label,
-            "column_separator": "\x01",
-            "format": "CSV",
+            **fmt.headers(),
             "max_filter_ratio": str(self.max_error_ratio),
+            # Non-transactional chunks commit one by one, so values that fail
+            # conversion load as NULL; strict mode is left to transactional loads
             "strict_mode": "false",
             "timezone": "Asia/Shanghai",
             "Expect": "100-continue",
@@ -427,12 +770,13 @@ class ETLOrchestrator:
         auth = (self.user, self.password)
 
         try:
-            with open(csv_path, "rb") as f:
-                file_data = f.read()
-
-            response = requests.put(
-                url, headers=headers, data=file_data, auth=auth, timeout=self.timeout
+            response, bytes_sent = self.transport.put(
+                url, headers, lambda: fmt.iter_body(chunk_df), auth, self.timeout
             )
+            with self._stats_lock:
+                self.bytes_sent_by_format[fmt.name] = (
+                    self.bytes_sent_by_format.get(fmt.name, 0) + bytes_sent
+                )
 
             result = response.json()
 
@@ -442,6 +786,7 @@ class ETLOrchestrator:
                 # Parse error details
                 status = result.get("Status", "Unknown")
                 message = result.get("Message", "No message")
+
                 total = result.get("NumberTotalRows", 0)
                 loaded = result.get("NumberLoadedRows", 0)
                 filtered = result.get("NumberFilteredRows", 0)
@@ -461,21 +806,84 @@ class ETLOrchestrator:
             logger.error(f"{RED}Stream Load exception: {e}{RESET}")
             return False, {"error": str(e)}
 
+    def track_loaded_dates(self, df: pl.DataFrame, table_name: str, result: Dict[str, Any]):
+        """
+        Record the distinct dates of a tracked table's load in the tenant state directory.
+
+        Only tables listed in load_tracking.TRACKED_DATE_COLUMNS are tracked, and
+        only in multi-tenant mode (the state lives under the tenant's data path).
+
+        Args:
+            df: DataFrame that was loaded
+            table_name: Database table name
+            result: orchestrate() result dict; gets a "loaded_dates" count
+        """
+        date_column = TRACKED_DATE_COLUMNS.get(table_name)
+        if self.tenant_config is None or date_column not in df.columns:
+            return
+
+        try:
+            dates = (
+                df.get_column(date_column).cast(pl.Int64, strict=False).drop_nulls().unique()
+            ).to_list()
+            pending = record_loaded_dates(self.tenant_config.data_state_path, table_name, dates)
+            result["loaded_dates"] = len(dates)
+            logger.info(
+                f"{CYAN}Tracked {len(dates)} {date_column} value(s) for {table_name} "
+                f"({pending} pending for downstream jobs){RESET}"
+            )
+        except Exception as e:
+            logger.warning(f"{YELLOW}Could not record loaded dates for {table_name}: {e}{RESET}")
+
+    def track_deleted_dates(self, table_name: str, date_range: Tuple[int, int]):
+        """
+        Record every date of a deleted range of a tracked table in the tenant state directory.
+
+        Called as soon as delete_dates succeeds, so incremental jobs recompute the
+        range even if the reload fails later or brings no rows for some dates.
+
+        Args:
+            table_name: Database table name
+            date_range: (first, last) YYYYMMDD dates that were deleted, inclusive
+        """
+        if self.tenant_config is None or table_name not in TRACKED_DATE_COLUMNS:
+            return
+
+        try:
+            dates = dates_in_range(*date_range)
+            pending = record_loaded_dates(self.tenant_config.data_state_path, table_name, dates)
+            logger.info(
+                f"{CYAN}Tracked {len(dates)} deleted {TRACKED_DATE_COLUMNS[table_name]} value(s) "
+                f"for {table_name} ({pending} pending for downstream jobs){RESET}"
+            )
+        except Exception as e:
+            logger.warning(f"{YELLOW}Could not record deleted dates for {table_name}: {e}{RESET}")
+
     def orchestrate(
         self,
         parquet_path: Path,
         table_name: str,
         schema: Optional[Dict] = None,
         truncate: bool = True,
+        date_range: Optional[Tuple[int, int]] = None,
     ) -> Tuple[bool, Dict[str, Any]]:
         """
         Execute complete ETL pipeline: Extract → Transform → Clean → Validate → Load.
 
+        With date_range, only that range of a fact table is reloaded: extract
+        reads just the row groups covering it, and the range's rows are deleted
+        (instead of truncating the table) before loading. The delete runs
+        before the load, also in transactional mode, so a failed load leaves
+        the range empty until it is re-run.
+
         Args:
             parquet_path: Path to parquet file
             table_name: Database table name
             schema: Schema dictionary (if None, will be loaded from db/column_mappings/)
-            truncate: Whether to truncate table before loading
+            truncate: Whether to replace the table's contents (TRUNCATE before the
+                      load, or a shadow-table swap after it - see load_strategy);
+                      ignored with date_range
+            date_range: Optional (first, last) YYYYMMDD dates to reload (fact tables)
 
         Returns:
             Tuple of (success_bool, result_dict) with pipeline metadata
@@ -516,19 +924,56 @@ class ETLOrchestrator:
                 if not schema:
                     raise Exception(f"Could not load schema for {table_name}")
 
-            # STEP 1: EXTRACT
-            df = self.extract(parquet_path)
-            if df is None:
-                raise Exception("Extract failed")
-            result["steps"]["extract"] = {"rows": len(df), "columns": len(df.columns)}
+            date_column = None
+            if date_range is not None:
+                date_column = FACT_DATE_COLUMNS.get(table_name)
+                if date_column is None:
+                    raise Exception(f"{table_name} has no date column for a date-range reload")
+                truncate = False
+                result["date_range"] = list(date_range)
 
-            # STEP 2: TRUNCATE (if requested)
-            if truncate:
+            # STEP 1: EXTRACT
+            if self.lazy_transform:
+                df = self.extract_lazy(parquet_path, date_range, date_column)
+                if df is None:
+                    raise Exception("Extract failed")
+                # Row count of a parquet scan comes from the file footer
+                result["steps"]["extract"] = {
+                    "rows": df.select(pl.len()).collect().item(),
+                    "columns": len(df.collect_schema()),
+                    "lazy": True,
+                }
+            else:
+                df = self.extract(parquet_path, date_range, date_column)
+                if df is None:
+                    raise Exception("Extract failed")
+                result["steps"]["extract"] = {"rows": len(df), "columns": len(df.columns)}
+
+            # STEP 2: TRUNCATE (if requested; the swap strategy replaces the table after loading)
+            # A transaction cannot roll back a TRUNCATE, so transactional reloads always swap
+            swap = truncate and (self.load_strategy == "swap" or self.transactional)
+            if swap and self.load_strategy != "swap":
+                logger.info(
+                    f"{CYAN}Transactional reload of {table_name}: "
+                    f"using shadow-table swap instead of TRUNCATE{RESET}"
+                )
+            if truncate and not swap:
                 if not self.truncate_table(table_name):
                     logger.warning(f"{YELLOW}Truncate failed, continuing anyway{RESET}")
-
-            # STEP 3: TRANSFORM
-            df, mapping = self.transform(df, table_name, schema)
+            elif date_range is not None:
+                if not self.delete_dates(table_name, date_range):
+                    raise Exception(f"Could not delete {table_name} rows for {date_range}")
+                self.track_deleted_dates(table_name, date_range)
+
+            # STEP 3: TRANSFORM (lazy: with the CLEAN type conversions in the same plan)
+            db_columns = None
+            if self.lazy_transform:
+                db_columns = self.get_table_columns(table_name)
+                if not db_columns:
+                    logger.warning(
+                        f"{YELLOW}[CLEAN] Could not get DB schema, skipping type conversion{RESET}"
+                    )
+            df, mapping = self.transform(df, table_name, schema, db_columns=db_columns)
             if df is None:
                 raise Exception("Transform failed")
             result["steps"]["transform"] = {
@@ -537,10 +982,11 @@ class ETLOrchestrator:
                 "mappings": len(mapping),
             }
 
-            # STEP 4: CLEAN
-            df = self.clean(df, table_name)
-            if df is None:
-                raise Exception("Clean failed")
+            # STEP 4: CLEAN (already part of the lazy transform plan)
+            if not self.lazy_transform:
+                df = self.clean(df, table_name)
+                if df is None:
+                    raise Exception("Clean failed")
             result["steps"]["clean"] = {"rows": len(df), "columns": len(df.columns)}
 
             # STEP 5: VALIDATE
@@ -549,9 +995,16 @@ class ETLOrchestrator:
             result["steps"]["validate"] = {"passed": True}
 
             # STEP 6: LOAD
-            load_success, load_result = self.load(df, table_name)
+            if swap:
+                load_success, load_result = self.load_via_shadow_table(df, table_name)
+            else:
+                load_success, load_result = self.load(df, table_name)
             result["steps"]["load"] = load_result
 
+            # Remember which dates this load touched (even on partial failure, so
+            # downstream incremental jobs recompute them rather than miss them)
+            self.track_loaded_dates(df, table_name, result)
+
             if not load_success:
                 logger.warning(f"{YELLOW}Load completed with warnings{RESET}")
 
@@ -582,7 +1035,11 @@ class ETLOrchestrator:
 
 # Convenience function for one-off orchestration
 def orchestrate_etl(
-    parquet_path: Path, table_name: str, schema: Optional[Dict] = None, truncate: bool = True
+    parquet_path: Path,
+    table_name: str,
+    schema: Optional[Dict] = None,
+    truncate: bool = True,
+    date_range: Optional[Tuple[int, int]] = None,
 ) -> Tuple[bool, Dict[str, Any]]:
     """
     Execute complete ETL pipeline for a dimension table.
@@ -595,6 +1052,7 @@ def orchestrate_etl(
         table_name: Database table name
         schema: Optional schema dictionary
         truncate: Whether to truncate table first (default True)
+        date_range: Optional (first, last) YYYYMMDD dates to reload instead (fact tables)
 
     Returns:
         Tuple of (success_bool, result_dict)
@@ -606,4 +1064,4 @@ def orchestrate_etl(
         )
     """
     orchestrator = ETLOrchestrator()
-    return orchestrator.orchestrate(parquet_path, table_name, schema, truncate)
+    return orchestrator.orchestrate(parquet_path, table_name, schema, truncate, date_range)
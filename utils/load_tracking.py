@@ -0,0 +1,139 @@
+"""
+Load Tracking Utilities
+
+Records which posting dates each incremental load touched, so downstream
+jobs (e.g. DD logic) can recompute only the affected dates instead of the
+full history.
+
+State is a small JSON file per table under the tenant's data/state directory
+(legacy loaders such as core/loaders/insert_records use Config.DATA_STATE_DIR,
+and record nothing while it is unset):
+
+    {"table": "fact_invoice_details", "column": "posting_date",
+     "pending_dates": [20250114, 20250115], "updated_at": "..."}
+
+Loaders add the dates they insert and the dates they delete with
+record_loaded_dates(); consumers read them with
+read_pending_dates() and remove the dates they have processed with
+clear_pending_dates(). Dates loaded while a consumer is running stay pending.
+
+Loaders and consumers run as separate processes, so every read/modify/write
+holds an flock on a sibling lock file ({table}_loaded_dates.json.lock) in
+addition to the in-process thread lock.
+"""
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+# Tables whose loaded dates are tracked, and the date column (YYYYMMDD) to track
+TRACKED_DATE_COLUMNS = {
+    "fact_invoice_details": "posting_date",
+}
+
+_STATE_LOCK = threading.Lock()
+
+
+def _state_file(state_dir: Path, table_name: str) -> Path:
+    return Path(state_dir) / f"{table_name}_loaded_dates.json"
+
+
+@contextmanager
+def _locked_state(state_dir: Path, table_name: str) -> Iterator[None]:
+    """Hold the thread lock and an exclusive flock on the table's state lock file."""
+    path = _state_file(state_dir, table_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_path = path.with_suffix(".json.lock")
+    with _STATE_LOCK, open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_state(state_dir: Path, table_name: str) -> dict:
+    path = _state_file(state_dir, table_name)
+    if not path.exists():
+        return {
+            "table": table_name,
+            "column": TRACKED_DATE_COLUMNS.get(table_name),
+            "pending_dates": [],
+        }
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _write_state(state_dir: Path, table_name: str, state: dict):
+    """Write state atomically (temp file + rename)."""
+    path = _state_file(state_dir, table_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def record_loaded_dates(state_dir: Path, table_name: str, dates: Iterable[int]) -> int:
+    """
+    Add dates touched by a load to the table's pending set.
+
+    Args:
+        state_dir: Tenant state directory
+        table_name: Loaded table
+        dates: YYYYMMDD dates present in the loaded data
+
+    Returns:
+        Number of pending dates after the update
+    """
+    new_dates = {int(d) for d in dates if d is not None}
+    with _locked_state(state_dir, table_name):
+        state = _read_state(state_dir, table_name)
+        pending = set(state.get("pending_dates", [])) | new_dates
+        state["pending_dates"] = sorted(pending)
+        _write_state(state_dir, table_name, state)
+    return len(pending)
+
+
+def dates_in_range(first: int, last: int) -> List[int]:
+    """Every calendar date from first to last (YYYYMMDD, inclusive), e.g. a deleted range."""
+    day = datetime.strptime(str(first), "%Y%m%d").date()
+    end = datetime.strptime(str(last), "%Y%m%d").date()
+    dates = []
+    while day <= end:
+        dates.append(int(day.strftime("%Y%m%d")))
+        day += timedelta(days=1)
+    return dates
+
+
+def read_pending_dates(state_dir: Path, table_name: str) -> List[int]:
+    """Dates loaded into table_name that no consumer has processed yet (sorted)."""
+    with _locked_state(state_dir, table_name):
+        return sorted(_read_state(state_dir, table_name).get("pending_dates", []))
+
+
+def clear_pending_dates(state_dir: Path, table_name: str, dates: Iterable[int]) -> int:
+    """
+    Remove processed dates from the table's pending set.
+
+    Args:
+        state_dir: Tenant state directory
+        table_name: Loaded table
+        dates: Dates the consumer has processed
+
+    Returns:
+        Number of dates still pending
+    """
+    done = {int(d) for d in dates}
+    with _locked_state(state_dir, table_name):
+        state = _read_state(state_dir, table_name)
+        pending = [d for d in state.get("pending_dates", []) if d not in done]
+        state["pending_dates"] = pending
+        _write_state(state_dir, table_name, state)
+    return len(pending)
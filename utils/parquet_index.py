@@ -0,0 +1,328 @@
+"""
+Parquet Row-Group Statistics Index
+
+A small JSON sidecar next to each converted parquet file holding, per row
+group, the row count and min/max/null_count of the key columns
+(invoice_date, posting_date, sales_group_code, customer_code):
+
+    data/.../FactInvoiceDetails_107_112.parquet
+    data/.../FactInvoiceDetails_107_112.parquet.index.json
+
+    {"file_size": 73400320, "file_mtime_ns": ..., "num_rows": 1843211,
+     "columns": {"posting_date": "postingdate", ...},
+     "row_groups": [{"num_rows": 100000,
+                     "stats": {"posting_date": {"min": 20250101, "max": 20250114,
+                                                "null_count": 0}, ...}}, ...]}
+
+The converters write it right after the parquet file (write_parquet_index).
+It is built from the parquet footer only, so rebuilding a missing or stale
+index never reads the data pages. Consumers use it to:
+
+- get a file's date range without scanning it (column_range)
+- pick the row groups a date/sales-group filter needs (select_row_groups)
+- read only those row groups (read_row_groups)
+
+footer_column_stats aggregates the footer statistics of every column (not
+just the key columns) for footer-only validation of streamed outputs.
+"""
+
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import polars as pl
+import pyarrow.parquet as pq
+
+# Key columns indexed by default (matched case- and underscore-insensitively,
+# so raw "postingdate" and cleaned "posting_date" both map to posting_date)
+INDEX_COLUMNS = ("invoice_date", "posting_date", "sales_group_code", "customer_code")
+
+INDEX_SUFFIX = ".index.json"
+
+
+def _normalize(name: str) -> str:
+    return name.lower().replace("_", "")
+
+
+def _json_value(value: Any) -> Any:
+    """Statistics value as a JSON-serializable scalar."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def index_path(parquet_path: Path) -> Path:
+    """Sidecar index path of a parquet file."""
+    parquet_path = Path(parquet_path)
+    return parquet_path.with_name(parquet_path.name + INDEX_SUFFIX)
+
+
+def build_parquet_index(
+    parquet_path: Path, columns: Sequence[str] = INDEX_COLUMNS
+) -> Dict[str, Any]:
+    """
+    Build the row-group index of a parquet file from its footer.
+
+    Args:
+        parquet_path: Parquet file
+        columns: Key columns to index (missing ones are skipped)
+
+    Returns:
+        Index dict (see module docstring)
+    """
+    parquet_path = Path(parquet_path)
+    metadata = pq.ParquetFile(parquet_path).metadata
+    stat = parquet_path.stat()
+
+    file_columns = {
+        _normalize(metadata.schema.column(i).name): (i, metadata.schema.column(i).name)
+        for i in range(metadata.num_columns)
+    }
+    indexed = {
+        key: file_columns[_normalize(key)] for key in columns if _normalize(key) in file_columns
+    }
+
+    row_groups = []
+    for rg_index in range(metadata.num_row_groups):
+        row_group = metadata.row_group(rg_index)
+        stats = {}
+        for key, (col_index, _) in indexed.items():
+            statistics = row_group.column(col_index).statistics
+            if statistics is None or not statistics.has_min_max:
+                stats[key] = None
+                continue
+            stats[key] = {
+                "min": _json_value(statistics.min),
+                "max": _json_value(statistics.max),
+                "null_count": statistics.null_count,
+            }
+        row_groups.append({"num_rows": row_group.num_rows, "stats": stats})
+
+    return {
+        "file_size": stat.st_size,
+        "file_mtime_ns": stat.st_mtime_ns,
+        "num_rows": metadata.num_rows,
+        "columns": {key: name for key, (_, name) in indexed.items()},
+        "row_groups": row_groups,
+    }
+
+
+def write_parquet_index(
+    parquet_path: Path, columns: Sequence[str] = INDEX_COLUMNS
+) -> Optional[Dict[str, Any]]:
+    """
+    Build and write the sidecar index of a parquet file (best effort).
+
+    Returns:
+        The index, or None if it could not be built or written (the parquet
+        file is still usable; readers fall back to the footer or a scan)
+    """
+    try:
+        index = build_parquet_index(parquet_path, columns)
+        path = index_path(parquet_path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+        return index
+    except Exception:
+        return None
+
+
+def load_parquet_index(parquet_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Sidecar index of a parquet file, rebuilt from the footer if missing or stale.
+
+    Returns:
+        Index dict, or None if the file is not readable parquet
+    """
+    parquet_path = Path(parquet_path)
+    path = index_path(parquet_path)
+    try:
+        stat = parquet_path.stat()
+        if path.exists():
+            with open(path, "r") as f:
+                index = json.load(f)
+            if (
+                index.get("file_size") == stat.st_size
+                and index.get("file_mtime_ns") == stat.st_mtime_ns
+            ):
+                return index
+    except (OSError, ValueError):
+        pass
+    return write_parquet_index(parquet_path)
+
+
+def _as_stats_type(value: Any, sample: Any) -> Any:
+    """
+    Coerce a filter value to the type of the stored statistics (str vs number).
+
+    String statistics compare lexicographically, which is exact for value
+    membership and for fixed-width YYYYMMDD date ranges.
+    """
+    if isinstance(sample, str) and not isinstance(value, str):
+        return str(value)
+    if isinstance(sample, (int, float)) and isinstance(value, str):
+        return type(sample)(value)
+    return value
+
+
+def column_range(index: Dict[str, Any], column: str) -> Optional[Tuple[Any, Any]]:
+    """
+    Min/max of an indexed column over the whole file, without reading data.
+
+    Returns:
+        (min, max), or None if the column is not indexed or a row group has no
+        statistics (callers then fall back to a scan)
+    """
+    if column not in index.get("columns", {}):
+        return None
+    mins, maxs = [], []
+    for row_group in index.get("row_groups", []):
+        if row_group["num_rows"] == 0:
+            continue
+        stats = row_group["stats"].get(column)
+        if stats is None:
+            return None
+        mins.append(stats["min"])
+        maxs.append(stats["max"])
+    if not mins:
+        return None
+    return min(mins), max(maxs)
+
+
+def select_row_groups(
+    index: Dict[str, Any],
+    column: str,
+    lo: Any = None,
+    hi: Any = None,
+    values: Optional[Iterable[Any]] = None,
+) -> List[int]:
+    """
+    Row groups that may contain rows with lo <= column <= hi (and/or in values).
+
+    Row groups without statistics for the column are always selected, so the
+    result is safe to read and filter afterwards.
+
+    Args:
+        index: Parquet index
+        column: Indexed key column
+        lo: Lower bound (inclusive), None = unbounded
+        hi: Upper bound (inclusive), None = unbounded
+        values: Optional set of values (e.g. sales group codes)
+
+    Returns:
+        Row group indices, in file order
+    """
+    wanted = list(values) if values is not None else None
+    selected = []
+    for rg_index, row_group in enumerate(index.get("row_groups", [])):
+        stats = row_group["stats"].get(column)
+        if stats is None:
+            selected.append(rg_index)
+            continue
+        rg_min, rg_max = stats["min"], stats["max"]
+        if lo is not None and rg_max < _as_stats_type(lo, rg_max):
+            continue
+        if hi is not None and rg_min > _as_stats_type(hi, rg_min):
+            continue
+        if wanted is not None and not any(
+            rg_min <= v <= rg_max for v in (_as_stats_type(w, rg_min) for w in wanted)
+        ):
+            continue
+        selected.append(rg_index)
+    return selected
+
+
+def read_row_groups(parquet_path: Path, row_groups: Sequence[int]) -> pl.DataFrame:
+    """Read only the given row groups of a parquet file into a Polars DataFrame."""
+    table = pq.ParquetFile(parquet_path).read_row_groups(list(row_groups))
+    return pl.from_arrow(table)
+
+
+def read_parquet_filtered(
+    parquet_path: Path,
+    column: str,
+    lo: Any = None,
+    hi: Any = None,
+    values: Optional[Iterable[Any]] = None,
+) -> pl.DataFrame:
+    """
+    Read the rows of a parquet file matching a key-column filter, skipping row
+    groups whose statistics rule them out.
+
+    Args:
+        parquet_path: Parquet file
+        column: Indexed key column (e.g. "posting_date")
+        lo: Lower bound (inclusive), None = unbounded
+        hi: Upper bound (inclusive), None = unbounded
+        values: Optional set of values to keep
+
+    Returns:
+        Filtered DataFrame
+
+    Raises:
+        ValueError: If the file has no such key column
+    """
+    index = load_parquet_index(parquet_path)
+    if index is None or column not in index["columns"]:
+        raise ValueError(f"{column} is not indexed in {Path(parquet_path).name}")
+
+    wanted = list(values) if values is not None else None
+    df = read_row_groups(parquet_path, select_row_groups(index, column, lo, hi, wanted))
+
+    name = index["columns"][column]
+    bounds = [b for b in (lo, hi) if b is not None]
+    key = pl.col(name)
+    if bounds and not isinstance(bounds[0], str):
+        # Raw parquets keep dates as strings; compare YYYYMMDD numerically
+        key = key.cast(pl.Int64, strict=False)
+    if lo is not None:
+        df = df.filter(key >= lo)
+    if hi is not None:
+        df = df.filter(key <= hi)
+    if wanted is not None:
+        df = df.filter(pl.col(name).cast(pl.Utf8).is_in([str(v) for v in wanted]))
+    return df
+
+
+def footer_column_stats(parquet_path: Path) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """
+    Whole-file statistics of every column, aggregated from the parquet footer.
+
+    Returns:
+        Tuple of (num_rows, {column: {"null_count", "min", "max"}}); a value is
+        None when a row group lacks the statistic
+    """
+    metadata = pq.ParquetFile(parquet_path).metadata
+    stats: Dict[str, Dict[str, Any]] = {}
+    for col_index in range(metadata.num_columns):
+        null_counts, mins, maxs = [], [], []
+        for rg_index in range(metadata.num_row_groups):
+            row_group = metadata.row_group(rg_index)
+            statistics = row_group.column(col_index).statistics
+            if statistics is None:
+                null_counts.append(None)
+                mins.append(None)
+                continue
+            null_counts.append(statistics.null_count if statistics.has_null_count else None)
+            if statistics.has_min_max:
+                mins.append(_json_value(statistics.min))
+                maxs.append(_json_value(statistics.max))
+            elif statistics.null_count != row_group.num_rows:
+                mins.append(None)  # Values present but no min/max recorded
+
+        has_min_max = bool(maxs) and None not in mins
+        stats[metadata.schema.column(col_index).name] = {
+            "null_count": None if None in null_counts else sum(null_counts),
+            "min": min(mins) if has_min_max else None,
+            "max": max(maxs) if has_min_max else None,
+        }
+    return metadata.num_rows, stats
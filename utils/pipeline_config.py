@@ -43,16 +43,24 @@ class Config:
     AZURE_SAS_TOKEN = os.getenv("AZURE_SAS_TOKEN", "")
 
     # Processing Configuration
-    CHUNK_SIZE = 100000  # Records per chunk for bulk operations
+    # Rows per Stream Load chunk: 0 = adaptive (utils/chunk_planner sizes chunks
+    # from MEMORY_BUDGET_MB and STREAM_LOAD_TARGET_BODY_MB)
+    CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "0"))
+    MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", "0"))  # 0 = container cgroup limit
+    STREAM_LOAD_TARGET_BODY_MB = int(os.getenv("STREAM_LOAD_TARGET_BODY_MB", "64"))
     STREAM_LOAD_TIMEOUT = 1800  # 30 minutes
     MAX_ERROR_RATIO = 0.1  # 10% error tolerance
     MAX_RETRIES = 3
     RETRY_DELAY = 2
+    LOAD_STRATEGY = os.getenv("LOAD_STRATEGY", "truncate")  # truncate, or swap (shadow table)
 
     # FIS Incremental Configuration
     FACT_CHUNK_SIZE = 100000  # Records per chunk for bulk operations
     FACT_DELETE_CHUNK_SIZE = 50000  # Records per chunk for deletion
     MAX_CONCURRENT_DELETIONS = 5  # Concurrent delete tasks
+    # Fact re-load deletes: sales_group (whole history of the file's groups) or
+    # date_range (only the file's invoice/posting dates, pruned to partitions)
+    FACT_DELETE_STRATEGY = os.getenv("FACT_DELETE_STRATEGY", "sales_group")
     MAX_CONCURRENT_INSERTS = 3  # Concurrent insert tasks
     LOCK_TIMEOUT = 3600  # 1 hour lock timeout
     LOCK_FILE_PATH = PROJECT_ROOT / "data" / ".fis_processing.lock"  # Lock file path
@@ -61,6 +69,10 @@ class Config:
     DATA_INCREMENTAL_RAW = DATA_INCREMENTAL_DIR / "incremental"
     DATA_INCREMENTAL_PARQUETS_RAW = DATA_INCREMENTAL_DIR / "raw_parquets"
     DATA_INCREMENTAL_PARQUETS_CLEANED = DATA_INCREMENTAL_DIR / "cleaned_parquets"
+    # Dates touched by legacy loads (utils/load_tracking); set it to the tenant's
+    # data/<tenant>/state directory so incremental DD logic sees insert_records loads.
+    # Unset = insert_records does not track dates (no consumer reads a shared state dir)
+    DATA_STATE_DIR = Path(os.environ["DATA_STATE_DIR"]) if os.getenv("DATA_STATE_DIR") else None
 
     # Schema Configuration
     # SCHEMA_PATHS = [
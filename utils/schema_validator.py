@@ -3,10 +3,14 @@ Schema Validator Module
 Validates parquet dataframes against database schemas defined in db/schemas
 """
 
+import copy
 import importlib.util
 import sys
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import polars as pl
 import json
 import re
@@ -22,6 +26,122 @@ CYAN = "\033[96m"
 YELLOW = "\033[93m"
 RESET = "\033[0m"
 
+# StarRocks integer ranges (LARGEINT is practically unlimited)
+INTEGER_TYPE_RANGES = {
+    "TINYINT": (-128, 127),
+    "SMALLINT": (-32768, 32767),
+    "INT": (-2147483648, 2147483647),
+    "BIGINT": (-9223372036854775808, 9223372036854775807),
+    "LARGEINT": (None, None),
+}
+
+# Checked most specific first ("INT" is a substring of the others)
+INTEGER_TYPE_ORDER = ("TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT")
+
+# Formats tried for DATE/DATETIME string columns, in order; one format is
+# picked per column so day and month are never swapped row by row
+DATE_FORMATS = ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y%m%d", "%Y-%m-%d %H:%M:%S"]
+
+# Rows sampled to pick the format of a DATE string column in a lazy plan
+DATE_FORMAT_SAMPLE_ROWS = 10000
+
+# Characters ignored when matching column names
+_SPECIAL_CHARS_RE = re.compile(r"[\s_/%\-]")
+
+
+@dataclass(frozen=True)
+class ColumnTypeInfo:
+    """Parsed form of a column type string such as 'VARCHAR(100) NULL'"""
+
+    type_str: str
+    upper: str
+    varchar_size: int = 0
+    integer_type: Optional[str] = None
+    integer_range: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+
+@lru_cache(maxsize=4096)
+def _schema_lookup_key(col_name: str) -> str:
+    """Memoized SchemaValidator._get_schema_lookup_key"""
+    base_name = col_name.strip().strip('"').strip("'")
+    normalized = _SPECIAL_CHARS_RE.sub("", base_name.lower())
+    if is_reserved_keyword(base_name):
+        normalized = normalized + "_raw"
+    return normalized
+
+
+@lru_cache(maxsize=None)
+def parse_column_type(col_type: str) -> ColumnTypeInfo:
+    """
+    Parse a column type string once; later lookups are served from the cache.
+
+    Args:
+        col_type: Column type string from a CREATE TABLE statement or mapping
+
+    Returns:
+        ColumnTypeInfo with upper-cased type, VARCHAR size and integer range
+    """
+    upper = col_type.upper()
+    integer_type = next((t for t in INTEGER_TYPE_ORDER if t in upper), None)
+    return ColumnTypeInfo(
+        type_str=col_type,
+        upper=upper,
+        varchar_size=SchemaValidator._extract_varchar_limit(upper),
+        integer_type=integer_type,
+        integer_range=INTEGER_TYPE_RANGES.get(integer_type),
+    )
+
+
+@dataclass
+class CompiledTableSchema:
+    """
+    A table's CREATE TABLE statement, parsed and indexed once per validator.
+
+    All validator methods resolve DataFrame columns through these indexes
+    instead of re-parsing the schema and scanning every schema column.
+    """
+
+    name: str
+    columns: Dict[str, str] = field(default_factory=dict)  # schema name → type string
+    types: Dict[str, ColumnTypeInfo] = field(default_factory=dict)  # schema name → parsed type
+    schema_lookup: Dict[str, Tuple[str, str]] = field(default_factory=dict)  # lookup key → (name, type)
+    column_names_lower: frozenset = frozenset()
+    # lowercase schema name → (schema name, parsed type); first definition wins
+    by_lower: Dict[str, Tuple[str, ColumnTypeInfo]] = field(default_factory=dict)
+    # (lookup key variations, schema name, type string, parsed type) for fuzzy matching
+    match_candidates: List[Tuple[Tuple[str, ...], str, str, ColumnTypeInfo]] = field(
+        default_factory=list
+    )
+
+
+@dataclass
+class ColumnProfile:
+    """Statistics for one schema-checked column (None = not computed for its type)"""
+
+    column: str
+    schema_type: str
+    null_count: Optional[int] = None
+    max_length: Optional[int] = None  # VARCHAR columns: max byte length
+    min_value: Optional[object] = None  # Integer columns: min of non-null values
+    max_value: Optional[object] = None  # Integer columns: max of non-null values
+
+
+@dataclass
+class DataFrameProfile:
+    """Column statistics of a DataFrame against a table schema, computed in one pass"""
+
+    table_name: str
+    row_count: int = 0
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+
+    def get(self, column: str) -> Optional[ColumnProfile]:
+        return self.columns.get(column)
+
+
+# Process-wide validator cache: (cache_key, schemas_dir, mappings_dir) → (files stamp, validator)
+_VALIDATOR_CACHE: Dict[Tuple[str, str, str], Tuple[int, "SchemaValidator"]] = {}
+_VALIDATOR_CACHE_LOCK = threading.Lock()
+
 
 class SchemaValidator:
     # Allowed type upgrades mapping (source_type: [allowed_target_types])
@@ -96,6 +216,56 @@ class SchemaValidator:
         self.schema_changes = []  # Track all schema expansions
         self.logs_dir = Path(__file__).parent.parent / "logs"
         self.logs_dir.mkdir(exist_ok=True)
+        self._compiled_tables: Dict[str, CompiledTableSchema] = {}
+
+    def compiled_table(self, table_name: str) -> Optional[CompiledTableSchema]:
+        """
+        Get a table's parsed schema, compiling it on first use.
+
+        Args:
+            table_name: Name of the table
+
+        Returns:
+            CompiledTableSchema, or None if the table is not loaded
+        """
+        compiled = self._compiled_tables.get(table_name)
+        if compiled is not None:
+            return compiled
+        if table_name not in self.tables:
+            return None
+
+        columns = self._extract_columns_from_schema(self.tables[table_name].get("schema", ""))
+        types = {name: parse_column_type(col_type) for name, col_type in columns.items()}
+        schema_lookup = {
+            self._get_schema_lookup_key(name): (name, col_type) for name, col_type in columns.items()
+        }
+
+        by_lower = {}
+        for name, info in types.items():
+            by_lower.setdefault(name.lower(), (name, info))
+
+        # Match with and without common prefixes (e.g. CM)
+        match_candidates = [
+            (
+                (key, key.replace("cmcustomergroup", "customergroup"), key.replace("cm", "")),
+                name,
+                col_type,
+                types[name],
+            )
+            for key, (name, col_type) in schema_lookup.items()
+        ]
+
+        compiled = CompiledTableSchema(
+            name=table_name,
+            columns=columns,
+            types=types,
+            schema_lookup=schema_lookup,
+            column_names_lower=frozenset(by_lower),
+            by_lower=by_lower,
+            match_candidates=match_candidates,
+        )
+        self._compiled_tables[table_name] = compiled
+        return compiled
 
     @staticmethod
     def _normalize_column_name(col_name: str) -> str:
@@ -119,7 +289,7 @@ class SchemaValidator:
         # Remove quotes (for schema columns like "Div")
         normalized = col_name.strip().strip('"').strip("'")
         # Remove spaces, underscores, hyphens, slashes, percent signs, and other special chars
-        normalized = re.sub(r"[\s_/%\-]", "", normalized)
+        normalized = _SPECIAL_CHARS_RE.sub("", normalized)
         # Convert to lowercase
         normalized = normalized.lower()
         return normalized
@@ -144,23 +314,14 @@ class SchemaValidator:
         Returns:
             Normalized lookup key
         """
-        # First, normalize to lowercase
-        normalized = col_name.strip().strip('"').strip("'").lower()
-        # Remove special characters for matching
-        normalized = re.sub(r"[\s_/%\-]", "", normalized)
-
-        # Check if this matches a reserved keyword (before special char removal)
-        base_name = col_name.strip().strip('"').strip("'")
-        if is_reserved_keyword(base_name):
-            normalized = normalized + "_raw"
-
-        return normalized
+        # Lowercase, strip special characters, '_raw' suffix for reserved keywords
+        return _schema_lookup_key(col_name)
 
     def _find_best_schema_match(
         self,
         parquet_col_name: str,
         parquet_col_dtype: pl.DataType,
-        schema_lookup: Dict,
+        compiled: CompiledTableSchema,
         table_name: str = None,
     ) -> Tuple[str, str]:
         """
@@ -178,16 +339,18 @@ class SchemaValidator:
         Args:
             parquet_col_name: Name of parquet column
             parquet_col_dtype: Polars dtype of parquet column
-            schema_lookup: Dictionary of {lookup_key: (original_name, col_type)}
+            compiled: Compiled table schema (lookup keys and precomputed match candidates)
             table_name: Optional table name to check column_mappings
 
         Returns:
             Tuple of (schema_col_original_name, col_type) or (None, None) if no match
         """
+        parquet_key = self._get_schema_lookup_key(parquet_col_name)
+        is_string = parquet_col_dtype == pl.Utf8 or str(parquet_col_dtype).upper() == "STRING"
+
         # Step 1: Check explicit mapping if table_name provided
         if table_name and table_name in self.column_mappings:
             table_mappings = self.column_mappings[table_name]
-            parquet_key = self._get_schema_lookup_key(parquet_col_name)
 
             if parquet_key in table_mappings:
                 mapping_info = table_mappings[parquet_key]
@@ -199,70 +362,54 @@ class SchemaValidator:
                     return (db_column, data_type)
 
         # Step 2: Try exact lookup in schema
-        exact_key = self._get_schema_lookup_key(parquet_col_name)
-        if exact_key in schema_lookup:
-            schema_col, col_type = schema_lookup[exact_key]
+        if parquet_key in compiled.schema_lookup:
+            schema_col, col_type = compiled.schema_lookup[parquet_key]
 
             # If parquet data is string but schema says INT, check data before committing
-            if parquet_col_dtype == pl.Utf8 or str(parquet_col_dtype).upper() == "STRING":
-                if any(t in col_type.upper() for t in ["INT", "SMALLINT", "TINYINT", "BIGINT"]):
-                    # String data with numeric-only schema type - might be wrong match
-                    # Look for VARCHAR alternative
-                    pass  # Continue to look for alternatives below
-                else:
+            if is_string:
+                if compiled.types[schema_col].integer_type is None:
                     # String data with VARCHAR schema - good match!
                     return (schema_col, col_type)
+                # String data with numeric-only schema type - might be wrong match,
+                # look for VARCHAR alternative below
 
         # Step 3: Look for all candidate schema columns with similar base names
-        # Extract the core name (removing prefixes like CM, remove numbers at end sometimes)
-        base_normalized = re.sub(
-            r"[\s_/%\-]", "", parquet_col_name.lower().strip().strip('"').strip("'")
+        # (variations without prefixes like CM are precomputed per table)
+        base_normalized = _SPECIAL_CHARS_RE.sub(
+            "", parquet_col_name.lower().strip().strip('"').strip("'")
         )
 
-        candidates = []
-        for key, (orig_name, col_type) in schema_lookup.items():
-            # Try matching with and without common prefixes
-            key_variations = [
-                key,
-                key.replace("cmcustomergroup", "customergroup"),
-                key.replace("cm", ""),
-            ]
-
-            for var in key_variations:
-                if var == base_normalized or (
-                    len(base_normalized) > 0 and var.startswith(base_normalized)
-                ):
-                    # Calculate preference score based on type compatibility
-                    type_score = 0
-
-                    # If parquet data is string/UTF8
-                    if parquet_col_dtype == pl.Utf8 or str(parquet_col_dtype).upper() == "STRING":
-                        # Strongly prefer VARCHAR columns for string data
-                        if "VARCHAR" in col_type.upper():
-                            type_score = 100
-                        # De-prefer INT/SMALLINT for string data
-                        elif any(t in col_type.upper() for t in ["INT", "SMALLINT", "TINYINT"]):
-                            type_score = -50
-                        else:
-                            type_score = 10
-                    else:
-                        # For non-string data, prefer numeric types
-                        if any(
-                            t in col_type.upper()
-                            for t in ["INT", "SMALLINT", "TINYINT", "BIGINT", "FLOAT", "DOUBLE"]
-                        ):
-                            type_score = 100
-                        else:
-                            type_score = 10
+        best = None
+        for key_variations, orig_name, col_type, info in compiled.match_candidates:
+            if not any(
+                var == base_normalized or (base_normalized and var.startswith(base_normalized))
+                for var in key_variations
+            ):
+                continue
 
-                    candidates.append((type_score, key, orig_name, col_type))
-                    break  # Don't add same column multiple times
+            # Calculate preference score based on type compatibility
+            if is_string:
+                # Strongly prefer VARCHAR columns for string data,
+                # de-prefer INT/SMALLINT for string data
+                if "VARCHAR" in info.upper:
+                    type_score = 100
+                elif info.integer_type is not None:
+                    type_score = -50
+                else:
+                    type_score = 10
+            else:
+                # For non-string data, prefer numeric types
+                if info.integer_type is not None or "FLOAT" in info.upper or "DOUBLE" in info.upper:
+                    type_score = 100
+                else:
+                    type_score = 10
+
+            # First candidate with the highest score wins
+            if best is None or type_score > best[0]:
+                best = (type_score, orig_name, col_type)
 
-        if candidates:
-            # Sort by score (highest first)
-            candidates.sort(reverse=True, key=lambda x: x[0])
-            _, _, orig_name, col_type = candidates[0]
-            return (orig_name, col_type)
+        if best:
+            return (best[1], best[2])
 
         return (None, None)
 
@@ -306,6 +453,97 @@ class SchemaValidator:
 
         return summary
 
+    @staticmethod
+    def _list_schema_files(schemas_dir: Path) -> List[Path]:
+        """
+        List schema .py files: root, tables/, views/ and matviews/, sorted by name.
+        """
+        schema_files = sorted(schemas_dir.glob("*.py"))  # Root level files
+        schema_files.extend(sorted(schemas_dir.glob("tables/*.py")))  # tables/ subdirectory
+        schema_files.extend(sorted(schemas_dir.glob("views/*.py")))  # views/ subdirectory
+        schema_files.extend(sorted(schemas_dir.glob("matviews/*.py")))  # matviews/ subdirectory
+        return schema_files
+
+    @classmethod
+    def _files_stamp(cls, schemas_dir: Path, column_mappings_dir: Optional[Path]) -> int:
+        """
+        Newest mtime (ns) of the schema and mapping files and their directories.
+
+        Directory mtimes catch added or removed files; file mtimes catch files
+        rewritten in place, e.g. by another process running
+        update_schema_files_for_overflow.
+        """
+        paths = [schemas_dir] + [schemas_dir / sub for sub in ("tables", "views", "matviews")]
+        paths.extend(cls._list_schema_files(schemas_dir))
+        if column_mappings_dir:
+            paths.append(column_mappings_dir)
+            paths.extend(column_mappings_dir.glob("*.json"))
+
+        stamp = 0
+        for path in paths:
+            try:
+                stamp = max(stamp, path.stat().st_mtime_ns)
+            except OSError:
+                continue  # Missing subdirectory, or removed while listing
+        return stamp
+
+    @classmethod
+    def cached(
+        cls, schemas_dir: Path, column_mappings_dir: Path = None, cache_key: str = "default"
+    ) -> "SchemaValidator":
+        """
+        Get a validator for a schema directory, loading and compiling it once per process.
+
+        The loaded tables, mappings and compiled table schemas are shared; the
+        returned validator is a fresh per-run view (for_run), so schema changes
+        found by one file or run never show up in another's ALTER statements.
+        Repeated calls only stat the schema and mapping files; when any of them
+        changed on disk (also from another process), the directory is reloaded.
+        clear_cache() drops cached validators explicitly.
+
+        Args:
+            schemas_dir: Path to schemas directory
+            column_mappings_dir: Optional path to column mappings directory
+            cache_key: Cache namespace, e.g. the tenant_id
+
+        Returns:
+            SchemaValidator for one run, backed by the shared compiled schemas
+        """
+        schemas_dir = Path(schemas_dir).resolve()
+        column_mappings_dir = Path(column_mappings_dir).resolve() if column_mappings_dir else None
+        key = (cache_key, str(schemas_dir), str(column_mappings_dir or ""))
+
+        stamp = cls._files_stamp(schemas_dir, column_mappings_dir)
+
+        with _VALIDATOR_CACHE_LOCK:
+            cached_stamp, validator = _VALIDATOR_CACHE.get(key, (None, None))
+            if validator is None or cached_stamp != stamp:
+                validator = cls.from_schema_files(schemas_dir, column_mappings_dir)
+                _VALIDATOR_CACHE[key] = (stamp, validator)
+        return validator.for_run()
+
+    def for_run(self) -> "SchemaValidator":
+        """
+        Validator for one validation run: shares this validator's loaded and
+        compiled schemas, but starts with no recorded schema changes.
+        """
+        run = copy.copy(self)
+        run.schema_changes = []
+        return run
+
+    @staticmethod
+    def clear_cache(cache_key: str = None):
+        """
+        Drop cached validators (all, or only those for one cache_key).
+
+        Args:
+            cache_key: Cache namespace to clear, or None for everything
+        """
+        with _VALIDATOR_CACHE_LOCK:
+            for key in list(_VALIDATOR_CACHE):
+                if cache_key is None or key[0] == cache_key:
+                    del _VALIDATOR_CACHE[key]
+
     @classmethod
     def from_schema_files(
         cls, schemas_dir: Path, column_mappings_dir: Path = None
@@ -323,13 +561,7 @@ class SchemaValidator:
         tables = {}
         column_mappings = {}
         schemas_dir = Path(schemas_dir)
-
-        # Get all .py files in schemas directory and subdirectories, sorted by name
-        # Look in: root, tables/, views/, matviews/ directories
-        schema_files = sorted(schemas_dir.glob("*.py"))  # Root level files
-        schema_files.extend(sorted(schemas_dir.glob("tables/*.py")))  # tables/ subdirectory
-        schema_files.extend(sorted(schemas_dir.glob("views/*.py")))  # views/ subdirectory
-        schema_files.extend(sorted(schemas_dir.glob("matviews/*.py")))  # matviews/ subdirectory
+        schema_files = cls._list_schema_files(schemas_dir)
 
         print(f"{CYAN}Loading schemas from {schemas_dir} (including subdirectories){RESET}")
 
@@ -484,9 +716,7 @@ class SchemaValidator:
             elif "DATE" in expected_type.upper():
 
                 # Try multiple date formats
-                date_formats = ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%Y%m%d", "%Y-%m-%d %H:%M:%S"]
-
-                for fmt in date_formats:
+                for fmt in DATE_FORMATS:
                     try:
                         if "DATETIME" in expected_type.upper():
                             converted_df = df.with_columns(
@@ -655,99 +885,187 @@ class SchemaValidator:
         Returns:
             Set of lowercase column names from the schema, or empty set if table not found
         """
-        if table_name not in self.tables:
+        compiled = self.compiled_table(table_name)
+        if compiled is None:
             return set()
 
-        table_def = self.tables[table_name]
-        schema_str = table_def.get("schema", "")
+        # Return column names as lowercase set
+        return set(compiled.column_names_lower)
 
-        if not schema_str:
-            return set()
+    def _schema_checked_columns(self, df: pl.DataFrame, table_name: str) -> Dict:
+        """DataFrame columns that match a schema column: {col_name: ColumnTypeInfo}"""
+        by_lower = self.compiled_table(table_name).by_lower
+        checked = {}
+        for col_name in df.columns:
+            match = by_lower.get(col_name.lower())
+            if match is not None and match[1].upper:
+                checked[col_name] = match[1]
+        return checked
+
+    def _profile_exprs(
+        self, frame: pl.DataFrame, table_name: str, profile: DataFrameProfile
+    ) -> Dict[Tuple[str, str], pl.Expr]:
+        """
+        Statistic expressions of profile_dataframe, keyed by (column, stat).
+
+        Adds an empty ColumnProfile to profile for every schema-checked column.
+        frame only needs the schema (an empty frame works).
+        """
+        stat_exprs = {}
+        for col_name, type_info in self._schema_checked_columns(frame, table_name).items():
+            profile.columns[col_name] = ColumnProfile(column=col_name, schema_type=type_info.upper)
+            col = pl.col(col_name)
+            stat_exprs[(col_name, "null_count")] = col.null_count()
+
+            if "VARCHAR" in type_info.upper:
+                if type_info.varchar_size:
+                    stat_exprs[(col_name, "max_length")] = col.cast(pl.Utf8).str.len_bytes().max()
+            elif (
+                type_info.integer_type not in (None, "LARGEINT")
+                and frame.schema[col_name] != pl.Utf8
+            ):
+                stat_exprs[(col_name, "min_value")] = col.min()
+                stat_exprs[(col_name, "max_value")] = col.max()
+        return stat_exprs
 
-        expected_columns = self._extract_columns_from_schema(schema_str)
+    def profile_lazyframe(self, lf: pl.LazyFrame, table_name: str) -> DataFrameProfile:
+        """
+        profile_dataframe for a plan that is never collected in full.
 
-        # Return column names as lowercase set
-        return set(col_name.lower() for col_name in expected_columns.keys())
+        The row count and every statistic are computed by one aggregate run
+        on the streaming engine, so only the aggregates are held in memory.
 
-    def detect_data_overflows(self, df: pl.DataFrame, table_name: str) -> Dict:
+        Args:
+            lf: LazyFrame plan (e.g. scan_parquet of a streamed output)
+            table_name: Name of the table schema to profile against
+
+        Returns:
+            DataFrameProfile (empty if the table is unknown)
+        """
+        frame = pl.DataFrame(schema=lf.collect_schema())
+        profile = DataFrameProfile(table_name=table_name)
+        if table_name not in self.tables or len(frame.columns) == 0:
+            profile.row_count = lf.select(pl.len()).collect(engine="streaming").item()
+            return profile
+
+        stat_exprs = self._profile_exprs(frame, table_name, profile)
+        row = (
+            lf.select(
+                [pl.len().alias("rows")]
+                + [expr.alias(f"s{i}") for i, expr in enumerate(stat_exprs.values())]
+            )
+            .collect(engine="streaming")
+            .row(0)
+        )
+        profile.row_count = row[0]
+        for (col_name, stat), value in zip(stat_exprs, row[1:]):
+            setattr(profile.columns[col_name], stat, value)
+        return profile
+
+    def profile_dataframe(self, df: pl.DataFrame, table_name: str) -> DataFrameProfile:
+        """
+        Compute overflow statistics for all schema-checked columns in a single pass.
+
+        Null counts for every checked column, max byte length for sized VARCHAR
+        columns and min/max for non-string integer columns are built as one
+        expression batch and evaluated with a single df.select, so Polars scans
+        the frame once and parallelizes across columns.
+
+        Args:
+            df: Polars DataFrame to profile
+            table_name: Name of the table schema to profile against
+
+        Returns:
+            DataFrameProfile (empty if the table is unknown)
+        """
+        profile = DataFrameProfile(table_name=table_name, row_count=df.height)
+        if table_name not in self.tables or len(df.columns) == 0:
+            return profile
+
+        stat_exprs = self._profile_exprs(df, table_name, profile)
+        if not stat_exprs:
+            return profile
+
+        keys = list(stat_exprs)
+        try:
+            row = df.select(
+                [expr.alias(f"s{i}") for i, expr in enumerate(stat_exprs.values())]
+            ).row(0)
+            values = dict(zip(keys, row))
+        except Exception as e:
+            # One bad column fails the whole batch: fall back to per-statistic selects
+            print(f"{YELLOW}Warning: Batched profiling failed ({e}), profiling per column{RESET}")
+            values = {}
+            for key, expr in stat_exprs.items():
+                try:
+                    values[key] = df.select(expr).item()
+                except Exception as col_error:
+                    print(
+                        f"{YELLOW}Warning: Could not compute {key[1]} for {key[0]}: {col_error}{RESET}"
+                    )
+
+        for (col_name, stat), value in values.items():
+            setattr(profile.columns[col_name], stat, value)
+        return profile
+
+    def detect_data_overflows(
+        self, df: pl.DataFrame, table_name: str, profile: DataFrameProfile = None
+    ) -> Dict:
         """
         Detect VARCHAR overflow, numeric type overflow, and type mismatches.
 
+        Statistics come from profile_dataframe (one pass over all columns);
+        pass a precomputed profile to reuse it.
+
         Returns dictionary with:
         {
             "varchar_overflows": [{"column": "col_name", "schema_size": 100, "max_actual": 250}],
             "numeric_overflows": [{"column": "col_name", "schema_type": "SMALLINT", "min": -50000, "max": 50000}],
-            "type_mismatches": [{"column": "col_name", "schema_type": "INT", "data_type": "VARCHAR"}]
+            "type_mismatches": [{"column": "col_name", "schema_type": "INT", "data_type": "VARCHAR"}],
+            "profile": DataFrameProfile
         }
         """
         if table_name not in self.tables or len(df.columns) == 0:
-            return {"varchar_overflows": [], "numeric_overflows": [], "type_mismatches": []}
-
-        table_def = self.tables[table_name]
-        schema_str = table_def.get("schema", "")
-        expected_columns_raw = self._extract_columns_from_schema(schema_str)
-
-        # Convert expected_columns to dict with type info
-        expected_columns = {}
-        for col_name, col_info in expected_columns_raw.items():
-            if isinstance(col_info, dict):
-                expected_columns[col_name] = col_info
-            else:
-                # col_info is just the type string
-                expected_columns[col_name] = {"type": col_info}
-
-        issues = {"varchar_overflows": [], "numeric_overflows": [], "type_mismatches": []}
-
-        for col_name in df.columns:
-            col_name_lower = col_name.lower()
-
-            # Find matching schema column (case-insensitive)
-            schema_col = None
-            schema_type = None
-            for schema_col_name, col_info in expected_columns.items():
-                if schema_col_name.lower() == col_name_lower:
-                    schema_col = schema_col_name
-                    if isinstance(col_info, dict):
-                        schema_type = col_info.get("type", "").upper()
-                    else:
-                        schema_type = str(col_info).upper()
-                    break
-
-            if not schema_col or not schema_type:
-                continue  # Column not in schema, skip
+            return {
+                "varchar_overflows": [],
+                "numeric_overflows": [],
+                "type_mismatches": [],
+                "profile": DataFrameProfile(table_name=table_name, row_count=df.height),
+            }
+
+        if profile is None:
+            profile = self.profile_dataframe(df, table_name)
+
+        issues = {
+            "varchar_overflows": [],
+            "numeric_overflows": [],
+            "type_mismatches": [],
+            "profile": profile,
+        }
 
-            df_dtype = str(df[col_name].dtype)
+        for col_name, type_info in self._schema_checked_columns(df, table_name).items():
+            schema_type = type_info.upper
+            df_dtype = str(df.schema[col_name])
+            stats = profile.get(col_name) or ColumnProfile(column=col_name, schema_type=schema_type)
 
             # ===== VARCHAR Overflow Check =====
             if "VARCHAR" in schema_type:
-                # Extract VARCHAR size (e.g., "VARCHAR(100)" → 100)
-                import re
-
-                match = re.search(r"VARCHAR\((\d+)\)", schema_type)
-                if match:
-                    varchar_size = int(match.group(1))
-                    # Get actual max string length in data
-                    try:
-                        str_lengths = df[col_name].cast(pl.Utf8).str.lengths()
-                        max_actual = str_lengths.max()
-                        if max_actual is not None and max_actual > varchar_size:
-                            issues["varchar_overflows"].append(
-                                {
-                                    "column": col_name,
-                                    "schema_size": varchar_size,
-                                    "max_actual": max_actual,
-                                    "recommended_size": int(max_actual * 1.2),  # 20% buffer
-                                }
-                            )
-                    except Exception as e:
-                        print(
-                            f"{YELLOW}Warning: Could not check VARCHAR length for {col_name}: {e}{RESET}"
+                # VARCHAR size (e.g., "VARCHAR(100)" → 100), parsed once per schema
+                varchar_size = type_info.varchar_size
+                if varchar_size:
+                    max_actual = stats.max_length
+                    if max_actual is not None and max_actual > varchar_size:
+                        issues["varchar_overflows"].append(
+                            {
+                                "column": col_name,
+                                "schema_size": varchar_size,
+                                "max_actual": max_actual,
+                                "recommended_size": int(max_actual * 1.2),  # 20% buffer
+                            }
                         )
 
             # ===== Numeric Type Overflow Check =====
-            elif any(
-                t in schema_type for t in ["TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT"]
-            ):
+            elif type_info.integer_type is not None:
                 if df_dtype == "Utf8":
                     # Type mismatch: schema expects number, data is string
                     issues["type_mismatches"].append(
@@ -759,39 +1077,24 @@ class SchemaValidator:
                         }
                     )
                 else:
-                    # Check for overflow
-                    type_ranges = {
-                        "TINYINT": (-128, 127),
-                        "SMALLINT": (-32768, 32767),
-                        "INT": (-2147483648, 2147483647),
-                        "BIGINT": (-9223372036854775808, 9223372036854775807),
-                    }
-
-                    current_type = None
-                    for t in ["TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT"]:
-                        if t in schema_type:
-                            current_type = t
-                            break
-
-                    if current_type and current_type in type_ranges:
+                    # Check for overflow (LARGEINT is practically unlimited)
+                    current_type = type_info.integer_type
+
+                    # min/max ignore nulls; None means all-null (or not computable)
+                    min_val, max_val = stats.min_value, stats.max_value
+                    if current_type != "LARGEINT" and min_val is not None and max_val is not None:
                         try:
-                            # Try to get min/max (handle nulls)
-                            col_data = df[col_name].drop_nulls()
-                            if len(col_data) > 0:
-                                min_val = col_data.min()
-                                max_val = col_data.max()
-
-                                rng = type_ranges[current_type]
-                                if (min_val < rng[0]) or (max_val > rng[1]):
-                                    issues["numeric_overflows"].append(
-                                        {
-                                            "column": col_name,
-                                            "schema_type": current_type,
-                                            "min": min_val,
-                                            "max": max_val,
-                                            "range": rng,
-                                        }
-                                    )
+                            rng = type_info.integer_range
+                            if (min_val < rng[0]) or (max_val > rng[1]):
+                                issues["numeric_overflows"].append(
+                                    {
+                                        "column": col_name,
+                                        "schema_type": current_type,
+                                        "min": min_val,
+                                        "max": max_val,
+                                        "range": rng,
+                                    }
+                                )
                         except Exception as e:
                             print(
                                 f"{YELLOW}Warning: Could not check numeric range for {col_name}: {e}{RESET}"
@@ -812,7 +1115,7 @@ class SchemaValidator:
         return issues
 
     def validate_dataframe_against_schema(
-        self, df: pl.DataFrame, table_name: str
+        self, df: pl.DataFrame, table_name: str, profile: DataFrameProfile = None
     ) -> Tuple[bool, str, pl.DataFrame]:
         """
         Validate dataframe against table schema.
@@ -824,9 +1127,14 @@ class SchemaValidator:
         It does NOT require the dataframe to have all schema columns,
         as parquet files may contain only a subset of columns.
 
+        The VARCHAR lengths and integer min/max behind the schema-change log
+        are taken from profile where it already holds them (detect_data_overflows
+        on the same DataFrame); the rest are computed in one batched select.
+
         Args:
             df: Polars DataFrame to validate
             table_name: Name of the table schema to validate against
+            profile: Optional profile of df from profile_dataframe to reuse
 
         Returns:
             Tuple of (is_valid, error_message)
@@ -834,21 +1142,15 @@ class SchemaValidator:
         if table_name not in self.tables:
             return False, f"Table '{table_name}' not found in loaded schemas", df
 
-        table_def = self.tables[table_name]
+        # Column definitions from CREATE TABLE statement, parsed once per table
+        compiled = self.compiled_table(table_name)
 
-        # Get column definitions from CREATE TABLE statement
-        schema_str = table_def.get("schema", "")
-        expected_columns = self._extract_columns_from_schema(schema_str)
-
-        if not expected_columns:
+        if not compiled.columns:
             return (True, "Could not extract column definitions, skipping validation", df)
 
-        # Build lookup map using the new smarter key generation
-        # For each schema column, create a lookup key that handles reserved keywords
-        schema_lookup = {}
-        for schema_col_name, col_type in expected_columns.items():
-            lookup_key = self._get_schema_lookup_key(schema_col_name)
-            schema_lookup[lookup_key] = (schema_col_name, col_type)
+        # Lookup map keyed by the smarter key generation (handles reserved keywords)
+        schema_lookup = compiled.schema_lookup
+        table_mappings = self.column_mappings.get(table_name, {})
 
         df_columns = set(df.columns)
 
@@ -860,10 +1162,7 @@ class SchemaValidator:
 
             # Check both schema and mappings
             in_schema = parquet_lookup_key in schema_lookup
-            in_mappings = (
-                table_name in self.column_mappings
-                and parquet_lookup_key in self.column_mappings[table_name]
-            )
+            in_mappings = parquet_lookup_key in table_mappings
 
             if not in_schema and not in_mappings:
                 extra_columns.append(col_name)
@@ -875,224 +1174,466 @@ class SchemaValidator:
             # Don't fail validation for extra columns, just note them
 
         # Validate columns that exist in both dataframe and schema
+        checked = []  # (col_name, type_info) whose schema changes are logged below
+        stat_exprs = {}  # (col_name, stat) → expression, for statistics profile lacks
+        stats = {}  # col_name → ColumnProfile used for logging
         for col_name in df_columns:
             # Use smarter matching that considers data type compatibility and column mappings
             schema_col_original, col_type = self._find_best_schema_match(
-                col_name, df[col_name].dtype, schema_lookup, table_name
+                col_name, df[col_name].dtype, compiled, table_name
             )
 
             if col_type is None:
                 continue
 
+            # Parsed once per distinct type string (schema or mapping data_type)
+            type_info = parse_column_type(col_type)
+            col_type_upper = type_info.upper
+            source_dtype = df[col_name].dtype
+
             # Attempt data type conversion for data cleaning (string numbers to actual numbers)
-            if df[col_name].dtype == pl.Utf8 and "VARCHAR" not in col_type.upper():
+            if source_dtype == pl.Utf8 and "VARCHAR" not in col_type_upper:
                 df = self._clean_numeric_strings(df, col_name, col_type)
+            dtype = df[col_name].dtype
 
+            needed = ()
+            if "VARCHAR" in col_type:
+                if type_info.varchar_size and dtype == pl.Utf8:
+                    needed = ("max_length",)
+            elif dtype == pl.Utf8:
+                # Check if schema expects numeric type but data is string
+                if type_info.integer_type is not None or any(
+                    t in col_type_upper for t in ["FLOAT", "DOUBLE", "DECIMAL"]
+                ):
+                    # This should not happen anymore since we clean the data above
+                    print(
+                        f"{YELLOW}Warning: Column {col_name} still contains string data after cleaning attempt. Schema expects {col_type}.{RESET}"
+                    )
+                    continue
+            elif type_info.integer_type not in (None, "LARGEINT"):
+                needed = ("min_value", "max_value")
+
+            # The profile holds these statistics if it checked the column as the same
+            # type and the column was not converted from strings since
+            cached = profile.get(col_name) if profile is not None else None
+            if (
+                cached is not None
+                and cached.schema_type == col_type_upper
+                and source_dtype == dtype
+            ):
+                stats[col_name] = ColumnProfile(
+                    column=col_name,
+                    schema_type=col_type_upper,
+                    **{stat: getattr(cached, stat) for stat in needed},
+                )
+            else:
+                stats[col_name] = ColumnProfile(column=col_name, schema_type=col_type_upper)
+                col = pl.col(col_name)
+                if "max_length" in needed:
+                    stat_exprs[(col_name, "max_length")] = col.str.len_bytes().max()
+                if "min_value" in needed:
+                    stat_exprs[(col_name, "min_value")] = col.min()
+                    stat_exprs[(col_name, "max_value")] = col.max()
+            checked.append((col_name, type_info))
+
+        if stat_exprs:
             try:
-                # VARCHAR logic (as before)
-                if "VARCHAR" in col_type:
-                    varchar_limit = self._extract_varchar_limit(col_type)
-                    if varchar_limit and df[col_name].dtype == pl.Utf8:
-                        try:
-                            max_len = df[col_name].str.lengths().max()
-                        except AttributeError:
-                            max_len = (
-                                df[col_name]
-                                .map_elements(lambda x: len(x) if x else 0, return_dtype=pl.UInt32)
-                                .max()
-                            )
-                        if max_len is not None and max_len > varchar_limit:
-                            new_size = int(max_len * 1.2)
-                            new_size = min(new_size, 5000)
-                            self._log_schema_change(
-                                table_name,
-                                col_name,
-                                varchar_limit,
-                                new_size,
-                                f"Data contains {max_len} chars, expanded with 20% buffer",
-                            )
-                            print(
-                                f"{YELLOW}⚠️  SCHEMA EXPANSION: {col_name}{RESET}\n"
-                                f"  Found data: {max_len} chars\n"
-                                f"  Schema limit: {varchar_limit}\n"
-                                f"  New limit: {new_size} (with 20% buffer)\n"
-                                f"  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
-                            )
-                # Numeric and date type upgrades
-                else:
-                    # Map Polars dtype to SQL type
-                    pl_dtype = str(df[col_name].dtype).upper()
-
-                    # Skip validation if column contains string data but schema expects numeric
-                    if df[col_name].dtype == pl.Utf8:
-                        # Check if schema expects numeric type but data is string
-                        if any(
-                            t in col_type.upper()
-                            for t in [
-                                "TINYINT",
-                                "SMALLINT",
-                                "INT",
-                                "BIGINT",
-                                "LARGEINT",
-                                "FLOAT",
-                                "DOUBLE",
-                                "DECIMAL",
-                            ]
-                        ):
-                            # This should not happen anymore since we clean the data above
-                            print(
-                                f"{YELLOW}Warning: Column {col_name} still contains string data after cleaning attempt. Schema expects {col_type}.{RESET}"
-                            )
-                            continue
-
-                    # Integer types - only validate if data is actually numeric
-                    if (
-                        any(
-                            t in col_type.upper()
-                            for t in ["TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT"]
+                row = df.select(
+                    [expr.alias(f"s{i}") for i, expr in enumerate(stat_exprs.values())]
+                ).row(0)
+                values = dict(zip(stat_exprs, row))
+            except Exception as e:
+                print(
+                    f"{YELLOW}Warning: Batched column statistics failed ({e}), "
+                    f"computing per column{RESET}"
+                )
+                values = {}
+                for key, expr in stat_exprs.items():
+                    try:
+                        values[key] = df.select(expr).item()
+                    except Exception as col_error:
+                        print(
+                            f"{YELLOW}Warning: Could not compute {key[1]} for {key[0]}: {col_error}{RESET}"
                         )
-                        and df[col_name].dtype != pl.Utf8
-                    ):
-                        # Get min/max for the column
-                        try:
-                            min_val = df[col_name].min()
-                            max_val = df[col_name].max()
+            for (col_name, stat), value in values.items():
+                setattr(stats[col_name], stat, value)
 
-                            # Skip if min_val or max_val is None (all nulls)
-                            if min_val is None or max_val is None:
-                                continue
+        for col_name, type_info in checked:
+            col_stats = stats[col_name]
+            try:
+                self._log_type_upgrade(
+                    table_name,
+                    col_name,
+                    type_info,
+                    df[col_name].dtype,
+                    col_stats.max_length,
+                    col_stats.min_value,
+                    col_stats.max_value,
+                )
+            except Exception as e:
+                print(f"{RED}Warning: Could not validate column {col_name}: {str(e)}{RESET}")
 
-                        except Exception as e:
-                            print(
-                                f"{YELLOW}Warning: Could not get min/max for {col_name}: {e}{RESET}"
-                            )
-                            continue
-
-                        # Define StarRocks type ranges
-                        type_ranges = {
-                            "TINYINT": (-128, 127),
-                            "SMALLINT": (-32768, 32767),
-                            "INT": (-2147483648, 2147483647),
-                            "BIGINT": (-9223372036854775808, 9223372036854775807),
-                            "LARGEINT": (None, None),  # practically unlimited
-                        }
+        # Step 3: Rename columns based on mappings (e.g., div → div_raw for reserved keywords)
+        rename_map = self._mapping_renames(df.columns, table_name)
+        if rename_map:
+            df = df.rename(rename_map)
 
-                        # Find current type
-                        current_type = None
-                        for t in ["TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT"]:
-                            if t in col_type.upper():
-                                current_type = t
-                                break
+        return True, "Validation passed", df
+
+    def _log_type_upgrade(
+        self,
+        table_name: str,
+        col_name: str,
+        type_info: ColumnTypeInfo,
+        dtype: pl.DataType,
+        max_len: Optional[int] = None,
+        min_val: Optional[object] = None,
+        max_val: Optional[object] = None,
+    ):
+        """
+        Log the schema change a column's data needs (VARCHAR expansion or type upgrade).
+
+        Shared by the eager validation and the streaming path
+        (log_profile_schema_changes), which compute the statistics differently.
 
-                        # Find next allowed type if overflow
-                        if current_type and current_type != "LARGEINT":
-                            rng = type_ranges[current_type]
-                            if (rng[0] is not None and min_val < rng[0]) or (
-                                rng[1] is not None and max_val > rng[1]
+        Args:
+            table_name: Table being validated
+            col_name: Column name
+            type_info: Parsed schema type of the column
+            dtype: Polars dtype of the column's data
+            max_len: Longest value (VARCHAR columns; None = not computed)
+            min_val: Minimum value (integer columns; None = all null)
+            max_val: Maximum value (integer columns; None = all null)
+        """
+        col_type_upper = type_info.upper
+
+        # VARCHAR logic (as before)
+        if "VARCHAR" in col_type_upper:
+            varchar_limit = type_info.varchar_size
+            if varchar_limit and max_len is not None and max_len > varchar_limit:
+                new_size = int(max_len * 1.2)
+                new_size = min(new_size, 5000)
+                self._log_schema_change(
+                    table_name,
+                    col_name,
+                    varchar_limit,
+                    new_size,
+                    f"Data contains {max_len} chars, expanded with 20% buffer",
+                )
+                print(
+                    f"{YELLOW}⚠️  SCHEMA EXPANSION: {col_name}{RESET}\n"
+                    f"  Found data: {max_len} chars\n"
+                    f"  Schema limit: {varchar_limit}\n"
+                    f"  New limit: {new_size} (with 20% buffer)\n"
+                    f"  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
+                )
+            return
+
+        # Numeric and date type upgrades - only if the data is not string
+        if dtype == pl.Utf8:
+            return
+        pl_dtype = str(dtype).upper()
+
+        # Integer types
+        if type_info.integer_type is not None:
+            # Skip if min_val or max_val is None (all nulls)
+            if min_val is None or max_val is None:
+                return
+
+            # StarRocks type ranges, current type parsed once per type string
+            type_ranges = INTEGER_TYPE_RANGES
+            current_type = type_info.integer_type
+
+            # Find next allowed type if overflow
+            if current_type and current_type != "LARGEINT":
+                rng = type_ranges[current_type]
+                if (rng[0] is not None and min_val < rng[0]) or (
+                    rng[1] is not None and max_val > rng[1]
+                ):
+                    # Find next allowed type
+                    allowed = self.ALLOWED_TYPE_UPGRADES.get(current_type, [])
+                    for next_type in allowed:
+                        if next_type in type_ranges:
+                            next_range = type_ranges[next_type]
+                            if (next_range[0] is None or min_val >= next_range[0]) and (
+                                next_range[1] is None or max_val <= next_range[1]
                             ):
-                                # Find next allowed type
-                                allowed = self.ALLOWED_TYPE_UPGRADES.get(current_type, [])
-                                for next_type in allowed:
-                                    if next_type in type_ranges:
-                                        next_range = type_ranges[next_type]
-                                        if (next_range[0] is None or min_val >= next_range[0]) and (
-                                            next_range[1] is None or max_val <= next_range[1]
-                                        ):
-                                            # Log the schema change
-                                            self._log_schema_change(
-                                                table_name,
-                                                col_name,
-                                                current_type,
-                                                next_type,
-                                                f"Data out of range for {current_type}: min={min_val}, max={max_val}",
-                                            )
-                                            print(
-                                                f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Found data: min={min_val}, max={max_val}\n  Schema type: {current_type}\n  New type: {next_type}\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
-                                            )
-                                            break
-                    # FLOAT/DOUBLE/DECIMAL upgrades - only validate if data is actually numeric
-                    elif (
-                        any(t in col_type.upper() for t in ["FLOAT", "DOUBLE", "DECIMAL"])
-                        and df[col_name].dtype != pl.Utf8
-                    ):
-                        # For FLOAT, check if values require DOUBLE/DECIMAL
-                        if "FLOAT" in col_type.upper():
-                            # If any value is not representable as float32, suggest upgrade
-                            # (Polars uses float64 by default, so just check dtype)
-                            if pl_dtype == "FLOAT64":
-                                # Prefer DOUBLE, then DECIMAL
+                                # Log the schema change
                                 self._log_schema_change(
                                     table_name,
                                     col_name,
-                                    "FLOAT",
-                                    "DOUBLE",
-                                    f"Data requires DOUBLE precision (float64 detected)",
+                                    current_type,
+                                    next_type,
+                                    f"Data out of range for {current_type}: min={min_val}, max={max_val}",
                                 )
                                 print(
-                                    f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Data requires DOUBLE precision (float64 detected)\n  Schema type: FLOAT\n  New type: DOUBLE\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
+                                    f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Found data: min={min_val}, max={max_val}\n  Schema type: {current_type}\n  New type: {next_type}\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
                                 )
-                        # For DOUBLE, check if DECIMAL is needed (not auto-detectable, placeholder)
-                        # For DECIMAL, check if precision/scale needs to be increased (not auto-detectable, placeholder)
-                        # (Advanced: user can add logic for precision/scale checks)
-                    # DATE → DATETIME - only validate if data is actually date/datetime type
-                    elif (
-                        "DATE" in col_type.upper()
-                        and "DATETIME" not in col_type.upper()
-                        and df[col_name].dtype != pl.Utf8
-                    ):
-                        # If any value has time component, suggest DATETIME
-                        # (Polars reads as date/datetime, so check dtype)
-                        if pl_dtype in [
-                            "DATETIME[NS]",
-                            "DATETIME[US]",
-                            "DATETIME[MS]",
-                            "DATETIME[S]",
-                        ]:
-                            self._log_schema_change(
-                                table_name,
-                                col_name,
-                                "DATE",
-                                "DATETIME",
-                                f"Data contains time component, upgrade to DATETIME",
-                            )
-                            print(
-                                f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Data contains time component\n  Schema type: DATE\n  New type: DATETIME\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
-                            )
+                                break
+        # FLOAT/DOUBLE/DECIMAL upgrades
+        elif any(t in col_type_upper for t in ["FLOAT", "DOUBLE", "DECIMAL"]):
+            # For FLOAT, check if values require DOUBLE/DECIMAL
+            if "FLOAT" in col_type_upper:
+                # If any value is not representable as float32, suggest upgrade
+                # (Polars uses float64 by default, so just check dtype)
+                if pl_dtype == "FLOAT64":
+                    # Prefer DOUBLE, then DECIMAL
+                    self._log_schema_change(
+                        table_name,
+                        col_name,
+                        "FLOAT",
+                        "DOUBLE",
+                        f"Data requires DOUBLE precision (float64 detected)",
+                    )
+                    print(
+                        f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Data requires DOUBLE precision (float64 detected)\n  Schema type: FLOAT\n  New type: DOUBLE\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
+                    )
+            # For DOUBLE, check if DECIMAL is needed (not auto-detectable, placeholder)
+            # For DECIMAL, check if precision/scale needs to be increased (not auto-detectable, placeholder)
+            # (Advanced: user can add logic for precision/scale checks)
+        # DATE → DATETIME - only if the data is a datetime
+        elif "DATE" in col_type_upper and "DATETIME" not in col_type_upper:
+            # If any value has time component, suggest DATETIME
+            # (Polars reads as date/datetime, so check dtype; any time unit)
+            if dtype == pl.Datetime:
+                self._log_schema_change(
+                    table_name,
+                    col_name,
+                    "DATE",
+                    "DATETIME",
+                    f"Data contains time component, upgrade to DATETIME",
+                )
+                print(
+                    f"{YELLOW}⚠️  SCHEMA TYPE UPGRADE: {col_name}{RESET}\n  Data contains time component\n  Schema type: DATE\n  New type: DATETIME\n  Logged to: {self.logs_dir / 'schema_changes.log'}{RESET}"
+                )
+
+    def log_profile_schema_changes(
+        self, schema: Dict[str, pl.DataType], table_name: str, profile: DataFrameProfile
+    ) -> List[Dict]:
+        """
+        Schema-change logging of validate_dataframe_against_schema, from a profile.
+
+        For plans that are never collected: the VARCHAR max lengths and integer
+        min/max come from profile_lazyframe (one streaming aggregate) instead of
+        the DataFrame.
+
+        Args:
+            schema: Column name → Polars dtype of the profiled data
+            table_name: Table the data is loaded into
+            profile: Profile of the same data
+
+        Returns:
+            Schema change records logged by this call
+        """
+        if table_name not in self.tables:
+            return []
+        first_change = len(self.schema_changes)
+        frame = pl.DataFrame(schema=schema)
+        for col_name, type_info in self._schema_checked_columns(frame, table_name).items():
+            stats = profile.get(col_name) or ColumnProfile(
+                column=col_name, schema_type=type_info.upper
+            )
+            try:
+                self._log_type_upgrade(
+                    table_name,
+                    col_name,
+                    type_info,
+                    schema[col_name],
+                    stats.max_length,
+                    stats.min_value,
+                    stats.max_value,
+                )
             except Exception as e:
                 print(f"{RED}Warning: Could not validate column {col_name}: {str(e)}{RESET}")
+        return self.schema_changes[first_change:]
 
-        # Step 3: Rename columns based on mappings (e.g., div → div_raw for reserved keywords)
-        # Only rename columns that have explicit mappings for reserved keywords or special cases
+    def _mapping_renames(self, columns: List[str], table_name: str) -> Dict[str, str]:
+        """
+        Renames from explicit column mappings (e.g., div → div_raw for reserved keywords).
+
+        Only renames a column if the mapped db_column differs, has not already
+        been used as a rename target, and is not already a column.
+        """
+        table_mappings = self.column_mappings.get(table_name, {})
         rename_map = {}
         renamed_targets = set()  # Track which db_columns we've already renamed to
 
-        if table_name in self.column_mappings:
-            table_mappings = self.column_mappings[table_name]
-            for parquet_col in df.columns:
-                lookup_key = self._get_schema_lookup_key(parquet_col)
-                if lookup_key in table_mappings:
-                    mapping_info = table_mappings[lookup_key]
-                    db_column = mapping_info.get("db_column")
-
-                    # Only rename if:
-                    # 1. db_column is different from parquet_col
-                    # 2. We haven't already renamed to this db_column (avoid duplicates)
-                    # 3. db_column is not already in the dataframe
-                    if (
-                        db_column
-                        and db_column != parquet_col
-                        and db_column not in renamed_targets
-                        and db_column not in df.columns
-                    ):
-
-                        rename_map[parquet_col] = db_column
-                        renamed_targets.add(db_column)
-                        print(f"{GREEN}✓ Renaming column: {parquet_col} → {db_column}{RESET}")
+        for parquet_col in columns:
+            lookup_key = self._get_schema_lookup_key(parquet_col)
+            if lookup_key not in table_mappings:
+                continue
+            db_column = table_mappings[lookup_key].get("db_column")
+            if (
+                db_column
+                and db_column != parquet_col
+                and db_column not in renamed_targets
+                and db_column not in columns
+            ):
+                rename_map[parquet_col] = db_column
+                renamed_targets.add(db_column)
+                print(f"{GREEN}✓ Renaming column: {parquet_col} → {db_column}{RESET}")
+
+        return rename_map
+
+    @staticmethod
+    def _detect_date_format(values: pl.Series, expected_type: str) -> Optional[str]:
+        """
+        The DATE format _clean_numeric_strings would pick for these values.
+
+        The first of DATE_FORMATS that leaves at most 10% of the values
+        unparsed wins.
+
+        Args:
+            values: String values (e.g. a sample of the column)
+            expected_type: Expected SQL type from schema (DATE or DATETIME)
+
+        Returns:
+            strptime format, or None if no format fits
+        """
+        dtype = pl.Datetime if "DATETIME" in expected_type.upper() else pl.Date
+        original_nulls = values.null_count()
+        for fmt in DATE_FORMATS:
+            try:
+                parsed = values.str.strptime(dtype, format=fmt, strict=False)
+            except Exception:
+                continue
+            if parsed.null_count() - original_nulls <= len(values) * 0.1:
+                return fmt
+        return None
+
+    @staticmethod
+    def _numeric_string_expr(
+        col_name: str, expected_type: str, date_format: Optional[str] = None
+    ) -> Optional[pl.Expr]:
+        """
+        Expression form of _clean_numeric_strings, for lazy plans.
+
+        DATE/DATETIME strings are parsed with the column's one date_format
+        (see _detect_date_format); values in another format become NULL.
+
+        Returns:
+            Cleaning expression, or None if the type needs no cleaning
+        """
+        type_upper = expected_type.upper()
+        col = pl.col(col_name)
+        if any(t in type_upper for t in ["TINYINT", "SMALLINT", "INT", "BIGINT", "LARGEINT"]):
+            return col.str.strip_chars().replace("", None).cast(pl.Int64, strict=False)
+        if any(t in type_upper for t in ["FLOAT", "DOUBLE", "DECIMAL"]):
+            return col.str.strip_chars().replace("", None).cast(pl.Float64, strict=False)
+        if "DATE" in type_upper and date_format is not None:
+            dtype = pl.Datetime if "DATETIME" in type_upper else pl.Date
+            return col.str.strptime(dtype, format=date_format, strict=False)
+        return None
+
+    def conform_lazyframe(
+        self, lf: pl.LazyFrame, table_name: str
+    ) -> Tuple[pl.LazyFrame, Dict[str, str]]:
+        """
+        Lazy counterpart of validate_dataframe_against_schema, for streaming plans.
+
+        Adds the same data changes to the plan: string columns whose schema
+        type is numeric or DATE are cleaned (strip, '' → NULL, non-strict cast)
+        and mapping renames are applied. Only DATE string columns are read, and
+        only their first DATE_FORMAT_SAMPLE_ROWS rows, to pick one format per
+        column as the eager path does. Checks that need all the data
+        (conversion failure rate, overflows, schema changes) are left to the
+        caller, e.g. profile_lazyframe on the written file.
+
+        Args:
+            lf: LazyFrame plan (columns already renamed to DB names)
+            table_name: Name of the table schema to conform to
+
+        Returns:
+            Tuple of (plan, cleaned_columns) - cleaned_columns maps each cleaned
+            column's output name to its name before this step
 
+        Raises:
+            ValueError: If no date format fits a DATE column's sample
+        """
+        if table_name not in self.tables:
+            return lf, {}
+        compiled = self.compiled_table(table_name)
+        if not compiled.columns:
+            return lf, {}
+
+        schema = lf.collect_schema()
+        col_types = {}
+        for col_name, dtype in schema.items():
+            if dtype != pl.Utf8:
+                continue
+            _, col_type = self._find_best_schema_match(col_name, dtype, compiled, table_name)
+            if col_type is None or "VARCHAR" in col_type.upper():
+                continue
+            col_types[col_name] = col_type
+
+        # One format per DATE column, picked from a sample (one read for all of them)
+        date_formats = {}
+        date_columns = [c for c, t in col_types.items() if "DATE" in t.upper()]
+        if date_columns:
+            sample = lf.select(date_columns).head(DATE_FORMAT_SAMPLE_ROWS).collect()
+            for col_name in date_columns:
+                fmt = self._detect_date_format(sample[col_name], col_types[col_name])
+                if fmt is None:
+                    raise ValueError(
+                        f"Could not convert {col_name} to date - no suitable format found"
+                    )
+                date_formats[col_name] = fmt
+
+        exprs = []
+        cleaned = []
+        for col_name, col_type in col_types.items():
+            expr = self._numeric_string_expr(col_name, col_type, date_formats.get(col_name))
+            if expr is not None:
+                exprs.append(expr.alias(col_name))
+                cleaned.append(col_name)
+
+        if exprs:
+            lf = lf.with_columns(exprs)
+
+        rename_map = self._mapping_renames(list(schema.keys()), table_name)
         if rename_map:
-            df = df.rename(rename_map)
+            lf = lf.rename(rename_map)
 
-        return True, "Validation passed", df
+        return lf, {rename_map.get(col, col): col for col in cleaned}
+
+    def profile_parquet_footer(self, parquet_path: Path, table_name: str) -> DataFrameProfile:
+        """
+        profile_dataframe from a parquet file's footer only (no data pages read).
+
+        Null counts and integer min/max come from the row-group statistics;
+        VARCHAR max lengths are not stored in the footer and stay None, so
+        detect_data_overflows skips the VARCHAR check for such a profile.
+
+        Args:
+            parquet_path: Parquet file
+            table_name: Name of the table schema to profile against
+
+        Returns:
+            DataFrameProfile (use with detect_data_overflows(empty frame, ..., profile))
+        """
+        from utils.parquet_index import footer_column_stats
+
+        num_rows, stats = footer_column_stats(parquet_path)
+        profile = DataFrameProfile(table_name=table_name, row_count=num_rows)
+        if table_name not in self.tables:
+            return profile
+
+        frame = pl.DataFrame(schema=pl.read_parquet_schema(parquet_path))
+        for col_name, type_info in self._schema_checked_columns(frame, table_name).items():
+            column_stats = stats.get(col_name, {})
+            column = ColumnProfile(
+                column=col_name,
+                schema_type=type_info.upper,
+                null_count=column_stats.get("null_count"),
+            )
+            if (
+                type_info.integer_type not in (None, "LARGEINT")
+                and frame.schema[col_name] != pl.Utf8
+            ):
+                column.min_value = column_stats.get("min")
+                column.max_value = column_stats.get("max")
+            profile.columns[col_name] = column
+        return profile
 
     @staticmethod
     def _extract_columns_from_schema(schema_str: str) -> Dict[str, str]:
@@ -1386,6 +1927,8 @@ class SchemaValidator:
             if updated:
                 with open(schema_file, "w") as f:
                     f.write(content)
+                # Cached validators were compiled from the old file
+                SchemaValidator.clear_cache()
                 print(f"{GREEN}✓ Schema file updated: {schema_file}{RESET}")
                 return True, "Schema file updated successfully"
             else:
@@ -1,18 +1,22 @@
 """
 StarRocks Database Utilities
 
-Provides connection management, Stream Load operations, and query execution
+Provides connection management (via the shared pool in
+core/loaders/connection_pool.py), Stream Load operations, and query execution
 for StarRocks. Uses the HTTP Stream Load API for efficient bulk inserts.
 """
 
 import time
 import os
-import requests
-import pymysql
-from typing import Optional, Dict, List, Tuple, Any
+import polars as pl
+from typing import Optional, Dict, List, Tuple, Any, Callable, Iterable
 import logging
 
 from utils.DB_CONFIG import DB_CONFIG
+from core.loaders.connection_pool import PooledConnection, get_connection_pool
+from core.loaders.stream_load_body import iter_file_body
+from core.loaders.stream_load_formats import get_stream_load_format, resolve_stream_load_format
+from core.loaders.stream_load_transport import get_stream_load_transport
 
 # Color codes for console output
 RED = "\033[31m"
@@ -28,47 +32,34 @@ CHUNK_SIZE = 100000  # Records per chunk
 
 
 class StarRocksConnection:
-    """Context manager for StarRocks MySQL connections"""
+    """Context manager for pooled StarRocks MySQL connections"""
 
     def __init__(self, config: Dict = None):
         self.config = config or DB_CONFIG
         self.conn = None
 
     def __enter__(self):
-        self.conn = pymysql.connect(
-            host=self.config["host"],
-            port=self.config.get("port", 9030),
-            user=self.config["user"],
-            password=self.config["password"],
-            database=self.config["database"],
-            charset=self.config.get("charset", "utf8mb4"),
-            autocommit=self.config.get("autocommit", True),
-        )
+        self.conn = get_connection_pool(self.config).acquire()
         return self.conn
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.conn:
-            self.conn.close()
+            self.conn.__exit__(exc_type, exc_val, exc_tb)
+
 
+def get_starrocks_connection() -> PooledConnection:
+    """Check out a StarRocks MySQL connection from the shared pool
 
-def get_starrocks_connection() -> pymysql.Connection:
-    """Create and return a StarRocks MySQL connection
+    The connection is opened lazily and reused across calls; close() returns
+    it to the pool.
 
     Returns:
-        pymysql.Connection: Active database connection
+        PooledConnection: Active database connection
 
     Raises:
         pymysql.Error: If connection fails
     """
-    return pymysql.connect(
-        host=DB_CONFIG["host"],
-        port=DB_CONFIG.get("port", 9030),
-        user=DB_CONFIG["user"],
-        password=DB_CONFIG["password"],
-        database=DB_CONFIG["database"],
-        charset=DB_CONFIG.get("charset", "utf8mb4"),
-        autocommit=DB_CONFIG.get("autocommit", True),
-    )
+    return get_connection_pool(DB_CONFIG).acquire()
 
 
 def execute_query(query: str, logger: Optional[logging.Logger] = None) -> List[Tuple]:
@@ -204,6 +195,8 @@ def stream_load_csv(
 ) -> Tuple[bool, Dict]:
     """Load CSV data into StarRocks using Stream Load HTTP API
 
+    The file is streamed from disk in blocks rather than read into memory.
+
     Args:
         table_name: Target table name
         csv_file_path: Path to CSV file
@@ -211,6 +204,79 @@ def stream_load_csv(
         columns: List of column names for CSV->DB mapping (in order)
         logger: Optional logger instance
 
+    Returns:
+        Tuple of (success: bool, response_json: dict)
+    """
+    return _stream_load(
+        table_name,
+        body_factory=lambda: iter_file_body(csv_file_path),
+        format_headers={"column_separator": "\x01", "format": "CSV"},
+        format_name="csv",
+        chunk_id=chunk_id,
+        columns=columns,
+        logger=logger,
+    )
+
+
+def stream_load_dataframe(
+    table_name: str,
+    df: pl.DataFrame,
+    chunk_id: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    logger: Optional[logging.Logger] = None,
+    body_format: Optional[str] = None,
+) -> Tuple[bool, Dict]:
+    """Load a Polars DataFrame into StarRocks using Stream Load HTTP API
+
+    The body is serialized in the format from stream_load_defaults.yaml
+    (csv by default, parquet/arrow opt-in) without a temp file. A typed format
+    the cluster's version does not support is sent as CSV instead.
+
+    Args:
+        table_name: Target table name
+        df: DataFrame to load
+        chunk_id: Optional chunk identifier for logging
+        columns: Column names for body->DB mapping (default: df.columns)
+        logger: Optional logger instance
+        body_format: Optional format override (csv, parquet, arrow)
+
+    Returns:
+        Tuple of (success: bool, response_json: dict)
+    """
+    fmt = resolve_stream_load_format(
+        get_stream_load_format(body_format), get_connection_pool(DB_CONFIG)
+    )
+    return _stream_load(
+        table_name,
+        body_factory=lambda: fmt.iter_body(df),
+        format_headers=fmt.headers(),
+        format_name=fmt.name,
+        chunk_id=chunk_id,
+        columns=columns or df.columns,
+        logger=logger,
+    )
+
+
+def _stream_load(
+    table_name: str,
+    body_factory: Callable[[], Iterable[bytes]],
+    format_headers: Dict[str, str],
+    format_name: str,
+    chunk_id: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Tuple[bool, Dict]:
+    """Send one Stream Load request and report the result
+
+    Args:
+        table_name: Target table name
+        body_factory: Callable returning a fresh body iterable
+        format_headers: Body format headers (format, separator, null marker)
+        format_name: Body format name, used for bytes-sent reporting
+        chunk_id: Optional chunk identifier for logging
+        columns: List of column names for body->DB mapping
+        logger: Optional logger instance
+
     Returns:
         Tuple of (success: bool, response_json: dict)
     """
@@ -220,8 +286,7 @@ def stream_load_csv(
     # Prepare headers
     headers = {
         "label": f"{table_name}_{int(time.time())}_{chunk_id if chunk_id else ''}",
-        "column_separator": "\x01",
-        "format": "CSV",
+        **format_headers,
         "max_filter_ratio": str(MAX_ERROR_RATIO),
         "strict_mode": "false",
         "timezone": "Asia/Shanghai",
@@ -236,17 +301,21 @@ def stream_load_csv(
     auth = (DB_CONFIG["user"], DB_CONFIG["password"])
 
     try:
-        # Read the file
-        with open(csv_file_path, "rb") as f:
-            file_data = f.read()
-
-        # Execute Stream Load
-        response = requests.put(
-            url, headers=headers, data=file_data, auth=auth, timeout=STREAM_LOAD_TIMEOUT
+        # Execute Stream Load with a streamed body
+        transport = get_stream_load_transport(
+            DB_CONFIG["host"], os.getenv("STARROCKS_HTTP_PORT", "8040")
+        )
+        response, bytes_sent = transport.put(
+            url, headers, body_factory, auth, STREAM_LOAD_TIMEOUT
         )
 
         # Parse response
         result = response.json()
+        result["BodyFormat"] = format_name
+        result["BytesSent"] = bytes_sent
+
+        if logger:
+            logger.debug(f"Sent {bytes_sent / 1024 / 1024:.2f}MB ({format_name}) to {table_name}")
 
         if result.get("Status") == "Success":
             return True, result